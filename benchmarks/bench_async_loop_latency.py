@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""异步断点下载对事件循环的影响。
+
+在事件循环中一边执行 `resumable_download_async` 下载大文件，一边运行一个每1ms唤醒一次的协程，
+统计它被唤醒的延迟（实际唤醒时间减去预期时间）。比较文件写入和断点信息保存放到线程池中执行
+（ `offload` ）和直接在事件循环中执行（ `inline` ）两种方式。 `BENCH_DISK_DELAY_MS` 模拟较慢的磁盘，
+每次写入额外阻塞若干毫秒。
+
+用法 ::
+
+    python benchmarks/bench_async_loop_latency.py
+    BENCH_SIZE_MB=512 BENCH_DISK_DELAY_MS=5 python benchmarks/bench_async_loop_latency.py
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+import functools
+import contextlib
+import statistics
+from unittest import mock
+
+import aliyun_oss_x
+from aliyun_oss_x import http
+from aliyun_oss_x.resumable import _aio, async_resumable
+from aliyun_oss_x.resumable._writer import _FileWriter
+
+from common import LocalOssServer, BUCKET_NAME, report, env_int
+
+
+_TICK = 0.001
+
+
+async def _inline_io(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+@contextlib.contextmanager
+def _io_mode(mode, disk_delay):
+    with contextlib.ExitStack() as stack:
+        if mode == "inline":
+            stack.enter_context(mock.patch.object(_aio, "run_io", _inline_io))
+            stack.enter_context(mock.patch.object(async_resumable, "run_io", _inline_io))
+
+        if disk_delay:
+            write = _FileWriter.write
+
+            @functools.wraps(write)
+            def slow_write(self, offset, data):
+                time.sleep(disk_delay)
+                return write(self, offset, data)
+
+            stack.enter_context(mock.patch.object(_FileWriter, "write", slow_write))
+        yield
+
+
+async def _ticker(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + _TICK
+        await asyncio.sleep(_TICK)
+        lags.append(loop.time() - expected)
+
+
+async def _download(endpoint, root, mode, num_threads):
+    session = http.AsyncSession(http2=False)
+    bucket = aliyun_oss_x.AsyncBucket(aliyun_oss_x.AnonymousAuth(), endpoint, BUCKET_NAME, session=session)
+    filename = os.path.join(root, mode)
+    store = aliyun_oss_x.AsyncResumableDownloadStore(root=root, dir=f"store-{mode}")
+
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+
+    start = time.perf_counter()
+    try:
+        await aliyun_oss_x.resumable_download_async(
+            bucket, "key", filename, multiget_threshold=1, part_size=4 * 2**20, num_threads=num_threads, store=store
+        )
+    finally:
+        stop.set()
+        await ticker
+    elapsed = time.perf_counter() - start
+
+    os.remove(filename)
+    return elapsed, lags
+
+
+def main():
+    size = env_int("BENCH_SIZE_MB", 256) * 2**20
+    num_threads = env_int("BENCH_THREADS", 8)
+    disk_delay = env_int("BENCH_DISK_DELAY_MS", 2) / 1000
+
+    rows = []
+    with LocalOssServer(object_size=size) as server, tempfile.TemporaryDirectory() as root:
+        for mode in ("inline", "offload"):
+            with _io_mode(mode, disk_delay):
+                elapsed, lags = asyncio.run(_download(server.endpoint, root, mode, num_threads))
+
+            lags_ms = sorted(lag * 1000 for lag in lags)
+            p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+            rows.append(
+                (
+                    mode,
+                    f"{elapsed:.2f}",
+                    f"{size / 2**20 / elapsed:.0f}",
+                    f"{statistics.median(lags_ms):.2f}",
+                    f"{p99:.2f}",
+                    f"{lags_ms[-1]:.2f}",
+                )
+            )
+
+    report(
+        f"{size // 2**20}MB, {num_threads} threads, disk delay {disk_delay * 1000:.0f}ms",
+        rows,
+        ("io", "seconds", "MB/s", "lag p50 ms", "lag p99 ms", "lag max ms"),
+    )
+
+
+if __name__ == "__main__":
+    main()
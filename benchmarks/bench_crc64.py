@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""CRC64各个计算后端在不同的数据块大小下的速度（MB/s）。
+
+除了SDK可选的后端（ `crcmod-c` 、 `python` ），还列出crcmod自带的纯Python实现（ `crcmod-python` ），
+即没有C扩展时原来的速度。
+
+用法 ::
+
+    python benchmarks/bench_crc64.py
+    BENCH_CRC_MB=64 python benchmarks/bench_crc64.py
+"""
+
+import os
+import sys
+import time
+
+import crcmod
+import crcmod.crcmod
+import crcmod._crcfunpy
+
+from aliyun_oss_x.utils import _crc64, crc64_backend
+
+from common import report, env_int
+
+
+_CHUNK_SIZES = [256, 8 * 1024, 64 * 1024, 1024 * 1024]
+
+
+def _crcmod_python():
+    table = sys.modules["crcmod.crcmod"]._mkTable_r(_crc64._POLY, 64)
+
+    def update(crc, data):
+        return _crc64._MASK ^ crcmod._crcfunpy._crc64r(data, _crc64._MASK ^ crc, table)
+
+    return update
+
+
+def run(update, data, chunk_size):
+    view = memoryview(data)
+    crc = 0
+    start = time.perf_counter()
+    for offset in range(0, len(data), chunk_size):
+        crc = update(crc, view[offset : offset + chunk_size])
+    elapsed = time.perf_counter() - start
+
+    assert crc == _crc64.BACKENDS["python"](0, data)
+    return len(data) / elapsed / 2**20
+
+
+def main():
+    data = os.urandom(env_int("BENCH_CRC_MB", 8) * 2**20)
+    backends = dict(_crc64.BACKENDS, **{"crcmod-python": _crcmod_python()})
+
+    rows = []
+    for name, update in backends.items():
+        rows.append([name] + [f"{run(update, data, chunk_size):.1f}" for chunk_size in _CHUNK_SIZES])
+
+    columns = ["backend"] + [f"{size // 1024}KB" if size >= 1024 else f"{size}B" for size in _CHUNK_SIZES]
+    report(f"CRC64 MB/s over {len(data) // 2**20}MB, active backend: {crc64_backend()}", rows, columns)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""连接池大小对并发吞吐量的影响。
+
+固定并发线程数，改变 `PoolConfig.max_connections` ，统计单位时间内完成的GET请求数。
+模拟服务端对每个请求增加固定延迟，以模拟公网上的往返时延。
+
+用法 ::
+
+    python benchmarks/bench_pool_size.py
+    BENCH_THREADS=64 BENCH_DELAY_MS=50 python benchmarks/bench_pool_size.py
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aliyun_oss_x
+
+from common import LocalOssServer, make_bucket, report, env_int
+
+
+def run(endpoint, pool_size, num_threads, num_requests):
+    config = aliyun_oss_x.PoolConfig(max_connections=pool_size, max_keepalive_connections=pool_size)
+    bucket = make_bucket(endpoint, session=aliyun_oss_x.Session(http2=False, pool_config=config), enable_crc=False)
+
+    def get(_):
+        with bucket.get_object("bench-object") as result:
+            return len(result.read())
+
+    with ThreadPoolExecutor(num_threads) as executor:
+        # 预热：建立连接
+        list(executor.map(get, range(num_threads)))
+
+        start = time.perf_counter()
+        total = sum(executor.map(get, range(num_requests)))
+        elapsed = time.perf_counter() - start
+
+    bucket.session.close()
+    return num_requests / elapsed, total / elapsed / 2**20
+
+
+def main():
+    num_threads = env_int("BENCH_THREADS", 32)
+    num_requests = env_int("BENCH_REQUESTS", 640)
+    delay = env_int("BENCH_DELAY_MS", 20) / 1000
+    object_size = env_int("BENCH_SIZE_KB", 64) * 1024
+    pool_sizes = [int(n) for n in os.getenv("BENCH_POOL_SIZES", "1,2,4,8,16,32,64").split(",")]
+
+    rows = []
+    with LocalOssServer(object_size=object_size, delay=delay) as server:
+        for pool_size in pool_sizes:
+            qps, mbps = run(server.endpoint, pool_size, num_threads, num_requests)
+            rows.append((pool_size, f"{qps:.1f}", f"{mbps:.1f}"))
+
+    report(
+        f"{num_threads} threads, {num_requests} GETs of {object_size // 1024}KB, server delay {delay * 1000:.0f}ms",
+        rows,
+        ("pool_size", "req/s", "MB/s"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""断点信息存储的写入开销。
+
+模拟断点下载每完成一个分片就保存一次断点记录，比较每次重写整个JSON记录（ `compact_threshold=0` ）
+和追加日志两种方式的耗时。
+
+用法 ::
+
+    python benchmarks/bench_resumable_store.py
+    BENCH_PARTS=10000 BENCH_FSYNC_EVERY=100 python benchmarks/bench_resumable_store.py
+"""
+
+import time
+import tempfile
+
+import aliyun_oss_x
+
+from common import report, env_int
+
+
+def run(root, num_parts, compact_threshold, fsync_every):
+    store = aliyun_oss_x.ResumableDownloadStore(
+        root=root, dir=f"store-{compact_threshold}", compact_threshold=compact_threshold, fsync_every=fsync_every
+    )
+    record = {"op_type": "ResumableDownload", "size": num_parts * 10 * 2**20, "etag": "0" * 32, "parts": []}
+
+    start = time.perf_counter()
+    store.put("key", record)
+    for i in range(num_parts):
+        record["parts"].append(
+            {"part_number": i + 1, "start": i * 10 * 2**20, "end": (i + 1) * 10 * 2**20, "part_crc": 2**63 + i}
+        )
+        store.put("key", record)
+    elapsed = time.perf_counter() - start
+
+    assert store.get("key") == record
+    return elapsed
+
+
+def main():
+    num_parts = env_int("BENCH_PARTS", 2000)
+    fsync_every = env_int("BENCH_FSYNC_EVERY", 0)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as root:
+        for name, compact_threshold in (
+            ("rewrite", 0),
+            ("journal", aliyun_oss_x.defaults.resumable_journal_compact_threshold),
+        ):
+            elapsed = run(root, num_parts, compact_threshold, fsync_every)
+            rows.append((name, f"{elapsed:.2f}", f"{num_parts / elapsed:.0f}"))
+
+    report(f"{num_parts} parts, fsync every {fsync_every or 'never'}", rows, ("store", "seconds", "puts/s"))
+
+
+if __name__ == "__main__":
+    main()
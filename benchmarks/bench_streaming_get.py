@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""对比流式与非流式GET的内存峰值和首字节时间（TTFB）。
+
+用法 ::
+
+    python benchmarks/bench_streaming_get.py            # 默认下载512MB
+    BENCH_SIZE_MB=2048 python benchmarks/bench_streaming_get.py
+
+每种模式在独立的子进程中运行，以便单独统计内存峰值。"非流式"模式通过关闭请求上的
+`stream` 标志还原为一次性读取整个响应体后再返回的行为。
+"""
+
+import sys
+import time
+import subprocess
+
+import aliyun_oss_x
+
+from common import LocalOssServer, make_bucket, peak_rss_mb, report, env_int
+
+
+class _BufferedSession(aliyun_oss_x.Session):
+    def do_request(self, req, timeout):
+        req.stream = False
+        return super(_BufferedSession, self).do_request(req, timeout)
+
+
+def run_child(mode, endpoint, size):
+    session = aliyun_oss_x.Session(http2=False) if mode == "stream" else _BufferedSession(http2=False)
+    bucket = make_bucket(endpoint, session=session, enable_crc=False)
+
+    base_rss = peak_rss_mb()
+    start = time.perf_counter()
+    with bucket.get_object("bench-object") as result:
+        first = result.read(64 * 1024)
+        ttfb = time.perf_counter() - start
+        total = len(first)
+        while True:
+            chunk = result.read(1024 * 1024)
+            if not chunk:
+                break
+            total += len(chunk)
+    elapsed = time.perf_counter() - start
+
+    assert total == size, (total, size)
+    print(f"{ttfb:.4f} {elapsed:.4f} {peak_rss_mb() - base_rss:.1f}")
+
+
+def main():
+    size = env_int("BENCH_SIZE_MB", 512) * 1024 * 1024
+
+    rows = []
+    with LocalOssServer(object_size=size) as server:
+        for mode in ("buffered", "stream"):
+            out = subprocess.check_output(
+                [sys.executable, __file__, "--child", mode, server.endpoint, str(size)], text=True
+            )
+            ttfb, elapsed, rss = out.split()
+            rows.append((mode, f"{float(ttfb) * 1000:.1f}", f"{size / float(elapsed) / 2**20:.1f}", rss))
+
+    report(f"GET {size // 2**20}MB object", rows, ("mode", "ttfb(ms)", "MB/s", "peak_rss(MB)"))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        main()
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""基准测试公用代码：本地模拟OSS服务端以及内存、时间统计工具。
+
+模拟服务端只实现基准测试需要的最小子集：
+
+    * GET/HEAD：返回确定性内容，支持 `Range` 头部，响应携带 `x-oss-hash-crc64ecma`
+    * PUT/POST：读取并丢弃请求体，返回一个固定的ETag
+"""
+
+import os
+import sys
+import time
+import resource
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aliyun_oss_x
+
+BUCKET_NAME = "bench-bucket"
+
+_PATTERN = bytes(range(256)) * 4096
+
+
+def make_content(size):
+    """生成长度为 `size` 的确定性内容，与模拟服务端返回的内容一致。"""
+    repeat, remain = divmod(size, len(_PATTERN))
+    return _PATTERN * repeat + _PATTERN[:remain]
+
+
+def peak_rss_mb():
+    """返回当前进程的内存占用峰值（MB）。"""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return usage / 1024 / 1024
+    return usage / 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _object_size(self):
+        return self.server.object_size
+
+    def _send_headers(self, status, length, extra=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("x-oss-request-id", "bench-request-id")
+        self.send_header("ETag", '"bench-etag"')
+        self.send_header("Last-Modified", "Fri, 11 Dec 2015 13:01:41 GMT")
+        for k, v in (extra or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+
+    def _parse_range(self, size):
+        value = self.headers.get("Range")
+        if not value or not value.startswith("bytes="):
+            return None
+        start, _, end = value[len("bytes=") :].partition("-")
+        start = int(start) if start else 0
+        end = int(end) if end else size - 1
+        return start, min(end, size - 1)
+
+    def do_HEAD(self):
+        size = self._object_size()
+        self._send_headers(200, size, {"x-oss-hash-crc64ecma": str(self.server.object_crc)})
+
+    def do_GET(self):
+        size = self._object_size()
+        byte_range = self._parse_range(size)
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        if byte_range is None:
+            start, end = 0, size - 1
+            self._send_headers(200, size, {"x-oss-hash-crc64ecma": str(self.server.object_crc)})
+        else:
+            start, end = byte_range
+            self._send_headers(206, end - start + 1, {"Content-Range": f"bytes {start}-{end}/{size}"})
+
+        view = memoryview(self.server.content)
+        chunk = 256 * 1024
+        pos = start
+        try:
+            while pos <= end:
+                n = min(chunk, end - pos + 1)
+                self.wfile.write(view[pos : pos + n])
+                pos += n
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _discard_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        while length > 0:
+            data = self.rfile.read(min(length, 1024 * 1024))
+            if not data:
+                break
+            length -= len(data)
+
+    def do_PUT(self):
+        self._discard_body()
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        self._send_headers(200, 0)
+
+    do_POST = do_PUT
+
+
+class LocalOssServer:
+    """在后台线程中运行的模拟OSS服务端。
+
+    :param int object_size: GET返回的对象大小
+    :param float delay: 每个请求在返回响应之前的延迟（秒），用于模拟网络时延
+    """
+
+    def __init__(self, object_size=0, delay=0.0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.object_size = object_size
+        self.httpd.content = make_content(object_size)
+        self.httpd.delay = delay
+
+        crc = aliyun_oss_x.utils.Crc64()
+        crc.update(self.httpd.content)
+        self.httpd.object_crc = crc.crc
+
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def make_bucket(endpoint, **kwargs):
+    kwargs.setdefault("session", aliyun_oss_x.Session(http2=False))
+    return aliyun_oss_x.Bucket(aliyun_oss_x.AnonymousAuth(), endpoint, BUCKET_NAME, **kwargs)
+
+
+def report(title, rows, columns):
+    """以表格形式打印结果。"""
+    print(title)
+    widths = [max(len(str(c)), 12) for c in columns]
+    print("  ".join(str(c).rjust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(v).rjust(w) for v, w in zip(row, widths)))
+    print()
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default))
@@ -12,7 +12,11 @@ from .auth import (
     make_auth,
     ProviderAuthV4,
 )
-from .http import Session
+from .http import Session, PoolConfig
+from .retry import RetryPolicy, RetryBudget, RetryStats, RetryEvent
+from .hedge import HedgePolicy, HedgeStats
+from .concurrency import AdaptiveConcurrency
+from .executor import TransferExecutor
 from .credentials import (
     EcsRamRoleCredentialsProvider,
     EcsRamRoleCredential,
@@ -40,6 +44,9 @@ from .iterators import (
 from .resumable.sync_resumable import (
     resumable_upload,
     resumable_download,
+    resumable_copy,
+    start_resumable_upload,
+    start_resumable_download,
     ResumableStore,
     ResumableDownloadStore,
     determine_part_size,
@@ -50,11 +57,23 @@ from .resumable.sync_resumable import (
 from .resumable.async_resumable import (
     resumable_upload_async,
     resumable_download_async,
+    resumable_copy_async,
+    start_resumable_upload_async,
+    start_resumable_download_async,
     AsyncResumableStore,
     AsyncResumableDownloadStore,
     make_upload_store_async,
     make_download_store_async,
 )
+from .resumable.handle import TransferHandle, AsyncTransferHandle, TransferStats
+from .resumable.sync_stream import upload_stream
+from .resumable.async_stream import upload_stream_async
+from .resumable._directory import DirectoryTransferResult
+from .resumable.sync_directory import upload_directory, download_directory, sync_directory
+from .resumable.async_directory import upload_directory_async, download_directory_async, sync_directory_async
+from .object_writer import ObjectWriter, AsyncObjectWriter
+from .object_reader import ObjectReader
+from .parallel_get import ObjectStream, AsyncObjectStream
 
 from .compat import to_bytes
 
@@ -133,6 +152,15 @@ __all__ = [
     "make_auth",
     "ProviderAuthV4",
     "Session",
+    "PoolConfig",
+    "RetryPolicy",
+    "RetryBudget",
+    "RetryStats",
+    "RetryEvent",
+    "HedgePolicy",
+    "HedgeStats",
+    "AdaptiveConcurrency",
+    "TransferExecutor",
     "EcsRamRoleCredentialsProvider",
     "EcsRamRoleCredential",
     "CredentialsProvider",
@@ -184,6 +212,9 @@ __all__ = [
     "BUCKET_DATA_REDUNDANCY_TYPE_ZRS",
     "resumable_upload",
     "resumable_download",
+    "resumable_copy",
+    "start_resumable_upload",
+    "start_resumable_download",
     "ResumableStore",
     "ResumableDownloadStore",
     "determine_part_size",
@@ -191,10 +222,30 @@ __all__ = [
     "make_download_store",
     "resumable_upload_async",
     "resumable_download_async",
+    "resumable_copy_async",
+    "start_resumable_upload_async",
+    "start_resumable_download_async",
     "AsyncResumableStore",
     "AsyncResumableDownloadStore",
     "make_upload_store_async",
     "make_download_store_async",
+    "TransferHandle",
+    "AsyncTransferHandle",
+    "TransferStats",
+    "upload_stream",
+    "upload_stream_async",
+    "DirectoryTransferResult",
+    "upload_directory",
+    "download_directory",
+    "upload_directory_async",
+    "download_directory_async",
+    "sync_directory",
+    "sync_directory_async",
+    "ObjectWriter",
+    "AsyncObjectWriter",
+    "ObjectReader",
+    "ObjectStream",
+    "AsyncObjectStream",
     "LocalRsaProvider",
     "AliKMSProvider",
     "RsaProvider",
@@ -1,9 +1,12 @@
+import asyncio
 import logging
 from pathlib import Path
 from urllib.parse import quote
 from typing import Type, Callable, Sequence, TYPE_CHECKING
 
 from .. import http
+from .. import hedge
+from .. import retry
 from .. import utils
 from .. import defaults
 from .. import xml_utils
@@ -26,7 +29,7 @@ from ..models import (
     PutObjectResult,
     AppendObjectResult,
     AsyncGetObjectResult,
-    SelectObjectResult,
+    AsyncSelectObjectResult,
     HeadObjectResult,
     GetSelectObjectMetaResult,
     GetObjectMetaResult,
@@ -145,12 +148,19 @@ class _Base:
         cloudbox_id: str | None = None,
         is_path_style: bool = False,
         is_verify_object_strict: bool = True,
+        pool_config: http.PoolConfig | None = None,
+        retry_policy: retry.RetryPolicy | None = None,
+        hedge_policy: hedge.HedgePolicy | None = None,
     ):
         self.auth = auth
         self.endpoint = _normalize_endpoint(endpoint.strip())
         if utils.is_valid_endpoint(self.endpoint) is not True:
             raise ClientError(f"The endpoint you has specified is not valid, endpoint: {endpoint}")
-        self.session = session or http.AsyncSession()
+        if session is not None and pool_config is not None:
+            raise ClientError("pool_config can not be specified together with session")
+        self.session = session or http.AsyncSession(pool_config=pool_config)
+        self.retry_policy = retry_policy or retry.RetryPolicy()
+        self.hedge_policy = hedge_policy
         self.timeout = defaults.get(connect_timeout, defaults.connect_timeout)
         self.app_name = app_name
         self.enable_crc = enable_crc
@@ -176,25 +186,45 @@ class _Base:
             cloudbox_id=self.cloudbox_id,
             **kwargs,
         )
-        self.auth._sign_request(req, bucket_name, key)
-
-        resp = await self.session.do_request(req, timeout=self.timeout)
-        if resp.status // 100 != 2:
-            e = await exceptions.make_exception_async(resp)
-            logger.info(f"Exception: {e}")
-            raise e
-
-        return resp
+        return await self.__do_with_retry(req, lambda: self.auth._sign_request(req, bucket_name, key))
 
     async def _do_url(self, method: str, sign_url: str, **kwargs):
         req = http.AsyncRequest(method, sign_url, app_name=self.app_name, proxies=self.proxies, **kwargs)
-        resp = await self.session.do_request(req, timeout=self.timeout)
-        if resp.status // 100 != 2:
-            e = await exceptions.make_exception_async(resp)
-            logger.info(f"Exception: {e}")
-            raise e
-
-        return resp
+        return await self.__do_with_retry(req)
+
+    async def __do_with_retry(self, req: http.AsyncRequest, sign: Callable[[], None] | None = None):
+        rewind = retry.body_rewinder_async(req.data)
+        attempt = 1
+        while True:
+            # 每次请求都重新签名，避免重试时签名中的时间过期
+            if sign is not None:
+                sign()
+
+            self.retry_policy.record_attempt()
+            try:
+                resp = await self.__send(req)
+            except exceptions.RequestError as e:
+                error = e
+            else:
+                if resp.status // 100 == 2:
+                    self.retry_policy.record_success()
+                    return resp
+                error = await exceptions.make_exception_async(resp)
+                await resp.aclose()
+
+            delay = self.retry_policy.next_delay(req.method, req.url, error, attempt, rewind is not None)
+            if delay is None:
+                logger.info(f"Exception: {error}")
+                raise error
+
+            await asyncio.sleep(delay)
+            await rewind()
+            attempt += 1
+
+    async def __send(self, req: http.AsyncRequest):
+        if self.hedge_policy is not None and req.method in hedge.HEDGEABLE_METHODS:
+            return await self.hedge_policy.run_async(lambda: self.session.do_request(req, timeout=self.timeout))
+        return await self.session.do_request(req, timeout=self.timeout)
 
     @staticmethod
     async def _parse_result(
@@ -224,6 +254,12 @@ class AsyncService(_Base):
     :param session: 会话。如果是None表示新开会话，非None则复用传入的会话
     :type session: aliyun_oss_x.Session
 
+    :param pool_config: 新开会话时使用的连接池配置，不能与 `session` 同时指定
+    :type pool_config: aliyun_oss_x.PoolConfig
+
+    :param retry_policy: 请求重试策略。缺省为使用 `defaults.request_retries` 的 :class:`RetryPolicy <aliyun_oss_x.RetryPolicy>`
+    :type retry_policy: aliyun_oss_x.RetryPolicy
+
     :param float connect_timeout: 连接超时时间，以秒为单位。
     :param str app_name: 应用名。该参数不为空，则在User Agent中加入其值。
         注意到，最终这个字符串是要作为HTTP Header的值传输的，所以必须要遵循HTTP标准。
@@ -250,6 +286,8 @@ class AsyncService(_Base):
         region=None,
         cloudbox_id=None,
         is_path_style=False,
+        pool_config=None,
+        retry_policy=None,
     ):
         logger.debug(
             f"Init oss service, endpoint: {endpoint}, connect_timeout: {connect_timeout}, app_name: {app_name}, proxies: {proxies}"
@@ -265,6 +303,8 @@ class AsyncService(_Base):
             region=region,
             cloudbox_id=cloudbox_id,
             is_path_style=is_path_style,
+            pool_config=pool_config,
+            retry_policy=retry_policy,
         )
 
     async def list_buckets(
@@ -657,6 +697,15 @@ class AsyncBucket(_Base):
     :param session: 会话。如果是None表示新开会话，非None则复用传入的会话
     :type session: aliyun_oss_x.Session
 
+    :param pool_config: 新开会话时使用的连接池配置，不能与 `session` 同时指定
+    :type pool_config: aliyun_oss_x.PoolConfig
+
+    :param retry_policy: 请求重试策略。缺省为使用 `defaults.request_retries` 的 :class:`RetryPolicy <aliyun_oss_x.RetryPolicy>`
+    :type retry_policy: aliyun_oss_x.RetryPolicy
+
+    :param hedge_policy: 对冲请求策略，只作用于GET和HEAD请求。缺省为None，即不对冲
+    :type hedge_policy: aliyun_oss_x.HedgePolicy
+
     :param float connect_timeout: 连接超时时间，以秒为单位。
 
     :param str app_name: 应用名。该参数不为空，则在User Agent中加入其值。
@@ -741,6 +790,9 @@ class AsyncBucket(_Base):
         cloudbox_id=None,
         is_path_style=False,
         is_verify_object_strict=True,
+        pool_config=None,
+        retry_policy=None,
+        hedge_policy=None,
     ):
         logger.debug(
             f"Init Bucket: {bucket_name}, endpoint: {endpoint}, isCname: {is_cname}, connect_timeout: {connect_timeout}, app_name: {app_name}, enabled_crc: {enable_crc}, region: {region}, proxies: {region}"
@@ -758,6 +810,9 @@ class AsyncBucket(_Base):
             cloudbox_id=cloudbox_id,
             is_path_style=is_path_style,
             is_verify_object_strict=is_verify_object_strict,
+            pool_config=pool_config,
+            retry_policy=retry_policy,
+            hedge_policy=hedge_policy,
         )
 
         self.bucket_name = bucket_name.strip()
@@ -949,11 +1004,8 @@ class AsyncBucket(_Base):
 
         _data = data
 
-        if progress_callback:
-            _data = utils.make_progress_adapter_async(_data, progress_callback)
-
-        if self.enable_crc:
-            _data = utils.make_crc_adapter_async(_data)
+        if progress_callback or self.enable_crc:
+            _data = utils.make_stream_adapter_async(_data, progress_callback, enable_crc=self.enable_crc)
 
         logger.debug(f"Start to put object, bucket: {self.bucket_name}, key: {key}, headers: {headers}")
         resp = await self.__do_object("PUT", key, data=_data, headers=headers)
@@ -991,6 +1043,44 @@ class AsyncBucket(_Base):
             result = await self.put_object(key, f, headers=headers, progress_callback=progress_callback)
             return result
 
+    def open_write(
+        self,
+        key,
+        headers=None,
+        part_size=None,
+        num_threads=None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+    ):
+        """以可写文件对象的方式上传文件，写满一个分片就在后台上传，适合边生成边上传的数据。
+
+        用法 ::
+
+            >>> async with bucket.open_write('data.bin') as f:
+            ...     async for chunk in produce():
+            ...         await f.write(chunk)
+
+        :param key: 上传到OSS的文件名
+
+        :param headers: 用户指定的HTTP头部，传给 `init_multipart_upload` 或者 `put_object`
+        :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+        :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.part_size`
+        :param num_threads: 并发上传的分片数，如不指定则使用 `aliyun_oss_x.defaults.multipart_num_threads`
+        :param progress_callback: 用户指定的进度回调函数。参考 :ref:`progress_callback`
+
+        :return: :class:`AsyncObjectWriter <aliyun_oss_x.AsyncObjectWriter>` ，需要调用 `close()` 或者作为异步上下文管理器使用
+        """
+        from ..object_writer import AsyncObjectWriter
+
+        return AsyncObjectWriter(
+            self,
+            key,
+            headers=headers,
+            part_size=part_size,
+            num_threads=num_threads,
+            progress_callback=progress_callback,
+        )
+
     async def put_object_with_url(
         self, sign_url, data, headers=None, progress_callback: Callable[[int, int | None], None] | None = None
     ):
@@ -1004,11 +1094,8 @@ class AsyncBucket(_Base):
         """
         headers = http.Headers(headers)
 
-        if progress_callback:
-            data = utils.make_progress_adapter_async(data, progress_callback)
-
-        if self.enable_crc:
-            data = utils.make_crc_adapter_async(data)
+        if progress_callback or self.enable_crc:
+            data = utils.make_stream_adapter_async(data, progress_callback, enable_crc=self.enable_crc)
 
         logger.debug(
             f"Start to put object with signed url, bucket: {self.bucket_name}, sign_url: {sign_url}, headers: {headers}"
@@ -1076,11 +1163,11 @@ class AsyncBucket(_Base):
         """
         headers = utils.set_content_type(http.Headers(headers), key)
 
-        if progress_callback:
-            data = utils.make_progress_adapter_async(data, progress_callback)
-
-        if self.enable_crc and init_crc is not None:
-            data = utils.make_crc_adapter_async(data, init_crc)
+        enable_crc = self.enable_crc and init_crc is not None
+        if progress_callback or enable_crc:
+            data = utils.make_stream_adapter_async(
+                data, progress_callback, enable_crc=enable_crc, init_crc=init_crc or 0
+            )
 
         logger.debug(
             f"Start to append object, bucket: {self.bucket_name}, key: {key}, headers: {headers}, position: {position}"
@@ -1143,7 +1230,7 @@ class AsyncBucket(_Base):
         logger.debug(
             f"Start to get object, bucket: {self.bucket_name}, key: {key}, range: {range_string}, headers: {headers}, params: {params}"
         )
-        resp = await self.__do_object("GET", key, headers=headers, params=params)
+        resp = await self.__do_object("GET", key, headers=headers, params=params, stream=True)
         logger.debug(f"Get object done, req_id: {resp.request_id}, status_code: {resp.status}")
 
         return AsyncGetObjectResult(resp, progress_callback, self.enable_crc)
@@ -1161,14 +1248,14 @@ class AsyncBucket(_Base):
 
         用法 ::
         对于Csv:
-            >>> result = bucket.select_object('access.log', 'select * from ossobject where _4 > 40')
-            >>> print(result.read())
+            >>> async with await bucket.select_object('access.log', 'select * from ossobject where _4 > 40') as result:
+            ...     print(await result.read())
             'hello world'
         对于Json Doc: { contacts:[{"firstName":"abc", "lastName":"def"},{"firstName":"abc1", "lastName":"def1"}]}
-            >>> result = bucket.select_object('sample.json', 'select s.firstName, s.lastName from ossobject.contacts[*] s', select_params = {"Json_Type":"DOCUMENT"})
+            >>> result = await bucket.select_object('sample.json', 'select s.firstName, s.lastName from ossobject.contacts[*] s', select_params = {"Json_Type":"DOCUMENT"})
 
         对于Json Lines: {"firstName":"abc", "lastName":"def"},{"firstName":"abc1", "lastName":"def1"}
-            >>> result = bucket.select_object('sample.json', 'select s.firstName, s.lastName from ossobject s', select_params = {"Json_Type":"LINES"})
+            >>> result = await bucket.select_object('sample.json', 'select s.firstName, s.lastName from ossobject s', select_params = {"Json_Type":"LINES"})
 
         :param key: 文件名
         :param sql: sql statement
@@ -1180,7 +1267,7 @@ class AsyncBucket(_Base):
         :param headers: HTTP头部
         :type headers: 可以是dict，建议是aliyun_oss_x.Headers
 
-        :return: file-like object
+        :return: :class:`AsyncSelectObjectResult <aliyun_oss_x.models.AsyncSelectObjectResult>`
 
         :raises: 如果文件不存在，则抛出 :class:`NoSuchKey <aliyun_oss_x.exceptions.NoSuchKey>` ；还可能抛出其他异常
         """
@@ -1208,12 +1295,12 @@ class AsyncBucket(_Base):
             params["x-oss-process"] = "json/select"
 
         self.timeout = 3600
-        resp = await self.__do_object("POST", key, data=body, headers=headers, params=params)
+        resp = await self.__do_object("POST", key, data=body, headers=headers, params=params, stream=True)
         crc_enabled = False
         if select_params is not None and SelectParameters.EnablePayloadCrc in select_params:
             if str(select_params[SelectParameters.EnablePayloadCrc]).lower() == "true":
                 crc_enabled = True
-        return SelectObjectResult(resp, progress_callback, crc_enabled)
+        return AsyncSelectObjectResult(resp, progress_callback, crc_enabled)
 
     async def get_object_to_file(
         self,
@@ -1254,13 +1341,16 @@ class AsyncBucket(_Base):
                 params=params,
             )
 
-            if result.content_length is None:
-                async for chunk in result:
-                    f.write(chunk)
-            else:
-                await utils.copyfileobj_and_verify_async(
-                    result, f, result.content_length, request_id=result.request_id
-                )
+            try:
+                if result.content_length is None:
+                    async for chunk in result:
+                        f.write(chunk)
+                else:
+                    await utils.copyfileobj_and_verify_async(
+                        result, f, result.content_length, request_id=result.request_id
+                    )
+            finally:
+                await result.aclose()
 
             if self.enable_crc and byte_range is None:
                 if (headers is None) or ("Accept-Encoding" not in headers) or (headers["Accept-Encoding"] != "gzip"):
@@ -1268,6 +1358,82 @@ class AsyncBucket(_Base):
 
             return result
 
+    async def get_object_into(
+        self,
+        key,
+        buffer,
+        headers=None,
+        params=None,
+        part_size=None,
+        num_threads=None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+    ):
+        """并发下载文件到调用者提供的缓冲区，数据直接写入缓冲区，不经过本地文件和中间的bytes对象。
+        响应体不经过解密，因此不支持AsyncCryptoBucket，加密的文件请使用 :meth:`get_object` 。
+
+        用法 ::
+
+            >>> buf = bytearray((await bucket.head_object('data.bin')).content_length)
+            >>> await bucket.get_object_into('data.bin', buf, num_threads=8)
+
+        :param key: 文件名
+        :param buffer: 支持缓冲区协议的可写对象，例如bytearray、memoryview、mmap或者NumPy数组，长度不能小于文件长度。
+            文件写入缓冲区的开头。
+
+        :param headers: HTTP头部
+        :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+        :param params: http 请求的查询字符串参数，例如versionId
+        :type params: dict
+
+        :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.multiget_part_size`
+        :param num_threads: 并发下载的分片数，如不指定则使用 `aliyun_oss_x.defaults.multiget_num_threads`
+        :param progress_callback: 用户指定的进度回调函数，在每个分片下载完成后调用。参考 :ref:`progress_callback`
+
+        :return: 文件长度，即写入缓冲区的字节数
+        """
+        from ..parallel_get import get_object_into_async
+
+        return await get_object_into_async(
+            self,
+            key,
+            buffer,
+            headers=headers,
+            params=params,
+            part_size=part_size,
+            num_threads=num_threads,
+            progress_callback=progress_callback,
+        )
+
+    async def get_object_stream(self, key, headers=None, params=None, part_size=None, num_threads=None):
+        """顺序读取文件，后台并发下载之后的 `num_threads` 个分片，按文件中的顺序返回数据。
+        分片不经过解密，因此不支持AsyncCryptoBucket。
+
+        用法 ::
+
+            >>> async with await bucket.get_object_stream('data.csv', num_threads=8) as stream:
+            ...     async for chunk in stream:
+            ...         process(chunk)
+
+        :param key: 文件名
+
+        :param headers: HTTP头部
+        :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+        :param params: http 请求的查询字符串参数，例如versionId
+        :type params: dict
+
+        :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.multiget_part_size`
+        :param num_threads: 预读的分片数，如不指定则使用 `aliyun_oss_x.defaults.multiget_num_threads`
+
+        :return: :class:`AsyncObjectStream <aliyun_oss_x.AsyncObjectStream>`
+        """
+        from ..parallel_get import AsyncObjectStream
+
+        return await AsyncObjectStream.open(
+            self, key, headers=headers, params=params, part_size=part_size, num_threads=num_threads
+        )
+
     async def get_object_with_url(
         self,
         sign_url: str,
@@ -1298,7 +1464,7 @@ class AsyncBucket(_Base):
         logger.debug(
             f"Start to get object with url, bucket: {self.bucket_name}, sign_url: {sign_url}, range: {range_string}, headers: {headers}"
         )
-        resp = await self._do_url("GET", sign_url, headers=headers)
+        resp = await self._do_url("GET", sign_url, headers=headers, stream=True)
         return AsyncGetObjectResult(resp, progress_callback, self.enable_crc)
 
     async def get_object_with_url_to_file(
@@ -1332,13 +1498,16 @@ class AsyncBucket(_Base):
             result = await self.get_object_with_url(
                 sign_url, byte_range=byte_range, headers=headers, progress_callback=progress_callback
             )
-            if result.content_length is None:
-                async for chunk in result:
-                    f.write(chunk)
-            else:
-                await utils.copyfileobj_and_verify_async(
-                    result, f, result.content_length, request_id=result.request_id
-                )
+            try:
+                if result.content_length is None:
+                    async for chunk in result:
+                        f.write(chunk)
+                else:
+                    await utils.copyfileobj_and_verify_async(
+                        result, f, result.content_length, request_id=result.request_id
+                    )
+            finally:
+                await result.aclose()
 
             return result
 
@@ -1365,12 +1534,11 @@ class AsyncBucket(_Base):
         :return: 如果文件不存在, 抛出 :class:`NoSuchKey <aliyun_oss_x.exceptions.NoSuchKey>`
         """
         with Path(filename).open("wb") as f:
-            result = await self.select_object(
+            async with await self.select_object(
                 key, sql, progress_callback=progress_callback, select_params=select_params, headers=headers
-            )
-
-            for chunk in result:
-                f.write(chunk)
+            ) as result:
+                async for chunk in result:
+                    f.write(chunk)
 
             return result
 
@@ -1772,11 +1940,8 @@ class AsyncBucket(_Base):
         """
         headers = http.Headers(headers)
 
-        if progress_callback:
-            data = utils.make_progress_adapter_async(data, progress_callback)
-
-        if self.enable_crc:
-            data = utils.make_crc_adapter_async(data)
+        if progress_callback or self.enable_crc:
+            data = utils.make_stream_adapter_async(data, progress_callback, enable_crc=self.enable_crc)
 
         logger.debug(
             f"Start to upload multipart, bucket: {self.bucket_name}, key: {key}, upload_id: {upload_id}, part_number: {part_number}, headers: {headers}"
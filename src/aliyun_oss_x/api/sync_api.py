@@ -1,3 +1,4 @@
+import time
 import shutil
 import logging
 from pathlib import Path
@@ -5,6 +6,8 @@ from urllib.parse import quote
 from typing import Type, Callable, TYPE_CHECKING
 
 from .. import http
+from .. import hedge
+from .. import retry
 from .. import utils
 from .. import defaults
 from .. import xml_utils
@@ -143,12 +146,19 @@ class _Base:
         cloudbox_id: str | None = None,
         is_path_style: bool = False,
         is_verify_object_strict: bool = True,
+        pool_config: http.PoolConfig | None = None,
+        retry_policy: retry.RetryPolicy | None = None,
+        hedge_policy: hedge.HedgePolicy | None = None,
     ):
         self.auth = auth
         self.endpoint = _normalize_endpoint(endpoint.strip())
         if utils.is_valid_endpoint(self.endpoint) is not True:
             raise ClientError("The endpoint you has specified is not valid, endpoint: {0}".format(endpoint))
-        self.session = session or http.Session()
+        if session is not None and pool_config is not None:
+            raise ClientError("pool_config can not be specified together with session")
+        self.session = session or http.Session(pool_config=pool_config)
+        self.retry_policy = retry_policy or retry.RetryPolicy()
+        self.hedge_policy = hedge_policy
         self.timeout = defaults.get(connect_timeout, defaults.connect_timeout)
         self.app_name = app_name
         self.enable_crc = enable_crc
@@ -174,25 +184,45 @@ class _Base:
             cloudbox_id=self.cloudbox_id,
             **kwargs,
         )
-        self.auth._sign_request(req, bucket_name, key)
-
-        resp = self.session.do_request(req, timeout=self.timeout)
-        if resp.status // 100 != 2:
-            e = exceptions.make_exception(resp)
-            logger.info("Exception: {0}".format(e))
-            raise e
-
-        return resp
+        return self.__do_with_retry(req, lambda: self.auth._sign_request(req, bucket_name, key))
 
     def _do_url(self, method: str, sign_url: str, **kwargs) -> http.OSSResponse:
         req = http.Request(method, sign_url, app_name=self.app_name, proxies=self.proxies, **kwargs)
-        resp = self.session.do_request(req, timeout=self.timeout)
-        if resp.status // 100 != 2:
-            e = exceptions.make_exception(resp)
-            logger.info("Exception: {0}".format(e))
-            raise e
-
-        return resp
+        return self.__do_with_retry(req)
+
+    def __do_with_retry(self, req: http.Request, sign: Callable[[], None] | None = None) -> http.OSSResponse:
+        rewind = retry.body_rewinder(req.data)
+        attempt = 1
+        while True:
+            # 每次请求都重新签名，避免重试时签名中的时间过期
+            if sign is not None:
+                sign()
+
+            self.retry_policy.record_attempt()
+            try:
+                resp = self.__send(req)
+            except exceptions.RequestError as e:
+                error = e
+            else:
+                if resp.status // 100 == 2:
+                    self.retry_policy.record_success()
+                    return resp
+                error = exceptions.make_exception(resp)
+                resp.close()
+
+            delay = self.retry_policy.next_delay(req.method, req.url, error, attempt, rewind is not None)
+            if delay is None:
+                logger.info("Exception: {0}".format(error))
+                raise error
+
+            time.sleep(delay)
+            rewind()
+            attempt += 1
+
+    def __send(self, req: http.Request) -> http.OSSResponse:
+        if self.hedge_policy is not None and req.method in hedge.HEDGEABLE_METHODS:
+            return self.hedge_policy.run(lambda: self.session.do_request(req, timeout=self.timeout))
+        return self.session.do_request(req, timeout=self.timeout)
 
     @staticmethod
     def _parse_result(
@@ -222,6 +252,12 @@ class Service(_Base):
     :param session: 会话。如果是None表示新开会话，非None则复用传入的会话
     :type session: aliyun_oss_x.Session
 
+    :param pool_config: 新开会话时使用的连接池配置，不能与 `session` 同时指定
+    :type pool_config: aliyun_oss_x.PoolConfig
+
+    :param retry_policy: 请求重试策略。缺省为使用 `defaults.request_retries` 的 :class:`RetryPolicy <aliyun_oss_x.RetryPolicy>`
+    :type retry_policy: aliyun_oss_x.RetryPolicy
+
     :param float connect_timeout: 连接超时时间，以秒为单位。
     :param str app_name: 应用名。该参数不为空，则在User Agent中加入其值。
         注意到，最终这个字符串是要作为HTTP Header的值传输的，所以必须要遵循HTTP标准。
@@ -248,6 +284,8 @@ class Service(_Base):
         region: str | None = None,
         cloudbox_id: str | None = None,
         is_path_style: bool = False,
+        pool_config: http.PoolConfig | None = None,
+        retry_policy: retry.RetryPolicy | None = None,
     ):
         logger.debug(
             f"Init oss service, endpoint: {endpoint}, connect_timeout: {connect_timeout}, app_name: {app_name}, proxies: {proxies}"
@@ -263,6 +301,8 @@ class Service(_Base):
             region=region,
             cloudbox_id=cloudbox_id,
             is_path_style=is_path_style,
+            pool_config=pool_config,
+            retry_policy=retry_policy,
         )
 
     def list_buckets(self, prefix="", marker="", max_keys=100, params=None, headers=None):
@@ -675,6 +715,15 @@ class Bucket(_Base):
     :param session: 会话。如果是None表示新开会话，非None则复用传入的会话
     :type session: aliyun_oss_x.Session
 
+    :param pool_config: 新开会话时使用的连接池配置，不能与 `session` 同时指定
+    :type pool_config: aliyun_oss_x.PoolConfig
+
+    :param retry_policy: 请求重试策略。缺省为使用 `defaults.request_retries` 的 :class:`RetryPolicy <aliyun_oss_x.RetryPolicy>`
+    :type retry_policy: aliyun_oss_x.RetryPolicy
+
+    :param hedge_policy: 对冲请求策略，只作用于GET和HEAD请求。缺省为None，即不对冲
+    :type hedge_policy: aliyun_oss_x.HedgePolicy
+
     :param float connect_timeout: 连接超时时间，以秒为单位。
 
     :param str app_name: 应用名。该参数不为空，则在User Agent中加入其值。
@@ -759,6 +808,9 @@ class Bucket(_Base):
         cloudbox_id=None,
         is_path_style=False,
         is_verify_object_strict=True,
+        pool_config=None,
+        retry_policy=None,
+        hedge_policy=None,
     ):
         logger.debug(
             f"Init Bucket: {bucket_name}, endpoint: {endpoint}, isCname: {is_cname}, connect_timeout: {connect_timeout}, app_name: {app_name}, enabled_crc: {enable_crc}, region: {region}, proxies: {region}"
@@ -776,6 +828,9 @@ class Bucket(_Base):
             cloudbox_id=cloudbox_id,
             is_path_style=is_path_style,
             is_verify_object_strict=is_verify_object_strict,
+            pool_config=pool_config,
+            retry_policy=retry_policy,
+            hedge_policy=hedge_policy,
         )
 
         self.bucket_name = bucket_name.strip()
@@ -959,11 +1014,8 @@ class Bucket(_Base):
         """
         headers = utils.set_content_type(http.Headers(headers), key)
 
-        if progress_callback:
-            data = utils.make_progress_adapter(data, progress_callback)
-
-        if self.enable_crc:
-            data = utils.make_crc_adapter(data)
+        if progress_callback or self.enable_crc:
+            data = utils.make_stream_adapter(data, progress_callback, enable_crc=self.enable_crc)
 
         logger.debug(f"Start to put object, bucket: {self.bucket_name}, key: {key}, headers: {headers}")
         resp = self.__do_object("PUT", key, data=data, headers=headers)
@@ -995,6 +1047,98 @@ class Bucket(_Base):
         with Path(filename).open("rb") as f:
             return self.put_object(key, f, headers=headers, progress_callback=progress_callback)
 
+    def open_write(
+        self,
+        key,
+        headers=None,
+        part_size=None,
+        num_threads=None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        executor=None,
+        priority=0,
+    ):
+        """以可写文件对象的方式上传文件，写满一个分片就在后台上传，适合边生成边上传的数据。
+
+        用法 ::
+
+            >>> with bucket.open_write('data.tar') as f:
+            ...     with tarfile.open(fileobj=f, mode='w|') as tar:
+            ...         tar.add('data')
+
+        :param key: 上传到OSS的文件名
+
+        :param headers: 用户指定的HTTP头部，传给 `init_multipart_upload` 或者 `put_object`
+        :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+        :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.part_size`
+        :param num_threads: 并发上传的线程数，如不指定则使用 `aliyun_oss_x.defaults.multipart_num_threads`
+        :param progress_callback: 用户指定的进度回调函数。参考 :ref:`progress_callback`
+        :param executor: 执行分片任务的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>`
+        :param priority: 分片任务的优先级，数值越大越优先
+
+        :return: :class:`ObjectWriter <aliyun_oss_x.ObjectWriter>` ，需要调用 `close()` 或者作为上下文管理器使用
+        """
+        from ..object_writer import ObjectWriter
+
+        return ObjectWriter(
+            self,
+            key,
+            headers=headers,
+            part_size=part_size,
+            num_threads=num_threads,
+            progress_callback=progress_callback,
+            executor=executor,
+            priority=priority,
+        )
+
+    def open_read(
+        self,
+        key,
+        block_size=None,
+        cache_blocks=None,
+        readahead_blocks=None,
+        headers=None,
+        params=None,
+        executor=None,
+    ):
+        """以可随机读取的文件对象的方式打开文件，适合Parquet、ZIP等需要先读文件尾部再分散读取的格式。
+
+        用法 ::
+
+            >>> with bucket.open_read('data.zip') as f:
+            ...     with zipfile.ZipFile(f) as zf:
+            ...         print(zf.namelist())
+
+        :param key: 文件名
+        :param block_size: 每次Range GET读取的块大小，如不指定则使用 `aliyun_oss_x.defaults.read_block_size`
+        :param cache_blocks: 缓存的块数，如不指定则使用 `aliyun_oss_x.defaults.read_cache_blocks`
+        :param readahead_blocks: 顺序读取时预读的块数，如不指定则使用 `aliyun_oss_x.defaults.read_ahead_blocks`
+
+        :param headers: HTTP头部
+        :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+        :param params: http 请求的查询字符串参数，例如versionId
+        :type params: dict
+
+        :param executor: 执行预读任务的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>`
+
+        :return: :class:`ObjectReader <aliyun_oss_x.ObjectReader>`
+
+        :raises: 如果文件不存在，则抛出 :class:`NotFound <aliyun_oss_x.exceptions.NotFound>` ；还可能抛出其他异常
+        """
+        from ..object_reader import ObjectReader
+
+        return ObjectReader(
+            self,
+            key,
+            block_size=block_size,
+            cache_blocks=cache_blocks,
+            readahead_blocks=readahead_blocks,
+            headers=headers,
+            params=params,
+            executor=executor,
+        )
+
     def put_object_with_url(
         self, sign_url, data, headers=None, progress_callback: Callable[[int, int | None], None] | None = None
     ):
@@ -1008,11 +1152,8 @@ class Bucket(_Base):
         """
         headers = http.Headers(headers)
 
-        if progress_callback:
-            data = utils.make_progress_adapter(data, progress_callback)
-
-        if self.enable_crc:
-            data = utils.make_crc_adapter(data)
+        if progress_callback or self.enable_crc:
+            data = utils.make_stream_adapter(data, progress_callback, enable_crc=self.enable_crc)
 
         logger.debug(
             f"Start to put object with signed url, bucket: {self.bucket_name}, sign_url: {sign_url}, headers: {headers}"
@@ -1075,11 +1216,9 @@ class Bucket(_Base):
         """
         headers = utils.set_content_type(http.Headers(headers), key)
 
-        if progress_callback:
-            data = utils.make_progress_adapter(data, progress_callback)
-
-        if self.enable_crc and init_crc is not None:
-            data = utils.make_crc_adapter(data, init_crc)
+        enable_crc = self.enable_crc and init_crc is not None
+        if progress_callback or enable_crc:
+            data = utils.make_stream_adapter(data, progress_callback, enable_crc=enable_crc, init_crc=init_crc or 0)
 
         logger.debug(
             f"Start to append object, bucket: {self.bucket_name}, key: {key}, headers: {headers}, position: {position}"
@@ -1142,7 +1281,7 @@ class Bucket(_Base):
         logger.debug(
             f"Start to get object, bucket: {self.bucket_name}, key: {key}, range: {range_string}, headers: {headers}, params: {params}"
         )
-        resp = self.__do_object("GET", key, headers=headers, params=params)
+        resp = self.__do_object("GET", key, headers=headers, params=params, stream=True)
         logger.debug(f"Get object done, req_id: {resp.request_id}, status_code: {resp.status}")
 
         return GetObjectResult(resp, progress_callback, self.enable_crc)
@@ -1207,7 +1346,7 @@ class Bucket(_Base):
             params["x-oss-process"] = "json/select"
 
         self.timeout = 3600
-        resp = self.__do_object("POST", key, data=body, headers=headers, params=params)
+        resp = self.__do_object("POST", key, data=body, headers=headers, params=params, stream=True)
         crc_enabled = False
         if select_params is not None and SelectParameters.EnablePayloadCrc in select_params:
             if str(select_params[SelectParameters.EnablePayloadCrc]).lower() == "true":
@@ -1243,18 +1382,16 @@ class Bucket(_Base):
         :return: 如果文件不存在，则抛出 :class:`NoSuchKey <aliyun_oss_x.exceptions.NoSuchKey>` ；还可能抛出其他异常
         """
         logger.debug(f"Start to get object to file, bucket: {self.bucket_name}, key: {key}, file path: {filename}")
-        with Path(filename).open("wb") as f:
-            result = self.get_object(
-                key,
-                byte_range=byte_range,
-                headers=headers,
-                progress_callback=progress_callback,
-                process=process,
-                params=params,
-            )
-
+        with Path(filename).open("wb") as f, self.get_object(
+            key,
+            byte_range=byte_range,
+            headers=headers,
+            progress_callback=progress_callback,
+            process=process,
+            params=params,
+        ) as result:
             if not result.content_length:
-                shutil.copyfileobj(result, f)
+                shutil.copyfileobj(result, f, defaults.stream_chunk_size)
             else:
                 utils.copyfileobj_and_verify(result, f, result.content_length, request_id=result.request_id)
 
@@ -1264,6 +1401,107 @@ class Bucket(_Base):
 
             return result
 
+    def get_object_into(
+        self,
+        key,
+        buffer,
+        headers=None,
+        params=None,
+        part_size=None,
+        num_threads=None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        executor=None,
+        priority=0,
+    ):
+        """并发下载文件到调用者提供的缓冲区，数据直接写入缓冲区，不经过本地文件和中间的bytes对象。
+        响应体不经过解密，因此不支持CryptoBucket，加密的文件请使用 :meth:`get_object` 。
+
+        用法 ::
+
+            >>> size = bucket.head_object('data.bin').content_length
+            >>> buf = bytearray(size)
+            >>> bucket.get_object_into('data.bin', buf, num_threads=8)
+
+        :param key: 文件名
+        :param buffer: 支持缓冲区协议的可写对象，例如bytearray、memoryview、mmap或者NumPy数组，长度不能小于文件长度。
+            文件写入缓冲区的开头。
+
+        :param headers: HTTP头部
+        :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+        :param params: http 请求的查询字符串参数，例如versionId
+        :type params: dict
+
+        :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.multiget_part_size`
+        :param num_threads: 并发下载的线程数，如不指定则使用 `aliyun_oss_x.defaults.multiget_num_threads`
+        :param progress_callback: 用户指定的进度回调函数，在每个分片下载完成后调用。参考 :ref:`progress_callback`
+        :param executor: 执行分片任务的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>`
+        :param priority: 分片任务的优先级，数值越大越优先
+
+        :return: 文件长度，即写入缓冲区的字节数
+
+        :raises: 如果文件不存在，则抛出 :class:`NotFound <aliyun_oss_x.exceptions.NotFound>` ；下载过程中文件被修改时抛出
+            :class:`PreconditionFailed <aliyun_oss_x.exceptions.PreconditionFailed>` ；还可能抛出其他异常
+        """
+        from ..parallel_get import get_object_into
+
+        return get_object_into(
+            self,
+            key,
+            buffer,
+            headers=headers,
+            params=params,
+            part_size=part_size,
+            num_threads=num_threads,
+            progress_callback=progress_callback,
+            executor=executor,
+            priority=priority,
+        )
+
+    def get_object_stream(
+        self, key, headers=None, params=None, part_size=None, num_threads=None, executor=None, priority=0
+    ):
+        """顺序读取文件，后台并发下载之后的 `num_threads` 个分片，按文件中的顺序返回数据。
+        占用的内存约为 `num_threads × part_size` ，适合把大文件直接交给解压缩或者解析程序。
+        分片不经过解密，因此不支持CryptoBucket。
+
+        用法 ::
+
+            >>> with bucket.get_object_stream('logs.gz', num_threads=8) as stream:
+            ...     for line in gzip.open(stream):
+            ...         process(line)
+
+        :param key: 文件名
+
+        :param headers: HTTP头部
+        :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+        :param params: http 请求的查询字符串参数，例如versionId
+        :type params: dict
+
+        :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.multiget_part_size`
+        :param num_threads: 预读的分片数，如不指定则使用 `aliyun_oss_x.defaults.multiget_num_threads`
+        :param executor: 执行分片任务的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>`
+        :param priority: 分片任务的优先级，数值越大越优先
+
+        :return: :class:`ObjectStream <aliyun_oss_x.ObjectStream>`
+
+        :raises: 如果文件不存在，则抛出 :class:`NotFound <aliyun_oss_x.exceptions.NotFound>` ；读取过程中文件被修改时抛出
+            :class:`PreconditionFailed <aliyun_oss_x.exceptions.PreconditionFailed>` ；还可能抛出其他异常
+        """
+        from ..parallel_get import ObjectStream
+
+        return ObjectStream(
+            self,
+            key,
+            headers=headers,
+            params=params,
+            part_size=part_size,
+            num_threads=num_threads,
+            executor=executor,
+            priority=priority,
+        )
+
     def get_object_with_url(
         self,
         sign_url,
@@ -1294,7 +1532,7 @@ class Bucket(_Base):
         logger.debug(
             f"Start to get object with url, bucket: {self.bucket_name}, sign_url: {sign_url}, range: {range_string}, headers: {headers}"
         )
-        resp = self._do_url("GET", sign_url, headers=headers)
+        resp = self._do_url("GET", sign_url, headers=headers, stream=True)
         return GetObjectResult(resp, progress_callback, self.enable_crc)
 
     def get_object_with_url_to_file(
@@ -1324,12 +1562,11 @@ class Bucket(_Base):
             f"Start to get object with url, bucket: {self.bucket_name}, sign_url: {sign_url}, file path: {filename}, range: {byte_range}, headers: {headers}"
         )
 
-        with Path(filename).open("wb") as f:
-            result = self.get_object_with_url(
-                sign_url, byte_range=byte_range, headers=headers, progress_callback=progress_callback
-            )
+        with Path(filename).open("wb") as f, self.get_object_with_url(
+            sign_url, byte_range=byte_range, headers=headers, progress_callback=progress_callback
+        ) as result:
             if result.content_length is None:
-                shutil.copyfileobj(result, f)
+                shutil.copyfileobj(result, f, defaults.stream_chunk_size)
             else:
                 utils.copyfileobj_and_verify(result, f, result.content_length, request_id=result.request_id)
 
@@ -1357,11 +1594,9 @@ class Bucket(_Base):
 
         :return: 如果文件不存在, 抛出 :class:`NoSuchKey <aliyun_oss_x.exceptions.NoSuchKey>`
         """
-        with Path(filename).open("wb") as f:
-            result = self.select_object(
-                key, sql, progress_callback=progress_callback, select_params=select_params, headers=headers
-            )
-
+        with Path(filename).open("wb") as f, self.select_object(
+            key, sql, progress_callback=progress_callback, select_params=select_params, headers=headers
+        ) as result:
             for chunk in result:
                 f.write(chunk)
 
@@ -1761,11 +1996,8 @@ class Bucket(_Base):
         """
         headers = http.Headers(headers)
 
-        if progress_callback:
-            data = utils.make_progress_adapter(data, progress_callback)
-
-        if self.enable_crc:
-            data = utils.make_crc_adapter(data)
+        if progress_callback or self.enable_crc:
+            data = utils.make_stream_adapter(data, progress_callback, enable_crc=self.enable_crc)
 
         logger.debug(
             f"Start to upload multipart, bucket: {self.bucket_name}, key: {key}, upload_id: {upload_id}, part_number: {part_number}, headers: {headers}"
@@ -0,0 +1,233 @@
+"""断点续传的自适应并发控制。
+
+:class:`AdaptiveConcurrency` 采用AIMD（加性增、乘性减）的方式调整并发数：
+
+    * 每完成一轮（当前并发数个分片）统计一次总吞吐量，吞吐量有明显提升就把并发数加 `increase` ；
+    * 传输分片的请求发生了重试（通常是503 SlowDown、429或者连接错误），或者单个分片每字节的耗时
+      超过历史最好水平的 `latency_tolerance` 倍（带宽已经饱和，继续加并发只会排队），就把并发数乘以
+      `decrease_factor` ；
+    * 并发数始终在 [`min_limit`, `max_limit`] 之间。
+
+用法 ::
+
+    >>> controller = aliyun_oss_x.AdaptiveConcurrency(max_limit=32, on_change=lambda limit: print(limit))
+    >>> aliyun_oss_x.resumable_download(bucket, key, filename, concurrency=controller)
+    >>> controller.limit
+"""
+
+import time
+import asyncio
+import logging
+import threading
+import collections
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from .exceptions import ServerError
+from .retry import RetryEvent, _watch_retries
+
+
+logger = logging.getLogger(__name__)
+
+_THROTTLE_STATUS = frozenset([429, 503])
+
+
+class AdaptiveConcurrency:
+    """AIMD并发控制器，同一个对象可以用于同步（线程）或者异步（协程）的断点续传，但不能同时用于两者。
+
+    :param max_limit: 并发数上限，断点续传会启动这么多个工作线程（协程），由控制器决定其中多少个同时工作
+    :param min_limit: 并发数下限
+    :param initial_limit: 初始并发数，缺省为 `min(4, max_limit)`
+    :param increase: 每次增加的并发数
+    :param decrease_factor: 减小并发数时乘以的系数
+    :param latency_tolerance: 分片每字节耗时超过历史最好水平的多少倍时认为带宽已经饱和
+    :param min_gain: 一轮的吞吐量比上一轮至少提高多少（比例）才继续增加并发
+    :param on_change: 并发数变化时调用的回调函数，参数为新的并发数
+    """
+
+    def __init__(
+        self,
+        max_limit: int = 16,
+        min_limit: int = 1,
+        initial_limit: int | None = None,
+        increase: int = 1,
+        decrease_factor: float = 0.7,
+        latency_tolerance: float = 2.0,
+        min_gain: float = 0.05,
+        on_change: Callable[[int], None] | None = None,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"invalid concurrency limits: min_limit={min_limit}, max_limit={max_limit}")
+
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_gain = min_gain
+        self.on_change = on_change
+
+        if initial_limit is None:
+            initial_limit = min(4, max_limit)
+        self.__limit = min(max(initial_limit, min_limit), max_limit)
+        self.__in_flight = 0
+        self.__cond = threading.Condition()
+        self.__async_waiters = collections.deque()
+
+        self.__best_per_byte = None
+        self.__ewma_per_byte = None
+        self.__last_throughput = None
+        self.__reset_round()
+
+    @property
+    def limit(self) -> int:
+        """当前的并发数。"""
+        return self.__limit
+
+    @property
+    def in_flight(self) -> int:
+        """正在传输的分片数。"""
+        return self.__in_flight
+
+    def acquire(self):
+        """等待直到正在传输的分片数小于并发数。"""
+        with self.__cond:
+            while self.__in_flight >= self.__limit:
+                self.__cond.wait()
+            self.__in_flight += 1
+
+    async def acquire_async(self):
+        """异步版本的 :meth:`acquire` 。"""
+        while True:
+            with self.__cond:
+                if self.__in_flight < self.__limit:
+                    self.__in_flight += 1
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self.__async_waiters.append(waiter)
+            await waiter
+
+    def release(self):
+        with self.__cond:
+            self.__in_flight -= 1
+            self.__wake()
+
+    def run(self, call: Callable[[], Any], nbytes: int) -> Any:
+        """在并发限制内执行 `call` 传输一个分片，并根据耗时和是否发生重试调整并发数。
+
+        只统计 `call` 本身（同一个线程中）的请求的重试，其他分片的重试不计入。
+
+        :param call: 传输分片的函数
+        :param nbytes: 分片大小
+        """
+        self.acquire()
+        try:
+            retries = []
+            start = time.monotonic()
+            try:
+                with _watch_retries(partial(self.__on_retry, retries)):
+                    result = call()
+            except ServerError as e:
+                if e.status in _THROTTLE_STATUS:
+                    self.record_throttled()
+                raise
+            if not retries:
+                self.record_success(nbytes, time.monotonic() - start)
+            return result
+        finally:
+            self.release()
+
+    async def run_async(self, call: Callable[[], Awaitable[Any]], nbytes: int) -> Any:
+        """异步版本的 :meth:`run` ，只统计 `call` 所在协程的请求的重试。"""
+        await self.acquire_async()
+        try:
+            retries = []
+            start = time.monotonic()
+            try:
+                with _watch_retries(partial(self.__on_retry, retries)):
+                    result = await call()
+            except ServerError as e:
+                if e.status in _THROTTLE_STATUS:
+                    self.record_throttled()
+                raise
+            if not retries:
+                self.record_success(nbytes, time.monotonic() - start)
+            return result
+        finally:
+            self.release()
+
+    def __on_retry(self, retries: list, event: RetryEvent):
+        # 重试发生时立即减小并发，不等分片传输结束；发生过重试的分片耗时包含退避时间，不计入吞吐量
+        retries.append(event)
+        self.record_throttled()
+
+    def record_success(self, nbytes: int, seconds: float):
+        """一个分片成功传输了 `nbytes` 字节，耗时 `seconds` 秒。"""
+        with self.__cond:
+            per_byte = seconds / max(nbytes, 1)
+            if self.__best_per_byte is None or per_byte < self.__best_per_byte:
+                self.__best_per_byte = per_byte
+            if self.__ewma_per_byte is None:
+                self.__ewma_per_byte = per_byte
+            else:
+                self.__ewma_per_byte = 0.7 * self.__ewma_per_byte + 0.3 * per_byte
+
+            self.__round_bytes += nbytes
+            self.__round_count += 1
+            if self.__round_count < self.__limit:
+                return
+
+            elapsed = max(time.monotonic() - self.__round_start, 1e-9)
+            throughput = self.__round_bytes / elapsed
+            if self.__ewma_per_byte > self.__best_per_byte * self.latency_tolerance:
+                logger.debug(f"Part latency is rising, throughput: {throughput:.0f}B/s")
+                self.__decrease()
+                return
+
+            if self.__last_throughput is None or throughput > self.__last_throughput * (1 + self.min_gain):
+                self.__set_limit(self.__limit + self.increase)
+            self.__last_throughput = throughput
+            self.__reset_round()
+
+    def record_throttled(self):
+        """传输分片时发生了限流或者重试。每一轮最多减小一次并发数。"""
+        with self.__cond:
+            if self.__round_throttled:
+                return
+            self.__decrease()
+            self.__round_throttled = True
+
+    def __decrease(self):
+        self.__set_limit(int(self.__limit * self.decrease_factor))
+        self.__last_throughput = None
+        self.__ewma_per_byte = self.__best_per_byte
+        self.__reset_round()
+
+    def __reset_round(self):
+        self.__round_start = time.monotonic()
+        self.__round_bytes = 0
+        self.__round_count = 0
+        self.__round_throttled = False
+
+    def __set_limit(self, limit):
+        limit = min(max(limit, self.min_limit), self.max_limit)
+        if limit == self.__limit:
+            return
+
+        logger.info(f"Change transfer concurrency from {self.__limit} to {limit}")
+        self.__limit = limit
+        self.__wake()
+        if self.on_change:
+            self.on_change(limit)
+
+    def __wake(self):
+        self.__cond.notify_all()
+        while self.__async_waiters:
+            waiter = self.__async_waiters.popleft()
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(_wake_waiter, waiter)
+
+
+def _wake_waiter(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -1,4 +1,6 @@
 import sys
+import threading
+import functools
 
 # -----------------------------------------------------------------------------
 # Export mkCombineFun to user to support crc64 combine feature.
@@ -25,6 +27,7 @@ import sys
 #
 
 
+@functools.lru_cache(maxsize=None)
 def make_combine_function(poly, initCrc=~int(0), rev=True, xorOut=0):
     # mask = (1L<<n) - 1
 
@@ -74,15 +77,8 @@ def gf2_matrix_times(mat, vec):
     return summary
 
 
-def _combine64(poly, initCrc, rev, xorOut, crc1, crc2, len2):
-    if len2 == 0:
-        return crc1
-
-    even = [0] * GF2_DIM
+def _one_zero_bit_operator(poly, rev):
     odd = [0] * GF2_DIM
-
-    crc1 ^= initCrc ^ xorOut
-
     if rev:
         # put operator for one zero bit in odd
         odd[0] = poly  # CRC-64 polynomial
@@ -96,26 +92,86 @@ def _combine64(poly, initCrc, rev, xorOut, crc1, crc2, len2):
             odd[n] = row
             row <<= 1
         odd[GF2_DIM - 1] = poly
+    return odd
 
-    gf2_matrix_square(even, odd)
 
-    gf2_matrix_square(odd, even)
+class _ZeroBytesOperators:
+    """在CRC后追加 `2^k` 个零字节的算子（64x64的GF(2)矩阵），第k个由第k-1个平方得到，按需生成后缓存。"""
+
+    def __init__(self, poly, rev):
+        matrix = _one_zero_bit_operator(poly, rev)
+        # 1个零比特平方3次得到1个零字节
+        for _ in range(3):
+            square = [0] * GF2_DIM
+            gf2_matrix_square(square, matrix)
+            matrix = square
+
+        self.__matrices = [matrix]
+        self.__lock = threading.Lock()
+
+    def get(self, k):
+        with self.__lock:
+            while len(self.__matrices) <= k:
+                square = [0] * GF2_DIM
+                gf2_matrix_square(square, self.__matrices[-1])
+                self.__matrices.append(square)
+            return self.__matrices[k]
 
-    while True:
-        gf2_matrix_square(even, odd)
-        if len2 & int(1):
-            crc1 = gf2_matrix_times(even, crc1)
-        len2 >>= 1
-        if len2 == 0:
-            break
 
-        gf2_matrix_square(odd, even)
-        if len2 & int(1):
-            crc1 = gf2_matrix_times(odd, crc1)
+@functools.lru_cache(maxsize=None)
+def _zero_bytes_operators(poly, rev):
+    return _ZeroBytesOperators(poly, rev)
+
+
+@functools.lru_cache(maxsize=1024)
+def _shift_operator(poly, rev, len2):
+    """追加 `len2` 个零字节的算子，按字节展开成8张256项的表，应用时只需要查8次表。
+
+    分片大多长度相同，按 `len2` 缓存之后合并每个分片的CRC只需要一次计算。
+    """
+    operators = _zero_bytes_operators(poly, rev)
+
+    matrix = None
+    k = 0
+    while len2:
+        if len2 & 1:
+            power = operators.get(k)
+            matrix = power if matrix is None else [gf2_matrix_times(power, row) for row in matrix]
         len2 >>= 1
+        k += 1
+
+    tables = []
+    for byte_index in range(GF2_DIM // 8):
+        rows = matrix[byte_index * 8 : byte_index * 8 + 8]
+        table = [0] * 256
+        for value in range(1, 256):
+            lowest = value & -value
+            table[value] = table[value ^ lowest] ^ rows[lowest.bit_length() - 1]
+        tables.append(table)
+    return tables
+
+
+def _apply_shift_operator(tables, vec):
+    t0, t1, t2, t3, t4, t5, t6, t7 = tables
+    return (
+        t0[vec & 0xFF]
+        ^ t1[vec >> 8 & 0xFF]
+        ^ t2[vec >> 16 & 0xFF]
+        ^ t3[vec >> 24 & 0xFF]
+        ^ t4[vec >> 32 & 0xFF]
+        ^ t5[vec >> 40 & 0xFF]
+        ^ t6[vec >> 48 & 0xFF]
+        ^ t7[vec >> 56]
+    )
+
+
+def _combine64(poly, initCrc, rev, xorOut, crc1, crc2, len2):
+    if len2 == 0:
+        return crc1
+
+    crc1 ^= initCrc ^ xorOut
 
-        if len2 == 0:
-            break
+    crc1 = _apply_shift_operator(_shift_operator(poly, rev, len2), crc1)
 
     crc1 ^= crc2
 
@@ -39,6 +39,15 @@ class AsyncCryptoBucket(AsyncBucket):
     :param session: 会话。如果是None表示新开会话，非None则复用传入的会话
     :type session: aliyun_oss_x.Session
 
+    :param pool_config: 新开会话时使用的连接池配置，不能与 `session` 同时指定
+    :type pool_config: aliyun_oss_x.PoolConfig
+
+    :param retry_policy: 请求重试策略。缺省为使用 `defaults.request_retries` 的 :class:`RetryPolicy <aliyun_oss_x.RetryPolicy>`
+    :type retry_policy: aliyun_oss_x.RetryPolicy
+
+    :param hedge_policy: 对冲请求策略，只作用于GET和HEAD请求。缺省为None，即不对冲
+    :type hedge_policy: aliyun_oss_x.HedgePolicy
+
     :param float connect_timeout: 连接超时时间，以秒为单位。
 
     :param str app_name: 应用名。该参数不为空，则在User Agent中加入其值。
@@ -63,6 +72,9 @@ class AsyncCryptoBucket(AsyncBucket):
         region=None,
         cloudbox_id=None,
         is_path_style=False,
+        pool_config=None,
+        retry_policy=None,
+        hedge_policy=None,
     ):
         if not isinstance(crypto_provider, BaseCryptoProvider):
             raise ClientError("crypto_provider must be an instance of BaseCryptoProvider")
@@ -81,6 +93,9 @@ class AsyncCryptoBucket(AsyncBucket):
             region=region,
             cloudbox_id=cloudbox_id,
             is_path_style=is_path_style,
+            pool_config=pool_config,
+            retry_policy=retry_policy,
+            hedge_policy=hedge_policy,
         )
 
         self.crypto_provider = crypto_provider
@@ -220,7 +235,7 @@ class AsyncCryptoBucket(AsyncBucket):
                 self.bucket_name, key, range_string, headers, params
             )
         )
-        resp = await self._do("GET", self.bucket_name, key, headers=headers, params=params)
+        resp = await self._do("GET", self.bucket_name, key, headers=headers, params=params, stream=True)
         logger.debug("Get object done, req_id: {0}, status_code: {1}".format(resp.request_id, resp.status))
 
         return AsyncGetObjectResult(
@@ -281,7 +296,7 @@ class AsyncCryptoBucket(AsyncBucket):
                 self.bucket_name, sign_url, range_string, headers
             )
         )
-        resp = await self._do_url("GET", sign_url, headers=headers)
+        resp = await self._do_url("GET", sign_url, headers=headers, stream=True)
         return AsyncGetObjectResult(
             resp, progress_callback, self.enable_crc, crypto_provider=self.crypto_provider, discard=discard
         )
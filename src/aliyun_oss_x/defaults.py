@@ -29,6 +29,21 @@ min_part_size = 100 * 1024
 #: 每个Session连接池大小
 connection_pool_size = 10
 
+#: 每个Session按代理配置缓存的客户端（连接池）个数，超出时关闭最久未使用的客户端
+proxy_client_cache_size = 8
+
+#: 断点续传共用线程池（ `aliyun_oss_x.TransferExecutor` ）的线程数上限
+transfer_max_workers = 32
+
+#: 异步断点续传中读写本地文件、保存断点信息所用的线程数
+async_file_io_threads = 8
+
+#: 断点信息日志累计多少条之后压缩为快照
+resumable_journal_compact_threshold = 1000
+
+#: 断点信息每追加多少条日志调用一次fsync，0表示不调用
+resumable_store_fsync_every = 0
+
 
 #: 对于断点下载，如果OSS文件大小大于该值就进行并行下载（multiget）
 multiget_threshold = 100 * 1024 * 1024
@@ -38,3 +53,50 @@ multiget_num_threads = 4
 
 #: 并行下载（multiget）的缺省分片大小
 multiget_part_size = 10 * 1024 * 1024
+
+#: 断点下载时，分片的下载时间超过按平均速度估算的时间的多少倍时，空闲线程会拆分它尚未下载的部分
+multiget_straggler_factor = 2.0
+
+#: 拆分慢分片时，拆分后两部分的最小长度
+multiget_min_split_size = 1024 * 1024
+
+#: 断点下载是否通过mmap写入临时文件
+multiget_use_mmap = False
+
+
+#: 断点拷贝（resumable_copy）时，源文件长度大于或等于该值就使用分片拷贝，否则只发送一次 `copy_object` 请求
+copy_threshold = 100 * 1024 * 1024
+
+#: 分片拷贝的缺省分片大小，数据不经过客户端，分片可以比上传时大
+copy_part_size = 64 * 1024 * 1024
+
+#: 分片拷贝缺省并发数
+copy_num_threads = 8
+
+
+#: 目录上传、下载（upload_directory、download_directory）时同时传输的文件数
+directory_num_threads = 8
+
+
+#: 随机读取（open_read）时每次Range GET读取的块大小
+read_block_size = 1024 * 1024
+
+#: 随机读取（open_read）时缓存的块数
+read_cache_blocks = 32
+
+#: 随机读取（open_read）检测到顺序读取时预读的块数，同时也是预读的并发数
+read_ahead_blocks = 4
+
+
+#: 并行计算本地文件CRC64、MD5（calc_file_crc64、calc_range_checksums）时每段的缺省长度
+checksum_part_size = 64 * 1024 * 1024
+
+#: 并行计算本地文件CRC64、MD5的缺省线程数
+checksum_num_threads = 4
+
+
+#: 适配器（进度回调、CRC、加解密）被迭代时，以及下载写入本地文件时每次读取的长度
+stream_chunk_size = 1024 * 1024
+
+#: 进度回调函数两次调用之间的最小间隔，以秒为单位。读取结束时总会调用一次；设为0则每次读取都调用
+progress_interval = 0.1
@@ -409,6 +409,10 @@ def _parse_error_body(body):
 def _guess_error_details(body):
     details = {}
 
+    # 网关等返回的错误响应体可能为空或者不是XML
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+
     if "<Error>" not in body or "</Error>" not in body:
         return details
 
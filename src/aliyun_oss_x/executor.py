@@ -0,0 +1,256 @@
+"""断点续传共用的传输线程池。
+
+每次调用 `resumable_upload` 、 `resumable_download` 都会创建一个传输（ :class:`Transfer` ），它的分片作为
+任务提交到同一个 :class:`TransferExecutor` 中执行，而不是各自启动一组线程：
+
+    * 线程池的线程数不超过 `max_workers` ，同时进行成百上千个传输也不会创建成千上万个线程；
+    * 每个传输同时执行的任务数不超过它的 `max_parallel` （即 `num_threads` ）；
+    * 空闲线程优先执行 `priority` 较大的传输的任务，优先级相同的传输轮流执行，一个大传输不会饿死其他传输；
+    * 传输的所有任务完成后通过 `threading.Event` 通知等待者，不需要轮询。
+
+用法 ::
+
+    >>> executor = aliyun_oss_x.TransferExecutor(max_workers=64)
+    >>> aliyun_oss_x.resumable_download(bucket, key, filename, executor=executor, priority=1)
+"""
+
+import sys
+import time
+import logging
+import functools
+import threading
+import traceback
+import collections
+from typing import Any, Callable
+
+from . import defaults
+
+
+logger = logging.getLogger(__name__)
+
+# 空闲线程等待这么多秒仍然没有任务时退出
+_IDLE_TIMEOUT = 60
+
+# 在线程池的线程中等待传输结束时，每隔这么多秒检查一次能否帮忙执行它的任务
+_HELP_INTERVAL = 0.05
+
+_local = threading.local()
+
+
+class Transfer:
+    """一个传输的任务集合，由 :meth:`TransferExecutor.transfer` 创建。
+
+    :param executor: 执行任务的线程池
+    :param max_parallel: 同时执行的任务数上限
+    :param priority: 优先级，数值越大越优先
+    """
+
+    def __init__(self, executor: "TransferExecutor", max_parallel: int, priority: int = 0):
+        if max_parallel < 1:
+            raise ValueError(f"max_parallel must be positive: {max_parallel}")
+
+        self.executor = executor
+        self.max_parallel = max_parallel
+        self.priority = priority
+
+        # 以下字段由executor的锁保护
+        self._tasks = collections.deque()
+        self._running = 0
+        self._scheduled = False
+        self.__exc_info = None
+        self.__exc_stack = ""
+        self.__done = threading.Event()
+        self.__done.set()
+
+    @property
+    def running(self) -> int:
+        """正在执行的任务数。"""
+        return self._running
+
+    @property
+    def pending(self) -> int:
+        """等待执行的任务数。"""
+        return len(self._tasks)
+
+    @property
+    def idle(self) -> bool:
+        """没有等待执行的任务，并且正在执行的任务数小于 `max_parallel` 。"""
+        return not self._tasks and self._running < self.max_parallel
+
+    def ok(self) -> bool:
+        """还没有任务抛出异常。"""
+        return self.__exc_info is None
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs):
+        """提交一个任务。已经有任务抛出异常时忽略新提交的任务。"""
+        self.executor._submit(self, functools.partial(func, *args, **kwargs))
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """等待所有任务结束。
+
+        有任务抛出异常时，不再执行尚未开始的任务，等正在执行的任务结束之后抛出第一个异常。
+
+        :param timeout: 最长等待的秒数，None表示一直等待
+        :return: 所有任务都已结束返回True，超时返回False
+        """
+        if getattr(_local, "executor", None) is not self.executor:
+            if not self.__done.wait(timeout):
+                return False
+        else:
+            # 在线程池的线程中等待：自己执行本传输的任务，避免所有线程都在等待而死锁
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                self.executor._help(self)
+                interval = _HELP_INTERVAL if deadline is None else min(_HELP_INTERVAL, deadline - time.monotonic())
+                if self.__done.wait(max(interval, 0)):
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+
+        if self.__exc_info:
+            logger.debug(f"An exception was thrown by transfer task, backtrace: {self.__exc_stack}")
+            raise self.__exc_info[1]
+        return True
+
+    def _is_runnable(self):
+        return bool(self._tasks) and self._running < self.max_parallel and self.__exc_info is None
+
+    def _start(self):
+        self._running += 1
+        self.__done.clear()
+        return self._tasks.popleft()
+
+    def _add(self, task):
+        if self.__exc_info is None:
+            self._tasks.append(task)
+            self.__done.clear()
+
+    def _task_done(self, exc_info):
+        self._running -= 1
+        if exc_info and self.__exc_info is None:
+            self.__exc_info = exc_info
+            self.__exc_stack = "".join(traceback.format_exception(*exc_info))
+            self._tasks.clear()
+        if not self._running and not (self._tasks and self.__exc_info is None):
+            self.__done.set()
+
+
+class TransferExecutor:
+    """多个传输共用的有界线程池，线程按需创建，空闲一段时间后退出。
+
+    :param max_workers: 线程数上限，缺省为 `aliyun_oss_x.defaults.transfer_max_workers`
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = defaults.get(max_workers, defaults.transfer_max_workers)
+        if self.max_workers < 1:
+            raise ValueError(f"max_workers must be positive: {self.max_workers}")
+
+        self.__cond = threading.Condition()
+        self.__transfers = collections.deque()
+        self.__workers = 0
+        self.__idle = 0
+
+    @property
+    def workers(self) -> int:
+        """当前的线程数。"""
+        return self.__workers
+
+    def transfer(self, max_parallel: int, priority: int = 0) -> Transfer:
+        """创建一个传输。"""
+        return Transfer(self, max_parallel, priority)
+
+    def _submit(self, transfer: Transfer, task):
+        with self.__cond:
+            transfer._add(task)
+            if not transfer._scheduled and transfer._tasks:
+                transfer._scheduled = True
+                self.__transfers.append(transfer)
+
+            if not transfer._is_runnable():
+                return
+            if self.__idle:
+                self.__idle -= 1
+                self.__cond.notify()
+            elif self.__workers < self.max_workers:
+                self.__workers += 1
+                thread = threading.Thread(target=self.__worker, name=f"oss-transfer-{id(self):x}-{self.__workers}")
+                thread.daemon = True
+                thread.start()
+
+    def __next_task(self, only: Transfer | None = None):
+        best = None
+        for transfer in self.__transfers:
+            if only is not None and transfer is not only:
+                continue
+            if transfer._is_runnable() and (best is None or transfer.priority > best.priority):
+                best = transfer
+
+        if best is None:
+            return None, None
+
+        # 轮流执行：选中的传输排到同优先级的其他传输之后
+        task = best._start()
+        self.__transfers.remove(best)
+        if best._tasks:
+            self.__transfers.append(best)
+        else:
+            best._scheduled = False
+        return best, task
+
+    def __run(self, transfer, task):
+        exc_info = None
+        try:
+            task()
+        except BaseException:
+            exc_info = sys.exc_info()
+
+        with self.__cond:
+            transfer._task_done(exc_info)
+            if transfer._scheduled and not transfer._tasks:
+                # 出错时尚未开始的任务已被丢弃
+                transfer._scheduled = False
+                self.__transfers.remove(transfer)
+            # 传输有了空闲名额，可能有其他线程在等待它的任务
+            if transfer._is_runnable() and self.__idle:
+                self.__idle -= 1
+                self.__cond.notify()
+
+    def __worker(self):
+        _local.executor = self
+        while True:
+            with self.__cond:
+                transfer, task = self.__next_task()
+                while task is None:
+                    self.__idle += 1
+                    if not self.__cond.wait(_IDLE_TIMEOUT):
+                        self.__idle -= 1
+                        transfer, task = self.__next_task()
+                        if task is None:
+                            self.__workers -= 1
+                            return
+                    else:
+                        transfer, task = self.__next_task()
+
+            self.__run(transfer, task)
+
+    def _help(self, transfer: Transfer):
+        while True:
+            with self.__cond:
+                if not transfer._is_runnable():
+                    return
+                transfer, task = self.__next_task(only=transfer)
+            self.__run(transfer, task)
+
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor() -> TransferExecutor:
+    """返回进程内共用的 :class:`TransferExecutor` 。"""
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = TransferExecutor()
+        return _default_executor
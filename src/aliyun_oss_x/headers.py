@@ -7,6 +7,7 @@ IF_MATCH = "If-Match"
 
 OSS_COPY_OBJECT_SOURCE = "x-oss-copy-source"
 OSS_COPY_OBJECT_SOURCE_RANGE = "x-oss-copy-source-range"
+OSS_COPY_OBJECT_SOURCE_IF_MATCH = "x-oss-copy-source-if-match"
 
 OSS_REQUEST_ID = "x-oss-request-id"
 
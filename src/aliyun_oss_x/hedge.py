@@ -0,0 +1,275 @@
+"""对冲请求（hedged requests）。
+
+少数慢连接会拖慢小对象 `get_object` / `head_object` 的长尾延迟。开启对冲后，如果第一个请求在
+一段时间内还没有收到响应头部，就再发送一个相同的请求，使用先成功返回的那个，另一个被取消或者关闭。
+出错或者返回5xx的请求不算成功，会继续等待另一个请求。
+
+等待时间取最近若干个请求延迟的某个分位数（缺省为p95），额外请求的数量受 `max_hedge_ratio` 限制。
+只有GET和HEAD这类幂等的读请求会被对冲。
+
+用法 ::
+
+    >>> policy = aliyun_oss_x.HedgePolicy(percentile=95, max_hedge_ratio=0.05)
+    >>> bucket = aliyun_oss_x.Bucket(auth, endpoint, bucket_name, hedge_policy=policy)
+    >>> policy.stats.hedges, policy.stats.hedge_wins
+"""
+
+import time
+import asyncio
+import logging
+import weakref
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait, TimeoutError as FutureTimeoutError
+from typing import Awaitable, Callable
+
+from .types import OSSResponse, AsyncOSSResponse
+
+
+logger = logging.getLogger(__name__)
+
+HEDGEABLE_METHODS = frozenset(["GET", "HEAD"])
+
+
+class HedgeStats:
+    """对冲统计信息，所有计数都是累计值。
+
+    :param requests: 经过对冲策略的请求数
+    :param hedges: 额外发出的对冲请求数
+    :param hedge_wins: 对冲请求先于原请求返回的次数
+    :param budget_exhausted: 因为超过 `max_hedge_ratio` 而没有对冲的次数
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+        self.__lock = threading.Lock()
+
+    def _add(self, **kwargs):
+        with self.__lock:
+            for name, value in kwargs.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _acquire_hedge(self, max_hedge_ratio: float, burst: int) -> bool:
+        """在同一把锁内检查比例上限并计数，并发的请求不会一起越过上限。"""
+        with self.__lock:
+            if self.hedges < self.requests * max_hedge_ratio + burst:
+                self.hedges += 1
+                return True
+            self.budget_exhausted += 1
+            return False
+
+    def __repr__(self):
+        return (
+            f"HedgeStats(requests={self.requests}, hedges={self.hedges}, hedge_wins={self.hedge_wins}, "
+            f"budget_exhausted={self.budget_exhausted})"
+        )
+
+
+class HedgePolicy:
+    """对冲请求策略。
+
+    :param percentile: 用哪个延迟分位数作为发出对冲请求前的等待时间
+    :param window: 统计延迟分位数时使用的最近请求数
+    :param min_samples: 样本数少于该值时使用 `initial_delay`
+    :param initial_delay: 样本不足时的等待时间，以秒为单位
+    :param min_delay: 等待时间下限，以秒为单位
+    :param max_delay: 等待时间上限，以秒为单位
+    :param max_hedge_ratio: 对冲请求数占总请求数的比例上限
+    :param burst: 在比例限制之外允许的对冲请求数，使刚开始的少量请求也能对冲
+    :param max_workers: 同步接口用于并发发送请求的线程数。没有空闲线程时请求在调用者的线程中发送，不排队也不对冲
+
+    同步接口的线程池在第一次对冲时创建，不再使用时调用 :meth:`close` 关闭，或者在对象被回收时自动关闭。
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        window: int = 200,
+        min_samples: int = 20,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.01,
+        max_delay: float = 5.0,
+        max_hedge_ratio: float = 0.05,
+        burst: int = 10,
+        max_workers: int = 64,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_hedge_ratio = max_hedge_ratio
+        self.burst = burst
+        self.max_workers = max_workers
+        self.stats = HedgeStats()
+
+        self.__latencies = collections.deque(maxlen=window)
+        self.__lock = threading.Lock()
+        self.__executor = None
+        self.__finalizer = None
+        # 线程池中正在执行的请求占用的名额，拿到名额才提交，提交的请求总是立即开始而不会排队
+        self.__slots = threading.BoundedSemaphore(max_workers)
+
+    def record_latency(self, seconds: float):
+        with self.__lock:
+            self.__latencies.append(seconds)
+
+    def delay(self) -> float:
+        """发出对冲请求之前的等待时间。"""
+        with self.__lock:
+            if len(self.__latencies) < self.min_samples:
+                return self.initial_delay
+            samples = sorted(self.__latencies)
+
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return min(self.max_delay, max(self.min_delay, samples[index]))
+
+    def _acquire(self) -> bool:
+        return self.stats._acquire_hedge(self.max_hedge_ratio, self.burst)
+
+    def close(self):
+        """关闭同步接口使用的线程池，不等待正在进行的请求。之后再使用时会重新创建线程池。"""
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+            finalizer, self.__finalizer = self.__finalizer, None
+        if finalizer is not None:
+            finalizer.detach()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __get_executor(self):
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="oss-hedge")
+                self.__finalizer = weakref.finalize(self, self.__executor.shutdown, wait=False)
+            return self.__executor
+
+    def __submit(self, call):
+        """在线程池中发送请求，调用者已经拿到名额，请求结束时归还。"""
+        try:
+            future = self.__get_executor().submit(self.__timed, call)
+        except BaseException:
+            self.__slots.release()
+            raise
+        future.add_done_callback(lambda _: self.__slots.release())
+        return future
+
+    def __timed(self, call):
+        start = time.monotonic()
+        result = call()
+        self.record_latency(time.monotonic() - start)
+        return result
+
+    def run(self, call: Callable[[], OSSResponse]) -> OSSResponse:
+        """发送请求，超过等待时间仍未返回时发送对冲请求，返回先成功的响应。
+
+        已经开始的落后请求无法中止，它继续占用一个线程直到返回，响应随后被关闭。
+        """
+        self.stats._add(requests=1)
+
+        if not self.__slots.acquire(blocking=False):
+            # 没有空闲线程，在调用者的线程中发送，排队的时间不会被当成请求的延迟而触发对冲
+            return self.__timed(call)
+
+        primary = self.__submit(call)
+        try:
+            return primary.result(timeout=self.delay())
+        except FutureTimeoutError:
+            pass
+
+        if not self.__slots.acquire(blocking=False):
+            return primary.result()
+        if not self._acquire():
+            self.__slots.release()
+            return primary.result()
+
+        logger.debug("Send hedged request")
+        hedge = self.__submit(call)
+        winner = _first_success([primary, hedge])
+
+        loser = hedge if winner is primary else primary
+        if not loser.cancel():
+            loser.add_done_callback(_close_response)
+        if winner is hedge and _succeeded(hedge):
+            self.stats._add(hedge_wins=1)
+        return winner.result()
+
+    async def __timed_async(self, call):
+        start = time.monotonic()
+        result = await call()
+        self.record_latency(time.monotonic() - start)
+        return result
+
+    async def run_async(self, call: Callable[[], Awaitable[AsyncOSSResponse]]) -> AsyncOSSResponse:
+        """异步版本的 :meth:`run` ，落后的请求会被取消。"""
+        self.stats._add(requests=1)
+
+        primary = asyncio.ensure_future(self.__timed_async(call))
+        try:
+            done, _ = await asyncio.wait([primary], timeout=self.delay())
+            if done or not self._acquire():
+                return await primary
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+
+        logger.debug("Send hedged request")
+        hedge = asyncio.ensure_future(self.__timed_async(call))
+        try:
+            winner = await _first_success_async([primary, hedge])
+        except BaseException:
+            for task in (primary, hedge):
+                task.cancel()
+            raise
+
+        loser = hedge if winner is primary else primary
+        if loser.done():
+            if not loser.cancelled() and loser.exception() is None:
+                await loser.result().aclose()
+        else:
+            loser.cancel()
+        if winner is hedge and _succeeded(hedge):
+            self.stats._add(hedge_wins=1)
+        return winner.result()
+
+
+def _succeeded(future) -> bool:
+    return future.exception() is None and future.result().status < 500
+
+
+def _first_success(futures):
+    """返回第一个成功的请求。都不成功时优先返回5xx响应的请求，其次是最后一个出错的请求。"""
+    pending = set(futures)
+    failed = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in futures:
+            if future in done:
+                if _succeeded(future):
+                    return future
+                if failed is None or failed.exception() is not None:
+                    failed = future
+    return failed
+
+
+async def _first_success_async(tasks):
+    """:func:`_first_success` 的异步版本。"""
+    pending = set(tasks)
+    failed = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task in done:
+                if _succeeded(task):
+                    return task
+                if failed is None or failed.exception() is not None:
+                    failed = task
+    return failed
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
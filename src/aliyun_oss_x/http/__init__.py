@@ -1,5 +1,9 @@
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Generic, TypeVar
+from urllib.parse import urlsplit
 
 import httpx
 from httpx import Headers
@@ -7,6 +11,7 @@ from httpx import Headers
 if TYPE_CHECKING:
     from httpx._types import ProxiesTypes
 
+from .. import defaults
 from ..compat import to_bytes
 from ..__version__ import __version__
 from ..exceptions import RequestError
@@ -19,13 +24,200 @@ USER_AGENT = f"aliyun-oss-x/{__version__}"
 logger = logging.getLogger(__name__)
 
 
+class PoolConfig:
+    """Session的连接池配置。
+
+    缺省配置在创建时根据 `aliyun_oss_x.defaults` 计算：空闲连接数取 `connection_pool_size` 、
+    `multipart_num_threads` 和 `multiget_num_threads` 中的最大值，从而并发分片上传、下载的每个线程
+    都能保持一个长连接。如果需要更大的并发（如 `resumable_upload(num_threads=64)` ），应相应地调大
+    连接池，或者在创建Session之前修改上述缺省值。
+
+    :param max_connections: 最大连接数（包括正在使用和空闲的连接），None表示不限制。缺省为
+        `max(100, max_keepalive_connections)`
+    :param max_keepalive_connections: 最多保留的空闲连接数
+    :param keepalive_expiry: 空闲连接的保留时间，以秒为单位
+    :param http2: 是否启用HTTP/2。None表示使用Session的 `http2` 参数
+    :param max_connections_per_host: 对同一个主机（域名和端口）的最大并发请求数，None表示不限制。
+        注意流式响应（如 `get_object` ）在读完或者关闭之前一直占用名额。
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool | None = None,
+        max_connections_per_host: int | None = None,
+    ):
+        if max_keepalive_connections is None:
+            max_keepalive_connections = max(
+                defaults.connection_pool_size, defaults.multipart_num_threads, defaults.multiget_num_threads
+            )
+        if max_connections is None:
+            max_connections = max(100, max_keepalive_connections)
+
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.max_connections_per_host = max_connections_per_host
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def max_concurrency(self) -> int | None:
+        """不排队等待连接的情况下，最多可以同时进行的请求数。None表示不限制。"""
+        limits = [n for n in (self.max_connections, self.max_connections_per_host) if n is not None]
+        return min(limits) if limits else None
+
+    def __repr__(self):
+        return (
+            f"PoolConfig(max_connections={self.max_connections}, "
+            f"max_keepalive_connections={self.max_keepalive_connections}, "
+            f"keepalive_expiry={self.keepalive_expiry}, http2={self.http2}, "
+            f"max_connections_per_host={self.max_connections_per_host})"
+        )
+
+
+def _host_of(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+class _HostLimiter:
+    """限制对同一个主机的并发请求数。"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.__lock = threading.Lock()
+        self.__semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def get(self, host: str) -> threading.BoundedSemaphore:
+        with self.__lock:
+            semaphore = self.__semaphores.get(host)
+            if semaphore is None:
+                semaphore = self.__semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return semaphore
+
+
+class _AsyncHostLimiter:
+    """异步版本的 `_HostLimiter` 。"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.__semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def get(self, host: str) -> asyncio.Semaphore:
+        semaphore = self.__semaphores.get(host)
+        if semaphore is None:
+            semaphore = self.__semaphores[host] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+
+ClientT = TypeVar("ClientT", httpx.Client, httpx.AsyncClient)
+
+
+def _proxies_key(proxies: "ProxiesTypes") -> str:
+    """把代理配置转换成可以作为字典键的值，内容相同的代理配置得到相同的键。"""
+    if isinstance(proxies, dict):
+        return repr(sorted((str(k), repr(v) if not isinstance(v, str) else v) for k, v in proxies.items()))
+    return proxies if isinstance(proxies, str) else repr(proxies)
+
+
+class _CachedClient(Generic[ClientT]):
+    def __init__(self, client: ClientT):
+        self.client = client
+        self.users = 0
+        self.evicted = False
+
+
+class _ClientCache(Generic[ClientT]):
+    """按代理配置缓存httpx客户端，从而使用代理的请求也能复用连接池。
+
+    最多缓存 `max_size` 个客户端，超出时按LRU淘汰。被淘汰的客户端如果仍有请求在使用
+    （包括尚未读完的流式响应），要等到最后一个请求释放后才关闭。
+
+    :param max_size: 最多缓存的客户端个数
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max(max_size, 1)
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict[tuple, _CachedClient[ClientT]] = OrderedDict()
+
+    def acquire(self, key: tuple, factory) -> tuple[_CachedClient[ClientT], list[ClientT]]:
+        """取得 `key` 对应的客户端，不存在时用 `factory` 创建。
+
+        :return: (缓存项, 需要调用者关闭的客户端列表)
+        """
+        to_close = []
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                entry = _CachedClient(factory())
+                self.__entries[key] = entry
+                while len(self.__entries) > self.max_size:
+                    _, evicted = self.__entries.popitem(last=False)
+                    evicted.evicted = True
+                    if evicted.users == 0:
+                        to_close.append(evicted.client)
+            else:
+                self.__entries.move_to_end(key)
+            entry.users += 1
+        return entry, to_close
+
+    def release(self, entry: _CachedClient[ClientT]) -> ClientT | None:
+        """释放一次对 `entry` 的使用。如果返回客户端，调用者需要将其关闭。"""
+        with self.__lock:
+            entry.users -= 1
+            if entry.evicted and entry.users == 0:
+                return entry.client
+        return None
+
+    def clear(self) -> list[ClientT]:
+        """清空缓存，返回所有需要关闭的客户端。"""
+        with self.__lock:
+            clients = [entry.client for entry in self.__entries.values()]
+            for entry in self.__entries.values():
+                entry.evicted = True
+            self.__entries.clear()
+        return clients
+
+    def __len__(self):
+        return len(self.__entries)
+
+
 class Session:
-    """属于同一个 Session 的请求共享一组连接池，如有可能也会重用HTTP连接。"""
+    """属于同一个 Session 的请求共享一组连接池，如有可能也会重用HTTP连接。
+
+    请求指定了与 `proxies` 不同的代理时，会使用按代理配置缓存的客户端，缓存个数由
+    `defaults.proxy_client_cache_size` 决定。
+
+    :param proxies: 缺省代理
+    :param http2: 是否启用HTTP/2
+    :param pool_config: 连接池配置，参见 :class:`PoolConfig` 。缺省时根据 `aliyun_oss_x.defaults` 计算
+    :type pool_config: aliyun_oss_x.http.PoolConfig
+    """
 
-    def __init__(self, proxies: "ProxiesTypes | None" = None, http2: bool = True):
+    def __init__(
+        self, proxies: "ProxiesTypes | None" = None, http2: bool = True, pool_config: PoolConfig | None = None
+    ):
+        self.pool_config = pool_config or PoolConfig()
         self.proxies = proxies
-        self.http2 = http2
-        self.client = httpx.Client(http2=http2, proxies=proxies)
+        self.http2 = http2 if self.pool_config.http2 is None else self.pool_config.http2
+        self.client = self.__make_client(proxies)
+        self.proxy_clients: _ClientCache[httpx.Client] = _ClientCache(defaults.proxy_client_cache_size)
+        self.__host_limiter = None
+        if self.pool_config.max_connections_per_host is not None:
+            self.__host_limiter = _HostLimiter(self.pool_config.max_connections_per_host)
+
+    def __make_client(self, proxies):
+        return httpx.Client(http2=self.http2, proxies=proxies, limits=self.pool_config.limits)
 
     def do_request(self, req: "Request", timeout: float):
         try:
@@ -33,21 +225,71 @@ class Session:
                 f"发送请求,方法: {req.method}, URL: {req.url}, 参数: {req.params}, 头部: {req.headers}, 超时: {timeout}, 代理: {req.proxies}"
             )
 
-            if req.proxies:
-                self.client = httpx.Client(http2=self.http2, proxies=req.proxies)
-
-            response = self.client.request(
-                method=req.method,
-                url=req.url,
-                content=req.data,
-                params=req.params,
-                headers=req.headers,
-                timeout=timeout,
-            )
-            return OSSResponse(response)
+            releases = []
+            client = self.client
+            if req.proxies and req.proxies != self.proxies:
+                entry, to_close = self.proxy_clients.acquire(
+                    (_proxies_key(req.proxies), self.http2), lambda: self.__make_client(req.proxies)
+                )
+                for c in to_close:
+                    c.close()
+                client = entry.client
+                releases.append(lambda: self.__release(entry))
+
+            if self.__host_limiter is not None:
+                semaphore = self.__host_limiter.get(_host_of(req.url))
+                semaphore.acquire()
+                releases.append(semaphore.release)
+
+            if not releases:
+                return self.__send(client, req, timeout)
+
+            def release():
+                for r in releases:
+                    r()
+
+            # 非流式响应返回时响应体已读完，可以立即释放；流式响应要等读完或关闭后再释放
+            try:
+                resp = self.__send(client, req, timeout, on_close=release if req.stream else None)
+            except BaseException:
+                release()
+                raise
+            if not req.stream:
+                release()
+            return resp
         except httpx.RequestError as e:
             raise RequestError(e)
 
+    def __send(self, client: httpx.Client, req: "Request", timeout: float, on_close=None):
+        request = client.build_request(
+            method=req.method,
+            url=req.url,
+            content=req.data,
+            params=req.params,
+            headers=req.headers,
+            timeout=timeout,
+        )
+        # stream=True 时只读取响应头部，响应体在读取时才从连接上获取，读完或close()后释放连接
+        response = client.send(request, stream=req.stream)
+        return OSSResponse(response, on_close=on_close)
+
+    def __release(self, entry: _CachedClient[httpx.Client]):
+        client = self.proxy_clients.release(entry)
+        if client is not None:
+            client.close()
+
+    def close(self):
+        """关闭默认客户端和所有缓存的代理客户端。"""
+        for client in self.proxy_clients.clear():
+            client.close()
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 
 class Request:
     def __init__(
@@ -62,6 +304,7 @@ class Request:
         region: str | None = None,
         product: str | None = None,
         cloudbox_id: str | None = None,
+        stream: bool = False,
     ):
         self.method = method
         self.url = url
@@ -71,6 +314,7 @@ class Request:
         self.region = region
         self.product = product
         self.cloudbox_id = cloudbox_id
+        self.stream = stream
 
         if not isinstance(headers, Headers):
             self.headers = Headers(headers or {})
@@ -90,12 +334,31 @@ class Request:
 
 
 class AsyncSession:
-    """属于同一个异步 Session 的请求共享一组连接池,如有可能也会重用HTTP连接。"""
+    """属于同一个异步 Session 的请求共享一组连接池,如有可能也会重用HTTP连接。
+
+    请求指定了与 `proxies` 不同的代理时，会使用按代理配置缓存的客户端，缓存个数由
+    `defaults.proxy_client_cache_size` 决定。
+
+    :param proxies: 缺省代理
+    :param http2: 是否启用HTTP/2
+    :param pool_config: 连接池配置，参见 :class:`PoolConfig` 。缺省时根据 `aliyun_oss_x.defaults` 计算
+    :type pool_config: aliyun_oss_x.http.PoolConfig
+    """
 
-    def __init__(self, proxies: "ProxiesTypes | None" = None, http2: bool = True):
+    def __init__(
+        self, proxies: "ProxiesTypes | None" = None, http2: bool = True, pool_config: PoolConfig | None = None
+    ):
+        self.pool_config = pool_config or PoolConfig()
         self.default_proxies = proxies
-        self.http2 = http2
-        self.client = httpx.AsyncClient(http2=http2, proxies=proxies)
+        self.http2 = http2 if self.pool_config.http2 is None else self.pool_config.http2
+        self.client = self.__make_client(proxies)
+        self.proxy_clients: _ClientCache[httpx.AsyncClient] = _ClientCache(defaults.proxy_client_cache_size)
+        self.__host_limiter = None
+        if self.pool_config.max_connections_per_host is not None:
+            self.__host_limiter = _AsyncHostLimiter(self.pool_config.max_connections_per_host)
+
+    def __make_client(self, proxies):
+        return httpx.AsyncClient(http2=self.http2, proxies=proxies, limits=self.pool_config.limits)
 
     async def do_request(self, req: "AsyncRequest", timeout: float):
         try:
@@ -103,35 +366,73 @@ class AsyncSession:
                 f"发送异步请求,方法: {req.method}, URL: {req.url}, 参数: {req.params}, 头部: {req.headers}, 超时: {timeout}, 代理: {req.proxies}"
             )
 
+            releases = []
+            client = self.client
             if req.proxies and req.proxies != self.default_proxies:
-                async with httpx.AsyncClient(http2=self.http2, proxies=req.proxies) as client:
-                    response = await client.request(
-                        method=req.method,
-                        url=req.url,
-                        content=req.data,
-                        params=req.params,
-                        headers=req.headers,
-                        timeout=timeout,
-                    )
-            else:
-                response = await self.client.request(
-                    method=req.method,
-                    url=req.url,
-                    content=req.data,
-                    params=req.params,
-                    headers=req.headers,
-                    timeout=timeout,
+                entry, to_close = self.proxy_clients.acquire(
+                    (_proxies_key(req.proxies), self.http2), lambda: self.__make_client(req.proxies)
                 )
-
-            return AsyncOSSResponse(response)
+                for c in to_close:
+                    await c.aclose()
+                client = entry.client
+                releases.append(lambda: self.__release(entry))
+
+            if self.__host_limiter is not None:
+                semaphore = self.__host_limiter.get(_host_of(req.url))
+                await semaphore.acquire()
+                releases.append(lambda: _release_semaphore(semaphore))
+
+            if not releases:
+                return await self.__send(client, req, timeout)
+
+            async def release():
+                for r in releases:
+                    await r()
+
+            # 非流式响应返回时响应体已读完，可以立即释放；流式响应要等读完或关闭后再释放
+            try:
+                resp = await self.__send(client, req, timeout, on_close=release if req.stream else None)
+            except BaseException:
+                await release()
+                raise
+            if not req.stream:
+                await release()
+            return resp
         except httpx.RequestError as e:
             raise RequestError(e)
 
+    async def __send(self, client: httpx.AsyncClient, req: "AsyncRequest", timeout: float, on_close=None):
+        request = client.build_request(
+            method=req.method,
+            url=req.url,
+            content=req.data,
+            params=req.params,
+            headers=req.headers,
+            timeout=timeout,
+        )
+        response = await client.send(request, stream=req.stream)
+        return AsyncOSSResponse(response, on_close=on_close)
+
+    async def __release(self, entry: _CachedClient[httpx.AsyncClient]):
+        client = self.proxy_clients.release(entry)
+        if client is not None:
+            await client.aclose()
+
+    async def aclose(self):
+        """关闭默认客户端和所有缓存的代理客户端。"""
+        for client in self.proxy_clients.clear():
+            await client.aclose()
+        await self.client.aclose()
+
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        await self.aclose()
+
+
+async def _release_semaphore(semaphore: asyncio.Semaphore):
+    semaphore.release()
 
 
 class AsyncRequest:
@@ -147,6 +448,7 @@ class AsyncRequest:
         region: str | None = None,
         product: str | None = None,
         cloudbox_id: str | None = None,
+        stream: bool = False,
     ):
         self.method = method
         self.url = url
@@ -156,6 +458,7 @@ class AsyncRequest:
         self.region = region
         self.product = product
         self.cloudbox_id = cloudbox_id
+        self.stream = stream
 
         if not isinstance(headers, Headers):
             self.headers = Headers(headers or {})
@@ -1,7 +1,9 @@
 import json
+import asyncio
 import copy
 import logging
 from enum import Enum
+from functools import partial
 from urllib.parse import quote, unquote
 from typing import TypeVar, Callable, Any, Literal, cast, TYPE_CHECKING
 
@@ -9,16 +11,14 @@ from .utils import (
     AES_GCM,
     AES_CTR,
     http_to_unixtime,
-    make_progress_adapter,
-    make_progress_adapter_async,
-    make_crc_adapter,
-    make_crc_adapter_async,
+    make_stream_adapter,
+    make_stream_adapter_async,
     b64encode_as_string,
     b64decode_from_string,
 )
 from .types import ResponseType, AsyncOSSResponse, OSSResponse
 from .exceptions import ClientError, InconsistentError
-from .select_response import SelectResponseAdapter
+from .select_response import SelectResponseAdapter, AsyncSelectResponseAdapter
 from .headers import (
     OSS_NEXT_APPEND_POSITION,
     OSS_HASH_CRC64_ECMA,
@@ -316,14 +316,7 @@ class GetObjectResult(HeadObjectResult):
 
         self.content_range = _hget(resp.headers, "Content-Range")
 
-        if progress_callback:
-            self.stream = make_progress_adapter(self.resp, progress_callback, self.content_length)
-        else:
-            self.stream = cast(OSSResponse, self.resp)
-
-        if self.__crc_enabled:
-            self.stream = make_crc_adapter(self.stream, discard=discard)
-
+        cipher_callback = None
         if self.__crypto_provider:
             content_crypto_material = ContentCryptoMaterial(
                 self.__crypto_provider.cipher, self.__crypto_provider.wrap_alg
@@ -370,13 +363,26 @@ class GetObjectResult(HeadObjectResult):
                     cipher.initial_by_counter(plain_key, plain_counter + offset)
                 else:
                     cipher.initialize(plain_key, plain_iv, offset)
-                self.stream = crypto_provider.make_decrypt_adapter(self.stream, cipher, discard)
+                cipher_callback = partial(cipher.decrypt)
         else:
             if OSS_CLIENT_SIDE_ENCRYPTION_KEY in resp.headers or DEPRECATED_CLIENT_SIDE_ENCRYPTION_KEY in resp.headers:
                 logger.warn(
                     "Using Bucket to get an encrypted object will return raw data, please confirm if you really want to do this"
                 )
 
+        # 进度回调、CRC校验和解密在同一个适配器中完成，每次读取只经过一层
+        if progress_callback or self.__crc_enabled or cipher_callback:
+            self.stream = make_stream_adapter(
+                self.resp,
+                progress_callback,
+                self.content_length,
+                enable_crc=self.__crc_enabled,
+                cipher_callback=cipher_callback,
+                discard=discard,
+            )
+        else:
+            self.stream = cast(OSSResponse, self.resp)
+
     @staticmethod
     def _parse_range_str(content_range):
         # :param str content_range: sample 'bytes 0-128/1024'
@@ -388,7 +394,7 @@ class GetObjectResult(HeadObjectResult):
         return self.stream.read(amt)
 
     def close(self):
-        self.resp.response.close()
+        self.resp.close()
 
     def __iter__(self):
         return iter(self.stream)
@@ -424,14 +430,7 @@ class AsyncGetObjectResult(HeadObjectResult):
 
         self.content_range = _hget(resp.headers, "Content-Range")
 
-        if progress_callback:
-            self.stream = make_progress_adapter_async(self.resp, progress_callback, self.content_length)
-        else:
-            self.stream = cast(AsyncOSSResponse, self.resp)
-
-        if self.__crc_enabled:
-            self.stream = make_crc_adapter_async(self.stream, discard=discard)
-
+        cipher_callback = None
         if self.__crypto_provider:
             content_crypto_material = ContentCryptoMaterial(
                 self.__crypto_provider.cipher, self.__crypto_provider.wrap_alg
@@ -478,13 +477,26 @@ class AsyncGetObjectResult(HeadObjectResult):
                     cipher.initial_by_counter(plain_key, plain_counter + offset)
                 else:
                     cipher.initialize(plain_key, plain_iv, offset)
-                self.stream = crypto_provider.make_decrypt_adapter_async(self.stream, cipher, discard)
+                cipher_callback = partial(cipher.decrypt)
         else:
             if OSS_CLIENT_SIDE_ENCRYPTION_KEY in resp.headers or DEPRECATED_CLIENT_SIDE_ENCRYPTION_KEY in resp.headers:
                 logger.warn(
                     "Using Bucket to get an encrypted object will return raw data, please confirm if you really want to do this"
                 )
 
+        # 进度回调、CRC校验和解密在同一个适配器中完成，每次读取只经过一层
+        if progress_callback or self.__crc_enabled or cipher_callback:
+            self.stream = make_stream_adapter_async(
+                self.resp,
+                progress_callback,
+                self.content_length,
+                enable_crc=self.__crc_enabled,
+                cipher_callback=cipher_callback,
+                discard=discard,
+            )
+        else:
+            self.stream = cast(AsyncOSSResponse, self.resp)
+
     @staticmethod
     def _parse_range_str(content_range):
         # :param str content_range: sample 'bytes 0-128/1024'
@@ -496,7 +508,12 @@ class AsyncGetObjectResult(HeadObjectResult):
         return await self.stream.read(amt)
 
     def close(self):
-        self.resp.response.close()
+        """在当前事件循环中安排关闭响应，不等待连接释放。在协程中请使用 :meth:`aclose` 。"""
+        self._closing = asyncio.get_running_loop().create_task(self.aclose())
+
+    async def aclose(self):
+        """关闭响应，未读完的响应体会被丢弃，连接随之释放。"""
+        await self.resp.aclose()
 
     async def __aiter__(self):
         async for chunk in self.stream:
@@ -506,7 +523,7 @@ class AsyncGetObjectResult(HeadObjectResult):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+        await self.aclose()
 
     @property
     def client_crc(self):
@@ -545,6 +562,41 @@ class SelectObjectResult(HeadObjectResult):
         self.close()
 
 
+class AsyncSelectObjectResult(HeadObjectResult):
+    def __init__(
+        self,
+        resp: AsyncOSSResponse,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        crc_enabled=False,
+    ):
+        super(AsyncSelectObjectResult, self).__init__(resp)
+        self.__crc_enabled = crc_enabled
+        self.select_resp = AsyncSelectResponseAdapter(resp, progress_callback, None, enable_crc=self.__crc_enabled)
+
+    async def read(self):
+        return await self.select_resp.read()
+
+    def close(self):
+        """在当前事件循环中安排关闭响应，不等待连接释放。在协程中请使用 :meth:`aclose` 。"""
+        self._closing = asyncio.get_running_loop().create_task(self.aclose())
+
+    async def aclose(self):
+        """关闭响应，未读完的响应体会被丢弃，连接随之释放。"""
+        await self.resp.aclose()
+
+    def __aiter__(self):
+        return aiter(self.select_resp)
+
+    async def __anext__(self):
+        return await anext(self.select_resp)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
 class PutObjectResult(RequestResult):
     def __init__(self, resp: ResponseType):
         super(PutObjectResult, self).__init__(resp)
@@ -0,0 +1,264 @@
+"""可随机读取的OSS文件对象，由 `Bucket.open_read` 创建。
+
+Parquet、ZIP、HDF5等格式先读取文件尾部的元信息，再读取分散的数据块，直接用 `get_object(byte_range=...)`
+每次小的读取都是一次网络往返。 :class:`ObjectReader` 按块（ `defaults.read_block_size` ）通过Range GET读取：
+
+    * 读过的块保存在LRU缓存中（ `defaults.read_cache_blocks` 块），重复读取不再发送请求；
+    * 连续两次读取首尾相接时认为是顺序读取，在后台并发预读之后的 `defaults.read_ahead_blocks` 块；
+    * 一次读取跨越多个未缓存的块时，这些块并发读取；
+    * 所有Range GET都带有 `If-Match` ，文件在读取过程中被修改时抛出
+      :class:`PreconditionFailed <aliyun_oss_x.exceptions.PreconditionFailed>` 。
+
+用法 ::
+
+    >>> with bucket.open_read('data.parquet') as f:
+    ...     table = pyarrow.parquet.read_table(f)
+    >>> print(f.hit_ratio, f.bytes_fetched, f.bytes_read)
+"""
+
+import io
+import logging
+import threading
+import collections
+from typing import TYPE_CHECKING
+
+from . import defaults
+from . import http
+from .exceptions import InconsistentError
+from .executor import TransferExecutor, get_default_executor
+from .headers import IF_MATCH
+
+if TYPE_CHECKING:
+    from .api import Bucket
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Block:
+    """一个正在读取或者已经读取的块。"""
+
+    __slots__ = ("done", "data", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.data = b""
+        self.error: BaseException | None = None
+
+
+class ObjectReader(io.RawIOBase):
+    """可随机读取的OSS文件对象，参见模块说明。不是线程安全的，同一时刻只能有一个线程读取。
+
+    :param bucket: :class:`Bucket <aliyun_oss_x.Bucket>` 对象
+    :param key: 文件名
+    :param block_size: 每次Range GET读取的块大小，如不指定则使用 `aliyun_oss_x.defaults.read_block_size`
+    :param cache_blocks: 缓存的块数，如不指定则使用 `aliyun_oss_x.defaults.read_cache_blocks`
+    :param readahead_blocks: 顺序读取时预读的块数，0表示不预读，如不指定则使用 `aliyun_oss_x.defaults.read_ahead_blocks`
+    :param headers: 传给 `head_object` 和 `get_object` 的HTTP头部
+    :param params: 传给 `head_object` 和 `get_object` 的请求参数，例如versionId
+    :param executor: 执行预读任务的线程池，缺省为进程内共用的线程池
+    """
+
+    def __init__(
+        self,
+        bucket: "Bucket",
+        key: str,
+        block_size: int | None = None,
+        cache_blocks: int | None = None,
+        readahead_blocks: int | None = None,
+        headers: dict | http.Headers | None = None,
+        params: dict | None = None,
+        executor: TransferExecutor | None = None,
+    ):
+        super().__init__()
+        self.bucket = bucket
+        self.key = key
+        self.block_size = defaults.get(block_size, defaults.read_block_size)
+        if self.block_size < 1:
+            raise ValueError(f"block_size must be positive: {self.block_size}")
+        self.__cache_blocks = max(defaults.get(cache_blocks, defaults.read_cache_blocks), 1)
+        self.__readahead = max(defaults.get(readahead_blocks, defaults.read_ahead_blocks), 0)
+        self.__headers = headers
+        self.__params = params
+
+        result = bucket.head_object(key, headers=headers, params=params)
+
+        #: 文件长度
+        self.size: int = result.content_length or 0
+
+        #: 文件的ETag，每次Range GET都用它作为 `If-Match`
+        self.etag: str = result.etag
+
+        self.__position = 0
+        self.__next_sequential = -1
+        self.__sequential = 0
+        self.__transfer = (executor or get_default_executor()).transfer(max(self.__readahead, 1))
+
+        # protect below fields
+        self.__lock = threading.Lock()
+        self.__blocks: collections.OrderedDict[int, _Block] = collections.OrderedDict()
+
+        #: 访问的块已经在缓存中（包括正在预读）的次数
+        self.cache_hits = 0
+
+        #: 访问的块需要发送请求读取的次数
+        self.cache_misses = 0
+
+        #: 调用者读到的字节数
+        self.bytes_read = 0
+
+        #: 通过Range GET读取的字节数，包括预读
+        self.bytes_fetched = 0
+
+        logger.debug(
+            f"Open object for reading, bucket: {bucket.bucket_name}, key: {key}, size: {self.size}, etag: {self.etag}, "
+            f"block_size: {self.block_size}"
+        )
+
+    @property
+    def hit_ratio(self) -> float:
+        """缓存命中率，还没有读取时为0。"""
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"invalid whence: {whence}")
+        if offset < 0:
+            raise ValueError(f"negative seek position: {offset}")
+        self.__position = offset
+        return offset
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            size = max(self.size - self.__position, 0)
+        return super().read(size)
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer) -> int:
+        self._checkClosed()
+        view = memoryview(buffer).cast("B")
+        start = self.__position
+        end = min(start + len(view), self.size)
+        if start >= end:
+            return 0
+
+        self.__sequential = self.__sequential + 1 if start == self.__next_sequential else 0
+        indexes = range(start // self.block_size, (end - 1) // self.block_size + 1)
+        blocks = self.__acquire(indexes)
+        if self.__sequential and self.__readahead:
+            self.__prefetch(indexes[-1] + 1)
+
+        n = 0
+        for index, block in zip(indexes, blocks):
+            data = memoryview(self.__wait(index, block))
+            offset = start + n - index * self.block_size
+            count = min(len(data) - offset, end - start - n)
+            view[n : n + count] = data[offset : offset + count]
+            n += count
+
+        self.__position = end
+        self.__next_sequential = end
+        self.bytes_read += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            with self.__lock:
+                self.__blocks.clear()
+        super().close()
+
+    def __acquire(self, indexes: range) -> list[_Block]:
+        """返回 `indexes` 对应的块，没有缓存的块第一个在当前线程读取，其余的在线程池中并发读取。"""
+        blocks = []
+        missing = []
+        with self.__lock:
+            for index in indexes:
+                block = self.__blocks.get(index)
+                if block is not None:
+                    self.__blocks.move_to_end(index)
+                    self.cache_hits += 1
+                else:
+                    block = self.__add(index, protected=indexes)
+                    self.cache_misses += 1
+                    missing.append((index, block))
+                blocks.append(block)
+
+        for index, block in missing[1:]:
+            self.__transfer.submit(self.__fetch, index, block)
+        if missing:
+            self.__fetch(*missing[0])
+        return blocks
+
+    def __prefetch(self, first: int):
+        last = min(first + self.__readahead, (self.size + self.block_size - 1) // self.block_size)
+        with self.__lock:
+            started = [(index, self.__add(index)) for index in range(first, last) if index not in self.__blocks]
+        for index, block in started:
+            self.__transfer.submit(self.__fetch, index, block)
+        if started:
+            logger.debug(f"Read ahead blocks {started[0][0]}-{started[-1][0]} of {self.key}")
+
+    def __add(self, index: int, protected: range | None = None) -> _Block:
+        """加入一个新的块，缓存满时淘汰最久没有访问的已读完的块。调用者需要持有锁。"""
+        block = _Block()
+        self.__blocks[index] = block
+        for old in list(self.__blocks):
+            if len(self.__blocks) <= self.__cache_blocks:
+                break
+            if old == index or (protected is not None and old in protected):
+                continue
+            if self.__blocks[old].done.is_set():
+                del self.__blocks[old]
+        return block
+
+    def __wait(self, index: int, block: _Block) -> bytes:
+        block.done.wait()
+        if block.error is not None:
+            with self.__lock:
+                if self.__blocks.get(index) is block:
+                    del self.__blocks[index]
+            raise block.error
+        return block.data
+
+    def __fetch(self, index: int, block: _Block):
+        try:
+            start = index * self.block_size
+            end = min(start + self.block_size, self.size)
+
+            headers = http.Headers(self.__headers)
+            headers[IF_MATCH] = self.etag or ""
+            params = dict(self.__params) if self.__params else None
+            with self.bucket.get_object(
+                self.key, byte_range=(start, end - 1), headers=headers, params=params
+            ) as result:
+                data = result.read()
+            if len(data) != end - start:
+                raise InconsistentError(
+                    f"range get returned {len(data)} bytes, expected {end - start}", result.request_id
+                )
+
+            block.data = data
+            with self.__lock:
+                self.bytes_fetched += len(data)
+        except BaseException as e:
+            block.error = e
+        finally:
+            block.done.set()
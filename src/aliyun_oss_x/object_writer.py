@@ -0,0 +1,431 @@
+"""可写的OSS文件对象，由 `Bucket.open_write` 、 `AsyncBucket.open_write` 创建。
+
+写入的数据先缓存在分片缓冲区中，每写满一个分片就在后台通过分片上传接口上传，调用者可以继续写入；
+`close()` 时上传最后一个分片并完成分片上传。数据不足一个分片时退化为 `put_object` 。
+
+分片缓冲区最多 `num_threads` 个并且重复使用，所有缓冲区都在上传时 `write()` 等待，因此占用的内存不超过
+`num_threads × part_size` 。开启CRC校验时记录每个分片的CRC64，完成分片上传时用
+:func:`calc_obj_crc_from_parts <aliyun_oss_x.utils.calc_obj_crc_from_parts>` 合并，和OSS返回的文件CRC64比较。
+
+用法 ::
+
+    >>> with bucket.open_write('data.csv.gz') as f:
+    ...     with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+    ...         df.to_csv(gz)
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Callable, TYPE_CHECKING
+
+from . import defaults
+from . import exceptions
+from . import http
+from .compat import to_bytes
+from .exceptions import ClientError
+from .models import PartInfo
+from .utils import calc_obj_crc_from_parts, AsyncSizedFileAdapter
+from .executor import TransferExecutor, get_default_executor
+from .headers import OSS_OBJECT_ACL, OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
+from .resumable._base import _populate_valid_headers, _check_pool_capacity
+from .resumable._stream import _BufferPool, _BufferReader, _AsyncBufferReader, _stream_part_size
+
+if TYPE_CHECKING:
+    from .api import Bucket, AsyncBucket
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ObjectWriterBase:
+    def __init__(
+        self,
+        bucket,
+        key: str,
+        headers: dict | http.Headers | None = None,
+        part_size: int | None = None,
+        num_threads: int | None = None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+    ):
+        self.bucket = bucket
+        self.key = key
+        self._headers = headers
+        self._part_size = defaults.get(part_size, defaults.part_size)
+        self._num_threads = defaults.get(num_threads, defaults.multipart_num_threads)
+        self._progress_callback = progress_callback
+        _check_pool_capacity(bucket, self._num_threads)
+
+        self._pool = _BufferPool()
+        self._buf: bytearray | None = None
+        self._buf_len = 0
+        self._part_number = 1
+        self._offset = 0
+        self._upload_id = ""
+        self._closed = False
+
+        self._lock = threading.Lock()
+        self._finished_size = 0
+        self._finished_parts: list[PartInfo] = []
+
+        #: 完成上传之后的结果，类型为 :class:`PutObjectResult <aliyun_oss_x.models.PutObjectResult>`
+        self.result = None
+
+        #: 完成上传之后整个文件的CRC64，没有开启CRC校验时为None
+        self.crc = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def upload_id(self) -> str:
+        """分片上传ID，还没有开始分片上传时为空字符串。"""
+        return self._upload_id
+
+    def writable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        """已经写入的字节数。"""
+        return self._offset
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("I/O operation on closed file")
+
+    def _current_part_size(self) -> int:
+        return _stream_part_size(self._part_number, self._part_size)
+
+    def _fill(self, view: memoryview) -> int:
+        """把 `view` 开头的数据拷贝到当前分片缓冲区，返回拷贝的字节数。"""
+        assert self._buf is not None
+        count = min(len(view), self._current_part_size() - self._buf_len)
+        self._buf[self._buf_len : self._buf_len + count] = view[:count]
+        self._buf_len += count
+        return count
+
+    def _part_full(self) -> bool:
+        return self._buf_len == self._current_part_size()
+
+    def _take_buffer(self):
+        if self._part_number > defaults.max_part_count:
+            raise ClientError(f"object has more than {defaults.max_part_count} parts, use a larger part_size")
+        self._buf = self._pool.take(self._current_part_size())
+
+    def _next_part(self):
+        self._buf = None
+        self._buf_len = 0
+        self._part_number += 1
+
+    def _finish_part(self, part_info: PartInfo):
+        with self._lock:
+            self._finished_parts.append(part_info)
+            self._finished_size += part_info.size or 0
+            if self._progress_callback:
+                self._progress_callback(self._finished_size, None)
+
+    def _sorted_parts(self):
+        return sorted(self._finished_parts, key=lambda p: p.part_number)
+
+    def _set_result(self, result, parts=None):
+        self.result = result
+        if self.bucket.enable_crc:
+            self.crc = result.crc if parts is None else calc_obj_crc_from_parts(parts)
+
+
+class ObjectWriter(_ObjectWriterBase):
+    """可写的OSS文件对象，由 :meth:`Bucket.open_write <aliyun_oss_x.Bucket.open_write>` 创建，参见模块说明。
+
+    不是线程安全的，同一时刻只能有一个线程写入。作为上下文管理器使用时，正常退出会完成上传，抛出异常时取消上传。
+
+    :param bucket: :class:`Bucket <aliyun_oss_x.Bucket>` 对象
+    :param key: 文件名
+    :param headers: 传给 `init_multipart_upload` 或者 `put_object` 的HTTP头部
+    :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.part_size` 。分片大小每上传
+        `defaults.max_part_count` 的十分之一个分片翻一倍。
+    :param num_threads: 并发上传的线程数，同时也是分片缓冲区的个数
+    :param progress_callback: 上传进度回调函数，在每个分片上传完成后调用，总字节数为None。参见 :ref:`progress_callback` 。
+    :param executor: 执行分片任务的线程池，缺省为进程内共用的线程池
+    :param priority: 分片任务的优先级，数值越大越优先
+    """
+
+    def __init__(
+        self,
+        bucket: "Bucket",
+        key: str,
+        headers: dict | http.Headers | None = None,
+        part_size: int | None = None,
+        num_threads: int | None = None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        executor: TransferExecutor | None = None,
+        priority: int = 0,
+    ):
+        super().__init__(bucket, key, headers, part_size, num_threads, progress_callback)
+        self.__executor = executor or get_default_executor()
+        self.__priority = priority
+        self.__slots = threading.Semaphore(self._num_threads)
+        self.__transfer = None
+
+    def write(self, data) -> int:
+        """写入数据，返回写入的字节数。所有分片缓冲区都在上传时等待。
+
+        :param data: bytes、bytearray、memoryview或者str
+        """
+        self._check_open()
+        self.__check_failed()
+
+        view = memoryview(to_bytes(data)).cast("B")
+        total = len(view)
+        while view:
+            if self._buf is None:
+                self.__slots.acquire()
+                if self.__transfer is not None and not self.__transfer.ok():
+                    self.__slots.release()
+                    self.__check_failed()
+                self._take_buffer()
+            view = view[self._fill(view) :]
+            if self._part_full():
+                self.__submit()
+
+        self._offset += total
+        return total
+
+    def flush(self):
+        """检查后台上传是否出错。不足一个分片的数据无法单独上传，仍然留在缓冲区中，直到写满或者 `close()` 。"""
+        self._check_open()
+        self.__check_failed()
+
+    def close(self):
+        """上传剩余的数据并完成上传。出错时取消分片上传并抛出异常。重复调用没有作用。"""
+        if self._closed:
+            return
+
+        try:
+            if self.__transfer is None:
+                data = b"" if self._buf is None else _BufferReader(memoryview(self._buf)[: self._buf_len])
+                logger.debug(f"Object is smaller than one part, put object directly, size: {self._buf_len}")
+                result = self.bucket.put_object(
+                    self.key, data, headers=self._headers, progress_callback=self._progress_callback
+                )
+                self._set_result(result)
+                return
+
+            if self._buf is not None:
+                self.__submit()
+            self.__transfer.wait()
+
+            parts = self._sorted_parts()
+            headers = _populate_valid_headers(self._headers, [OSS_REQUEST_PAYER, OSS_OBJECT_ACL])
+            result = self.bucket.complete_multipart_upload(self.key, self._upload_id, parts, headers=headers)
+            self._set_result(result, parts)
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._closed = True
+            self._buf = None
+
+    def abort(self):
+        """放弃写入，取消分片上传。"""
+        self._closed = True
+        self._buf = None
+        if self.__transfer is None:
+            return
+
+        # 等正在上传的分片结束之后再取消，否则取消之后仍可能留下分片
+        try:
+            self.__transfer.wait()
+        except BaseException:
+            pass
+        try:
+            self.bucket.abort_multipart_upload(self.key, self._upload_id)
+        except exceptions.NoSuchUpload:
+            pass
+        except exceptions.OssError as e:
+            logger.warning(f"Abort multipart upload failed, upload_id: {self._upload_id}, error: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __check_failed(self):
+        """后台上传出错时取消分片上传，抛出导致失败的异常。"""
+        if self.__transfer is not None and not self.__transfer.ok():
+            try:
+                self.__transfer.wait()
+            finally:
+                self.abort()
+
+    def __submit(self):
+        if self.__transfer is None:
+            self._upload_id = self.bucket.init_multipart_upload(self.key, self._headers).upload_id
+            self.__transfer = self.__executor.transfer(self._num_threads, priority=self.__priority)
+            logger.debug(f"Init multipart upload for object writer, upload_id: {self._upload_id}")
+
+        self.__transfer.submit(self.__upload_part, self._part_number, self._buf, self._buf_len)
+        self._next_part()
+
+    def __upload_part(self, part_number: int, buf: bytearray, size: int):
+        try:
+            headers = _populate_valid_headers(self._headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
+            result = self.bucket.upload_part(
+                self.key, self._upload_id, part_number, _BufferReader(memoryview(buf)[:size]), headers=headers
+            )
+            logger.debug(f"Upload part success, part_number: {part_number}, etag: {result.etag}, size: {size}")
+            self._finish_part(PartInfo(part_number, result.etag, size=size, part_crc=result.crc))
+        finally:
+            self._pool.give(buf)
+            self.__slots.release()
+
+
+class AsyncObjectWriter(_ObjectWriterBase):
+    """异步版本的 :class:`ObjectWriter` ，由 :meth:`AsyncBucket.open_write <aliyun_oss_x.AsyncBucket.open_write>`
+    创建，分片作为后台任务并发上传。 `write` 、 `flush` 、 `close` 和 `abort` 都是协程函数。
+
+    :param bucket: :class:`AsyncBucket <aliyun_oss_x.AsyncBucket>` 对象
+
+    其他参数参见 :class:`ObjectWriter` 。
+    """
+
+    def __init__(
+        self,
+        bucket: "AsyncBucket",
+        key: str,
+        headers: dict | http.Headers | None = None,
+        part_size: int | None = None,
+        num_threads: int | None = None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+    ):
+        super().__init__(bucket, key, headers, part_size, num_threads, progress_callback)
+        self.__slots = asyncio.Semaphore(self._num_threads)
+        self.__tasks: list[asyncio.Task] = []
+        self.__multipart = False
+
+    async def write(self, data) -> int:
+        """参见 :meth:`ObjectWriter.write` 。"""
+        self._check_open()
+        await self.__check_failed()
+
+        view = memoryview(to_bytes(data)).cast("B")
+        total = len(view)
+        while view:
+            if self._buf is None:
+                await self.__slots.acquire()
+                if self.__failed():
+                    self.__slots.release()
+                    await self.__check_failed()
+                self._take_buffer()
+            view = view[self._fill(view) :]
+            if self._part_full():
+                await self.__submit()
+
+        self._offset += total
+        return total
+
+    async def flush(self):
+        """参见 :meth:`ObjectWriter.flush` 。"""
+        self._check_open()
+        await self.__check_failed()
+
+    async def close(self):
+        """参见 :meth:`ObjectWriter.close` 。"""
+        if self._closed:
+            return
+
+        try:
+            if not self.__multipart:
+                data = b""
+                if self._buf is not None:
+                    data = AsyncSizedFileAdapter(
+                        _AsyncBufferReader(memoryview(self._buf)[: self._buf_len]), self._buf_len
+                    )
+                logger.debug(f"Object is smaller than one part, put object directly, size: {self._buf_len}")
+                result = await self.bucket.put_object(
+                    self.key, data, headers=self._headers, progress_callback=self._progress_callback
+                )
+                self._set_result(result)
+                return
+
+            if self._buf is not None:
+                await self.__submit()
+            await asyncio.gather(*self.__tasks)
+
+            parts = self._sorted_parts()
+            headers = _populate_valid_headers(self._headers, [OSS_REQUEST_PAYER, OSS_OBJECT_ACL])
+            result = await self.bucket.complete_multipart_upload(self.key, self._upload_id, parts, headers=headers)
+            self._set_result(result, parts)
+        except BaseException:
+            await self.abort()
+            raise
+        finally:
+            self._closed = True
+            self._buf = None
+
+    async def abort(self):
+        """参见 :meth:`ObjectWriter.abort` 。"""
+        self._closed = True
+        self._buf = None
+        if not self.__multipart:
+            return
+
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        try:
+            await self.bucket.abort_multipart_upload(self.key, self._upload_id)
+        except exceptions.NoSuchUpload:
+            pass
+        except exceptions.OssError as e:
+            logger.warning(f"Abort multipart upload failed, upload_id: {self._upload_id}, error: {e}")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await self.close()
+        else:
+            await self.abort()
+
+    def __failed(self) -> BaseException | None:
+        for task in self.__tasks:
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                return task.exception()
+        return None
+
+    async def __check_failed(self):
+        exc = self.__failed()
+        if exc is not None:
+            await self.abort()
+            raise exc
+
+    async def __submit(self):
+        if not self.__multipart:
+            self._upload_id = (await self.bucket.init_multipart_upload(self.key, self._headers)).upload_id
+            self.__multipart = True
+            logger.debug(f"Init multipart upload for object writer, upload_id: {self._upload_id}")
+
+        task = asyncio.create_task(self.__upload_part(self._part_number, self._buf, self._buf_len))
+        self.__tasks.append(task)
+        self._next_part()
+
+    async def __upload_part(self, part_number: int, buf: bytearray, size: int):
+        try:
+            headers = _populate_valid_headers(self._headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
+            data = AsyncSizedFileAdapter(_AsyncBufferReader(memoryview(buf)[:size]), size)
+            result = await self.bucket.upload_part(self.key, self._upload_id, part_number, data, headers=headers)
+            logger.debug(f"Upload part success, part_number: {part_number}, etag: {result.etag}, size: {size}")
+            self._finish_part(PartInfo(part_number, result.etag, size=size, part_crc=result.crc))
+        finally:
+            self._pool.give(buf)
+            self.__slots.release()
@@ -0,0 +1,485 @@
+"""并发Range GET下载到内存。
+
+    * :func:`get_object_into` 把文件按 `_split_to_parts` 分片，并发发送Range GET，响应体通过 `readinto()` 直接写入
+      调用者提供的缓冲区（bytearray、memoryview、mmap、NumPy数组等支持缓冲区协议的可写对象）的对应位置，不产生
+      中间的bytes对象；
+    * :class:`ObjectStream` 在读取者之前并发下载之后的若干个分片，按顺序返回数据，适合把大文件直接交给解压缩或者
+      解析程序，不需要临时文件。
+
+开启CRC校验时计算每个分片的CRC64，合并之后和OSS返回的文件CRC64比较。
+"""
+
+import asyncio
+import logging
+import threading
+import collections
+from typing import Callable, TYPE_CHECKING
+
+from . import defaults
+from . import http
+from .exceptions import ClientError, InconsistentError
+from .executor import TransferExecutor, get_default_executor
+from .crypto_bucket import CryptoBucket, AsyncCryptoBucket
+from .headers import IF_MATCH, OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
+from .utils import Crc64, check_crc, calc_obj_crc_from_parts
+from .resumable._base import _split_to_parts, _populate_valid_headers, _PartToProcess
+
+if TYPE_CHECKING:
+    from .api import Bucket, AsyncBucket
+
+
+logger = logging.getLogger(__name__)
+
+
+def _target_view(buffer, size: int) -> memoryview:
+    view = memoryview(buffer)
+    if view.readonly:
+        raise ClientError("buffer is read-only")
+    if not view.c_contiguous:
+        raise ClientError("buffer must be C-contiguous")
+    view = view.cast("B")
+    if len(view) < size:
+        raise ClientError(f"buffer is too small: {len(view)} bytes, object size: {size}")
+    return view[:size]
+
+
+def _part_headers(headers, etag: str | None) -> http.Headers:
+    part_headers = _populate_valid_headers(headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT]) or http.Headers()
+    part_headers[IF_MATCH] = etag or ""
+    return part_headers
+
+
+def _part_crc(view: memoryview, part: _PartToProcess) -> int:
+    crc = Crc64()
+    crc.update(view[part.start : part.end])
+    return crc.crc
+
+
+class _Progress:
+    def __init__(self, progress_callback: Callable[[int, int | None], None] | None, total: int):
+        self.__progress_callback = progress_callback
+        self.__total = total
+        self.__consumed = 0
+        self.__lock = threading.Lock()
+
+    def add(self, size: int):
+        if self.__progress_callback:
+            with self.__lock:
+                self.__consumed += size
+                self.__progress_callback(self.__consumed, self.__total)
+
+
+def get_object_into(
+    bucket: "Bucket",
+    key: str,
+    buffer,
+    headers: dict | http.Headers | None = None,
+    params: dict | None = None,
+    part_size: int | None = None,
+    num_threads: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    executor: TransferExecutor | None = None,
+    priority: int = 0,
+) -> int:
+    """并发下载文件到调用者提供的缓冲区，参见 :meth:`Bucket.get_object_into <aliyun_oss_x.Bucket.get_object_into>` 。"""
+    if isinstance(bucket, CryptoBucket):
+        raise ClientError("get object into does not support CryptoBucket")
+
+    head = bucket.head_object(key, headers=headers, params=params)
+    size = head.content_length or 0
+    view = _target_view(buffer, size)
+
+    part_size = defaults.get(part_size, defaults.multiget_part_size)
+    num_threads = defaults.get(num_threads, defaults.multiget_num_threads)
+    parts = _split_to_parts(size, part_size)
+    part_headers = _part_headers(headers, head.etag)
+    progress = _Progress(progress_callback, size)
+
+    logger.debug(
+        f"Start to get object into buffer, bucket: {bucket.bucket_name}, key: {key}, size: {size}, "
+        f"part_size: {part_size}, num_threads: {num_threads}"
+    )
+
+    def get_part(part: _PartToProcess):
+        target = view[part.start : part.end]
+        with bucket.get_object(
+            key, byte_range=(part.start, part.end - 1), headers=part_headers, params=params
+        ) as result:
+            n = result.resp.readinto(target)
+            if n != part.size:
+                raise InconsistentError("IncompleteRead from source", result.request_id)
+        if bucket.enable_crc:
+            part.part_crc = _part_crc(view, part)
+        progress.add(part.size)
+
+    transfer = (executor or get_default_executor()).transfer(num_threads, priority=priority)
+    for part in parts:
+        transfer.submit(get_part, part)
+    transfer.wait()
+
+    if bucket.enable_crc and parts:
+        check_crc("get object into", calc_obj_crc_from_parts(parts), head.server_crc, head.request_id)
+    return size
+
+
+async def get_object_into_async(
+    bucket: "AsyncBucket",
+    key: str,
+    buffer,
+    headers: dict | http.Headers | None = None,
+    params: dict | None = None,
+    part_size: int | None = None,
+    num_threads: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+) -> int:
+    """异步版本的 :func:`get_object_into` ，分片作为并发的任务下载，同时进行的分片数不超过 `num_threads` 。"""
+    if isinstance(bucket, AsyncCryptoBucket):
+        raise ClientError("get object into does not support AsyncCryptoBucket")
+
+    head = await bucket.head_object(key, headers=headers, params=params)
+    size = head.content_length or 0
+    view = _target_view(buffer, size)
+
+    part_size = defaults.get(part_size, defaults.multiget_part_size)
+    num_threads = defaults.get(num_threads, defaults.multiget_num_threads)
+    parts = _split_to_parts(size, part_size)
+    part_headers = _part_headers(headers, head.etag)
+    progress = _Progress(progress_callback, size)
+    slots = asyncio.Semaphore(num_threads)
+
+    logger.debug(
+        f"Start to get object into buffer, bucket: {bucket.bucket_name}, key: {key}, size: {size}, "
+        f"part_size: {part_size}, num_threads: {num_threads}"
+    )
+
+    async def get_part(part: _PartToProcess):
+        async with slots:
+            target = view[part.start : part.end]
+            async with await bucket.get_object(
+                key, byte_range=(part.start, part.end - 1), headers=part_headers, params=params
+            ) as result:
+                n = await result.resp.readinto(target)
+                if n != part.size:
+                    raise InconsistentError("IncompleteRead from source", result.request_id)
+        if bucket.enable_crc:
+            part.part_crc = _part_crc(view, part)
+        progress.add(part.size)
+
+    tasks = [asyncio.ensure_future(get_part(part)) for part in parts]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    if bucket.enable_crc and parts:
+        check_crc("get object into", calc_obj_crc_from_parts(parts), head.server_crc, head.request_id)
+    return size
+
+
+class _Part:
+    """顺序流中的一个分片，由线程池中的任务读取。"""
+
+    __slots__ = ("part", "done", "data", "crc", "error")
+
+    def __init__(self, part: _PartToProcess):
+        self.part = part
+        self.done = threading.Event()
+        self.data = b""
+        self.crc = None
+        self.error: BaseException | None = None
+
+
+class _ObjectStreamBase:
+    def __init__(self, bucket, key: str, head, headers, params, part_size: int | None, num_threads: int | None):
+        self.bucket = bucket
+        self.key = key
+
+        #: 文件长度
+        self.size: int = head.content_length or 0
+
+        #: 文件的ETag，每个Range GET都用它作为 `If-Match`
+        self.etag: str = head.etag
+
+        self._server_crc = head.server_crc
+        self._request_id = head.request_id
+        self._part_headers = _part_headers(headers, head.etag)
+        self._params = params
+        self._num_threads = max(defaults.get(num_threads, defaults.multiget_num_threads), 1)
+        self._parts = collections.deque(
+            _split_to_parts(self.size, defaults.get(part_size, defaults.multiget_part_size))
+        )
+        self._window: collections.deque = collections.deque()
+
+        self._crc_func = Crc64() if bucket.enable_crc else None
+        self._crc = 0
+        self._offset = 0
+        self._current = memoryview(b"")
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def tell(self) -> int:
+        """已经读取的字节数。"""
+        return self._offset - len(self._current)
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("I/O operation on closed file")
+
+    def _next_parts(self) -> list[_Part]:
+        """补满预读窗口，返回需要开始读取的分片。"""
+        started = []
+        while self._parts and len(self._window) < self._num_threads:
+            part = _Part(self._parts.popleft())
+            self._window.append(part)
+            started.append(part)
+        return started
+
+    def _consume(self, part: _Part) -> memoryview:
+        if part.error is not None:
+            raise part.error
+        if self._crc_func is not None:
+            self._crc = self._crc_func.combine(self._crc, part.crc, part.part.size)
+        self._offset += part.part.size
+        if not self._parts and not self._window and self._crc_func is not None:
+            check_crc("get object stream", self._crc, self._server_crc, self._request_id)
+        return memoryview(part.data)
+
+    def _take(self, amt: int) -> bytes:
+        data = self._current[:amt]
+        self._current = self._current[amt:]
+        return bytes(data)
+
+    def _read_part(self, readinto, data: bytearray) -> int | None:
+        """按 `stream_chunk_size` 分段把响应体读入 `data` ，返回读取的字节数；流被关闭时返回None，不再读取剩余的数据。"""
+        view = memoryview(data)
+        chunk_size = defaults.stream_chunk_size
+        n = 0
+        while n < len(view) and not self._closed:
+            count = readinto(view[n : n + chunk_size])
+            if not count:
+                break
+            n += count
+        return None if self._closed else n
+
+    def _fetched(self, part: _Part, data: bytearray):
+        part.data = data
+        if self._crc_func is not None:
+            part.crc = _part_crc(memoryview(data), _PartToProcess(0, 0, len(data)))
+
+
+class ObjectStream(_ObjectStreamBase):
+    """顺序读取文件的流，由 :meth:`Bucket.get_object_stream <aliyun_oss_x.Bucket.get_object_stream>` 创建。
+
+    在后台对之后的 `num_threads` 个分片并发发送Range GET，按文件中的顺序返回数据。先下载完的分片在重排缓冲区中
+    等待，只有最前面的分片被读完之后才开始下载新的分片，因此占用的内存约为 `num_threads × part_size` 。
+    开启CRC校验时，读到文件末尾时把各分片的CRC64合并，和OSS返回的文件CRC64比较。
+
+    可以像 :class:`GetObjectResult <aliyun_oss_x.models.GetObjectResult>` 一样调用 `read()` 或者迭代，
+    迭代时每次返回一个分片的数据。
+    """
+
+    def __init__(
+        self,
+        bucket: "Bucket",
+        key: str,
+        headers: dict | http.Headers | None = None,
+        params: dict | None = None,
+        part_size: int | None = None,
+        num_threads: int | None = None,
+        executor: TransferExecutor | None = None,
+        priority: int = 0,
+    ):
+        if isinstance(bucket, CryptoBucket):
+            raise ClientError("get object stream does not support CryptoBucket")
+
+        head = bucket.head_object(key, headers=headers, params=params)
+        super().__init__(bucket, key, head, headers, params, part_size, num_threads)
+        self.__transfer = (executor or get_default_executor()).transfer(self._num_threads, priority=priority)
+        self.__start()
+
+    def read(self, amt: int | None = None) -> bytes:
+        """读取最多 `amt` 字节，一次不超过当前分片剩余的数据；不指定时读到文件末尾。返回空bytes表示已经读完。"""
+        self._check_open()
+        if amt is None or amt < 0:
+            chunks = [self._take(len(self._current))]
+            chunks.extend(bytes(view) for view in iter(self.__next_view, None))
+            return b"".join(chunks)
+
+        if not self._current:
+            self._current = self.__next_view() or memoryview(b"")
+        return self._take(amt)
+
+    def readinto(self, b) -> int:
+        """把数据读入可写的缓冲区 `b` ，返回读取的字节数，0表示已经读完。"""
+        self._check_open()
+        view = memoryview(b).cast("B")
+        if not self._current:
+            self._current = self.__next_view() or memoryview(b"")
+        count = min(len(view), len(self._current))
+        view[:count] = self._current[:count]
+        self._current = self._current[count:]
+        return count
+
+    def __iter__(self):
+        self._check_open()
+        if self._current:
+            yield self._take(len(self._current))
+        for view in iter(self.__next_view, None):
+            yield bytes(view)
+
+    def close(self):
+        """停止预读，丢弃尚未读取的数据。尚未开始的分片不再下载，等待正在下载的分片中止之后返回。"""
+        self._closed = True
+        self._parts.clear()
+        self._window.clear()
+        self._current = memoryview(b"")
+        self.__transfer.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __next_view(self) -> memoryview | None:
+        if not self._window:
+            return None
+        part = self._window.popleft()
+        self.__start()
+        part.done.wait()
+        return self._consume(part)
+
+    def __start(self):
+        for part in self._next_parts():
+            self.__transfer.submit(self.__fetch, part)
+
+    def __fetch(self, part: _Part):
+        try:
+            if self._closed:
+                return
+            data = bytearray(part.part.size)
+            with self.bucket.get_object(
+                self.key,
+                byte_range=(part.part.start, part.part.end - 1),
+                headers=self._part_headers,
+                params=self._params,
+            ) as result:
+                n = self._read_part(result.resp.readinto, data)
+                if n is None:
+                    return
+                if n != part.part.size:
+                    raise InconsistentError("IncompleteRead from source", result.request_id)
+            self._fetched(part, data)
+        except BaseException as e:
+            part.error = e
+        finally:
+            part.done.set()
+
+
+class AsyncObjectStream(_ObjectStreamBase):
+    """异步版本的 :class:`ObjectStream` ，由 :meth:`AsyncBucket.get_object_stream <aliyun_oss_x.AsyncBucket.get_object_stream>`
+    创建，分片作为后台任务并发下载。 `read` 、 `readinto` 和 `close` 都是协程函数，用 `async for` 迭代。
+    """
+
+    @classmethod
+    async def open(
+        cls,
+        bucket: "AsyncBucket",
+        key: str,
+        headers: dict | http.Headers | None = None,
+        params: dict | None = None,
+        part_size: int | None = None,
+        num_threads: int | None = None,
+    ) -> "AsyncObjectStream":
+        if isinstance(bucket, AsyncCryptoBucket):
+            raise ClientError("get object stream does not support AsyncCryptoBucket")
+
+        head = await bucket.head_object(key, headers=headers, params=params)
+        stream = cls(bucket, key, head, headers, params, part_size, num_threads)
+        stream.__tasks = {}
+        stream.__start()
+        return stream
+
+    async def read(self, amt: int | None = None) -> bytes:
+        """参见 :meth:`ObjectStream.read` 。"""
+        self._check_open()
+        if amt is None or amt < 0:
+            chunks = [self._take(len(self._current))]
+            while (view := await self.__next_view()) is not None:
+                chunks.append(bytes(view))
+            return b"".join(chunks)
+
+        if not self._current:
+            self._current = await self.__next_view() or memoryview(b"")
+        return self._take(amt)
+
+    async def readinto(self, b) -> int:
+        """参见 :meth:`ObjectStream.readinto` 。"""
+        self._check_open()
+        view = memoryview(b).cast("B")
+        if not self._current:
+            self._current = await self.__next_view() or memoryview(b"")
+        count = min(len(view), len(self._current))
+        view[:count] = self._current[:count]
+        self._current = self._current[count:]
+        return count
+
+    async def __aiter__(self):
+        self._check_open()
+        if self._current:
+            yield self._take(len(self._current))
+        while (view := await self.__next_view()) is not None:
+            yield bytes(view)
+
+    async def close(self):
+        """参见 :meth:`ObjectStream.close` 。"""
+        self._closed = True
+        self._parts.clear()
+        self._window.clear()
+        self._current = memoryview(b"")
+        tasks = list(self.__tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def __next_view(self) -> memoryview | None:
+        if not self._window:
+            return None
+        part = self._window.popleft()
+        self.__start()
+        task = self.__tasks.pop(id(part))
+        await asyncio.shield(task)
+        return self._consume(part)
+
+    def __start(self):
+        for part in self._next_parts():
+            self.__tasks[id(part)] = asyncio.ensure_future(self.__fetch(part))
+
+    async def __fetch(self, part: _Part):
+        try:
+            if self._closed:
+                return
+            data = bytearray(part.part.size)
+            async with await self.bucket.get_object(
+                self.key,
+                byte_range=(part.part.start, part.part.end - 1),
+                headers=self._part_headers,
+                params=self._params,
+            ) as result:
+                if await result.resp.readinto(data) != part.part.size:
+                    raise InconsistentError("IncompleteRead from source", result.request_id)
+            self._fetched(part, data)
+        except Exception as e:
+            part.error = e
@@ -2,6 +2,9 @@ from ._base import determine_part_size
 from .sync_resumable import (
     resumable_upload,
     resumable_download,
+    resumable_copy,
+    start_resumable_upload,
+    start_resumable_download,
     ResumableStore,
     ResumableDownloadStore,
     make_upload_store,
@@ -11,15 +14,27 @@ from .sync_resumable import (
 from .async_resumable import (
     resumable_upload_async,
     resumable_download_async,
+    resumable_copy_async,
+    start_resumable_upload_async,
+    start_resumable_download_async,
     AsyncResumableStore,
     AsyncResumableDownloadStore,
     make_upload_store_async,
     make_download_store_async,
 )
+from .sync_stream import upload_stream
+from .async_stream import upload_stream_async
+from .handle import TransferHandle, AsyncTransferHandle, TransferStats
+from ._directory import DirectoryTransferResult
+from .sync_directory import upload_directory, download_directory, sync_directory
+from .async_directory import upload_directory_async, download_directory_async, sync_directory_async
 
 __all__ = [
     "resumable_upload",
     "resumable_download",
+    "resumable_copy",
+    "start_resumable_upload",
+    "start_resumable_download",
     "ResumableStore",
     "ResumableDownloadStore",
     "determine_part_size",
@@ -27,8 +42,23 @@ __all__ = [
     "make_download_store",
     "resumable_upload_async",
     "resumable_download_async",
+    "resumable_copy_async",
+    "start_resumable_upload_async",
+    "start_resumable_download_async",
     "AsyncResumableStore",
     "AsyncResumableDownloadStore",
     "make_upload_store_async",
     "make_download_store_async",
+    "TransferHandle",
+    "AsyncTransferHandle",
+    "TransferStats",
+    "upload_stream",
+    "upload_stream_async",
+    "DirectoryTransferResult",
+    "upload_directory",
+    "download_directory",
+    "upload_directory_async",
+    "download_directory_async",
+    "sync_directory",
+    "sync_directory_async",
 ]
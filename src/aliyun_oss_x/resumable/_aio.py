@@ -0,0 +1,98 @@
+"""异步断点续传的文件I/O。
+
+读写本地文件和保存断点信息都是阻塞调用，直接在协程里执行会在磁盘较慢时卡住整个事件循环。
+这里把它们放到一个有界的线程池（ `defaults.async_file_io_threads` 个线程）中执行。
+"""
+
+import asyncio
+import functools
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import defaults
+from ._writer import _FileWriter
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(defaults.async_file_io_threads, thread_name_prefix="oss-file-io")
+        return _executor
+
+
+async def run_io(func, *args, **kwargs):
+    """在文件I/O线程池中执行 `func` 。"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+class _AsyncFile:
+    """只读文件的异步包装， `read` 、 `seek` 和 `tell` 在文件I/O线程池中执行，可以传给异步的适配器。"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+
+    @classmethod
+    async def open(cls, path: str | Path) -> "_AsyncFile":
+        return cls(await run_io(open, path, "rb"))
+
+    async def read(self, amt: int | None = -1) -> bytes:
+        return await run_io(self.fileobj.read, amt)
+
+    async def seek(self, offset: int, whence: int = 0) -> int:
+        return await run_io(self.fileobj.seek, offset, whence)
+
+    async def tell(self) -> int:
+        return self.fileobj.tell()
+
+    async def close(self):
+        await run_io(self.fileobj.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+class _AsyncFileWriter:
+    """:class:`_FileWriter` 的异步包装。"""
+
+    def __init__(self, writer: _FileWriter):
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, path: str | Path, size: int, use_mmap: bool = False) -> "_AsyncFileWriter":
+        return cls(await run_io(_FileWriter, path, size, use_mmap=use_mmap))
+
+    async def write(self, offset: int, data) -> int:
+        return await run_io(self.writer.write, offset, data)
+
+    def sink(self, offset: int) -> "_AsyncSink":
+        return _AsyncSink(self, offset)
+
+    async def close(self):
+        await run_io(self.writer.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+class _AsyncSink:
+    def __init__(self, writer: _AsyncFileWriter, offset: int):
+        self.__writer = writer
+        self.offset = offset
+
+    async def write(self, data) -> int:
+        size = await self.__writer.write(self.offset, data)
+        self.offset += size
+        return size
@@ -1,10 +1,14 @@
+import os
+import copy
 import json
+import time
 import logging
+import threading
 from pathlib import Path
 
 from .. import defaults
 from ..http import Headers
-from ..utils import makedir_p, how_many
+from ..utils import makedir_p, how_many, md5_string, Crc64, calc_range_checksums
 
 
 logger = logging.getLogger(__name__)
@@ -13,11 +17,64 @@ _MAX_MULTIGET_PART_COUNT = 100000
 _UPLOAD_TEMP_DIR = ".py-oss-upload"
 _DOWNLOAD_TEMP_DIR = ".py-oss-download"
 
+# 任务队列空了之后，空闲线程（协程）检查是否有可以拆分的慢分片的时间间隔，以秒为单位
+_SPLIT_POLL_INTERVAL = 0.1
+
+# 分片拷贝时从源文件继承的HTTP头部，另外还有所有 `x-oss-meta-` 开头的自定义元数据
+_COPY_METADATA_HEADERS = frozenset(
+    ["content-type", "cache-control", "content-disposition", "content-encoding", "content-language", "expires"]
+)
+
+
+def _check_pool_capacity(bucket, num_threads: int):
+    """并发数超过连接池允许的并发请求数时，多出的线程只能排队等待连接，给出警告。"""
+    pool_config = getattr(bucket.session, "pool_config", None)
+    if pool_config is None:
+        return
+
+    max_concurrency = pool_config.max_concurrency
+    if max_concurrency is not None and num_threads > max_concurrency:
+        logger.warning(
+            f"num_threads ({num_threads}) exceeds the connection pool capacity ({max_concurrency}), "
+            f"requests will be throttled by the pool, consider a larger PoolConfig"
+        )
+    elif num_threads > pool_config.max_keepalive_connections:
+        logger.info(
+            f"num_threads ({num_threads}) exceeds max_keepalive_connections "
+            f"({pool_config.max_keepalive_connections}), some connections will not be reused"
+        )
+
 
 class _ResumableStoreBase:
-    def __init__(self, root: Path | str, dir: Path | str):
+    """断点信息的持久存储，每个key对应 `root/dir/` 下的一个快照文件和一个日志文件。
+
+    断点记录（dict）中的 `parts` 列表只会在末尾追加。 :meth:`put` 发现只有 `parts` 变长时，只把新增的元素
+    追加到日志文件 `<key>.journal` ，每行一个JSON；其他变化，或者日志累计 `compact_threshold` 条之后，
+    把完整的记录写入临时文件再原子地重命名为快照文件，并删除日志。 :meth:`get` 读取快照并重放日志，
+    崩溃时写了一半的最后一行会被忽略。
+
+    :param root: 父目录
+    :param dir: 子目录
+    :param compact_threshold: 日志条数达到该值时压缩为快照，缺省为 `defaults.resumable_journal_compact_threshold`
+    :param fsync_every: 每追加多少条日志调用一次fsync，写快照时也会fsync；0表示不调用，缺省为
+        `defaults.resumable_store_fsync_every`
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        dir: Path | str,
+        compact_threshold: int | None = None,
+        fsync_every: int | None = None,
+    ):
         logger.debug(f"Init ResumableStoreBase, root path: {root}, temp dir: {dir}")
         self.dir = Path(root) / dir
+        self.compact_threshold = defaults.get(compact_threshold, defaults.resumable_journal_compact_threshold)
+        self.fsync_every = defaults.get(fsync_every, defaults.resumable_store_fsync_every)
+
+        # key -> _JournalState，记录已经持久化的内容
+        self.__states = {}
+        self.__lock = threading.Lock()
 
         if self.dir.is_dir():
             return
@@ -30,35 +87,162 @@ class _ResumableStoreBase:
 
         logger.debug(f"ResumableStoreBase: get key: {key} from file path: {pathname}")
 
-        if not file.exists():
-            logger.debug(f"file {pathname} is not exist")
-            return None
+        with self.__lock:
+            self.__states.pop(key, None)
+
+            if not file.exists():
+                logger.debug(f"file {pathname} is not exist")
+                _unlink(self.__journal_path(key))
+                return None
+
+            try:
+                content = json.loads(file.read_text(encoding="utf-8"))
+            except ValueError:
+                file.unlink()
+                _unlink(self.__journal_path(key))
+                return None
+
+            if isinstance(content, dict) and isinstance(content.get("parts"), list):
+                journaled = self.__replay(key, content["parts"])
+                self.__states[key] = _JournalState(content, journaled)
 
-        try:
-            content = json.loads(file.read_text(encoding="utf-8"))
-        except ValueError:
-            file.unlink()
-            return None
-        else:
             return content
 
     def put(self, key, value):
         pathname = self.__path(key)
 
-        Path(pathname).write_text(json.dumps(value), encoding="utf-8")
+        with self.__lock:
+            state = self.__states.get(key)
+            if state is not None and state.appended_only(value) and state.journaled < self.compact_threshold:
+                self.__append(key, state, value["parts"])
+            else:
+                self.__write_snapshot(key, value)
 
-        logger.debug(f"ResumableStoreBase: put key: {key} to file path: {pathname}, value: {value}")
+        logger.debug(f"ResumableStoreBase: put key: {key} to file path: {pathname}")
 
     def delete(self, key):
         pathname = self.__path(key)
         file = Path(pathname)
-        file.unlink()
+
+        with self.__lock:
+            self.__states.pop(key, None)
+            _unlink(self.__journal_path(key))
+            file.unlink()
 
         logger.debug(f"ResumableStoreBase: delete key: {key}, file path: {pathname}")
 
+    def __replay(self, key, parts):
+        """把日志中的part追加到 `parts` ，截掉日志末尾不完整或者无效的内容，返回日志条数。"""
+        journal = self.__journal_path(key)
+        try:
+            data = journal.read_bytes()
+        except FileNotFoundError:
+            return 0
+
+        count = 0
+        valid = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                index, part = json.loads(line)
+            except ValueError:
+                break
+
+            # 压缩时快照已经写入、日志还没有删除的情况下，日志中的part已经在快照里了
+            if index == len(parts):
+                parts.append(part)
+            elif index > len(parts):
+                break
+            count += 1
+            valid += len(line)
+
+        if valid < len(data):
+            logger.warning(f"Discard {len(data) - valid} bytes of torn journal: {journal}")
+            with journal.open("rb+") as f:
+                f.truncate(valid)
+
+        return count
+
+    def __append(self, key, state, parts):
+        new_parts = parts[state.parts_count :]
+        if not new_parts:
+            state.update(parts)
+            return
+
+        lines = "".join(json.dumps([state.parts_count + i, part]) + "\n" for i, part in enumerate(new_parts)).encode(
+            "utf-8"
+        )
+        fd = os.open(
+            self.__journal_path(key), os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644
+        )
+        try:
+            os.write(fd, lines)
+            if (
+                self.fsync_every
+                and (state.journaled + len(new_parts)) // self.fsync_every > state.journaled // self.fsync_every
+            ):
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        state.journaled += len(new_parts)
+        state.update(parts)
+
+    def __write_snapshot(self, key, value):
+        pathname = self.__path(key)
+        tmp = pathname.with_name(pathname.name + ".tmp")
+
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(value, f)
+            if self.fsync_every:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, pathname)
+        _unlink(self.__journal_path(key))
+
+        if isinstance(value, dict) and isinstance(value.get("parts"), list):
+            self.__states[key] = _JournalState(value, 0)
+        else:
+            self.__states.pop(key, None)
+
     def __path(self, key: str) -> Path:
         return self.dir / key
 
+    def __journal_path(self, key: str) -> Path:
+        return self.dir / (key + ".journal")
+
+
+class _JournalState:
+    """一个断点记录已经持久化的内容：除 `parts` 以外的字段、 `parts` 的长度和最后一个元素，以及日志条数。"""
+
+    def __init__(self, value, journaled):
+        self.fields = {k: v for k, v in value.items() if k != "parts"}
+        self.journaled = journaled
+        self.update(value["parts"])
+
+    def update(self, parts):
+        self.parts_count = len(parts)
+        self.last_part = parts[-1] if parts else None
+
+    def appended_only(self, value):
+        if not isinstance(value, dict) or not isinstance(value.get("parts"), list):
+            return False
+
+        parts = value["parts"]
+        if len(parts) < self.parts_count:
+            return False
+        if self.parts_count and parts[self.parts_count - 1] != self.last_part:
+            return False
+        return all(value.get(k) == v for k, v in self.fields.items()) and len(value) == len(self.fields) + 1
+
+
+def _unlink(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
 
 def _normalize_path(path: str | Path) -> str:
     return str(Path(path).resolve())
@@ -86,6 +270,142 @@ class _PartToProcess:
         return self.part_number, self.start, self.end
 
 
+class _RunningPart:
+    def __init__(self, part):
+        self.part = part
+        self.position = part.start
+        self.size = part.size
+        self.started = time.monotonic()
+
+
+class _StragglerSplitter:
+    """断点下载中慢分片的拆分。
+
+    记录每个正在下载的分片已经写到的位置。任务队列空了之后，空闲的线程（协程）调用 :meth:`split` ：
+    如果某个分片的下载时间超过按已完成分片的平均速度估算的 `factor` 倍，就把它尚未下载的后半部分
+    拆成一个新的分片，原分片的 `end` 相应缩小，原来的请求下载到新的 `end` 时提前结束。
+
+    :param next_part_number: 新分片使用的分片号，从该值开始递增
+    :param min_split_size: 拆分后两部分的最小长度
+    :param factor: 下载时间超过估算时间的多少倍时认为是慢分片
+    """
+
+    def __init__(self, next_part_number, min_split_size=None, factor=None):
+        self.min_split_size = defaults.get(min_split_size, defaults.multiget_min_split_size)
+        self.factor = defaults.get(factor, defaults.multiget_straggler_factor)
+
+        self.__lock = threading.Lock()
+        self.__next_part_number = next_part_number
+        self.__running = {}
+        self.__per_byte = None
+
+    def running(self):
+        return bool(self.__running)
+
+    def start(self, part):
+        running = _RunningPart(part)
+        with self.__lock:
+            self.__running[id(running)] = running
+        return running
+
+    def advance(self, running, size):
+        """读到了 `size` 字节，返回其中属于本分片（没有被拆走）的字节数，以及本分片是否已经完成。"""
+        with self.__lock:
+            size = max(0, min(size, running.part.end - running.position))
+            running.position += size
+            return size, running.position >= running.part.end
+
+    def finish(self, running, ok=True):
+        with self.__lock:
+            self.__running.pop(id(running), None)
+            written = running.position - running.part.start
+            if not ok or written <= 0:
+                return
+
+            per_byte = (time.monotonic() - running.started) / written
+            if self.__per_byte is None:
+                self.__per_byte = per_byte
+            else:
+                self.__per_byte = 0.8 * self.__per_byte + 0.2 * per_byte
+
+    def split(self):
+        """拆分剩余部分最大的慢分片，返回拆出来的新分片；没有可拆分的分片时返回None。"""
+        with self.__lock:
+            if self.__per_byte is None:
+                return None
+
+            now = time.monotonic()
+            straggler = None
+            for running in self.__running.values():
+                remaining = running.part.end - running.position
+                if remaining < 2 * self.min_split_size:
+                    continue
+                if now - running.started <= self.factor * self.__per_byte * running.size:
+                    continue
+                if straggler is None or remaining > straggler.part.end - straggler.position:
+                    straggler = running
+
+            if straggler is None:
+                return None
+
+            part = straggler.part
+            middle = straggler.position + (part.end - straggler.position) // 2
+            tail = _PartToProcess(self.__next_part_number, middle, part.end)
+            self.__next_part_number += 1
+            part.end = middle
+
+        logger.info(
+            f"Split straggler part {part.part_number}, range: [{part.start}, {middle}), new part {tail.part_number}, "
+            f"range: [{tail.start}, {tail.end})"
+        )
+        return tail
+
+
+def _truncated_crc(prefix_crc, data):
+    """已读部分的CRC为 `prefix_crc` ，计算再追加 `data` 之后的CRC。"""
+    if prefix_crc is None:
+        return None
+
+    crc = Crc64()
+    crc.update(data)
+    return crc.combine(prefix_crc, crc.crc, len(data))
+
+
+def _parts_to_download(total_size, part_size, finished_parts):
+    """根据已完成分片覆盖的范围计算还需要下载的分片。
+
+    拆分过的分片在断点记录里的范围和 `_split_to_parts` 的结果不一致，所以按范围而不是分片号求差集。
+    完全没有下载的分片保持原来的分片号，部分下载的分片的剩余范围使用新的分片号。
+    """
+    all_parts = _split_to_parts(total_size, part_size)
+    finished = sorted((p.start, p.end) for p in finished_parts)
+    next_part_number = max([len(all_parts)] + [p.part_number for p in finished_parts]) + 1
+
+    parts = []
+    for part in all_parts:
+        ranges = []
+        start = part.start
+        for finished_start, finished_end in finished:
+            if finished_end <= start:
+                continue
+            if finished_start >= part.end:
+                break
+            if finished_start > start:
+                ranges.append((start, finished_start))
+            start = max(start, finished_end)
+        if start < part.end:
+            ranges.append((start, part.end))
+
+        for start, end in ranges:
+            if (start, end) == (part.start, part.end):
+                parts.append(part)
+            else:
+                parts.append(_PartToProcess(next_part_number, start, end))
+                next_part_number += 1
+
+    return parts
+
+
 def determine_part_size(total_size, preferred_size=None):
     """确定分片上传是分片的大小。
 
@@ -127,6 +447,35 @@ def _split_to_parts(total_size, part_size):
     return parts
 
 
+def _verify_uploaded_parts(filename, total_size, part_size, parts):
+    """重新计算已上传分片对应的本地数据的MD5，只保留ETag和MD5相同的分片，并补上分片的CRC64。
+
+    分片号、长度和按 `part_size` 切分的结果不一致，或者ETag不同的分片会被丢弃，需要重新上传。
+
+    :param parts: `ListParts` 得到的 :class:`PartInfo <aliyun_oss_x.models.PartInfo>` 列表
+    :return: 校验通过的分片
+    """
+    expected = {p.part_number: p for p in _split_to_parts(total_size, part_size)}
+    candidates = []
+    for part in parts:
+        want = expected.get(part.part_number)
+        if want is not None and part.size == want.size:
+            candidates.append((part, want))
+        else:
+            logger.warning(f"Uploaded part {part.part_number} does not match the local file layout, re-upload it")
+
+    checksums = calc_range_checksums(filename, [(want.start, want.size) for _, want in candidates], md5=True)
+
+    verified = []
+    for (part, _), checksum in zip(candidates, checksums):
+        if part.etag.upper() != checksum.etag:
+            logger.warning(f"ETag of uploaded part {part.part_number} does not match the local data, re-upload it")
+            continue
+        part.part_crc = checksum.crc64
+        verified.append(part)
+    return verified
+
+
 def _populate_valid_headers(headers=None, valid_keys=None):
     """构建只包含有效keys的http header
 
@@ -221,3 +570,31 @@ class _ObjectInfo:
         objectInfo.mtime = head_object_result.last_modified
 
         return objectInfo
+
+
+def _source_bucket(bucket, src_bucket):
+    """返回拷贝源所在的Bucket对象。 `src_bucket` 是Bucket名时，复制 `bucket` 的配置（认证、Endpoint、Session等）。"""
+    if not isinstance(src_bucket, str):
+        return src_bucket
+
+    source = copy.copy(bucket)
+    source.bucket_name = src_bucket.strip()
+    return source
+
+
+def _copy_metadata(src_headers, headers=None):
+    """分片拷贝不会复制源文件的元数据，这里从源文件的HEAD结果中取出元数据，再用 `headers` 覆盖。"""
+    result = Headers()
+    for key, value in src_headers.items():
+        if key.lower().startswith("x-oss-meta-") or key.lower() in _COPY_METADATA_HEADERS:
+            result[key] = value
+    result.update(Headers(headers))
+    return result
+
+
+def _make_copy_store_key(bucket_name, key, src_bucket_name, src_key, version_id=None):
+    oss_pathname = f"oss://{bucket_name}/{key}"
+    src_pathname = f"oss://{src_bucket_name}/{src_key}"
+    if version_id is not None:
+        src_pathname += f"?versionid={version_id}"
+    return md5_string(oss_pathname) + "--" + md5_string(src_pathname)
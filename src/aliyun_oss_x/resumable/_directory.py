@@ -0,0 +1,137 @@
+"""目录上传、下载共用的过滤、路径映射和统计。"""
+
+import os
+import fnmatch
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterable, Iterator
+
+from ..exceptions import ClientError
+
+
+class DirectoryTransferResult:
+    """目录上传、下载的结果。单个文件失败不会中断其他文件的传输，失败的文件和异常记录在 `failed` 中。
+
+    列表中的路径都是相对于本地目录的路径，以 `/` 分隔，和去掉前缀的OSS文件名相同。
+    """
+
+    def __init__(self):
+        #: 传输成功的文件
+        self.succeeded: list[str] = []
+
+        #: 不需要传输而跳过的文件
+        self.skipped: list[str] = []
+
+        #: 传输失败的文件及其异常
+        self.failed: dict[str, BaseException] = {}
+
+        #: 同步目录时删除的OSS文件
+        self.deleted: list[str] = []
+
+        #: 传输成功的文件的总字节数
+        self.transferred_bytes = 0
+
+    @property
+    def ok(self) -> bool:
+        """没有失败的文件。"""
+        return not self.failed
+
+    def __repr__(self):
+        return (
+            f"<DirectoryTransferResult succeeded: {len(self.succeeded)}, skipped: {len(self.skipped)}, "
+            f"failed: {len(self.failed)}, deleted: {len(self.deleted)}, transferred_bytes: {self.transferred_bytes}>"
+        )
+
+
+def _matches(path: str, include: Iterable[str] | None, exclude: Iterable[str] | None) -> bool:
+    """`path` 匹配 `include` 中的某个glob模式，并且不匹配 `exclude` 中的任何模式。 `include` 为None时匹配所有路径。"""
+    if include is not None and not any(fnmatch.fnmatchcase(path, pattern) for pattern in include):
+        return False
+    return exclude is None or not any(fnmatch.fnmatchcase(path, pattern) for pattern in exclude)
+
+
+def _walk_local(directory: str | Path) -> Iterator[tuple[str, Path, os.stat_result]]:
+    """遍历目录下的所有文件（跟随符号链接到文件，不进入指向目录的符号链接），返回 `(相对路径, 路径, stat)` 。
+
+    相对路径按字典序返回，和ListObjects返回的OSS文件名顺序一致：子目录按 `名字 + '/'` 参与排序。
+    目录不存在或者无法读取时抛出异常，遍历过程中消失的文件被忽略。
+    """
+    root = Path(directory)
+
+    def walk(path: Path, relative: str):
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    if is_dir and entry.is_symlink():
+                        continue
+                except OSError:
+                    continue
+                entries.append((entry.name + "/" if is_dir else entry.name, entry))
+        entries.sort(key=lambda e: e[0])
+
+        for name, entry in entries:
+            if name.endswith("/"):
+                yield from walk(Path(entry.path), relative + name)
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            yield relative + name, Path(entry.path), stat
+
+    return walk(root, "")
+
+
+def _local_path(directory: str | Path, relative: str) -> Path:
+    """OSS文件名去掉前缀后对应的本地路径，拒绝会写到目录之外的文件名。"""
+    parts = PurePosixPath(relative).parts
+    if not parts or relative.startswith("/") or any(part in ("..", ".") for part in parts):
+        raise ClientError(f"object key can not be mapped into the directory: {relative!r}")
+    return Path(directory).joinpath(*parts)
+
+
+class _DirectoryProgress:
+    """把各个文件的进度合并为目录的进度。文件还没有列举完时，总长度为None。
+
+    :param progress_callback: 用户指定的进度回调函数。参见 :ref:`progress_callback`
+    """
+
+    def __init__(self, progress_callback: Callable[[int, int | None], None] | None):
+        self.__progress_callback = progress_callback
+        self.__consumed = 0
+        self.__total = 0
+        self.__listed = False
+        self.__lock = threading.Lock()
+
+    def add_file(self, size: int):
+        with self.__lock:
+            self.__total += size
+
+    def listed(self):
+        with self.__lock:
+            if not self.__listed:
+                self.__listed = True
+                self.__report()
+
+    def file_callback(self) -> Callable[[int, int | None], None] | None:
+        """返回单个文件的进度回调函数，它把文件的进度换算为增量加到目录的进度上。"""
+        if self.__progress_callback is None:
+            return None
+
+        reported = 0
+
+        def callback(consumed_bytes, total_bytes):
+            nonlocal reported
+            with self.__lock:
+                if consumed_bytes > reported:
+                    self.__consumed += consumed_bytes - reported
+                    reported = consumed_bytes
+                    self.__report()
+
+        return callback
+
+    def __report(self):
+        if self.__progress_callback is not None:
+            self.__progress_callback(self.__consumed, self.__total if self.__listed else None)
@@ -0,0 +1,178 @@
+"""流式分片上传共用的缓冲区和读取工具。"""
+
+import io
+import threading
+from typing import Iterable
+
+from .. import defaults
+from ..compat import to_bytes
+from ..exceptions import ClientError
+from ..types import is_readable_buffer_sync, is_readable_buffer_async
+from ._aio import run_io
+
+
+def _stream_part_size(part_number: int, part_size: int) -> int:
+    """总长度未知时第 `part_number` 个分片的大小。
+
+    每上传 `defaults.max_part_count` 的十分之一个分片，分片大小翻一倍。缺省配置下前1000个分片为10MB，
+    10000个分片可以上传约10TB，而小的流不会占用过大的缓冲区。
+    """
+    step = max(defaults.max_part_count // 10, 1)
+    return max(part_size, defaults.min_part_size) << ((part_number - 1) // step)
+
+
+class _BufferReader:
+    """内存缓冲区的只读文件对象包装，读取时只拷贝读到的部分；支持 `seek` 和 `tell` ，请求重试时可以回绕。
+
+    :param view: 缓冲区，类型为memoryview
+    """
+
+    def __init__(self, view: memoryview):
+        self.__view = view
+        self.__offset = 0
+
+    def read(self, amt: int | None = None) -> bytes:
+        end = len(self.__view) if amt is None or amt < 0 else min(self.__offset + amt, len(self.__view))
+        data = bytes(self.__view[self.__offset : end])
+        self.__offset = max(self.__offset, end)
+        return data
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__offset
+        elif whence == io.SEEK_END:
+            offset += len(self.__view)
+        self.__offset = max(offset, 0)
+        return self.__offset
+
+    def tell(self) -> int:
+        return self.__offset
+
+    def seekable(self) -> bool:
+        return True
+
+
+class _AsyncBufferReader:
+    """异步版本的 :class:`_BufferReader` ，可以作为异步请求的数据。"""
+
+    def __init__(self, view: memoryview):
+        self.__reader = _BufferReader(view)
+
+    async def read(self, amt: int | None = None) -> bytes:
+        return self.__reader.read(amt)
+
+    async def seek(self, offset: int, whence: int = 0) -> int:
+        return self.__reader.seek(offset, whence)
+
+    async def tell(self) -> int:
+        return self.__reader.tell()
+
+
+class _BufferPool:
+    """可以重复使用的分片缓冲区。调用者需要自己限制同时取出的缓冲区个数，这里只负责复用。
+
+    分片变大之后，较小的缓冲区被丢弃，因此缓冲区总大小不超过同时取出的个数乘以当前的分片大小。
+    """
+
+    def __init__(self):
+        self.__free: list[bytearray] = []
+        self.__lock = threading.Lock()
+
+    def take(self, size: int) -> bytearray:
+        with self.__lock:
+            while self.__free:
+                buf = self.__free.pop()
+                if len(buf) >= size:
+                    return buf
+        return bytearray(size)
+
+    def give(self, buf: bytearray):
+        with self.__lock:
+            self.__free.append(buf)
+
+
+def _make_chunk_reader(data):
+    """返回 `(readinto, read)` ，二者之一为None。不支持 `readinto` 的对象按块读取或者迭代。"""
+    data = to_bytes(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = io.BytesIO(data)
+
+    readinto = getattr(data, "readinto", None)
+    if callable(readinto):
+        return readinto, None
+    if is_readable_buffer_sync(data):
+        return None, data.read
+    if isinstance(data, Iterable):
+        it = iter(data)
+        return None, lambda amt: next(it, b"")
+
+    raise ClientError(f"{data.__class__.__name__} is not a file object, nor an iterator")
+
+
+class _StreamReader:
+    """从file object或者可迭代对象中读取数据，每次填满一个分片缓冲区。
+
+    :param data: 待上传的数据，可以是bytes、str、file object或者可迭代对象
+    """
+
+    def __init__(self, data):
+        self._readinto, self._read = _make_chunk_reader(data)
+        self._pending = memoryview(b"")
+        self._eof = False
+
+    def readinto(self, view: memoryview) -> int:
+        """填满 `view` ，返回读到的字节数。小于 `len(view)` 说明数据已经读完。"""
+        n = self._drain(view)
+        while n < len(view) and not self._eof:
+            if self._readinto is not None:
+                count = self._readinto(view[n:])
+                if not count:
+                    self._eof = True
+                n += count or 0
+            else:
+                self._feed(self._read(len(view) - n))
+                n += self._drain(view[n:])
+        return n
+
+    def _feed(self, chunk):
+        chunk = to_bytes(chunk)
+        if not chunk:
+            self._eof = True
+        self._pending = memoryview(chunk)
+
+    def _drain(self, view: memoryview) -> int:
+        count = min(len(self._pending), len(view))
+        view[:count] = self._pending[:count]
+        self._pending = self._pending[count:]
+        return count
+
+
+class _AsyncStreamReader(_StreamReader):
+    """异步版本的 :class:`_StreamReader` ，还可以从异步file object或者异步可迭代对象中读取。
+    同步的file object在文件I/O线程池中读取，不阻塞事件循环。
+    """
+
+    def __init__(self, data):
+        self.__aread = None
+        if is_readable_buffer_async(data):
+            self.__aread = data.read
+        elif hasattr(data, "__aiter__"):
+            it = data.__aiter__()
+            self.__aread = lambda amt: anext(it, b"")
+
+        if self.__aread is not None:
+            self._readinto, self._read = None, None
+            self._pending = memoryview(b"")
+            self._eof = False
+        else:
+            super().__init__(data)
+
+    async def readinto_async(self, view: memoryview) -> int:
+        if self.__aread is None:
+            return await run_io(self.readinto, view)
+
+        n = self._drain(view)
+        while n < len(view) and not self._eof:
+            self._feed(await self.__aread(len(view) - n))
+            n += self._drain(view[n:])
+        return n
@@ -0,0 +1,175 @@
+"""目录同步（sync_directory）用到的本地清单和比较。
+
+判断一个本地文件是否需要上传：
+    #. OSS上没有对应的文件，或者长度不同：上传；
+    #. 清单中记录的长度、修改时间和本地文件相同，并且记录的ETag和列举得到的ETag相同：文件在上次同步之后
+       两边都没有变化，跳过，不需要读取本地文件；
+    #. 否则计算本地文件的CRC64：和清单中的CRC64相同并且ETag没有变化，或者和HEAD得到的OSS文件的CRC64相同时跳过，
+       并更新清单，其他情况上传。
+
+OSS文件只通过一次ListObjectsV2获得，本地文件和OSS文件都按文件名的字典序返回，两边归并比较，
+内存占用和文件数无关。
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from ..utils import Crc64, md5_string, makedir_p
+from ._directory import _matches, _walk_local
+
+
+_SYNC_MANIFEST_DIR = ".py-oss-sync"
+
+# batch_delete_objects一次最多删除1000个文件
+_DELETE_BATCH_SIZE = 1000
+
+# 清单每修改多少条记录提交一次
+_MANIFEST_COMMIT_EVERY = 1000
+
+_CRC_CHUNK_SIZE = 1024 * 1024
+
+
+class _ManifestRecord:
+    __slots__ = ("size", "mtime_ns", "crc64", "etag")
+
+    def __init__(self, size: int, mtime_ns: int, crc64: int | None, etag: str | None):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.crc64 = crc64
+        self.etag = etag
+
+
+class _SyncManifest:
+    """上次同步后每个文件的长度、修改时间、CRC64和OSS文件的ETag，保存在SQLite数据库中。
+
+    记录每 `_MANIFEST_COMMIT_EVERY` 次修改提交一次，进程崩溃时丢失的记录只会让下次同步重新比较这些文件。
+
+    :param path: 数据库文件路径，所在目录不存在时自动创建
+    """
+
+    def __init__(self, path: str | Path):
+        path = Path(path)
+        makedir_p(path.parent)
+
+        self.__conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.__conn.execute(
+            "CREATE TABLE IF NOT EXISTS files "
+            "(path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, crc64 TEXT, etag TEXT)"
+        )
+        self.__conn.commit()
+        self.__changes = 0
+        self.__lock = threading.Lock()
+
+    def get(self, relative: str) -> _ManifestRecord | None:
+        with self.__lock:
+            row = self.__conn.execute(
+                "SELECT size, mtime_ns, crc64, etag FROM files WHERE path = ?", (relative,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        size, mtime_ns, crc64, etag = row
+        # CRC64是无符号64位整数，超出SQLite INTEGER的范围，以字符串保存
+        return _ManifestRecord(size, mtime_ns, None if crc64 is None else int(crc64), etag)
+
+    def put(self, relative: str, size: int, mtime_ns: int, crc64: int | None, etag: str | None):
+        with self.__lock:
+            self.__conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                (relative, size, mtime_ns, None if crc64 is None else str(crc64), etag),
+            )
+            self.__changed(1)
+
+    def delete(self, relatives: list[str]):
+        with self.__lock:
+            self.__conn.executemany("DELETE FROM files WHERE path = ?", ((r,) for r in relatives))
+            self.__changed(len(relatives))
+
+    def close(self):
+        with self.__lock:
+            self.__conn.commit()
+            self.__conn.close()
+
+    def __changed(self, count: int):
+        self.__changes += count
+        if self.__changes >= _MANIFEST_COMMIT_EVERY:
+            self.__conn.commit()
+            self.__changes = 0
+
+
+class _LocalFile:
+    __slots__ = ("relative", "path", "size", "mtime_ns", "record")
+
+    def __init__(self, relative: str, path: Path, size: int, mtime_ns: int, record: _ManifestRecord | None):
+        self.relative = relative
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.record = record
+
+
+def _default_manifest_path(bucket_name: str, prefix: str, directory: str | Path) -> Path:
+    """缺省的清单保存在HOME目录下，每个 `(Bucket, 前缀, 本地目录)` 一个文件。"""
+    name = md5_string(f"oss://{bucket_name}/{prefix}") + "--" + md5_string(str(Path(directory).resolve()))
+    return Path.home() / _SYNC_MANIFEST_DIR / (name + ".db")
+
+
+def _local_files(
+    directory: str | Path,
+    include: Iterable[str] | None,
+    exclude: Iterable[str] | None,
+    manifest: _SyncManifest,
+) -> Iterator[_LocalFile]:
+    """按字典序返回需要同步的本地文件及其清单记录。"""
+    for relative, path, stat in _walk_local(directory):
+        if _matches(relative, include, exclude):
+            yield _LocalFile(relative, path, stat.st_size, stat.st_mtime_ns, manifest.get(relative))
+
+
+def _unchanged(local: _LocalFile, obj) -> bool:
+    """根据清单判断文件在上次同步之后两边都没有变化。"""
+    record = local.record
+    return (
+        record is not None
+        and record.size == local.size == obj.size
+        and record.mtime_ns == local.mtime_ns
+        and record.etag == obj.etag
+    )
+
+
+def _merge_step(local: _LocalFile | None, remote: tuple | None) -> tuple[tuple, bool, bool]:
+    """比较两个列表当前的第一项，至少有一项不为None。
+
+    :return: `((相对路径, 本地文件, OSS文件), 本地列表是否前进, OSS列表是否前进)` ，只在一边存在时另一边为None
+    """
+    if remote is None or (local is not None and local.relative < remote[0]):
+        return (local.relative, local, None), True, False
+    if local is None or remote[0] < local.relative:
+        return (remote[0], None, remote[1]), False, True
+    return (local.relative, local, remote[1]), True, True
+
+
+def _merge(local_files: Iterator[_LocalFile], remote_objects: Iterator) -> Iterator[tuple]:
+    """归并两个按字典序排列的列表，返回 `(相对路径, 本地文件, OSS文件)` ，只在一边存在时另一边为None。
+
+    `remote_objects` 返回 `(相对路径, SimplifiedObjectInfo)` 。
+    """
+    local = next(local_files, None)
+    remote = next(remote_objects, None)
+    while local is not None or remote is not None:
+        item, advance_local, advance_remote = _merge_step(local, remote)
+        yield item
+        if advance_local:
+            local = next(local_files, None)
+        if advance_remote:
+            remote = next(remote_objects, None)
+
+
+def _file_crc64(path: Path) -> int:
+    crc = Crc64()
+    with path.open("rb") as f:
+        while chunk := f.read(_CRC_CHUNK_SIZE):
+            crc.update(chunk)
+    return crc.crc
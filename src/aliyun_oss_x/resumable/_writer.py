@@ -0,0 +1,130 @@
+import os
+import mmap
+import errno
+import logging
+import threading
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+# 断点下载时每次从响应中读取并写入文件的字节数
+_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# 文件系统不支持预分配时posix_fallocate返回的错误
+_FALLOCATE_UNSUPPORTED = frozenset([errno.EINVAL, errno.EOPNOTSUPP, errno.ENOSYS, getattr(errno, "ENOTSUP", 0)])
+
+
+class _FileWriter:
+    """断点下载的临时文件写入器，所有分片共用一个文件描述符。
+
+    按绝对偏移写入：支持 `os.pwrite` 的平台直接调用它，不需要加锁；其他平台（Windows）用锁保护
+    `lseek` 和 `write` 。打开时把文件预分配到对象大小，减少多线程写同一个大文件时的碎片；
+    `use_mmap` 为True时把文件映射到内存，写入变为内存拷贝。
+
+    :param path: 临时文件路径，不存在时创建，已有的内容（断点续传下载的部分）保持不变
+    :param size: 对象大小
+    :param use_mmap: 是否通过mmap写入
+    """
+
+    def __init__(self, path: str | Path, size: int, use_mmap: bool = False):
+        self.__fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        self.__seek_lock = threading.Lock()
+        self.__mmap = None
+
+        # 关闭时等待正在进行的写入结束，避免描述符被复用后写到其他文件
+        self.__cond = threading.Condition()
+        self.__writing = 0
+        self.__closed = False
+
+        try:
+            _preallocate(self.__fd, size)
+            if use_mmap and size > 0:
+                self.__mmap = mmap.mmap(self.__fd, size)
+        except BaseException:
+            os.close(self.__fd)
+            raise
+
+    def write(self, offset: int, data) -> int:
+        """在 `offset` 处写入 `data` 。"""
+        with self.__cond:
+            if self.__closed:
+                raise ValueError("I/O operation on closed file")
+            self.__writing += 1
+
+        try:
+            return self.__write(offset, data)
+        finally:
+            with self.__cond:
+                self.__writing -= 1
+                self.__cond.notify_all()
+
+    def __write(self, offset, data):
+        view = memoryview(data)
+        size = len(view)
+
+        if self.__mmap is not None:
+            self.__mmap[offset : offset + size] = view
+            return size
+
+        if hasattr(os, "pwrite"):
+            written = 0
+            while written < size:
+                written += os.pwrite(self.__fd, view[written:], offset + written)
+            return size
+
+        with self.__seek_lock:
+            os.lseek(self.__fd, offset, os.SEEK_SET)
+            written = 0
+            while written < size:
+                written += os.write(self.__fd, view[written:])
+        return size
+
+    def sink(self, offset: int) -> "_Sink":
+        """返回从 `offset` 开始顺序写入的file-like对象。"""
+        return _Sink(self, offset)
+
+    def close(self):
+        with self.__cond:
+            if self.__closed:
+                return
+            self.__closed = True
+            while self.__writing:
+                self.__cond.wait()
+
+        if self.__mmap is not None:
+            self.__mmap.close()
+        os.close(self.__fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _Sink:
+    def __init__(self, writer: _FileWriter, offset: int):
+        self.__writer = writer
+        self.offset = offset
+
+    def write(self, data) -> int:
+        size = self.__writer.write(self.offset, data)
+        self.offset += size
+        return size
+
+
+def _preallocate(fd: int, size: int):
+    if os.fstat(fd).st_size >= size:
+        return
+
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as e:
+            if e.errno not in _FALLOCATE_UNSUPPORTED:
+                raise
+            logger.debug(f"posix_fallocate is not supported: {e}, fall back to ftruncate")
+
+    os.ftruncate(fd, size)
@@ -0,0 +1,337 @@
+"""异步上传、下载整个目录，参见 :mod:`aliyun_oss_x.resumable.sync_directory` 。
+
+`num_threads` 个协程从同一个文件列表中依次取出文件传输；遍历本地目录在文件I/O线程池中进行，不阻塞事件循环。
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable
+
+from .. import defaults
+from .. import http
+from ..api import AsyncBucket
+from ..crypto_bucket import AsyncCryptoBucket
+from ..exceptions import ClientError
+from ..iterators import AsyncObjectIteratorV2
+from ..headers import OSS_REQUEST_PAYER
+from ._base import _populate_valid_headers, _check_pool_capacity
+from ._directory import DirectoryTransferResult, _DirectoryProgress, _matches, _walk_local, _local_path
+from ._sync import (
+    _SyncManifest,
+    _DELETE_BATCH_SIZE,
+    _default_manifest_path,
+    _local_files,
+    _unchanged,
+    _merge_step,
+    _file_crc64,
+)
+from ._aio import run_io
+from .async_resumable import (
+    resumable_upload_async,
+    resumable_download_async,
+    AsyncResumableStore,
+    AsyncResumableDownloadStore,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+async def upload_directory_async(
+    bucket: AsyncBucket | AsyncCryptoBucket,
+    directory: str | Path,
+    prefix: str = "",
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    store: AsyncResumableStore | None = None,
+    headers: dict | http.Headers | None = None,
+    multipart_threshold: int | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    part_num_threads: int | None = None,
+) -> DirectoryTransferResult:
+    """异步版本的 :func:`upload_directory <aliyun_oss_x.upload_directory>` ， `num_threads` 为同时上传的文件数。"""
+    logger.debug(
+        f"Start to upload directory, bucket: {bucket.bucket_name}, directory: {directory}, prefix: {prefix}, "
+        f"include: {include}, exclude: {exclude}, num_threads: {num_threads}"
+    )
+    store = store or AsyncResumableStore()
+    progress = _DirectoryProgress(progress_callback)
+
+    async def list_files():
+        files = _walk_local(directory)
+        while (entry := await run_io(next, files, None)) is not None:
+            relative, path, stat = entry
+            if _matches(relative, include, exclude):
+                progress.add_file(stat.st_size)
+                yield relative, (path, stat.st_size)
+
+    async def upload(relative, item):
+        path, size = item
+        await resumable_upload_async(
+            bucket,
+            prefix + relative,
+            str(path),
+            store=store,
+            headers=headers,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+            progress_callback=progress.file_callback(),
+            num_threads=part_num_threads,
+        )
+        return size
+
+    runner = _AsyncDirectoryRunner(bucket, list_files(), upload, progress, num_threads)
+    return await runner.run()
+
+
+async def download_directory_async(
+    bucket: AsyncBucket | AsyncCryptoBucket,
+    prefix: str,
+    directory: str | Path,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    store: AsyncResumableDownloadStore | None = None,
+    headers: dict | http.Headers | None = None,
+    multiget_threshold: int | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    part_num_threads: int | None = None,
+) -> DirectoryTransferResult:
+    """异步版本的 :func:`download_directory <aliyun_oss_x.download_directory>` ， `num_threads` 为同时下载的文件数。"""
+    logger.debug(
+        f"Start to download directory, bucket: {bucket.bucket_name}, prefix: {prefix}, directory: {directory}, "
+        f"include: {include}, exclude: {exclude}, num_threads: {num_threads}"
+    )
+    store = store or AsyncResumableDownloadStore()
+    progress = _DirectoryProgress(progress_callback)
+    list_headers = _populate_valid_headers(headers, [OSS_REQUEST_PAYER])
+
+    async def list_objects():
+        async for obj in AsyncObjectIteratorV2(bucket, prefix=prefix, headers=list_headers):
+            relative = obj.key[len(prefix) :]
+            if obj.key.endswith("/") or not _matches(relative, include, exclude):
+                continue
+            progress.add_file(obj.size)
+            yield relative, obj
+
+    async def download(relative, obj):
+        path = _local_path(directory, relative)
+        await run_io(path.parent.mkdir, parents=True, exist_ok=True)
+        await resumable_download_async(
+            bucket,
+            obj.key,
+            str(path),
+            multiget_threshold=multiget_threshold,
+            part_size=part_size,
+            progress_callback=progress.file_callback(),
+            num_threads=part_num_threads,
+            store=store,
+            headers=headers,
+        )
+        return obj.size
+
+    runner = _AsyncDirectoryRunner(bucket, list_objects(), download, progress, num_threads)
+    return await runner.run()
+
+
+async def sync_directory_async(
+    bucket: AsyncBucket,
+    directory: str | Path,
+    prefix: str = "",
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    delete: bool = False,
+    manifest: str | Path | None = None,
+    store: AsyncResumableStore | None = None,
+    headers: dict | http.Headers | None = None,
+    multipart_threshold: int | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    part_num_threads: int | None = None,
+) -> DirectoryTransferResult:
+    """异步版本的 :func:`sync_directory <aliyun_oss_x.sync_directory>` ， `num_threads` 为同时上传、比较的文件数。"""
+    logger.debug(
+        f"Start to sync directory, bucket: {bucket.bucket_name}, directory: {directory}, prefix: {prefix}, "
+        f"include: {include}, exclude: {exclude}, delete: {delete}, num_threads: {num_threads}"
+    )
+    if isinstance(bucket, AsyncCryptoBucket):
+        raise ClientError(
+            "sync_directory does not support CryptoBucket, the CRC64 of encrypted objects can not be compared"
+        )
+
+    store = store or AsyncResumableStore()
+    progress = _DirectoryProgress(progress_callback)
+    list_headers = _populate_valid_headers(headers, [OSS_REQUEST_PAYER])
+    num_threads = defaults.get(num_threads, defaults.directory_num_threads)
+    records = await run_io(_SyncManifest, manifest or _default_manifest_path(bucket.bucket_name, prefix, directory))
+
+    deletes = []
+    delete_limit = asyncio.Semaphore(num_threads)
+    deleted = []
+    delete_failed = {}
+
+    async def delete_batch(keys):
+        async with delete_limit:
+            try:
+                result = await bucket.batch_delete_objects(keys, headers=list_headers)
+            except Exception as e:
+                logger.warning(f"Failed to delete {len(keys)} objects: {e}")
+                delete_failed.update((key[len(prefix) :], e) for key in keys)
+                return
+
+        relatives = [key[len(prefix) :] for key in result.deleted_keys]
+        await run_io(records.delete, relatives)
+        deleted.extend(relatives)
+
+    async def merged():
+        local_files = _local_files(directory, include, exclude, records)
+        remote_objects = AsyncObjectIteratorV2(bucket, prefix=prefix, headers=list_headers).__aiter__()
+
+        async def next_remote():
+            while True:
+                try:
+                    obj = await remote_objects.__anext__()
+                except StopAsyncIteration:
+                    return None
+                relative = obj.key[len(prefix) :]
+                if not obj.key.endswith("/") and _matches(relative, include, exclude):
+                    return relative, obj
+
+        # 和 _merge 相同，只是读取下一项时不阻塞事件循环
+        local = await run_io(next, local_files, None)
+        remote = await next_remote()
+        while local is not None or remote is not None:
+            item, advance_local, advance_remote = _merge_step(local, remote)
+            yield item
+            if advance_local:
+                local = await run_io(next, local_files, None)
+            if advance_remote:
+                remote = await next_remote()
+
+    async def list_changes():
+        batch = []
+        async for relative, local, obj in merged():
+            if local is None:
+                if delete:
+                    batch.append(obj.key)
+                    if len(batch) == _DELETE_BATCH_SIZE:
+                        deletes.append(asyncio.ensure_future(delete_batch(batch)))
+                        batch = []
+            elif obj is not None and _unchanged(local, obj):
+                yield relative, None
+            else:
+                progress.add_file(local.size)
+                yield relative, (local, obj)
+
+        if batch:
+            deletes.append(asyncio.ensure_future(delete_batch(batch)))
+
+    async def sync_one(relative, item):
+        if item is None:
+            return None
+
+        local, obj = item
+        crc = None
+        if obj is not None and obj.size == local.size:
+            crc = await run_io(_file_crc64, local.path)
+            record = local.record
+            if record is not None and record.etag == obj.etag and record.crc64 == crc:
+                etag = obj.etag
+            else:
+                meta = await bucket.head_object(obj.key, headers=list_headers)
+                etag = meta.etag if meta.server_crc == crc else None
+
+            if etag is not None:
+                await run_io(records.put, relative, local.size, local.mtime_ns, crc, etag)
+                callback = progress.file_callback()
+                if callback is not None:
+                    callback(local.size, local.size)
+                return None
+
+        result = await resumable_upload_async(
+            bucket,
+            prefix + relative,
+            str(local.path),
+            store=store,
+            headers=headers,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+            progress_callback=progress.file_callback(),
+            num_threads=part_num_threads,
+        )
+        crc = crc if result.crc is None else result.crc
+        await run_io(records.put, relative, local.size, local.mtime_ns, crc, result.etag)
+        return local.size
+
+    try:
+        runner = _AsyncDirectoryRunner(bucket, list_changes(), sync_one, progress, num_threads)
+        result = await runner.run()
+    finally:
+        await asyncio.gather(*deletes, return_exceptions=True)
+        await run_io(records.close)
+
+    result.deleted.extend(deleted)
+    result.failed.update(delete_failed)
+    return result
+
+
+class _AsyncDirectoryRunner:
+    """异步版本的 :class:`_DirectoryRunner <aliyun_oss_x.resumable.sync_directory._DirectoryRunner>` 。"""
+
+    def __init__(
+        self,
+        bucket,
+        items: AsyncIterator,
+        transfer_one: Callable,
+        progress: _DirectoryProgress,
+        num_threads: int | None,
+    ):
+        self.__items = items
+        self.__transfer_one = transfer_one
+        self.__progress = progress
+        self.__num_threads = defaults.get(num_threads, defaults.directory_num_threads)
+        _check_pool_capacity(bucket, self.__num_threads)
+
+        self.__lock = asyncio.Lock()
+        self.__result = DirectoryTransferResult()
+
+    async def run(self) -> DirectoryTransferResult:
+        tasks = [asyncio.ensure_future(self.__worker()) for _ in range(self.__num_threads)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        result = self.__result
+        logger.debug(f"Directory transfer done: {result}")
+        return result
+
+    async def __worker(self):
+        while True:
+            # 异步生成器不能并发调用 `__anext__`
+            async with self.__lock:
+                try:
+                    relative, item = await self.__items.__anext__()
+                except StopAsyncIteration:
+                    self.__progress.listed()
+                    return
+
+            try:
+                size = await self.__transfer_one(relative, item)
+            except Exception as e:
+                logger.warning(f"Failed to transfer {relative}: {e}")
+                self.__result.failed[relative] = e
+            else:
+                if size is None:
+                    self.__result.skipped.append(relative)
+                else:
+                    self.__result.succeeded.append(relative)
+                    self.__result.transferred_bytes += size
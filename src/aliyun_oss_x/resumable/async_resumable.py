@@ -1,8 +1,8 @@
 import random
 import string
+import asyncio
 import logging
 import functools
-import threading
 from pathlib import Path
 from typing import Callable, cast
 
@@ -12,7 +12,7 @@ from ..utils import (
     md5_string,
     force_rename,
     silently_remove,
-    SizedFileAdapter,
+    AsyncSizedFileAdapter,
     b64encode_as_string,
     b64decode_from_string,
     calc_obj_crc_from_parts,
@@ -27,6 +27,7 @@ from ..iterators import AsyncPartIterator
 from ..crypto_bucket import AsyncCryptoBucket
 
 from ..models import PartInfo
+from ..concurrency import AdaptiveConcurrency
 from ..task_queue import AsyncTaskQueue
 from ..headers import (
     OSS_OBJECT_ACL,
@@ -36,6 +37,7 @@ from ..headers import (
     IF_UNMODIFIED_SINCE,
     OSS_SERVER_SIDE_ENCRYPTION,
     OSS_SERVER_SIDE_DATA_ENCRYPTION,
+    OSS_COPY_OBJECT_SOURCE_IF_MATCH,
 )
 from ._base import (
     _normalize_path,
@@ -50,8 +52,20 @@ from ._base import (
     _populate_valid_params,
     determine_part_size,
     _determine_part_size_internal,
+    _check_pool_capacity,
     _ObjectInfo,
+    _StragglerSplitter,
+    _truncated_crc,
+    _parts_to_download,
+    _SPLIT_POLL_INTERVAL,
+    _source_bucket,
+    _copy_metadata,
+    _make_copy_store_key,
+    _verify_uploaded_parts,
 )
+from ._writer import _DOWNLOAD_CHUNK_SIZE
+from ._aio import run_io, _AsyncFile, _AsyncFileWriter
+from .handle import AsyncTransferHandle, _current_control
 
 
 logger = logging.getLogger(__name__)
@@ -68,6 +82,8 @@ async def resumable_upload_async(
     progress_callback: Callable[[int, int | None], None] | None = None,
     num_threads: int | None = None,
     params: dict | None = None,
+    concurrency: AdaptiveConcurrency | None = None,
+    verify_parts: bool = False,
 ):
     """断点上传本地文件。
 
@@ -101,12 +117,17 @@ async def resumable_upload_async(
         # 只有'sequential'这个参数才会被传递到外部函数init_multipart_upload中。
         # 其他参数视为无效参数不会往外部函数传递。
     :type params: dict
+
+    :param concurrency: 自适应并发控制器，指定时忽略 `num_threads` ，并发数在 `concurrency.max_limit` 以内动态调整。
+        参见 :class:`AdaptiveConcurrency <aliyun_oss_x.AdaptiveConcurrency>` 。
+    :param verify_parts: 从断点继续上传时，是否重新计算已上传分片对应的本地数据的MD5并和分片的ETag比较。不一致的分片
+        重新上传；一致的分片补上CRC64，上传完成时可以校验整个文件的CRC64。使用CryptoBucket时忽略该参数。
     """
     logger.debug(
         f"Start to resumable upload, bucket: {bucket.bucket_name}, key: {key}, filename: {filename}, headers: {headers}, "
         f"multipart_threshold: {multipart_threshold}, part_size: {part_size}, num_threads: {num_threads}"
     )
-    size = Path(filename).stat().st_size
+    size = (await run_io(Path(filename).stat)).st_size
     multipart_threshold = defaults.get(multipart_threshold, defaults.multipart_threshold)
 
     logger.debug(f"The size of file to upload is: {size}, multipart_threshold: {multipart_threshold}")
@@ -122,11 +143,15 @@ async def resumable_upload_async(
             progress_callback=progress_callback,
             num_threads=num_threads,
             params=params,
+            concurrency=concurrency,
+            verify_parts=verify_parts,
         )
         result = await uploader.upload()
     else:
-        with Path(filename).open("rb") as f:
-            result = await bucket.put_object(key, f, headers=headers, progress_callback=progress_callback)
+        async with await _AsyncFile.open(filename) as f:
+            result = await bucket.put_object(
+                key, AsyncSizedFileAdapter(f, size), headers=headers, progress_callback=progress_callback
+            )
 
     return result
 
@@ -142,6 +167,7 @@ async def resumable_download_async(
     store: "AsyncResumableDownloadStore | None" = None,
     params: dict | None = None,
     headers: dict | http.Headers | None = None,
+    concurrency: AdaptiveConcurrency | None = None,
 ):
     """断点下载。
 
@@ -180,6 +206,9 @@ async def resumable_download_async(
         # 调用外部函数get_object_to_file, get_object目前需要向下传递的值有OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
     :type headers: 可以是dict，建议是aliyun_oss_x.Headers
 
+    :param concurrency: 自适应并发控制器，指定时忽略 `num_threads` ，并发数在 `concurrency.max_limit` 以内动态调整。
+        参见 :class:`AdaptiveConcurrency <aliyun_oss_x.AdaptiveConcurrency>` 。
+
     :raises: 如果OSS文件不存在，则抛出 :class:`NotFound <aliyun_oss_x.exceptions.NotFound>` ；也有可能抛出其他因下载文件而产生的异常。
     """
     logger.debug(
@@ -205,6 +234,7 @@ async def resumable_download_async(
             store=store,
             params=params,
             headers=valid_headers,
+            concurrency=concurrency,
         )
         await downloader.download(result.server_crc)
     else:
@@ -213,6 +243,120 @@ async def resumable_download_async(
         )
 
 
+async def resumable_copy_async(
+    bucket: AsyncBucket,
+    src_bucket: AsyncBucket | str,
+    src_key: str,
+    dst_key: str,
+    store: "AsyncResumableStore | None" = None,
+    headers: dict | http.Headers | None = None,
+    multipart_threshold: int | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    params: dict | None = None,
+):
+    """异步版本的 :func:`resumable_copy <aliyun_oss_x.resumable_copy>` ，分片作为并发的协程拷贝。
+
+    使用该函数应注意如下细节：
+        #. 源Bucket和目标Bucket需要在同一地域
+        #. 分片拷贝时目标文件的元数据从源文件复制， `headers` 中的同名头部优先
+        #. 不支持CryptoBucket
+
+    :param bucket: 目标文件所在的 :class:`AsyncBucket <aliyun_oss_x.AsyncBucket>` 对象
+    :param src_bucket: 源Bucket名，或者源Bucket的 :class:`AsyncBucket <aliyun_oss_x.AsyncBucket>` 对象。
+        只给出Bucket名时，用 `bucket` 的认证信息读取源文件的信息。
+    :param src_key: 源文件名
+    :param dst_key: 目标文件名
+    :param store: 用来保存断点信息的持久存储，参见 :class:`AsyncResumableStore` 的接口。如不指定，则使用 `AsyncResumableStore` 。
+
+    :param headers: HTTP头部
+        # 调用外部函数copy_object 或 init_multipart_upload传递完整headers
+        # 调用外部函数upload_part_copy目前只传递OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
+        # 调用外部函数complete_multipart_upload目前只传递OSS_REQUEST_PAYER, OSS_OBJECT_ACL
+    :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+    :param multipart_threshold: 源文件长度大于或等于该值时使用分片拷贝，如不指定则使用 `aliyun_oss_x.defaults.copy_threshold`
+    :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.copy_part_size` ，分片过多时自动调大
+    :param progress_callback: 拷贝进度回调函数，在每个分片完成后调用。参见 :ref:`progress_callback` 。
+    :param num_threads: 并发拷贝的分片数，如不指定则使用 `aliyun_oss_x.defaults.copy_num_threads` 。
+
+    :param params: 源文件的请求参数，可以传入versionId拷贝指定版本的文件
+    :type params: dict
+
+
+    :return: :class:`PutObjectResult <aliyun_oss_x.models.PutObjectResult>`
+    """
+    source = _source_bucket(bucket, src_bucket)
+    if isinstance(bucket, AsyncCryptoBucket) or isinstance(source, AsyncCryptoBucket):
+        raise exceptions.ClientError("resumable copy does not support CryptoBucket")
+
+    logger.debug(
+        f"Start to resumable copy, source bucket: {source.bucket_name}, source key: {src_key}, bucket: {bucket.bucket_name}, "
+        f"key: {dst_key}, headers: {headers}, multipart_threshold: {multipart_threshold}, part_size: {part_size}, "
+        f"num_threads: {num_threads}"
+    )
+    valid_headers = _populate_valid_headers(headers, [OSS_REQUEST_PAYER])
+    valid_params = _populate_valid_params(params, [AsyncBucket.VERSIONID])
+    result = await source.head_object(src_key, params=valid_params, headers=valid_headers)
+    multipart_threshold = defaults.get(multipart_threshold, defaults.copy_threshold)
+
+    logger.debug(f"The size of object to copy is: {result.content_length}, multipart_threshold: {multipart_threshold}")
+    if (result.content_length or 0) >= multipart_threshold:
+        copier = _AsyncResumableCopier(
+            bucket,
+            source,
+            src_key,
+            dst_key,
+            result,
+            store,
+            headers=headers,
+            part_size=part_size,
+            progress_callback=progress_callback,
+            num_threads=num_threads,
+            params=valid_params,
+        )
+        return await copier.copy()
+
+    return await bucket.copy_object(source.bucket_name, src_key, dst_key, headers=headers, params=valid_params)
+
+
+async def start_resumable_upload_async(
+    bucket: AsyncBucket | AsyncCryptoBucket,
+    key: str,
+    filename: str,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    **kwargs,
+) -> AsyncTransferHandle:
+    """在后台任务中断点上传本地文件，立即返回可以暂停、恢复和取消的
+    :class:`AsyncTransferHandle <aliyun_oss_x.AsyncTransferHandle>` 。
+
+    参数与 :func:`resumable_upload_async` 相同，上传结果保存在 `AsyncTransferHandle.result` 中。
+    """
+    return AsyncTransferHandle(
+        lambda progress: resumable_upload_async(bucket, key, filename, progress_callback=progress, **kwargs),
+        progress_callback,
+    )._start()
+
+
+async def start_resumable_download_async(
+    bucket: AsyncBucket | AsyncCryptoBucket,
+    key: str,
+    filename: str,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    **kwargs,
+) -> AsyncTransferHandle:
+    """在后台任务中断点下载，立即返回可以暂停、恢复和取消的
+    :class:`AsyncTransferHandle <aliyun_oss_x.AsyncTransferHandle>` 。
+
+    参数与 :func:`resumable_download_async` 相同。
+    """
+    return AsyncTransferHandle(
+        lambda progress: resumable_download_async(bucket, key, filename, progress_callback=progress, **kwargs),
+        progress_callback,
+    )._start()
+
+
 class _AsyncResumableOperation:
     def __init__(
         self,
@@ -223,6 +367,7 @@ class _AsyncResumableOperation:
         store: "AsyncResumableStore | AsyncResumableDownloadStore",
         progress_callback: Callable[[int, int | None], None] | None = None,
         versionid: str | None = None,
+        record_key: str | None = None,
     ):
         self.bucket = bucket
         self.key = key
@@ -233,30 +378,49 @@ class _AsyncResumableOperation:
 
         self.__store = store
 
-        if versionid is None:
+        if record_key is not None:
+            self.__record_key = record_key
+        elif versionid is None:
             self.__record_key = self.__store.make_store_key(bucket.bucket_name, self.key, self._abspath)
         else:
             self.__record_key = self.__store.make_store_key(bucket.bucket_name, self.key, self._abspath, versionid)
 
         logger.debug(f"Init _ResumableOperation, record_key: {self.__record_key}")
 
-        # protect self.__progress_callback
-        self.__plock = threading.Lock()
+        # 所有协程运行在同一个事件循环线程中，进度回调不会被并发调用，不需要加锁
         self.__progress_callback = progress_callback
 
-    def _del_record(self):
-        self.__store.delete(self.__record_key)
+        self._control = _current_control()
+        if self._control is not None:
+            self._control.operation = self
+
+        # 由子类设置，指定时 _run_part 在它的并发限制内传输分片
+        self._concurrency: AdaptiveConcurrency | None = None
+
+    async def _del_record(self):
+        await run_io(self.__store.delete, self.__record_key)
 
-    def _put_record(self, record):
-        self.__store.put(self.__record_key, record)
+    async def _put_record(self, record):
+        await run_io(self.__store.put, self.__record_key, record)
 
-    def _get_record(self):
-        return self.__store.get(self.__record_key)
+    async def _get_record(self):
+        return await run_io(self.__store.get, self.__record_key)
 
     def _report_progress(self, consumed_size):
         if self.__progress_callback:
-            with self.__plock:
-                self.__progress_callback(consumed_size, self.size)
+            self.__progress_callback(consumed_size, self.size)
+
+    def _check_stopped(self):
+        """通过 :class:`AsyncTransferHandle <aliyun_oss_x.AsyncTransferHandle>` 暂停或者取消时抛出异常，结束传输。"""
+        if self._control is not None:
+            self._control.check()
+
+    async def _run_part(self, func, part):
+        """传输一个分片，指定了 `_concurrency` 时由它控制并发数。"""
+        self._check_stopped()
+        if self._concurrency is None:
+            return await func(part)
+        return await self._concurrency.run_async(functools.partial(func, part), part.size)
 
 
 class _AsyncResumableDownloader(_AsyncResumableOperation):
@@ -272,6 +436,7 @@ class _AsyncResumableDownloader(_AsyncResumableOperation):
         num_threads: int | None = None,
         params: dict | None = None,
         headers: dict | http.Headers | None = None,
+        concurrency: AdaptiveConcurrency | None = None,
     ):
         versionid = None
         if params is not None and params.get("versionId") is not None:
@@ -291,21 +456,27 @@ class _AsyncResumableDownloader(_AsyncResumableOperation):
         self.__part_size = _determine_part_size_internal(self.size, self.__part_size, _MAX_MULTIGET_PART_COUNT)
 
         self.__tmp_file = None
+        self.__writer = None
         self.__num_threads = defaults.get(num_threads, defaults.multiget_num_threads)
+        self._concurrency = concurrency
+        if concurrency is not None:
+            self.__num_threads = concurrency.max_limit
+        _check_pool_capacity(bucket, self.__num_threads)
         self.__finished_parts = None
         self.__finished_size = None
+        self.__splitter = None
         self.__params = params
         self.__headers = headers
 
         # protect record
-        self.__lock = threading.Lock()
+        self.__lock = asyncio.Lock()
         self.__record = None
         logger.debug(
             f"Init _ResumableDownloader, bucket: {bucket.bucket_name}, key: {key}, part_size: {self.__part_size}, num_thread: {self.__num_threads}"
         )
 
     async def download(self, server_crc=None):
-        self.__load_record()
+        await self.__load_record()
 
         parts_to_download = self.__get_parts_to_download()
         logger.debug(f"Parts need to download: {parts_to_download}")
@@ -314,23 +485,25 @@ class _AsyncResumableDownloader(_AsyncResumableOperation):
         if self.__tmp_file is None:
             raise FileNotFoundError("tmp file not found")
 
-        open(self.__tmp_file, "a").close()
-
-        q = AsyncTaskQueue(
-            functools.partial(self.__producer, parts_to_download=parts_to_download),
-            [self.__consumer] * self.__num_threads,
-        )
-        await q.run()
+        async with await _AsyncFileWriter.open(
+            self.__tmp_file, self.size, use_mmap=defaults.multiget_use_mmap
+        ) as writer:
+            self.__writer = writer
+            q = AsyncTaskQueue(
+                functools.partial(self.__producer, parts_to_download=parts_to_download),
+                [self.__consumer] * self.__num_threads,
+            )
+            await q.run()
 
         if self.bucket.enable_crc and self.__finished_parts:
-            parts = sorted(self.__finished_parts, key=lambda p: p.part_number)
+            parts = sorted(self.__finished_parts, key=lambda p: p.start)
             object_crc = calc_obj_crc_from_parts(parts)
             check_crc("resume download", object_crc, server_crc, None)
 
-        force_rename(self.__tmp_file, self.filename)
+        await run_io(force_rename, self.__tmp_file, self.filename)
 
         self._report_progress(self.size)
-        self._del_record()
+        await self._del_record()
 
     async def __producer(self, q: AsyncTaskQueue, parts_to_download=None):
         if parts_to_download is None:
@@ -344,53 +517,98 @@ class _AsyncResumableDownloader(_AsyncResumableOperation):
             if part is None:
                 break
 
-            await self.__download_part(part)
+            await self._run_part(self.__download_part, part)
+
+        # 队列已经空了，帮忙下载慢分片尚未下载的部分
+        while q.ok() and self.__splitter is not None and self.__splitter.running():
+            part = self.__splitter.split()
+            if part is None:
+                await asyncio.sleep(_SPLIT_POLL_INTERVAL)
+            else:
+                await self._run_part(self.__download_part, part)
 
     async def __download_part(self, part):
         self._report_progress(self.__finished_size)
 
-        if self.__tmp_file is None:
+        if self.__writer is None:
             raise FileNotFoundError("tmp file not found")
 
-        with open(self.__tmp_file, "rb+") as f:
-            f.seek(part.start, 0)
+        f = self.__writer.sink(part.start)
 
-            headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
-            if headers is None:
-                headers = http.Headers()
-            headers[IF_MATCH] = self.objectInfo.etag or ""
-            headers[IF_UNMODIFIED_SINCE] = http_date(self.objectInfo.mtime)
+        headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
+        if headers is None:
+            headers = http.Headers()
+        headers[IF_MATCH] = self.objectInfo.etag or ""
+        headers[IF_UNMODIFIED_SINCE] = http_date(self.objectInfo.mtime)
 
+        running = self.__splitter.start(part) if self.__splitter is not None else None
+        try:
             result = await self.bucket.get_object(
                 self.key, byte_range=(part.start, part.end - 1), headers=headers, params=self.__params
             )
-            await copyfileobj_and_verify_async(result, f, part.end - part.start, request_id=result.request_id)
+            try:
+                if running is None:
+                    await copyfileobj_and_verify_async(
+                        result, f, part.end - part.start, chunk_size=_DOWNLOAD_CHUNK_SIZE, request_id=result.request_id
+                    )
+                    part.part_crc = result.client_crc
+                else:
+                    part.part_crc = await self.__copy_part(result, f, running)
+            finally:
+                await result.aclose()
+        except BaseException:
+            if running is not None:
+                self.__splitter.finish(running, ok=False)
+            raise
+        if running is not None:
+            self.__splitter.finish(running)
 
-        part.part_crc = result.client_crc
         logger.debug(
             f"down part success, add part info to record, part_number: {part.part_number}, start: {part.start}, end: {part.end}"
         )
 
-        self.__finish_part(part)
+        await self.__finish_part(part)
+
+    async def __copy_part(self, result, f, running, chunk_size=_DOWNLOAD_CHUNK_SIZE):
+        """把分片写入临时文件，分片被拆分后只写到新的 `end` 为止，返回写入部分的CRC。"""
+        while True:
+            self._check_stopped()
+            crc = result.client_crc
+            buf = await result.read(min(chunk_size, running.part.end - running.position))
+            if not buf:
+                break
+
+            size, done = self.__splitter.advance(running, len(buf))
+            if size < len(buf):
+                await f.write(buf[:size])
+                return _truncated_crc(crc, buf[:size])
 
-    def __load_record(self):
-        record = self._get_record()
+            await f.write(buf)
+            if done:
+                break
+
+        if running.position != running.part.end:
+            raise exceptions.InconsistentError("IncompleteRead from source", result.request_id)
+        return result.client_crc
+
+    async def __load_record(self):
+        record = await self._get_record()
         logger.debug(f"Load record return {record}")
 
         if record and not self.__is_record_sane(record):
             logger.warn("The content of record is invalid, delete the record")
-            self._del_record()
+            await self._del_record()
             record = None
 
-        if record and not Path(self.filename + record["tmp_suffix"]).exists():
+        if record and not await run_io(Path(self.filename + record["tmp_suffix"]).exists):
             logger.warn(f"Temp file: {self.filename + record['tmp_suffix']} does not exist, delete the record")
-            self._del_record()
+            await self._del_record()
             record = None
 
         if record and self.__is_remote_changed(record):
             logger.warn(f"Object: {self.key} has been overwritten，delete the record and tmp file")
-            silently_remove(self.filename + record["tmp_suffix"])
-            self._del_record()
+            await run_io(silently_remove, self.filename + record["tmp_suffix"])
+            await self._del_record()
             record = None
 
         if not record:
@@ -409,7 +627,7 @@ class _AsyncResumableDownloader(_AsyncResumableOperation):
             logger.debug(
                 f"Add new record, bucket: {self.bucket.bucket_name}, key: {self.key}, part_size: {self.__part_size}"
             )
-            self._put_record(record)
+            await self._put_record(record)
 
         self.__tmp_file = self.filename + record["tmp_suffix"]
         self.__part_size = record["part_size"]
@@ -425,10 +643,14 @@ class _AsyncResumableDownloader(_AsyncResumableOperation):
         if self.__finished_parts is None:
             return []
 
-        all_set = set(_split_to_parts(self.size, self.__part_size))
-        finished_set = set(self.__finished_parts)
+        parts = _parts_to_download(self.size, self.__part_size, self.__finished_parts)
 
-        return sorted(list(all_set - finished_set), key=lambda p: p.part_number)
+        # AsyncCryptoBucket解密时对范围的起点有对齐要求，不拆分
+        if parts and not isinstance(self.bucket, AsyncCryptoBucket):
+            next_part_number = max(p.part_number for p in parts + self.__finished_parts) + 1
+            self.__splitter = _StragglerSplitter(next_part_number)
+
+        return parts
 
     def __is_record_sane(self, record):
         try:
@@ -462,8 +684,8 @@ class _AsyncResumableDownloader(_AsyncResumableOperation):
             or record["etag"] != self.objectInfo.etag
         )
 
-    def __finish_part(self, part):
-        with self.__lock:
+    async def __finish_part(self, part):
+        async with self.__lock:
             if self.__finished_parts is None:
                 self.__finished_parts = []
             self.__finished_parts.append(part)
@@ -475,7 +697,13 @@ class _AsyncResumableDownloader(_AsyncResumableOperation):
             self.__record["parts"].append(
                 {"part_number": part.part_number, "start": part.start, "end": part.end, "part_crc": part.part_crc}
             )
-            self._put_record(self.__record)
+            await self._put_record(self.__record)
+
+    async def _abort(self):
+        """取消时删除临时文件和断点信息。"""
+        if self.__tmp_file is not None:
+            await run_io(silently_remove, self.__tmp_file)
+        await self._del_record()
 
     def __gen_tmp_suffix(self):
         return ".tmp-" + "".join(random.choice(string.ascii_lowercase) for i in range(12))
@@ -493,6 +721,7 @@ class _AsyncResumableUploader(_AsyncResumableOperation):
     :param part_size: 分片大小。优先使用用户提供的值。如果用户没有指定，那么对于新上传，计算出一个合理值；对于老的上传，采用第一个
         分片的大小。
     :param progress_callback: 上传进度回调函数。参见 :ref:`progress_callback` 。
+    :param verify_parts: 是否校验断点记录中已上传的分片和本地数据一致
     """
 
     def __init__(
@@ -507,6 +736,8 @@ class _AsyncResumableUploader(_AsyncResumableOperation):
         progress_callback: Callable[[int, int | None], None] | None = None,
         num_threads: int | None = None,
         params: dict | None = None,
+        concurrency: AdaptiveConcurrency | None = None,
+        verify_parts: bool = False,
     ):
         super(_AsyncResumableUploader, self).__init__(
             bucket, key, filename, size, store or AsyncResumableStore(), progress_callback=progress_callback
@@ -520,13 +751,18 @@ class _AsyncResumableUploader(_AsyncResumableOperation):
         self.__mtime = Path(filename).stat().st_mtime
 
         self.__num_threads = defaults.get(num_threads, defaults.multipart_num_threads)
+        self._concurrency = concurrency
+        if concurrency is not None:
+            self.__num_threads = concurrency.max_limit
+        _check_pool_capacity(bucket, self.__num_threads)
 
         self.__upload_id: str = ""
 
         self.__params = params
+        self.__verify_parts = verify_parts
 
         # protect below fields
-        self.__lock = threading.Lock()
+        self.__lock = asyncio.Lock()
         self.__record = None
         self.__finished_size = 0
         self.__finished_parts: list[PartInfo] = []
@@ -560,7 +796,7 @@ class _AsyncResumableUploader(_AsyncResumableOperation):
         result = await self.bucket.complete_multipart_upload(
             self.key, self.__upload_id, self.__finished_parts, headers=headers
         )
-        self._del_record()
+        await self._del_record()
 
         return result
 
@@ -576,55 +812,64 @@ class _AsyncResumableUploader(_AsyncResumableOperation):
             if part is None:
                 break
 
-            await self.__upload_part(part)
+            await self._run_part(self.__upload_part, part)
 
     async def __upload_part(self, part):
-        with Path(self.filename).open("rb") as f:
+        async with await _AsyncFile.open(self.filename) as f:
             self._report_progress(self.__finished_size)
 
-            f.seek(part.start, 0)
+            await f.seek(part.start, 0)
             headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
             if self.__encryption:
                 result = await cast(AsyncCryptoBucket, self.bucket).upload_part(
                     self.key,
                     self.__upload_id,
                     part.part_number,
-                    SizedFileAdapter(f, part.size),
+                    AsyncSizedFileAdapter(f, part.size),
                     headers=headers,
                     upload_context=self.__upload_context,
                 )
             else:
                 result = await self.bucket.upload_part(
-                    self.key, self.__upload_id, part.part_number, SizedFileAdapter(f, part.size), headers=headers
+                    self.key, self.__upload_id, part.part_number, AsyncSizedFileAdapter(f, part.size), headers=headers
                 )
 
             logger.debug(
                 f"Upload part success, add part info to record, part_number: {part.part_number}, etag: {result.etag}, size: {part.size}"
             )
-            self.__finish_part(PartInfo(part.part_number, result.etag, size=part.size, part_crc=result.crc))
+            await self.__finish_part(PartInfo(part.part_number, result.etag, size=part.size, part_crc=result.crc))
+
+    async def _abort(self):
+        """取消时取消分片上传并删除断点信息。"""
+        if self.__upload_id:
+            try:
+                await self.bucket.abort_multipart_upload(self.key, self.__upload_id)
+            except exceptions.NoSuchUpload:
+                pass
+        await self._del_record()
 
-    def __finish_part(self, part_info: PartInfo):
-        with self.__lock:
+    async def __finish_part(self, part_info: PartInfo):
+        async with self.__lock:
             self.__finished_parts.append(part_info)
             self.__finished_size += part_info.size or 0
 
     async def __load_record(self):
-        record = self._get_record()
+        record = await self._get_record()
         logger.debug(f"Load record return {record}")
 
         if record and not self.__is_record_sane(record):
             logger.warn("The content of record is invalid, delete the record")
-            self._del_record()
+            await self._del_record()
             record = None
 
         if record and self.__file_changed(record):
             logger.warn(f"File: {self.filename} has been changed, delete the record")
-            self._del_record()
+            await self._del_record()
             record = None
 
         if record and not self.__upload_exists(record["upload_id"]):
             logger.warn(f"Multipart upload: {record['upload_id']} does not exist, delete the record")
-            self._del_record()
+            await self._del_record()
             record = None
 
         if not record:
@@ -673,7 +918,7 @@ class _AsyncResumableUploader(_AsyncResumableOperation):
                 f"Add new record, bucket: {self.bucket.bucket_name}, key: {self.key}, upload_id: {upload_id}, part_size: {part_size}"
             )
 
-            self._put_record(record)
+            await self._put_record(record)
 
         self.__record = record
         self.__part_size = self.__record["part_size"]
@@ -710,6 +955,10 @@ class _AsyncResumableUploader(_AsyncResumableOperation):
                 raise exceptions.InvalidEncryptionRequest(err_msg)
 
         self.__finished_parts = await self.__get_finished_parts()
+        if self.__verify_parts and not self.__encryption and self.__finished_parts:
+            self.__finished_parts = await run_io(
+                _verify_uploaded_parts, self.filename, self.size, self.__part_size, self.__finished_parts
+            )
         self.__finished_size = sum(p.size or 0 for p in self.__finished_parts)
 
     async def __get_finished_parts(self) -> list[PartInfo]:
@@ -781,6 +1030,253 @@ class _AsyncResumableUploader(_AsyncResumableOperation):
         return True
 
 
+class _AsyncResumableCopier(_AsyncResumableOperation):
+    """以断点续传方式分片拷贝文件。
+
+    :param bucket: 目标文件所在的 :class:`AsyncBucket <aliyun_oss_x.AsyncBucket>` 对象
+    :param source: 源文件所在的 :class:`AsyncBucket <aliyun_oss_x.AsyncBucket>` 对象
+    :param src_key: 源文件名
+    :param key: 目标文件名
+    :param head_result: 源文件的 :class:`HeadObjectResult <aliyun_oss_x.models.HeadObjectResult>`
+    :param store: 用来保存进度的持久化存储
+    :param headers: 传给 `init_multipart_upload` 的HTTP头部，覆盖从源文件复制的元数据
+    :param part_size: 分片大小。对于老的拷贝，采用断点信息中的分片大小。
+    :param progress_callback: 拷贝进度回调函数。参见 :ref:`progress_callback` 。
+    """
+
+    def __init__(
+        self,
+        bucket: AsyncBucket,
+        source: AsyncBucket,
+        src_key: str,
+        key: str,
+        head_result: models.HeadObjectResult,
+        store: "AsyncResumableStore | None" = None,
+        headers: dict | http.Headers | None = None,
+        part_size: int | None = None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        num_threads: int | None = None,
+        params: dict | None = None,
+    ):
+        self.__version_id = (params or {}).get(AsyncBucket.VERSIONID)
+        super(_AsyncResumableCopier, self).__init__(
+            bucket,
+            key,
+            f"oss://{source.bucket_name}/{src_key}",
+            head_result.content_length,
+            store or AsyncResumableStore(),
+            progress_callback=progress_callback,
+            record_key=_make_copy_store_key(bucket.bucket_name, key, source.bucket_name, src_key, self.__version_id),
+        )
+
+        self.__op = "ResumableCopy"
+        self.source = source
+        self.src_key = src_key
+        self.objectInfo = _ObjectInfo.make(head_result)
+        self.__server_crc = head_result.server_crc
+        self.__src_headers = head_result.headers
+        self.__headers = headers
+        self.__part_size = determine_part_size(self.size, defaults.get(part_size, defaults.copy_part_size))
+
+        self.__num_threads = defaults.get(num_threads, defaults.copy_num_threads)
+        _check_pool_capacity(bucket, self.__num_threads)
+
+        self.__upload_id: str = ""
+
+        # protect below fields
+        self.__lock = asyncio.Lock()
+        self.__record = None
+        self.__finished_size = 0
+        self.__finished_parts: list[PartInfo] = []
+
+        logger.debug(
+            f"Init _AsyncResumableCopier, source bucket: {source.bucket_name}, source key: {src_key}, bucket: {bucket.bucket_name}, "
+            f"key: {key}, part_size: {self.__part_size}, num_thread: {self.__num_threads}"
+        )
+
+    async def copy(self):
+        await self.__load_record()
+
+        finished = set(p.part_number for p in self.__finished_parts)
+        parts_to_copy = [p for p in _split_to_parts(self.size, self.__part_size) if p.part_number not in finished]
+        logger.debug(f"Parts need to copy: {parts_to_copy}")
+
+        q = AsyncTaskQueue(
+            functools.partial(self.__producer, parts_to_copy=parts_to_copy), [self.__consumer] * self.__num_threads
+        )
+        await q.run()
+
+        self._report_progress(self.size)
+
+        parts = sorted(self.__finished_parts, key=lambda p: p.part_number)
+        if self.bucket.enable_crc and all(p.part_crc is not None for p in parts):
+            check_crc("resumable copy", calc_obj_crc_from_parts(parts), self.__server_crc, None)
+
+        headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_OBJECT_ACL])
+        result = await self.bucket.complete_multipart_upload(self.key, self.__upload_id, parts, headers=headers)
+        await self._del_record()
+
+        return result
+
+    async def __producer(self, q: AsyncTaskQueue, parts_to_copy=None):
+        if parts_to_copy is None:
+            return
+        for part in parts_to_copy:
+            await q.put(part)
+
+    async def __consumer(self, q: AsyncTaskQueue):
+        while True:
+            part = await q.get()
+            if part is None:
+                break
+
+            await self.__copy_part(part)
+
+    async def __copy_part(self, part):
+        self._check_stopped()
+
+        headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT]) or http.Headers()
+        headers[OSS_COPY_OBJECT_SOURCE_IF_MATCH] = self.objectInfo.etag or ""
+        # upload_part_copy会往params里添加uploadId等参数，每个分片用单独的dict
+        params = {AsyncBucket.VERSIONID: self.__version_id} if self.__version_id is not None else None
+
+        result = await self.bucket.upload_part_copy(
+            self.source.bucket_name,
+            self.src_key,
+            (part.start, part.end - 1),
+            self.key,
+            self.__upload_id,
+            part.part_number,
+            headers=headers,
+            params=params,
+        )
+
+        logger.debug(
+            f"Copy part success, add part info to record, part_number: {part.part_number}, etag: {result.etag}, size: {part.size}"
+        )
+        await self.__finish_part(PartInfo(part.part_number, result.etag, size=part.size, part_crc=result.crc))
+
+    async def _abort(self):
+        """取消时取消分片上传并删除断点信息。"""
+        if self.__upload_id:
+            try:
+                await self.bucket.abort_multipart_upload(self.key, self.__upload_id)
+            except exceptions.NoSuchUpload:
+                pass
+        await self._del_record()
+
+    async def __finish_part(self, part_info: PartInfo):
+        async with self.__lock:
+            self.__finished_parts.append(part_info)
+            self.__finished_size += part_info.size or 0
+
+            if self.__record is not None:
+                self.__record["parts"].append(
+                    {
+                        "part_number": part_info.part_number,
+                        "etag": part_info.etag,
+                        "size": part_info.size,
+                        "part_crc": part_info.part_crc,
+                    }
+                )
+                await self._put_record(self.__record)
+
+            self._report_progress(self.__finished_size)
+
+    async def __load_record(self):
+        record = await self._get_record()
+        logger.debug(f"Load record return {record}")
+
+        if record and not self.__is_record_sane(record):
+            logger.warning("The content of record is invalid, delete the record")
+            await self._del_record()
+            record = None
+
+        if record and self.__is_source_changed(record):
+            logger.warning(
+                f"Object: {self.src_key} has been overwritten, abort the multipart upload and delete the record"
+            )
+            self.__upload_id = record["upload_id"]
+            await self._abort()
+            self.__upload_id = ""
+            record = None
+
+        if record and not await self.__upload_exists(record["upload_id"]):
+            logger.warning(f"Multipart upload: {record['upload_id']} does not exist, delete the record")
+            await self._del_record()
+            record = None
+
+        if not record:
+            headers = _copy_metadata(self.__src_headers, self.__headers)
+            upload_id = (await self.bucket.init_multipart_upload(self.key, headers)).upload_id
+            record = {
+                "op_type": self.__op,
+                "upload_id": upload_id,
+                "src_bucket": self.source.bucket_name,
+                "src_key": self.src_key,
+                "size": self.size,
+                "mtime": self.objectInfo.mtime,
+                "etag": self.objectInfo.etag,
+                "bucket": self.bucket.bucket_name,
+                "key": self.key,
+                "part_size": self.__part_size,
+                "parts": [],
+            }
+            logger.debug(
+                f"Add new record, bucket: {self.bucket.bucket_name}, key: {self.key}, upload_id: {upload_id}, part_size: {self.__part_size}"
+            )
+            await self._put_record(record)
+
+        self.__record = record
+        self.__part_size = record["part_size"]
+        self.__upload_id = record["upload_id"]
+        self.__finished_parts = [
+            PartInfo(p["part_number"], p["etag"], size=p["size"], part_crc=p["part_crc"]) for p in record["parts"]
+        ]
+        self.__finished_size = sum(p.size or 0 for p in self.__finished_parts)
+
+    async def __upload_exists(self, upload_id):
+        try:
+            async for part in AsyncPartIterator(self.bucket, self.key, upload_id, "0", max_parts=1):
+                pass
+        except exceptions.NoSuchUpload:
+            return False
+        else:
+            return True
+
+    def __is_source_changed(self, record):
+        return (
+            record["mtime"] != self.objectInfo.mtime
+            or record["size"] != self.objectInfo.size
+            or record["etag"] != self.objectInfo.etag
+        )
+
+    def __is_record_sane(self, record):
+        try:
+            if record["op_type"] != self.__op:
+                logger.error(f"op_type invalid, op_type in record: {record['op_type']} is invalid")
+                return False
+
+            for key in ("upload_id", "src_bucket", "src_key", "etag", "bucket", "key"):
+                if not isinstance(record[key], str):
+                    logger.error(f"Type Error, {key} in record is not a string type: {record[key]}")
+                    return False
+
+            for key in ("size", "mtime", "part_size"):
+                if not isinstance(record[key], int):
+                    logger.error(f"Type Error, {key} in record is not an integer type: {record[key]}")
+                    return False
+
+            if not isinstance(record["parts"], list):
+                logger.error(f"parts is not a list: {record['parts']}")
+                return False
+        except KeyError as e:
+            logger.error(f"Key not found: {e.args}")
+            return False
+
+        return True
+
+
 class AsyncResumableStore(_ResumableStoreBase):
     """保存断点上传断点信息的类。
 
@@ -788,10 +1284,23 @@ class AsyncResumableStore(_ResumableStoreBase):
 
     :param str root: 父目录，缺省为HOME
     :param str dir: 子目录，缺省为 `_UPLOAD_TEMP_DIR`
+    :param int compact_threshold: 断点信息日志累计多少条之后压缩为快照，参见 `_ResumableStoreBase`
+    :param int fsync_every: 每追加多少条日志调用一次fsync，0表示不调用
     """
 
-    def __init__(self, root: Path | str | None = None, dir: Path | str | None = None):
-        super(AsyncResumableStore, self).__init__(Path(root or Path.home()), Path(dir or _UPLOAD_TEMP_DIR))
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        dir: Path | str | None = None,
+        compact_threshold: int | None = None,
+        fsync_every: int | None = None,
+    ):
+        super(AsyncResumableStore, self).__init__(
+            Path(root or Path.home()),
+            Path(dir or _UPLOAD_TEMP_DIR),
+            compact_threshold=compact_threshold,
+            fsync_every=fsync_every,
+        )
 
     @staticmethod
     def make_store_key(bucket_name: str, key: str, filename: str, version_id: str | None = None) -> str:
@@ -808,10 +1317,23 @@ class AsyncResumableDownloadStore(_ResumableStoreBase):
 
     :param str root: 父目录，缺省为HOME
     :param str dir: 子目录，缺省为 `_DOWNLOAD_TEMP_DIR`
+    :param int compact_threshold: 断点信息日志累计多少条之后压缩为快照，参见 `_ResumableStoreBase`
+    :param int fsync_every: 每追加多少条日志调用一次fsync，0表示不调用
     """
 
-    def __init__(self, root: Path | str | None = None, dir: Path | str | None = None):
-        super(AsyncResumableDownloadStore, self).__init__(Path(root or Path.home()), Path(dir or _DOWNLOAD_TEMP_DIR))
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        dir: Path | str | None = None,
+        compact_threshold: int | None = None,
+        fsync_every: int | None = None,
+    ):
+        super(AsyncResumableDownloadStore, self).__init__(
+            Path(root or Path.home()),
+            Path(dir or _DOWNLOAD_TEMP_DIR),
+            compact_threshold=compact_threshold,
+            fsync_every=fsync_every,
+        )
 
     @staticmethod
     def make_store_key(bucket_name: str, key: str, filename: str, version_id: str | None = None) -> str:
@@ -0,0 +1,177 @@
+"""异步版本的 :mod:`sync_stream <aliyun_oss_x.resumable.sync_stream>` ，分片作为后台任务并发上传。"""
+
+import asyncio
+import logging
+from typing import Callable
+
+from .. import defaults
+from .. import exceptions
+from .. import http
+from ..api import AsyncBucket
+from ..crypto_bucket import AsyncCryptoBucket
+from ..exceptions import ClientError
+from ..models import PartInfo
+from ..utils import AsyncSizedFileAdapter
+from ..headers import OSS_OBJECT_ACL, OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
+from ._base import determine_part_size, _populate_valid_headers, _check_pool_capacity
+from ._stream import _BufferPool, _AsyncBufferReader, _AsyncStreamReader, _stream_part_size
+
+
+logger = logging.getLogger(__name__)
+
+
+async def upload_stream_async(
+    bucket: AsyncBucket,
+    key: str,
+    data,
+    size: int | None = None,
+    headers: dict | http.Headers | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+):
+    """异步版本的 :func:`upload_stream <aliyun_oss_x.upload_stream>` 。
+
+    `data` 还可以是异步file object（ `read` 是协程函数）或者异步可迭代对象；同步的file object在文件I/O线程池中读取。
+
+    :param bucket: :class:`AsyncBucket <aliyun_oss_x.AsyncBucket>` 对象，不支持AsyncCryptoBucket
+    :param num_threads: 并发上传的分片数，同时也是分片缓冲区的个数，如不指定则使用 `aliyun_oss_x.defaults.multipart_num_threads` 。
+
+    其他参数参见 :func:`upload_stream <aliyun_oss_x.upload_stream>` 。
+    """
+    logger.debug(
+        f"Start to upload stream, bucket: {bucket.bucket_name}, key: {key}, size: {size}, part_size: {part_size}, "
+        f"num_threads: {num_threads}"
+    )
+    uploader = _AsyncStreamUploader(
+        bucket,
+        key,
+        size=size,
+        headers=headers,
+        part_size=part_size,
+        progress_callback=progress_callback,
+        num_threads=num_threads,
+    )
+    return await uploader.upload(_AsyncStreamReader(data))
+
+
+class _AsyncStreamUploader:
+    """异步版本的 :class:`_StreamUploader <aliyun_oss_x.resumable.sync_stream._StreamUploader>` 。"""
+
+    def __init__(
+        self,
+        bucket: AsyncBucket,
+        key: str,
+        size: int | None = None,
+        headers: dict | http.Headers | None = None,
+        part_size: int | None = None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        num_threads: int | None = None,
+    ):
+        if isinstance(bucket, AsyncCryptoBucket):
+            raise ClientError("upload stream does not support AsyncCryptoBucket")
+
+        self.bucket = bucket
+        self.key = key
+        self.size = size
+        self.__headers = headers
+        self.__progress_callback = progress_callback
+
+        self.__part_size = defaults.get(part_size, defaults.part_size)
+        if size is not None:
+            self.__part_size = max(determine_part_size(size, self.__part_size), 1)
+
+        self.__num_threads = defaults.get(num_threads, defaults.multipart_num_threads)
+        _check_pool_capacity(bucket, self.__num_threads)
+
+        self.__upload_id = ""
+        self.__finished_size = 0
+        self.__finished_parts: list[PartInfo] = []
+
+    def __part_size_of(self, part_number: int) -> int:
+        if self.size is not None:
+            return self.__part_size
+        return _stream_part_size(part_number, self.__part_size)
+
+    async def upload(self, reader: _AsyncStreamReader):
+        pool = _BufferPool()
+        slots = asyncio.Semaphore(self.__num_threads)
+
+        part_size = self.__part_size_of(1)
+        await slots.acquire()
+        buf = pool.take(part_size)
+        n = await reader.readinto_async(memoryview(buf)[:part_size])
+        if n < part_size or n == self.size:
+            logger.debug(f"Stream is smaller than one part, put object directly, size: {n}")
+            return await self.bucket.put_object(
+                self.key,
+                AsyncSizedFileAdapter(_AsyncBufferReader(memoryview(buf)[:n]), n),
+                headers=self.__headers,
+                progress_callback=self.__progress_callback,
+            )
+
+        self.__upload_id = (await self.bucket.init_multipart_upload(self.key, self.__headers)).upload_id
+        logger.debug(f"Init multipart upload for stream, upload_id: {self.__upload_id}")
+
+        tasks: list[asyncio.Task] = []
+        try:
+            part_number = 1
+            while True:
+                tasks.append(asyncio.create_task(self.__upload_part(part_number, buf, n, pool, slots)))
+                if n < part_size:
+                    break
+
+                part_number += 1
+                part_size = self.__part_size_of(part_number)
+
+                await slots.acquire()
+                if any(t.done() and not t.cancelled() and t.exception() is not None for t in tasks):
+                    slots.release()
+                    break
+
+                buf = pool.take(part_size)
+                n = await reader.readinto_async(memoryview(buf)[:part_size])
+                if n == 0:
+                    pool.give(buf)
+                    slots.release()
+                    break
+                if part_number > defaults.max_part_count:
+                    raise ClientError(f"stream has more than {defaults.max_part_count} parts, use a larger part_size")
+            await asyncio.gather(*tasks)
+
+            headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_OBJECT_ACL])
+            parts = sorted(self.__finished_parts, key=lambda p: p.part_number)
+            return await self.bucket.complete_multipart_upload(self.key, self.__upload_id, parts, headers=headers)
+        except BaseException:
+            await self.__abort(tasks)
+            raise
+
+    async def __upload_part(self, part_number: int, buf: bytearray, size: int, pool: _BufferPool, slots):
+        try:
+            headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
+            result = await self.bucket.upload_part(
+                self.key,
+                self.__upload_id,
+                part_number,
+                AsyncSizedFileAdapter(_AsyncBufferReader(memoryview(buf)[:size]), size),
+                headers=headers,
+            )
+            logger.debug(f"Upload stream part success, part_number: {part_number}, etag: {result.etag}, size: {size}")
+            self.__finished_parts.append(PartInfo(part_number, result.etag, size=size, part_crc=result.crc))
+            self.__finished_size += size
+            if self.__progress_callback:
+                self.__progress_callback(self.__finished_size, self.size)
+        finally:
+            pool.give(buf)
+            slots.release()
+
+    async def __abort(self, tasks):
+        # 等正在上传的分片结束之后再取消，否则取消之后仍可能留下分片
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            await self.bucket.abort_multipart_upload(self.key, self.__upload_id)
+        except exceptions.NoSuchUpload:
+            pass
+        except exceptions.OssError as e:
+            logger.warning(f"Abort multipart upload of stream failed, upload_id: {self.__upload_id}, error: {e}")
@@ -0,0 +1,335 @@
+"""可以暂停、恢复和取消的断点续传。
+
+:func:`start_resumable_upload <aliyun_oss_x.start_resumable_upload>` 、
+:func:`start_resumable_download <aliyun_oss_x.start_resumable_download>` 在后台线程中执行断点续传，立即返回
+:class:`TransferHandle` ；异步版本 `start_resumable_upload_async` 、 `start_resumable_download_async` 在后台任务
+中执行，返回 :class:`AsyncTransferHandle` 。
+
+    * `pause()` ：不再开始新的分片，断点下载正在下载的分片会尽快停止，断点上传正在上传的分片会上传完。
+      已经完成的分片保存在断点信息中，`resume()` 之后从断点信息继续传输；
+    * `cancel()` ：停止传输，取消分片上传或者删除下载的临时文件，并删除断点信息；
+    * `stats` ：已传输的字节数、速度和预计剩余时间。
+
+不需要分片的小文件无法暂停或者取消。
+
+用法 ::
+
+    >>> handle = aliyun_oss_x.start_resumable_download(bucket, key, filename)
+    >>> handle.pause()
+    >>> handle.resume()
+    >>> handle.wait()
+"""
+
+import time
+import asyncio
+import threading
+import contextvars
+import collections
+from typing import Any, Callable
+
+
+# 统计速度所用的时间窗口，以秒为单位
+_RATE_WINDOW = 5.0
+
+STATE_RUNNING = "running"
+STATE_PAUSED = "paused"
+STATE_COMPLETED = "completed"
+STATE_CANCELLED = "cancelled"
+STATE_FAILED = "failed"
+
+_transfer_control: contextvars.ContextVar["_TransferControl | None"] = contextvars.ContextVar(
+    "aliyun_oss_x_transfer_control", default=None
+)
+
+
+class _TransferStopped(Exception):
+    """暂停或者取消时由断点续传内部抛出，不会传给用户。"""
+
+
+class _TransferControl:
+    def __init__(self):
+        self.pause_requested = False
+        self.cancel_requested = False
+
+        # 最近一次创建的断点续传对象，暂停期间取消时用它清理
+        self.operation = None
+
+    def check(self):
+        if self.pause_requested or self.cancel_requested:
+            raise _TransferStopped()
+
+
+def _current_control() -> _TransferControl | None:
+    return _transfer_control.get()
+
+
+class TransferStats:
+    """传输的实时统计信息。
+
+    :param consumed_bytes: 已经传输的字节数
+    :param total_bytes: 总字节数，未知时为None
+    :param rate: 最近一段时间的平均速度，单位为字节/秒
+    :param eta: 预计剩余时间，以秒为单位，无法估算时为None
+    :param elapsed: 从开始到现在（或者结束）经过的时间，以秒为单位
+    """
+
+    def __init__(self, consumed_bytes: int, total_bytes: int | None, rate: float, eta: float | None, elapsed: float):
+        self.consumed_bytes = consumed_bytes
+        self.total_bytes = total_bytes
+        self.rate = rate
+        self.eta = eta
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (
+            f"TransferStats(consumed_bytes={self.consumed_bytes}, total_bytes={self.total_bytes}, "
+            f"rate={self.rate:.0f}, eta={self.eta}, elapsed={self.elapsed:.3f})"
+        )
+
+
+class _ProgressMeter:
+    """记录进度回调，计算速度和剩余时间，同时转发给用户的进度回调。"""
+
+    def __init__(self, progress_callback: Callable[[int, int | None], None] | None = None):
+        self.progress_callback = progress_callback
+        self.consumed_bytes = 0
+        self.total_bytes = None
+        self.__start = time.monotonic()
+        self.__end = None
+        self.__samples = collections.deque()
+        self.__lock = threading.Lock()
+
+    def __call__(self, consumed_bytes: int, total_bytes: int | None):
+        now = time.monotonic()
+        with self.__lock:
+            if consumed_bytes < self.consumed_bytes:
+                self.__samples.clear()
+            self.consumed_bytes = consumed_bytes
+            self.total_bytes = total_bytes
+            self.__samples.append((now, consumed_bytes))
+            while len(self.__samples) > 2 and now - self.__samples[0][0] > _RATE_WINDOW:
+                self.__samples.popleft()
+
+        if self.progress_callback:
+            self.progress_callback(consumed_bytes, total_bytes)
+
+    def stop(self):
+        self.__end = time.monotonic()
+        with self.__lock:
+            self.__samples.clear()
+
+    def stats(self) -> TransferStats:
+        now = self.__end or time.monotonic()
+        with self.__lock:
+            rate = 0.0
+            if len(self.__samples) >= 2:
+                (t0, b0), (t1, b1) = self.__samples[0], self.__samples[-1]
+                # 最近一个采样之后没有进度的时间也算在内，停滞时速度逐渐降低
+                rate = (b1 - b0) / max(now - t0, t1 - t0, 1e-9)
+
+            eta = None
+            if self.total_bytes is not None and self.consumed_bytes >= self.total_bytes:
+                eta = 0.0
+            elif self.total_bytes is not None and rate > 0:
+                eta = (self.total_bytes - self.consumed_bytes) / rate
+
+            return TransferStats(self.consumed_bytes, self.total_bytes, rate, eta, now - self.__start)
+
+
+class _TransferHandleBase:
+    def __init__(self, progress_callback: Callable[[int, int | None], None] | None = None):
+        self._control = _TransferControl()
+        self._meter = _ProgressMeter(progress_callback)
+        self._state = STATE_RUNNING
+        self.result: Any = None
+        self.exception: BaseException | None = None
+
+    @property
+    def state(self) -> str:
+        """传输状态：running、paused、completed、cancelled或者failed。"""
+        return self._state
+
+    @property
+    def stats(self) -> TransferStats:
+        """传输的实时统计信息，参见 :class:`TransferStats` 。"""
+        return self._meter.stats()
+
+    def done(self) -> bool:
+        """传输已经完成、取消或者失败。"""
+        return self._state in (STATE_COMPLETED, STATE_CANCELLED, STATE_FAILED)
+
+    def _finish(self, state, result=None, exception=None):
+        self._meter.stop()
+        self.result = result
+        self.exception = exception
+        self._state = state
+
+
+class TransferHandle(_TransferHandleBase):
+    """在后台线程中执行的断点续传，由 :func:`start_resumable_upload <aliyun_oss_x.start_resumable_upload>` 或者
+    :func:`start_resumable_download <aliyun_oss_x.start_resumable_download>` 创建。
+
+    :param func: 执行断点续传的函数，参数为进度回调
+    :param progress_callback: 用户的进度回调函数
+    """
+
+    def __init__(
+        self,
+        func: Callable[[Callable[[int, int | None], None]], Any],
+        progress_callback: Callable[[int, int | None], None] | None = None,
+    ):
+        super().__init__(progress_callback)
+        self.__func = func
+        self.__cond = threading.Condition()
+        self.__done = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, name="oss-transfer-handle", daemon=True)
+
+    def _start(self) -> "TransferHandle":
+        self.__thread.start()
+        return self
+
+    def pause(self):
+        """暂停传输，已完成的分片保存在断点信息中。"""
+        with self.__cond:
+            if not self.done():
+                self._control.pause_requested = True
+
+    def resume(self):
+        """从断点信息继续传输。"""
+        with self.__cond:
+            self._control.pause_requested = False
+            self.__cond.notify_all()
+
+    def cancel(self):
+        """取消传输，并清理已上传的分片或者已下载的临时文件。"""
+        with self.__cond:
+            if not self.done():
+                self._control.cancel_requested = True
+                self.__cond.notify_all()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """等待传输完成、取消或者失败，暂停期间会一直等待。
+
+        :param timeout: 最长等待的秒数，None表示一直等待
+        :return: 传输已经结束返回True，超时返回False
+        :raises: 传输失败时抛出导致失败的异常
+        """
+        if not self.__done.wait(timeout):
+            return False
+        if self.exception is not None:
+            raise self.exception
+        return True
+
+    def __run(self):
+        _transfer_control.set(self._control)
+        try:
+            while True:
+                try:
+                    result = self.__func(self._meter)
+                except _TransferStopped:
+                    if self.__wait_resumed():
+                        continue
+                    if self._control.operation is not None:
+                        self._control.operation._abort()
+                    self._finish(STATE_CANCELLED)
+                else:
+                    self._finish(STATE_COMPLETED, result=result)
+                return
+        except BaseException as e:
+            self._finish(STATE_FAILED, exception=e)
+        finally:
+            self.__done.set()
+
+    def __wait_resumed(self):
+        """暂停直到恢复或者取消，恢复时返回True。"""
+        with self.__cond:
+            if self._control.pause_requested and not self._control.cancel_requested:
+                self._state = STATE_PAUSED
+            while self._control.pause_requested and not self._control.cancel_requested:
+                self.__cond.wait()
+            if self._control.cancel_requested:
+                return False
+            self._state = STATE_RUNNING
+            return True
+
+
+class AsyncTransferHandle(_TransferHandleBase):
+    """在后台任务中执行的异步断点续传，由 `start_resumable_upload_async` 或者 `start_resumable_download_async` 创建。
+    `pause` 、 `resume` 和 `cancel` 需要在事件循环所在的线程中调用。
+
+    :param func: 执行断点续传的协程函数，参数为进度回调
+    :param progress_callback: 用户的进度回调函数
+    """
+
+    def __init__(
+        self,
+        func: Callable[[Callable[[int, int | None], None]], Any],
+        progress_callback: Callable[[int, int | None], None] | None = None,
+    ):
+        super().__init__(progress_callback)
+        self.__func = func
+        self.__wakeup = asyncio.Event()
+        self.__task = None
+
+    def _start(self) -> "AsyncTransferHandle":
+        self.__task = asyncio.get_running_loop().create_task(self.__run())
+        return self
+
+    def pause(self):
+        """暂停传输，已完成的分片保存在断点信息中。"""
+        if not self.done():
+            self._control.pause_requested = True
+
+    def resume(self):
+        """从断点信息继续传输。"""
+        self._control.pause_requested = False
+        self.__wakeup.set()
+
+    def cancel(self):
+        """取消传输，并清理已上传的分片或者已下载的临时文件。"""
+        if not self.done():
+            self._control.cancel_requested = True
+            self.__wakeup.set()
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """异步版本的 :meth:`TransferHandle.wait` 。"""
+        if self.__task is None:
+            raise RuntimeError("transfer is not started")
+        done, _ = await asyncio.wait([self.__task], timeout=timeout)
+        if not done:
+            return False
+        if self.exception is not None:
+            raise self.exception
+        return True
+
+    async def __run(self):
+        _transfer_control.set(self._control)
+        try:
+            while True:
+                try:
+                    result = await self.__func(self._meter)
+                except _TransferStopped:
+                    if await self.__wait_resumed():
+                        continue
+                    if self._control.operation is not None:
+                        await self._control.operation._abort()
+                    self._finish(STATE_CANCELLED)
+                else:
+                    self._finish(STATE_COMPLETED, result=result)
+                return
+        except asyncio.CancelledError:
+            self._finish(STATE_CANCELLED)
+            raise
+        except BaseException as e:
+            self._finish(STATE_FAILED, exception=e)
+
+    async def __wait_resumed(self):
+        if self._control.pause_requested and not self._control.cancel_requested:
+            self._state = STATE_PAUSED
+        while self._control.pause_requested and not self._control.cancel_requested:
+            self.__wakeup.clear()
+            await self.__wakeup.wait()
+        if self._control.cancel_requested:
+            return False
+        self._state = STATE_RUNNING
+        return True
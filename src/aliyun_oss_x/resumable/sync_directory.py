@@ -0,0 +1,413 @@
+"""上传、下载整个目录。
+
+:func:`upload_directory <aliyun_oss_x.upload_directory>` 和 :func:`download_directory <aliyun_oss_x.download_directory>`
+把目录中的每个文件交给 `resumable_upload` 、 `resumable_download` ：小文件用一次 `put_object` 或 `get_object` ，
+大文件分片传输并保存断点信息。
+
+文件之间也是并发的： `num_threads` 个任务在 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>` 中从同一个
+文件列表中依次取出文件传输，大量小文件时连接不会因为逐个等待请求返回而空闲。本地目录和OSS文件都是边列举边传输，
+不需要先把所有文件名保存在内存中。
+
+单个文件失败不会中断其他文件，结果汇总在 :class:`DirectoryTransferResult <aliyun_oss_x.DirectoryTransferResult>` 中。
+
+:func:`sync_directory <aliyun_oss_x.sync_directory>` 只上传有变化的文件，比较方法参见 :mod:`aliyun_oss_x.resumable._sync` 。
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from .. import defaults
+from .. import http
+from ..api import Bucket
+from ..crypto_bucket import CryptoBucket
+from ..exceptions import ClientError
+from ..iterators import ObjectIteratorV2
+from ..executor import TransferExecutor, get_default_executor
+from ..headers import OSS_REQUEST_PAYER
+from ._base import _populate_valid_headers, _check_pool_capacity
+from ._directory import DirectoryTransferResult, _DirectoryProgress, _matches, _walk_local, _local_path
+from ._sync import (
+    _SyncManifest,
+    _DELETE_BATCH_SIZE,
+    _default_manifest_path,
+    _local_files,
+    _unchanged,
+    _merge,
+    _file_crc64,
+)
+from .sync_resumable import resumable_upload, resumable_download, ResumableStore, ResumableDownloadStore
+
+
+logger = logging.getLogger(__name__)
+
+
+def upload_directory(
+    bucket: Bucket | CryptoBucket,
+    directory: str | Path,
+    prefix: str = "",
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    store: ResumableStore | None = None,
+    headers: dict | http.Headers | None = None,
+    multipart_threshold: int | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    part_num_threads: int | None = None,
+    executor: TransferExecutor | None = None,
+    priority: int = 0,
+) -> DirectoryTransferResult:
+    """上传目录下的所有文件（包括子目录），文件 `a/b.txt` 上传为 `prefix + 'a/b.txt'` 。
+
+    用法 ::
+
+        >>> result = aliyun_oss_x.upload_directory(bucket, 'logs', prefix='logs/', exclude=['*.tmp'])
+        >>> print(result.failed)
+
+    :param bucket: :class:`Bucket <aliyun_oss_x.Bucket>` 或者 ：:class:`CryptoBucket <aliyun_oss_x.CryptoBucket>` 对象
+    :param directory: 本地目录
+    :param prefix: OSS文件名的前缀，需要目录形式时以 `/` 结尾
+    :param include: glob模式列表，例如 `['*.csv', 'data/*']` ，只上传相对路径匹配其中之一的文件，None表示所有文件
+    :param exclude: glob模式列表，不上传相对路径匹配其中之一的文件，优先于 `include`
+    :param store: 用来保存断点信息的持久存储，所有文件共用。如不指定，则使用 `ResumableStore` 。
+    :param headers: 每个文件的HTTP头部，参见 :func:`resumable_upload <aliyun_oss_x.resumable_upload>`
+    :param multipart_threshold: 文件长度大于或等于该值时用分片上传，否则用 `put_object`
+    :param part_size: 分片大小，如不指定则自动计算
+    :param progress_callback: 整个目录的上传进度回调函数。本地目录还没有遍历完时总长度为None。参见 :ref:`progress_callback` 。
+    :param num_threads: 同时上传的文件数，如不指定则使用 `aliyun_oss_x.defaults.directory_num_threads`
+    :param part_num_threads: 每个大文件并发上传的分片数，如不指定则使用 `aliyun_oss_x.defaults.multipart_num_threads`
+    :param executor: 执行上传任务的线程池，缺省为进程内共用的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>` 。
+    :param priority: 上传任务的优先级，数值越大越优先
+
+    :return: :class:`DirectoryTransferResult <aliyun_oss_x.DirectoryTransferResult>`
+    """
+    logger.debug(
+        f"Start to upload directory, bucket: {bucket.bucket_name}, directory: {directory}, prefix: {prefix}, "
+        f"include: {include}, exclude: {exclude}, num_threads: {num_threads}"
+    )
+    store = store or ResumableStore()
+    progress = _DirectoryProgress(progress_callback)
+
+    def list_files():
+        for relative, path, stat in _walk_local(directory):
+            if _matches(relative, include, exclude):
+                progress.add_file(stat.st_size)
+                yield relative, (path, stat.st_size)
+
+    def upload(relative, item):
+        path, size = item
+        resumable_upload(
+            bucket,
+            prefix + relative,
+            str(path),
+            store=store,
+            headers=headers,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+            progress_callback=progress.file_callback(),
+            num_threads=part_num_threads,
+            executor=executor,
+            priority=priority,
+        )
+        return size
+
+    runner = _DirectoryRunner(bucket, list_files(), upload, progress, num_threads, executor, priority)
+    return runner.run()
+
+
+def download_directory(
+    bucket: Bucket | CryptoBucket,
+    prefix: str,
+    directory: str | Path,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    store: ResumableDownloadStore | None = None,
+    headers: dict | http.Headers | None = None,
+    multiget_threshold: int | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    part_num_threads: int | None = None,
+    executor: TransferExecutor | None = None,
+    priority: int = 0,
+) -> DirectoryTransferResult:
+    """下载以 `prefix` 开头的所有OSS文件，文件 `prefix + 'a/b.txt'` 下载为 `directory/a/b.txt` ，子目录自动创建。
+
+    以 `/` 结尾的文件（目录占位）被忽略；去掉前缀后不是合法相对路径（例如包含 `..` ）的文件记为失败，不会写到
+    `directory` 之外。
+
+    :param bucket: :class:`Bucket <aliyun_oss_x.Bucket>` 或者 ：:class:`CryptoBucket <aliyun_oss_x.CryptoBucket>` 对象
+    :param prefix: OSS文件名的前缀，需要目录形式时以 `/` 结尾
+    :param directory: 本地目录
+    :param include: glob模式列表，只下载去掉前缀后的文件名匹配其中之一的文件，None表示所有文件
+    :param exclude: glob模式列表，不下载去掉前缀后的文件名匹配其中之一的文件，优先于 `include`
+    :param store: 用来保存断点信息的持久存储，所有文件共用。如不指定，则使用 `ResumableDownloadStore` 。
+    :param headers: 每个文件的HTTP头部，参见 :func:`resumable_download <aliyun_oss_x.resumable_download>`
+    :param multiget_threshold: 文件长度大于或等于该值时分片下载，否则用 `get_object_to_file`
+    :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.multiget_part_size`
+    :param progress_callback: 整个目录的下载进度回调函数。OSS文件还没有列举完时总长度为None。参见 :ref:`progress_callback` 。
+    :param num_threads: 同时下载的文件数，如不指定则使用 `aliyun_oss_x.defaults.directory_num_threads`
+    :param part_num_threads: 每个大文件并发下载的分片数，如不指定则使用 `aliyun_oss_x.defaults.multiget_num_threads`
+    :param executor: 执行下载任务的线程池，缺省为进程内共用的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>` 。
+    :param priority: 下载任务的优先级，数值越大越优先
+
+    :return: :class:`DirectoryTransferResult <aliyun_oss_x.DirectoryTransferResult>`
+    """
+    logger.debug(
+        f"Start to download directory, bucket: {bucket.bucket_name}, prefix: {prefix}, directory: {directory}, "
+        f"include: {include}, exclude: {exclude}, num_threads: {num_threads}"
+    )
+    store = store or ResumableDownloadStore()
+    progress = _DirectoryProgress(progress_callback)
+    list_headers = _populate_valid_headers(headers, [OSS_REQUEST_PAYER])
+
+    def list_objects():
+        for obj in ObjectIteratorV2(bucket, prefix=prefix, headers=list_headers):
+            relative = obj.key[len(prefix) :]
+            if obj.key.endswith("/") or not _matches(relative, include, exclude):
+                continue
+            progress.add_file(obj.size)
+            yield relative, obj
+
+    def download(relative, obj):
+        path = _local_path(directory, relative)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        resumable_download(
+            bucket,
+            obj.key,
+            str(path),
+            multiget_threshold=multiget_threshold,
+            part_size=part_size,
+            progress_callback=progress.file_callback(),
+            num_threads=part_num_threads,
+            store=store,
+            headers=headers,
+            executor=executor,
+            priority=priority,
+        )
+        return obj.size
+
+    runner = _DirectoryRunner(bucket, list_objects(), download, progress, num_threads, executor, priority)
+    return runner.run()
+
+
+def sync_directory(
+    bucket: Bucket,
+    directory: str | Path,
+    prefix: str = "",
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    delete: bool = False,
+    manifest: str | Path | None = None,
+    store: ResumableStore | None = None,
+    headers: dict | http.Headers | None = None,
+    multipart_threshold: int | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    part_num_threads: int | None = None,
+    executor: TransferExecutor | None = None,
+    priority: int = 0,
+) -> DirectoryTransferResult:
+    """把本地目录同步到OSS：只上传新增或者有变化的文件，可选删除OSS上多余的文件。
+
+    OSS文件通过一次ListObjectsV2列举，和本地目录按文件名顺序归并比较。上次同步的结果保存在本地清单中，
+    长度、修改时间和ETag都没有变化的文件直接跳过，不需要读取本地文件，也不需要逐个HEAD；只有长度相同但
+    无法确定是否变化的文件才计算CRC64比较。
+
+    用法 ::
+
+        >>> result = aliyun_oss_x.sync_directory(bucket, 'data', prefix='data/', delete=True)
+        >>> print(len(result.succeeded), len(result.skipped), len(result.deleted))
+
+    :param bucket: :class:`Bucket <aliyun_oss_x.Bucket>` 对象，不支持 :class:`CryptoBucket <aliyun_oss_x.CryptoBucket>`
+    :param directory: 本地目录
+    :param prefix: OSS文件名的前缀，需要目录形式时以 `/` 结尾
+    :param include: glob模式列表，只同步相对路径匹配其中之一的文件，None表示所有文件
+    :param exclude: glob模式列表，不同步相对路径匹配其中之一的文件，优先于 `include` 。不同步的OSS文件也不会被删除。
+    :param delete: 是否删除本地不存在的OSS文件，每 `1000` 个文件调用一次 `batch_delete_objects`
+    :param manifest: 本地清单（SQLite数据库）的路径，缺省保存在 `HOME` 目录下，每个Bucket、前缀和本地目录一个文件
+    :param store: 用来保存断点信息的持久存储，所有文件共用。如不指定，则使用 `ResumableStore` 。
+    :param headers: 每个文件的HTTP头部，参见 :func:`resumable_upload <aliyun_oss_x.resumable_upload>`
+    :param multipart_threshold: 文件长度大于或等于该值时用分片上传，否则用 `put_object`
+    :param part_size: 分片大小，如不指定则自动计算
+    :param progress_callback: 需要上传的文件的进度回调函数，比较后不需要上传的文件计为已完成。参见 :ref:`progress_callback` 。
+    :param num_threads: 同时上传、比较的文件数，如不指定则使用 `aliyun_oss_x.defaults.directory_num_threads`
+    :param part_num_threads: 每个大文件并发上传的分片数，如不指定则使用 `aliyun_oss_x.defaults.multipart_num_threads`
+    :param executor: 执行任务的线程池，缺省为进程内共用的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>` 。
+    :param priority: 任务的优先级，数值越大越优先
+
+    :return: :class:`DirectoryTransferResult <aliyun_oss_x.DirectoryTransferResult>` ，没有变化的文件记在 `skipped` 中，
+        删除的OSS文件记在 `deleted` 中
+    """
+    logger.debug(
+        f"Start to sync directory, bucket: {bucket.bucket_name}, directory: {directory}, prefix: {prefix}, "
+        f"include: {include}, exclude: {exclude}, delete: {delete}, num_threads: {num_threads}"
+    )
+    if isinstance(bucket, CryptoBucket):
+        raise ClientError(
+            "sync_directory does not support CryptoBucket, the CRC64 of encrypted objects can not be compared"
+        )
+
+    store = store or ResumableStore()
+    progress = _DirectoryProgress(progress_callback)
+    list_headers = _populate_valid_headers(headers, [OSS_REQUEST_PAYER])
+    num_threads = defaults.get(num_threads, defaults.directory_num_threads)
+    executor = executor or get_default_executor()
+    records = _SyncManifest(manifest or _default_manifest_path(bucket.bucket_name, prefix, directory))
+
+    deletes = executor.transfer(num_threads, priority=priority)
+    delete_lock = threading.Lock()
+    deleted = []
+    delete_failed = {}
+
+    def delete_batch(keys):
+        try:
+            result = bucket.batch_delete_objects(keys, headers=list_headers)
+        except Exception as e:
+            logger.warning(f"Failed to delete {len(keys)} objects: {e}")
+            with delete_lock:
+                delete_failed.update((key[len(prefix) :], e) for key in keys)
+            return
+
+        relatives = [key[len(prefix) :] for key in result.deleted_keys]
+        records.delete(relatives)
+        with delete_lock:
+            deleted.extend(relatives)
+
+    def remote_objects():
+        for obj in ObjectIteratorV2(bucket, prefix=prefix, headers=list_headers):
+            relative = obj.key[len(prefix) :]
+            if not obj.key.endswith("/") and _matches(relative, include, exclude):
+                yield relative, obj
+
+    def list_changes():
+        batch = []
+        for relative, local, obj in _merge(_local_files(directory, include, exclude, records), remote_objects()):
+            if local is None:
+                if delete:
+                    batch.append(obj.key)
+                    if len(batch) == _DELETE_BATCH_SIZE:
+                        deletes.submit(delete_batch, batch)
+                        batch = []
+            elif obj is not None and _unchanged(local, obj):
+                yield relative, None
+            else:
+                progress.add_file(local.size)
+                yield relative, (local, obj)
+
+        if batch:
+            deletes.submit(delete_batch, batch)
+
+    def sync_one(relative, item):
+        if item is None:
+            return None
+
+        local, obj = item
+        crc = None
+        if obj is not None and obj.size == local.size:
+            crc = _file_crc64(local.path)
+            record = local.record
+            if record is not None and record.etag == obj.etag and record.crc64 == crc:
+                etag = obj.etag
+            else:
+                meta = bucket.head_object(obj.key, headers=list_headers)
+                etag = meta.etag if meta.server_crc == crc else None
+
+            if etag is not None:
+                records.put(relative, local.size, local.mtime_ns, crc, etag)
+                callback = progress.file_callback()
+                if callback is not None:
+                    callback(local.size, local.size)
+                return None
+
+        result = resumable_upload(
+            bucket,
+            prefix + relative,
+            str(local.path),
+            store=store,
+            headers=headers,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+            progress_callback=progress.file_callback(),
+            num_threads=part_num_threads,
+            executor=executor,
+            priority=priority,
+        )
+        records.put(relative, local.size, local.mtime_ns, crc if result.crc is None else result.crc, result.etag)
+        return local.size
+
+    try:
+        runner = _DirectoryRunner(bucket, list_changes(), sync_one, progress, num_threads, executor, priority)
+        result = runner.run()
+    finally:
+        deletes.wait()
+        records.close()
+
+    result.deleted.extend(deleted)
+    result.failed.update(delete_failed)
+    return result
+
+
+class _DirectoryRunner:
+    """`num_threads` 个任务从 `items` 中依次取出文件，调用 `transfer_one(relative, item)` 传输，返回传输的字节数，
+    不需要传输时返回None。
+
+    列举文件出错时整个目录传输失败，单个文件出错时记录在结果中，继续传输其他文件。
+    """
+
+    def __init__(
+        self,
+        bucket,
+        items: Iterator,
+        transfer_one: Callable,
+        progress: _DirectoryProgress,
+        num_threads: int | None,
+        executor: TransferExecutor | None,
+        priority: int,
+    ):
+        self.__items = items
+        self.__transfer_one = transfer_one
+        self.__progress = progress
+        self.__num_threads = defaults.get(num_threads, defaults.directory_num_threads)
+        _check_pool_capacity(bucket, self.__num_threads)
+        self.__executor = executor or get_default_executor()
+        self.__priority = priority
+
+        # protect below fields
+        self.__lock = threading.Lock()
+        self.__result = DirectoryTransferResult()
+
+    def run(self) -> DirectoryTransferResult:
+        transfer = self.__executor.transfer(self.__num_threads, priority=self.__priority)
+        for _ in range(self.__num_threads):
+            transfer.submit(self.__worker)
+        transfer.wait()
+
+        result = self.__result
+        logger.debug(f"Directory transfer done: {result}")
+        return result
+
+    def __worker(self):
+        while True:
+            with self.__lock:
+                relative, item = next(self.__items, (None, None))
+                if relative is None:
+                    self.__progress.listed()
+                    return
+
+            try:
+                size = self.__transfer_one(relative, item)
+            except Exception as e:
+                logger.warning(f"Failed to transfer {relative}: {e}")
+                with self.__lock:
+                    self.__result.failed[relative] = e
+            else:
+                with self.__lock:
+                    if size is None:
+                        self.__result.skipped.append(relative)
+                    else:
+                        self.__result.succeeded.append(relative)
+                        self.__result.transferred_bytes += size
@@ -27,7 +27,8 @@ from ..iterators import PartIterator
 from ..crypto_bucket import CryptoBucket
 
 from ..models import PartInfo
-from ..task_queue import TaskQueue
+from ..concurrency import AdaptiveConcurrency
+from ..executor import TransferExecutor, get_default_executor
 from ..headers import (
     OSS_OBJECT_ACL,
     OSS_REQUEST_PAYER,
@@ -36,6 +37,7 @@ from ..headers import (
     IF_UNMODIFIED_SINCE,
     OSS_SERVER_SIDE_ENCRYPTION,
     OSS_SERVER_SIDE_DATA_ENCRYPTION,
+    OSS_COPY_OBJECT_SOURCE_IF_MATCH,
 )
 from ._base import (
     _normalize_path,
@@ -50,8 +52,19 @@ from ._base import (
     _populate_valid_params,
     determine_part_size,
     _determine_part_size_internal,
+    _check_pool_capacity,
     _ObjectInfo,
+    _StragglerSplitter,
+    _truncated_crc,
+    _parts_to_download,
+    _SPLIT_POLL_INTERVAL,
+    _source_bucket,
+    _copy_metadata,
+    _make_copy_store_key,
+    _verify_uploaded_parts,
 )
+from ._writer import _FileWriter, _DOWNLOAD_CHUNK_SIZE
+from .handle import TransferHandle, _current_control
 
 
 logger = logging.getLogger(__name__)
@@ -68,6 +81,10 @@ def resumable_upload(
     progress_callback: Callable[[int, int | None], None] | None = None,
     num_threads: int | None = None,
     params: dict | None = None,
+    concurrency: AdaptiveConcurrency | None = None,
+    executor: TransferExecutor | None = None,
+    priority: int = 0,
+    verify_parts: bool = False,
 ):
     """断点上传本地文件。
 
@@ -101,6 +118,14 @@ def resumable_upload(
         # 只有'sequential'这个参数才会被传递到外部函数init_multipart_upload中。
         # 其他参数视为无效参数不会往外部函数传递。
     :type params: dict
+
+    :param concurrency: 自适应并发控制器，指定时忽略 `num_threads` ，并发数在 `concurrency.max_limit` 以内动态调整。
+        参见 :class:`AdaptiveConcurrency <aliyun_oss_x.AdaptiveConcurrency>` 。
+
+    :param executor: 执行分片任务的线程池，缺省为进程内共用的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>` 。
+    :param priority: 分片任务的优先级，数值越大越优先
+    :param verify_parts: 从断点继续上传时，是否重新计算已上传分片对应的本地数据的MD5并和分片的ETag比较。不一致的分片
+        重新上传；一致的分片补上CRC64，上传完成时可以校验整个文件的CRC64。使用CryptoBucket时忽略该参数。
     """
     logger.debug(
         f"Start to resumable upload, bucket: {bucket.bucket_name}, key: {key}, filename: {filename}, headers: {headers}, "
@@ -122,6 +147,10 @@ def resumable_upload(
             progress_callback=progress_callback,
             num_threads=num_threads,
             params=params,
+            concurrency=concurrency,
+            executor=executor,
+            priority=priority,
+            verify_parts=verify_parts,
         )
         result = uploader.upload()
     else:
@@ -142,6 +171,9 @@ def resumable_download(
     store: "ResumableDownloadStore | None" = None,
     params: dict | None = None,
     headers: dict | http.Headers | None = None,
+    concurrency: AdaptiveConcurrency | None = None,
+    executor: TransferExecutor | None = None,
+    priority: int = 0,
 ):
     """断点下载。
 
@@ -180,6 +212,12 @@ def resumable_download(
         # 调用外部函数get_object_to_file, get_object目前需要向下传递的值有OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
     :type headers: 可以是dict，建议是aliyun_oss_x.Headers
 
+    :param concurrency: 自适应并发控制器，指定时忽略 `num_threads` ，并发数在 `concurrency.max_limit` 以内动态调整。
+        参见 :class:`AdaptiveConcurrency <aliyun_oss_x.AdaptiveConcurrency>` 。
+
+    :param executor: 执行分片任务的线程池，缺省为进程内共用的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>` 。
+    :param priority: 分片任务的优先级，数值越大越优先
+
     :raises: 如果OSS文件不存在，则抛出 :class:`NotFound <aliyun_oss_x.exceptions.NotFound>` ；也有可能抛出其他因下载文件而产生的异常。
     """
     logger.debug(
@@ -205,6 +243,9 @@ def resumable_download(
             store=store,
             params=params,
             headers=valid_headers,
+            concurrency=concurrency,
+            executor=executor,
+            priority=priority,
         )
         downloader.download(result.server_crc)
     else:
@@ -213,6 +254,129 @@ def resumable_download(
         )
 
 
+def resumable_copy(
+    bucket: Bucket,
+    src_bucket: Bucket | str,
+    src_key: str,
+    dst_key: str,
+    store: "ResumableStore | None" = None,
+    headers: dict | http.Headers | None = None,
+    multipart_threshold: int | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    params: dict | None = None,
+    executor: TransferExecutor | None = None,
+    priority: int = 0,
+):
+    """断点拷贝，把源文件拷贝到 `bucket` 中的 `dst_key` ，数据不经过客户端。
+
+    源文件长度小于 `multipart_threshold` 时调用一次 `copy_object` ；否则按 `part_size` 分片，并发调用
+    `upload_part_copy` ，每完成一个分片就把分片信息保存到 `store` 中。如果拷贝中断，下次拷贝同样的源文件
+    到同样的目标文件时，只拷贝缺失的分片。每个分片都带有源文件的ETag（ `x-oss-copy-source-if-match` ），
+    源文件在拷贝过程中被修改时抛出 :class:`PreconditionFailed <aliyun_oss_x.exceptions.PreconditionFailed>` 。
+
+    使用该函数应注意如下细节：
+        #. 源Bucket和目标Bucket需要在同一地域
+        #. 分片拷贝时目标文件的元数据（Content-Type、 `x-oss-meta-` 等）从源文件复制， `headers` 中的同名头部优先
+        #. 不支持CryptoBucket
+
+    :param bucket: 目标文件所在的 :class:`Bucket <aliyun_oss_x.Bucket>` 对象
+    :param src_bucket: 源Bucket名，或者源Bucket的 :class:`Bucket <aliyun_oss_x.Bucket>` 对象。
+        只给出Bucket名时，用 `bucket` 的认证信息读取源文件的信息。
+    :param src_key: 源文件名
+    :param dst_key: 目标文件名
+    :param store: 用来保存断点信息的持久存储，参见 :class:`ResumableStore` 的接口。如不指定，则使用 `ResumableStore` 。
+
+    :param headers: HTTP头部
+        # 调用外部函数copy_object 或 init_multipart_upload传递完整headers
+        # 调用外部函数upload_part_copy目前只传递OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
+        # 调用外部函数complete_multipart_upload目前只传递OSS_REQUEST_PAYER, OSS_OBJECT_ACL
+    :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+    :param multipart_threshold: 源文件长度大于或等于该值时使用分片拷贝，如不指定则使用 `aliyun_oss_x.defaults.copy_threshold`
+    :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.copy_part_size` ，分片过多时自动调大
+    :param progress_callback: 拷贝进度回调函数，在每个分片完成后调用。参见 :ref:`progress_callback` 。
+    :param num_threads: 并发拷贝的分片数，如不指定则使用 `aliyun_oss_x.defaults.copy_num_threads` 。
+
+    :param params: 源文件的请求参数，可以传入versionId拷贝指定版本的文件
+    :type params: dict
+
+    :param executor: 执行分片任务的线程池，缺省为进程内共用的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>` 。
+    :param priority: 分片任务的优先级，数值越大越优先
+
+    :return: :class:`PutObjectResult <aliyun_oss_x.models.PutObjectResult>`
+    """
+    source = _source_bucket(bucket, src_bucket)
+    if isinstance(bucket, CryptoBucket) or isinstance(source, CryptoBucket):
+        raise exceptions.ClientError("resumable copy does not support CryptoBucket")
+
+    logger.debug(
+        f"Start to resumable copy, source bucket: {source.bucket_name}, source key: {src_key}, bucket: {bucket.bucket_name}, "
+        f"key: {dst_key}, headers: {headers}, multipart_threshold: {multipart_threshold}, part_size: {part_size}, "
+        f"num_threads: {num_threads}"
+    )
+    valid_headers = _populate_valid_headers(headers, [OSS_REQUEST_PAYER])
+    valid_params = _populate_valid_params(params, [Bucket.VERSIONID])
+    result = source.head_object(src_key, params=valid_params, headers=valid_headers)
+    multipart_threshold = defaults.get(multipart_threshold, defaults.copy_threshold)
+
+    logger.debug(f"The size of object to copy is: {result.content_length}, multipart_threshold: {multipart_threshold}")
+    if (result.content_length or 0) >= multipart_threshold:
+        copier = _ResumableCopier(
+            bucket,
+            source,
+            src_key,
+            dst_key,
+            result,
+            store,
+            headers=headers,
+            part_size=part_size,
+            progress_callback=progress_callback,
+            num_threads=num_threads,
+            params=valid_params,
+            executor=executor,
+            priority=priority,
+        )
+        return copier.copy()
+
+    return bucket.copy_object(source.bucket_name, src_key, dst_key, headers=headers, params=valid_params)
+
+
+def start_resumable_upload(
+    bucket: Bucket | CryptoBucket,
+    key: str,
+    filename: str,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    **kwargs,
+) -> TransferHandle:
+    """在后台线程中断点上传本地文件，立即返回可以暂停、恢复和取消的 :class:`TransferHandle <aliyun_oss_x.TransferHandle>` 。
+
+    参数与 :func:`resumable_upload` 相同，上传结果保存在 `TransferHandle.result` 中。
+    """
+    return TransferHandle(
+        lambda progress: resumable_upload(bucket, key, filename, progress_callback=progress, **kwargs),
+        progress_callback,
+    )._start()
+
+
+def start_resumable_download(
+    bucket: Bucket | CryptoBucket,
+    key: str,
+    filename: str,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    **kwargs,
+) -> TransferHandle:
+    """在后台线程中断点下载，立即返回可以暂停、恢复和取消的 :class:`TransferHandle <aliyun_oss_x.TransferHandle>` 。
+
+    参数与 :func:`resumable_download` 相同。
+    """
+    return TransferHandle(
+        lambda progress: resumable_download(bucket, key, filename, progress_callback=progress, **kwargs),
+        progress_callback,
+    )._start()
+
+
 class _ResumableOperation:
     def __init__(
         self,
@@ -223,6 +387,7 @@ class _ResumableOperation:
         store: "ResumableStore | ResumableDownloadStore",
         progress_callback: Callable[[int, int | None], None] | None = None,
         versionid: str | None = None,
+        record_key: str | None = None,
     ):
         self.bucket = bucket
         self.key = key
@@ -233,7 +398,9 @@ class _ResumableOperation:
 
         self.__store = store
 
-        if versionid is None:
+        if record_key is not None:
+            self.__record_key = record_key
+        elif versionid is None:
             self.__record_key = self.__store.make_store_key(bucket.bucket_name, self.key, self._abspath)
         else:
             self.__record_key = self.__store.make_store_key(bucket.bucket_name, self.key, self._abspath, versionid)
@@ -244,6 +411,13 @@ class _ResumableOperation:
         self.__plock = threading.Lock()
         self.__progress_callback = progress_callback
 
+        self._control = _current_control()
+        if self._control is not None:
+            self._control.operation = self
+
+        # 由子类设置，指定时 _run_part 在它的并发限制内传输分片
+        self._concurrency: AdaptiveConcurrency | None = None
+
     def _del_record(self):
         self.__store.delete(self.__record_key)
 
@@ -258,6 +432,18 @@ class _ResumableOperation:
             with self.__plock:
                 self.__progress_callback(consumed_size, self.size)
 
+    def _check_stopped(self):
+        """通过 :class:`TransferHandle <aliyun_oss_x.TransferHandle>` 暂停或者取消时抛出异常，结束传输。"""
+        if self._control is not None:
+            self._control.check()
+
+    def _run_part(self, func, part):
+        """传输一个分片，指定了 `_concurrency` 时由它控制并发数。"""
+        self._check_stopped()
+        if self._concurrency is None:
+            return func(part)
+        return self._concurrency.run(functools.partial(func, part), part.size)
+
 
 class _ResumableDownloader(_ResumableOperation):
     def __init__(
@@ -272,6 +458,9 @@ class _ResumableDownloader(_ResumableOperation):
         num_threads: int | None = None,
         params: dict | None = None,
         headers: dict | http.Headers | None = None,
+        concurrency: AdaptiveConcurrency | None = None,
+        executor: TransferExecutor | None = None,
+        priority: int = 0,
     ):
         versionid = None
         if params is not None and params.get("versionId") is not None:
@@ -291,9 +480,17 @@ class _ResumableDownloader(_ResumableOperation):
         self.__part_size = _determine_part_size_internal(self.size, self.__part_size, _MAX_MULTIGET_PART_COUNT)
 
         self.__tmp_file = None
+        self.__writer = None
         self.__num_threads = defaults.get(num_threads, defaults.multiget_num_threads)
+        self._concurrency = concurrency
+        if concurrency is not None:
+            self.__num_threads = concurrency.max_limit
+        _check_pool_capacity(bucket, self.__num_threads)
+        self.__executor = executor or get_default_executor()
+        self.__priority = priority
         self.__finished_parts = None
         self.__finished_size = None
+        self.__splitter = None
         self.__params = params
         self.__headers = headers
 
@@ -314,16 +511,15 @@ class _ResumableDownloader(_ResumableOperation):
         if self.__tmp_file is None:
             raise FileNotFoundError("tmp file not found")
 
-        open(self.__tmp_file, "a").close()
-
-        q = TaskQueue(
-            functools.partial(self.__producer, parts_to_download=parts_to_download),
-            [self.__consumer] * self.__num_threads,
-        )
-        q.run()
+        with _FileWriter(self.__tmp_file, self.size, use_mmap=defaults.multiget_use_mmap) as writer:
+            self.__writer = writer
+            transfer = self.__executor.transfer(self.__num_threads, priority=self.__priority)
+            for part in parts_to_download:
+                transfer.submit(self._run_part, self.__download_part, part)
+            self.__wait(transfer)
 
         if self.bucket.enable_crc and self.__finished_parts:
-            parts = sorted(self.__finished_parts, key=lambda p: p.part_number)
+            parts = sorted(self.__finished_parts, key=lambda p: p.start)
             object_crc = calc_obj_crc_from_parts(parts)
             check_crc("resume download", object_crc, server_crc, None)
 
@@ -332,47 +528,80 @@ class _ResumableDownloader(_ResumableOperation):
         self._report_progress(self.size)
         self._del_record()
 
-    def __producer(self, q, parts_to_download=None):
-        if parts_to_download is None:
+    def __wait(self, transfer):
+        if self.__splitter is None:
+            transfer.wait()
             return
-        for part in parts_to_download:
-            q.put(part)
-
-    def __consumer(self, q):
-        while q.ok():
-            part = q.get()
-            if part is None:
-                break
 
-            self.__download_part(part)
+        # 分片都已开始下载并且还有空闲名额时，拆分慢分片尚未下载的部分
+        while not transfer.wait(_SPLIT_POLL_INTERVAL):
+            while transfer.ok() and transfer.idle:
+                part = self.__splitter.split()
+                if part is None:
+                    break
+                transfer.submit(self._run_part, self.__download_part, part)
 
     def __download_part(self, part):
         self._report_progress(self.__finished_size)
 
-        if self.__tmp_file is None:
+        if self.__writer is None:
             raise FileNotFoundError("tmp file not found")
 
-        with open(self.__tmp_file, "rb+") as f:
-            f.seek(part.start, 0)
+        f = self.__writer.sink(part.start)
 
-            headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
-            if headers is None:
-                headers = http.Headers()
-            headers[IF_MATCH] = self.objectInfo.etag or ""
-            headers[IF_UNMODIFIED_SINCE] = http_date(self.objectInfo.mtime)
+        headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
+        if headers is None:
+            headers = http.Headers()
+        headers[IF_MATCH] = self.objectInfo.etag or ""
+        headers[IF_UNMODIFIED_SINCE] = http_date(self.objectInfo.mtime)
 
-            result = self.bucket.get_object(
+        running = self.__splitter.start(part) if self.__splitter is not None else None
+        try:
+            with self.bucket.get_object(
                 self.key, byte_range=(part.start, part.end - 1), headers=headers, params=self.__params
-            )
-            copyfileobj_and_verify(result, f, part.end - part.start, request_id=result.request_id)
+            ) as result:
+                if running is None:
+                    copyfileobj_and_verify(
+                        result, f, part.end - part.start, chunk_size=_DOWNLOAD_CHUNK_SIZE, request_id=result.request_id
+                    )
+                    part.part_crc = result.client_crc
+                else:
+                    part.part_crc = self.__copy_part(result, f, running)
+        except BaseException:
+            if running is not None:
+                self.__splitter.finish(running, ok=False)
+            raise
+        if running is not None:
+            self.__splitter.finish(running)
 
-        part.part_crc = result.client_crc
         logger.debug(
             f"down part success, add part info to record, part_number: {part.part_number}, start: {part.start}, end: {part.end}"
         )
 
         self.__finish_part(part)
 
+    def __copy_part(self, result, f, running, chunk_size=_DOWNLOAD_CHUNK_SIZE):
+        """把分片写入临时文件，分片被拆分后只写到新的 `end` 为止，返回写入部分的CRC。"""
+        while True:
+            self._check_stopped()
+            crc = result.client_crc
+            buf = result.read(min(chunk_size, running.part.end - running.position))
+            if not buf:
+                break
+
+            size, done = self.__splitter.advance(running, len(buf))
+            if size < len(buf):
+                f.write(buf[:size])
+                return _truncated_crc(crc, buf[:size])
+
+            f.write(buf)
+            if done:
+                break
+
+        if running.position != running.part.end:
+            raise exceptions.InconsistentError("IncompleteRead from source", result.request_id)
+        return result.client_crc
+
     def __load_record(self):
         record = self._get_record()
         logger.debug(f"Load record return {record}")
@@ -425,10 +654,14 @@ class _ResumableDownloader(_ResumableOperation):
         if self.__finished_parts is None:
             return []
 
-        all_set = set(_split_to_parts(self.size, self.__part_size))
-        finished_set = set(self.__finished_parts)
+        parts = _parts_to_download(self.size, self.__part_size, self.__finished_parts)
+
+        # CryptoBucket解密时对范围的起点有对齐要求，不拆分
+        if parts and not isinstance(self.bucket, CryptoBucket):
+            next_part_number = max(p.part_number for p in parts + self.__finished_parts) + 1
+            self.__splitter = _StragglerSplitter(next_part_number)
 
-        return sorted(list(all_set - finished_set), key=lambda p: p.part_number)
+        return parts
 
     def __is_record_sane(self, record):
         try:
@@ -477,6 +710,12 @@ class _ResumableDownloader(_ResumableOperation):
             )
             self._put_record(self.__record)
 
+    def _abort(self):
+        """取消时删除临时文件和断点信息。"""
+        if self.__tmp_file is not None:
+            silently_remove(self.__tmp_file)
+        self._del_record()
+
     def __gen_tmp_suffix(self):
         return ".tmp-" + "".join(random.choice(string.ascii_lowercase) for i in range(12))
 
@@ -493,6 +732,7 @@ class _ResumableUploader(_ResumableOperation):
     :param part_size: 分片大小。优先使用用户提供的值。如果用户没有指定，那么对于新上传，计算出一个合理值；对于老的上传，采用第一个
         分片的大小。
     :param progress_callback: 上传进度回调函数。参见 :ref:`progress_callback` 。
+    :param verify_parts: 是否校验断点记录中已上传的分片和本地数据一致
     """
 
     def __init__(
@@ -507,6 +747,10 @@ class _ResumableUploader(_ResumableOperation):
         progress_callback: Callable[[int, int | None], None] | None = None,
         num_threads: int | None = None,
         params: dict | None = None,
+        concurrency: AdaptiveConcurrency | None = None,
+        executor: TransferExecutor | None = None,
+        priority: int = 0,
+        verify_parts: bool = False,
     ):
         super(_ResumableUploader, self).__init__(
             bucket, key, filename, size, store or ResumableStore(), progress_callback=progress_callback
@@ -520,10 +764,17 @@ class _ResumableUploader(_ResumableOperation):
         self.__mtime = Path(filename).stat().st_mtime
 
         self.__num_threads = defaults.get(num_threads, defaults.multipart_num_threads)
+        self._concurrency = concurrency
+        if concurrency is not None:
+            self.__num_threads = concurrency.max_limit
+        _check_pool_capacity(bucket, self.__num_threads)
+        self.__executor = executor or get_default_executor()
+        self.__priority = priority
 
         self.__upload_id: str = ""
 
         self.__params = params
+        self.__verify_parts = verify_parts
 
         # protect below fields
         self.__lock = threading.Lock()
@@ -549,10 +800,10 @@ class _ResumableUploader(_ResumableOperation):
         parts_to_upload = sorted(parts_to_upload, key=lambda p: p.part_number)
         logger.debug(f"Parts need to upload: {parts_to_upload}")
 
-        q = TaskQueue(
-            functools.partial(self.__producer, parts_to_upload=parts_to_upload), [self.__consumer] * self.__num_threads
-        )
-        q.run()
+        transfer = self.__executor.transfer(self.__num_threads, priority=self.__priority)
+        for part in parts_to_upload:
+            transfer.submit(self._run_part, self.__upload_part, part)
+        transfer.wait()
 
         self._report_progress(self.size)
 
@@ -564,20 +815,6 @@ class _ResumableUploader(_ResumableOperation):
 
         return result
 
-    def __producer(self, q, parts_to_upload=None):
-        if parts_to_upload is None:
-            return
-        for part in parts_to_upload:
-            q.put(part)
-
-    def __consumer(self, q):
-        while True:
-            part = q.get()
-            if part is None:
-                break
-
-            self.__upload_part(part)
-
     def __upload_part(self, part):
         with Path(self.filename).open("rb") as f:
             self._report_progress(self.__finished_size)
@@ -603,6 +840,15 @@ class _ResumableUploader(_ResumableOperation):
             )
             self.__finish_part(PartInfo(part.part_number, result.etag, size=part.size, part_crc=result.crc))
 
+    def _abort(self):
+        """取消时取消分片上传并删除断点信息。"""
+        if self.__upload_id:
+            try:
+                self.bucket.abort_multipart_upload(self.key, self.__upload_id)
+            except exceptions.NoSuchUpload:
+                pass
+        self._del_record()
+
     def __finish_part(self, part_info: PartInfo):
         with self.__lock:
             self.__finished_parts.append(part_info)
@@ -710,6 +956,10 @@ class _ResumableUploader(_ResumableOperation):
                 raise exceptions.InvalidEncryptionRequest(err_msg)
 
         self.__finished_parts = self.__get_finished_parts()
+        if self.__verify_parts and not self.__encryption and self.__finished_parts:
+            self.__finished_parts = _verify_uploaded_parts(
+                self.filename, self.size, self.__part_size, self.__finished_parts
+            )
         self.__finished_size = sum(p.size or 0 for p in self.__finished_parts)
 
     def __get_finished_parts(self) -> list[PartInfo]:
@@ -778,6 +1028,242 @@ class _ResumableUploader(_ResumableOperation):
         return True
 
 
+class _ResumableCopier(_ResumableOperation):
+    """以断点续传方式分片拷贝文件。
+
+    :param bucket: 目标文件所在的 :class:`Bucket <aliyun_oss_x.Bucket>` 对象
+    :param source: 源文件所在的 :class:`Bucket <aliyun_oss_x.Bucket>` 对象
+    :param src_key: 源文件名
+    :param key: 目标文件名
+    :param head_result: 源文件的 :class:`HeadObjectResult <aliyun_oss_x.models.HeadObjectResult>`
+    :param store: 用来保存进度的持久化存储
+    :param headers: 传给 `init_multipart_upload` 的HTTP头部，覆盖从源文件复制的元数据
+    :param part_size: 分片大小。对于老的拷贝，采用断点信息中的分片大小。
+    :param progress_callback: 拷贝进度回调函数。参见 :ref:`progress_callback` 。
+    """
+
+    def __init__(
+        self,
+        bucket: Bucket,
+        source: Bucket,
+        src_key: str,
+        key: str,
+        head_result: models.HeadObjectResult,
+        store: "ResumableStore | None" = None,
+        headers: dict | http.Headers | None = None,
+        part_size: int | None = None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        num_threads: int | None = None,
+        params: dict | None = None,
+        executor: TransferExecutor | None = None,
+        priority: int = 0,
+    ):
+        self.__version_id = (params or {}).get(Bucket.VERSIONID)
+        super(_ResumableCopier, self).__init__(
+            bucket,
+            key,
+            f"oss://{source.bucket_name}/{src_key}",
+            head_result.content_length,
+            store or ResumableStore(),
+            progress_callback=progress_callback,
+            record_key=_make_copy_store_key(bucket.bucket_name, key, source.bucket_name, src_key, self.__version_id),
+        )
+
+        self.__op = "ResumableCopy"
+        self.source = source
+        self.src_key = src_key
+        self.objectInfo = _ObjectInfo.make(head_result)
+        self.__server_crc = head_result.server_crc
+        self.__src_headers = head_result.headers
+        self.__headers = headers
+        self.__part_size = determine_part_size(self.size, defaults.get(part_size, defaults.copy_part_size))
+
+        self.__num_threads = defaults.get(num_threads, defaults.copy_num_threads)
+        _check_pool_capacity(bucket, self.__num_threads)
+        self.__executor = executor or get_default_executor()
+        self.__priority = priority
+
+        self.__upload_id: str = ""
+
+        # protect below fields
+        self.__lock = threading.Lock()
+        self.__record = None
+        self.__finished_size = 0
+        self.__finished_parts: list[PartInfo] = []
+
+        logger.debug(
+            f"Init _ResumableCopier, source bucket: {source.bucket_name}, source key: {src_key}, bucket: {bucket.bucket_name}, "
+            f"key: {key}, part_size: {self.__part_size}, num_thread: {self.__num_threads}"
+        )
+
+    def copy(self):
+        self.__load_record()
+
+        finished = set(p.part_number for p in self.__finished_parts)
+        parts_to_copy = [p for p in _split_to_parts(self.size, self.__part_size) if p.part_number not in finished]
+        logger.debug(f"Parts need to copy: {parts_to_copy}")
+
+        transfer = self.__executor.transfer(self.__num_threads, priority=self.__priority)
+        for part in parts_to_copy:
+            transfer.submit(self.__run_part, part)
+        transfer.wait()
+
+        self._report_progress(self.size)
+
+        parts = sorted(self.__finished_parts, key=lambda p: p.part_number)
+        if self.bucket.enable_crc and all(p.part_crc is not None for p in parts):
+            check_crc("resumable copy", calc_obj_crc_from_parts(parts), self.__server_crc, None)
+
+        headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_OBJECT_ACL])
+        result = self.bucket.complete_multipart_upload(self.key, self.__upload_id, parts, headers=headers)
+        self._del_record()
+
+        return result
+
+    def __run_part(self, part):
+        self._check_stopped()
+
+        headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT]) or http.Headers()
+        headers[OSS_COPY_OBJECT_SOURCE_IF_MATCH] = self.objectInfo.etag or ""
+        # upload_part_copy会往params里添加uploadId等参数，每个分片用单独的dict
+        params = {Bucket.VERSIONID: self.__version_id} if self.__version_id is not None else None
+
+        result = self.bucket.upload_part_copy(
+            self.source.bucket_name,
+            self.src_key,
+            (part.start, part.end - 1),
+            self.key,
+            self.__upload_id,
+            part.part_number,
+            headers=headers,
+            params=params,
+        )
+
+        logger.debug(
+            f"Copy part success, add part info to record, part_number: {part.part_number}, etag: {result.etag}, size: {part.size}"
+        )
+        self.__finish_part(PartInfo(part.part_number, result.etag, size=part.size, part_crc=result.crc))
+
+    def _abort(self):
+        """取消时取消分片上传并删除断点信息。"""
+        if self.__upload_id:
+            try:
+                self.bucket.abort_multipart_upload(self.key, self.__upload_id)
+            except exceptions.NoSuchUpload:
+                pass
+        self._del_record()
+
+    def __finish_part(self, part_info: PartInfo):
+        with self.__lock:
+            self.__finished_parts.append(part_info)
+            self.__finished_size += part_info.size or 0
+
+            if self.__record is not None:
+                self.__record["parts"].append(
+                    {
+                        "part_number": part_info.part_number,
+                        "etag": part_info.etag,
+                        "size": part_info.size,
+                        "part_crc": part_info.part_crc,
+                    }
+                )
+                self._put_record(self.__record)
+
+            self._report_progress(self.__finished_size)
+
+    def __load_record(self):
+        record = self._get_record()
+        logger.debug(f"Load record return {record}")
+
+        if record and not self.__is_record_sane(record):
+            logger.warning("The content of record is invalid, delete the record")
+            self._del_record()
+            record = None
+
+        if record and self.__is_source_changed(record):
+            logger.warning(
+                f"Object: {self.src_key} has been overwritten, abort the multipart upload and delete the record"
+            )
+            self.__upload_id = record["upload_id"]
+            self._abort()
+            self.__upload_id = ""
+            record = None
+
+        if record and not self.__upload_exists(record["upload_id"]):
+            logger.warning(f"Multipart upload: {record['upload_id']} does not exist, delete the record")
+            self._del_record()
+            record = None
+
+        if not record:
+            headers = _copy_metadata(self.__src_headers, self.__headers)
+            upload_id = self.bucket.init_multipart_upload(self.key, headers).upload_id
+            record = {
+                "op_type": self.__op,
+                "upload_id": upload_id,
+                "src_bucket": self.source.bucket_name,
+                "src_key": self.src_key,
+                "size": self.size,
+                "mtime": self.objectInfo.mtime,
+                "etag": self.objectInfo.etag,
+                "bucket": self.bucket.bucket_name,
+                "key": self.key,
+                "part_size": self.__part_size,
+                "parts": [],
+            }
+            logger.debug(
+                f"Add new record, bucket: {self.bucket.bucket_name}, key: {self.key}, upload_id: {upload_id}, part_size: {self.__part_size}"
+            )
+            self._put_record(record)
+
+        self.__record = record
+        self.__part_size = record["part_size"]
+        self.__upload_id = record["upload_id"]
+        self.__finished_parts = [
+            PartInfo(p["part_number"], p["etag"], size=p["size"], part_crc=p["part_crc"]) for p in record["parts"]
+        ]
+        self.__finished_size = sum(p.size or 0 for p in self.__finished_parts)
+
+    def __upload_exists(self, upload_id):
+        try:
+            list(PartIterator(self.bucket, self.key, upload_id, "0", max_parts=1))
+        except exceptions.NoSuchUpload:
+            return False
+        else:
+            return True
+
+    def __is_source_changed(self, record):
+        return (
+            record["mtime"] != self.objectInfo.mtime
+            or record["size"] != self.objectInfo.size
+            or record["etag"] != self.objectInfo.etag
+        )
+
+    def __is_record_sane(self, record):
+        try:
+            if record["op_type"] != self.__op:
+                logger.error(f"op_type invalid, op_type in record: {record['op_type']} is invalid")
+                return False
+
+            for key in ("upload_id", "src_bucket", "src_key", "etag", "bucket", "key"):
+                if not isinstance(record[key], str):
+                    logger.error(f"Type Error, {key} in record is not a string type: {record[key]}")
+                    return False
+
+            for key in ("size", "mtime", "part_size"):
+                if not isinstance(record[key], int):
+                    logger.error(f"Type Error, {key} in record is not an integer type: {record[key]}")
+                    return False
+
+            if not isinstance(record["parts"], list):
+                logger.error(f"parts is not a list: {record['parts']}")
+                return False
+        except KeyError as e:
+            logger.error(f"Key not found: {e.args}")
+            return False
+
+        return True
+
+
 class ResumableStore(_ResumableStoreBase):
     """保存断点上传断点信息的类。
 
@@ -785,10 +1271,23 @@ class ResumableStore(_ResumableStoreBase):
 
     :param str root: 父目录，缺省为HOME
     :param str dir: 子目录，缺省为 `_UPLOAD_TEMP_DIR`
+    :param int compact_threshold: 断点信息日志累计多少条之后压缩为快照，参见 `_ResumableStoreBase`
+    :param int fsync_every: 每追加多少条日志调用一次fsync，0表示不调用
     """
 
-    def __init__(self, root: Path | str | None = None, dir: Path | str | None = None):
-        super(ResumableStore, self).__init__(Path(root or Path.home()), Path(dir or _UPLOAD_TEMP_DIR))
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        dir: Path | str | None = None,
+        compact_threshold: int | None = None,
+        fsync_every: int | None = None,
+    ):
+        super(ResumableStore, self).__init__(
+            Path(root or Path.home()),
+            Path(dir or _UPLOAD_TEMP_DIR),
+            compact_threshold=compact_threshold,
+            fsync_every=fsync_every,
+        )
 
     @staticmethod
     def make_store_key(bucket_name: str, key: str, filename: str, version_id: str | None = None) -> str:
@@ -805,10 +1304,23 @@ class ResumableDownloadStore(_ResumableStoreBase):
 
     :param str root: 父目录，缺省为HOME
     :param str dir: 子目录，缺省为 `_DOWNLOAD_TEMP_DIR`
+    :param int compact_threshold: 断点信息日志累计多少条之后压缩为快照，参见 `_ResumableStoreBase`
+    :param int fsync_every: 每追加多少条日志调用一次fsync，0表示不调用
     """
 
-    def __init__(self, root: Path | str | None = None, dir: Path | str | None = None):
-        super(ResumableDownloadStore, self).__init__(Path(root or Path.home()), Path(dir or _DOWNLOAD_TEMP_DIR))
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        dir: Path | str | None = None,
+        compact_threshold: int | None = None,
+        fsync_every: int | None = None,
+    ):
+        super(ResumableDownloadStore, self).__init__(
+            Path(root or Path.home()),
+            Path(dir or _DOWNLOAD_TEMP_DIR),
+            compact_threshold=compact_threshold,
+            fsync_every=fsync_every,
+        )
 
     @staticmethod
     def make_store_key(bucket_name: str, key: str, filename: str, version_id: str | None = None) -> str:
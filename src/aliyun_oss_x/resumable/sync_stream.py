@@ -0,0 +1,229 @@
+"""以分片上传的方式上传长度未知的流。
+
+:func:`upload_stream <aliyun_oss_x.upload_stream>` 从file object（例如标准输入、管道）或者可迭代对象（例如生成器）中
+读取数据，每读满一个分片就提交给线程池上传，不需要先把整个流保存到本地磁盘。
+
+分片缓冲区最多 `num_threads` 个并且重复使用，所有分片缓冲区都在上传时读取线程等待，因此占用的内存不超过
+`num_threads × part_size` 。
+"""
+
+import logging
+import threading
+from typing import Callable
+
+from .. import defaults
+from .. import exceptions
+from .. import http
+from ..api import Bucket
+from ..crypto_bucket import CryptoBucket
+from ..exceptions import ClientError
+from ..models import PartInfo
+from ..types import ObjectDataType
+from ..executor import TransferExecutor, get_default_executor
+from ..headers import OSS_OBJECT_ACL, OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
+from ._base import determine_part_size, _populate_valid_headers, _check_pool_capacity
+from ._stream import _BufferPool, _BufferReader, _StreamReader, _stream_part_size
+
+
+logger = logging.getLogger(__name__)
+
+
+def upload_stream(
+    bucket: Bucket,
+    key: str,
+    data: ObjectDataType,
+    size: int | None = None,
+    headers: dict | http.Headers | None = None,
+    part_size: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    num_threads: int | None = None,
+    executor: TransferExecutor | None = None,
+    priority: int = 0,
+):
+    """以分片上传的方式上传流，适合长度未知或者无法回绕的数据。
+
+    数据不足一个分片时退化为 `put_object` 。长度未知时，分片大小从 `part_size` 开始，每上传
+    `defaults.max_part_count` 的十分之一个分片翻一倍，保证分片数不超过 `defaults.max_part_count` 。
+    上传失败时会取消分片上传。
+
+    用法 ::
+
+        >>> aliyun_oss_x.upload_stream(bucket, 'backup.tar', sys.stdin.buffer, num_threads=4)
+
+    :param bucket: :class:`Bucket <aliyun_oss_x.Bucket>` 对象，不支持CryptoBucket
+    :param key: 上传到用户空间的文件名
+    :param data: 待上传的数据，可以是bytes、str、file object或者可迭代对象
+    :param size: 数据的总长度，已知时据此计算分片大小，可选
+
+    :param headers: HTTP头部
+        # 调用外部函数put_object 或 init_multipart_upload传递完整headers
+        # 调用外部函数uplpad_part目前只传递OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT
+        # 调用外部函数complete_multipart_upload目前只传递OSS_REQUEST_PAYER, OSS_OBJECT_ACL
+    :type headers: 可以是dict，建议是aliyun_oss_x.Headers
+
+    :param part_size: 分片大小，如不指定则使用 `aliyun_oss_x.defaults.part_size`
+    :param progress_callback: 上传进度回调函数，在每个分片上传完成后调用。参见 :ref:`progress_callback` 。
+    :param num_threads: 并发上传的线程数，同时也是分片缓冲区的个数，如不指定则使用 `aliyun_oss_x.defaults.multipart_num_threads` 。
+    :param executor: 执行分片任务的线程池，缺省为进程内共用的线程池。参见 :class:`TransferExecutor <aliyun_oss_x.TransferExecutor>` 。
+    :param priority: 分片任务的优先级，数值越大越优先
+
+    :return: 分片上传时返回 :class:`PutObjectResult <aliyun_oss_x.models.PutObjectResult>` ，
+        否则返回 `put_object` 的结果
+    """
+    logger.debug(
+        f"Start to upload stream, bucket: {bucket.bucket_name}, key: {key}, size: {size}, part_size: {part_size}, "
+        f"num_threads: {num_threads}"
+    )
+    uploader = _StreamUploader(
+        bucket,
+        key,
+        size=size,
+        headers=headers,
+        part_size=part_size,
+        progress_callback=progress_callback,
+        num_threads=num_threads,
+        executor=executor,
+        priority=priority,
+    )
+    return uploader.upload(_StreamReader(data))
+
+
+class _StreamUploader:
+    """以分片上传的方式上传流。
+
+    :param bucket: :class:`Bucket <aliyun_oss_x.Bucket>` 对象
+    :param key: 文件名
+    :param size: 数据的总长度，未知时为None
+    :param headers: 传给 `init_multipart_upload` 的HTTP头部
+    :param part_size: 分片大小
+    :param progress_callback: 上传进度回调函数。参见 :ref:`progress_callback` 。
+    """
+
+    def __init__(
+        self,
+        bucket: Bucket,
+        key: str,
+        size: int | None = None,
+        headers: dict | http.Headers | None = None,
+        part_size: int | None = None,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        num_threads: int | None = None,
+        executor: TransferExecutor | None = None,
+        priority: int = 0,
+    ):
+        if isinstance(bucket, CryptoBucket):
+            raise ClientError("upload stream does not support CryptoBucket")
+
+        self.bucket = bucket
+        self.key = key
+        self.size = size
+        self.__headers = headers
+        self.__progress_callback = progress_callback
+
+        self.__part_size = defaults.get(part_size, defaults.part_size)
+        if size is not None:
+            self.__part_size = max(determine_part_size(size, self.__part_size), 1)
+
+        self.__num_threads = defaults.get(num_threads, defaults.multipart_num_threads)
+        _check_pool_capacity(bucket, self.__num_threads)
+        self.__executor = executor or get_default_executor()
+        self.__priority = priority
+
+        self.__upload_id = ""
+
+        # protect below fields
+        self.__lock = threading.Lock()
+        self.__finished_size = 0
+        self.__finished_parts: list[PartInfo] = []
+
+    def __part_size_of(self, part_number: int) -> int:
+        if self.size is not None:
+            return self.__part_size
+        return _stream_part_size(part_number, self.__part_size)
+
+    def upload(self, reader: _StreamReader):
+        pool = _BufferPool()
+        slots = threading.Semaphore(self.__num_threads)
+
+        part_size = self.__part_size_of(1)
+        slots.acquire()
+        buf = pool.take(part_size)
+        n = reader.readinto(memoryview(buf)[:part_size])
+        if n < part_size or n == self.size:
+            logger.debug(f"Stream is smaller than one part, put object directly, size: {n}")
+            return self.bucket.put_object(
+                self.key,
+                _BufferReader(memoryview(buf)[:n]),
+                headers=self.__headers,
+                progress_callback=self.__progress_callback,
+            )
+
+        self.__upload_id = self.bucket.init_multipart_upload(self.key, self.__headers).upload_id
+        logger.debug(f"Init multipart upload for stream, upload_id: {self.__upload_id}")
+
+        transfer = self.__executor.transfer(self.__num_threads, priority=self.__priority)
+        try:
+            part_number = 1
+            while True:
+                transfer.submit(self.__upload_part, part_number, buf, n, pool, slots)
+                if n < part_size:
+                    break
+
+                part_number += 1
+                part_size = self.__part_size_of(part_number)
+
+                # 所有缓冲区都在上传时在这里等待；分片出错时它的缓冲区同样会归还
+                slots.acquire()
+                if not transfer.ok():
+                    slots.release()
+                    break
+
+                buf = pool.take(part_size)
+                n = reader.readinto(memoryview(buf)[:part_size])
+                if n == 0:
+                    pool.give(buf)
+                    slots.release()
+                    break
+                if part_number > defaults.max_part_count:
+                    raise ClientError(f"stream has more than {defaults.max_part_count} parts, use a larger part_size")
+            transfer.wait()
+
+            headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_OBJECT_ACL])
+            parts = sorted(self.__finished_parts, key=lambda p: p.part_number)
+            return self.bucket.complete_multipart_upload(self.key, self.__upload_id, parts, headers=headers)
+        except BaseException:
+            self.__abort(transfer)
+            raise
+
+    def __upload_part(self, part_number: int, buf: bytearray, size: int, pool: _BufferPool, slots):
+        try:
+            headers = _populate_valid_headers(self.__headers, [OSS_REQUEST_PAYER, OSS_TRAFFIC_LIMIT])
+            result = self.bucket.upload_part(
+                self.key, self.__upload_id, part_number, _BufferReader(memoryview(buf)[:size]), headers=headers
+            )
+            logger.debug(f"Upload stream part success, part_number: {part_number}, etag: {result.etag}, size: {size}")
+            self.__finish_part(PartInfo(part_number, result.etag, size=size, part_crc=result.crc))
+        finally:
+            pool.give(buf)
+            slots.release()
+
+    def __finish_part(self, part_info: PartInfo):
+        with self.__lock:
+            self.__finished_parts.append(part_info)
+            self.__finished_size += part_info.size or 0
+            if self.__progress_callback:
+                self.__progress_callback(self.__finished_size, self.size)
+
+    def __abort(self, transfer):
+        # 等正在上传的分片结束之后再取消，否则取消之后仍可能留下分片
+        try:
+            transfer.wait()
+        except BaseException:
+            pass
+
+        try:
+            self.bucket.abort_multipart_upload(self.key, self.__upload_id)
+        except exceptions.NoSuchUpload:
+            pass
+        except exceptions.OssError as e:
+            logger.warning(f"Abort multipart upload of stream failed, upload_id: {self.__upload_id}, error: {e}")
@@ -0,0 +1,315 @@
+"""请求重试策略。
+
+:class:`RetryPolicy` 决定一次失败的请求是否重试、等待多长时间再重试。它被 `Bucket` 、 `Service`
+及其异步版本的每个请求共用：
+
+    * 连接阶段的错误（请求尚未发出）对任何方法都可以重试；
+    * 其他网络错误、5xx以及429（如503 SlowDown）只对幂等方法（GET、HEAD、PUT、DELETE、OPTIONS）重试；
+    * 请求体必须可以回绕（bytes，或者可以seek回起点的文件对象/适配器），否则不重试；
+    * 重试间隔为带抖动（full jitter）的指数退避，并且不超过 `max_delay` ；服务端返回 `Retry-After` 时以其为准；
+    * 每个 `RetryPolicy` 带有一个 :class:`RetryBudget` ，限制重试占总请求的比例，避免在服务端故障时放大流量。
+
+用法 ::
+
+    >>> policy = aliyun_oss_x.RetryPolicy(max_retries=5, on_retry=lambda event: print(event))
+    >>> bucket = aliyun_oss_x.Bucket(auth, endpoint, bucket_name, retry_policy=policy)
+    >>> policy.stats.retries, policy.stats.retry_time
+"""
+
+import time
+import random
+import inspect
+import logging
+import threading
+import contextlib
+import contextvars
+import email.utils
+from typing import Any, Callable
+
+import httpx
+
+from . import defaults
+from .exceptions import OssError, RequestError, ServerError
+
+
+logger = logging.getLogger(__name__)
+
+_IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+
+_RETRYABLE_STATUS = frozenset([429, 500, 502, 503, 504])
+
+# 请求还没有发送到服务端的错误，重试不会导致请求被执行两次
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# 当前线程（协程）中的请求重试之前调用的函数，由 _watch_retries 设置
+_retry_listener: contextvars.ContextVar[Callable[["RetryEvent"], None] | None] = contextvars.ContextVar(
+    "oss_retry_listener", default=None
+)
+
+
+class RetryStats:
+    """重试统计信息，可供监控使用。所有计数都是累计值。
+
+    :param attempts: 发出的请求次数（包括重试）
+    :param retries: 重试次数
+    :param retry_time: 重试前等待的总时间，以秒为单位
+    :param budget_exhausted: 因为重试预算耗尽而放弃重试的次数
+    :param give_ups: 最终失败的请求数（包括不可重试的错误）
+    """
+
+    def __init__(self):
+        self.attempts = 0
+        self.retries = 0
+        self.retry_time = 0.0
+        self.budget_exhausted = 0
+        self.give_ups = 0
+        self.__lock = threading.Lock()
+
+    def _add(self, **kwargs):
+        with self.__lock:
+            for name, value in kwargs.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def __repr__(self):
+        return (
+            f"RetryStats(attempts={self.attempts}, retries={self.retries}, retry_time={self.retry_time:.3f}, "
+            f"budget_exhausted={self.budget_exhausted}, give_ups={self.give_ups})"
+        )
+
+
+class RetryEvent:
+    """传给 `on_retry` 回调的重试事件。
+
+    :param method: HTTP方法
+    :param url: 请求的URL
+    :param attempt: 即将进行第几次重试，从1开始
+    :param delay: 重试前等待的时间，以秒为单位
+    :param error: 导致重试的异常
+    """
+
+    def __init__(self, method: str, url: str, attempt: int, delay: float, error: OssError):
+        self.method = method
+        self.url = url
+        self.attempt = attempt
+        self.delay = delay
+        self.error = error
+
+    def __repr__(self):
+        return f"RetryEvent(method={self.method}, url={self.url}, attempt={self.attempt}, delay={self.delay:.3f}, error={self.error!r})"
+
+
+class RetryBudget:
+    """重试预算（令牌桶）。
+
+    每次重试消耗 `retry_cost` 个令牌（超时错误消耗 `timeout_cost` 个），每个成功的请求归还
+    `success_refill` 个令牌，令牌数不超过 `capacity` 。服务端持续出错时，重试在令牌耗尽后停止，
+    直到请求重新成功为止，从而避免重试放大故障。
+
+    :param capacity: 令牌桶容量，初始是满的
+    :param retry_cost: 每次重试消耗的令牌数
+    :param timeout_cost: 因为超时而重试时消耗的令牌数
+    :param success_refill: 每次请求成功归还的令牌数
+    """
+
+    def __init__(
+        self, capacity: float = 100, retry_cost: float = 5, timeout_cost: float = 10, success_refill: float = 1
+    ):
+        self.capacity = capacity
+        self.retry_cost = retry_cost
+        self.timeout_cost = timeout_cost
+        self.success_refill = success_refill
+        self.__tokens = capacity
+        self.__lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self.__tokens
+
+    def acquire(self, error: OssError) -> bool:
+        """为一次重试申请令牌，成功返回True。"""
+        cost = self.timeout_cost if _is_timeout(error) else self.retry_cost
+        with self.__lock:
+            if self.__tokens < cost:
+                return False
+            self.__tokens -= cost
+            return True
+
+    def record_success(self):
+        with self.__lock:
+            self.__tokens = min(self.capacity, self.__tokens + self.success_refill)
+
+
+class RetryPolicy:
+    """请求重试策略。
+
+    :param max_retries: 最多重试次数（不包括第一次请求）。缺省为 `defaults.request_retries` ，0表示不重试
+    :param base_delay: 指数退避的初始间隔，以秒为单位
+    :param max_delay: 单次重试间隔的上限，以秒为单位。服务端要求的 `Retry-After` 超过该值时不再重试
+    :param budget: 重试预算。缺省每个策略新建一个 :class:`RetryBudget` ；传入False表示不限制
+    :param on_retry: 每次重试之前调用的回调函数，参数为 :class:`RetryEvent`
+    """
+
+    def __init__(
+        self,
+        max_retries: int | None = None,
+        base_delay: float = 0.2,
+        max_delay: float = 20.0,
+        budget: RetryBudget | bool | None = None,
+        on_retry: Callable[[RetryEvent], None] | None = None,
+    ):
+        self.max_retries = max(defaults.get(max_retries, defaults.request_retries), 0)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        if budget is None or budget is True:
+            budget = RetryBudget()
+        self.budget = budget or None
+        self.on_retry = on_retry
+        self.stats = RetryStats()
+
+    def is_retryable(self, method: str, error: OssError) -> bool:
+        """判断 `error` 在不考虑次数、预算和请求体的情况下是否可以重试。"""
+        if isinstance(error, RequestError):
+            if isinstance(error.exception, _CONNECT_ERRORS):
+                return True
+            return method.upper() in _IDEMPOTENT_METHODS and isinstance(error.exception, httpx.TransportError)
+
+        if isinstance(error, ServerError):
+            return method.upper() in _IDEMPOTENT_METHODS and error.status in _RETRYABLE_STATUS
+
+        return False
+
+    def backoff(self, attempt: int) -> float:
+        """第 `attempt` 次重试（从1开始）之前的等待时间：带full jitter的指数退避。"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def next_delay(self, method: str, url: str, error: OssError, attempt: int, rewindable: bool) -> float | None:
+        """第 `attempt` 次请求（从1开始）失败后调用，返回重试前需要等待的时间，None表示不再重试。"""
+        delay = self.__next_delay(method, error, attempt, rewindable)
+        if delay is None:
+            self.stats._add(give_ups=1)
+            return None
+
+        self.stats._add(retries=1, retry_time=delay)
+        logger.info(f"Retry {method} {url} in {delay:.3f}s, attempt: {attempt}, error: {error}")
+        listener = _retry_listener.get()
+        if self.on_retry or listener:
+            event = RetryEvent(method, url, attempt, delay, error)
+            if self.on_retry:
+                self.on_retry(event)
+            if listener:
+                listener(event)
+        return delay
+
+    def __next_delay(self, method, error, attempt, rewindable):
+        if attempt > self.max_retries or not rewindable or not self.is_retryable(method, error):
+            return None
+
+        retry_after = _retry_after(error)
+        if retry_after is not None and retry_after > self.max_delay:
+            return None
+
+        if self.budget is not None and not self.budget.acquire(error):
+            self.stats._add(budget_exhausted=1)
+            logger.warning(f"Retry budget exhausted, give up retrying {method}, error: {error}")
+            return None
+
+        return retry_after if retry_after is not None else self.backoff(attempt)
+
+    def record_attempt(self):
+        self.stats._add(attempts=1)
+
+    def record_success(self):
+        if self.budget is not None:
+            self.budget.record_success()
+
+
+@contextlib.contextmanager
+def _watch_retries(listener: Callable[[RetryEvent], None]):
+    """with块内当前线程或者协程发出的请求每次重试之前调用 `listener` ，其他线程、协程的重试不受影响。"""
+    token = _retry_listener.set(listener)
+    try:
+        yield
+    finally:
+        _retry_listener.reset(token)
+
+
+def _is_timeout(error: OssError) -> bool:
+    return isinstance(error, RequestError) and isinstance(error.exception, httpx.TimeoutException)
+
+
+def _retry_after(error: OssError) -> float | None:
+    if not isinstance(error, ServerError) or not error.headers:
+        return None
+
+    value = error.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+def body_rewinder(data: Any) -> Callable[[], None] | None:
+    """返回把请求体回绕到当前位置的函数；请求体不能回绕时返回None。
+
+    bytes类型的请求体每次发送都是完整的，不需要回绕；适配器（参见 `aliyun_oss_x.utils` ）通过
+    `rewindable()` 和 `rewind()` 支持回绕；其他对象需要支持 `seek` 和 `tell` 。
+    """
+    if data is None or isinstance(data, (bytes, bytearray, memoryview, str)):
+        return lambda: None
+
+    if hasattr(data, "rewindable"):
+        return data.rewind if data.rewindable() else None
+
+    if hasattr(data, "seek") and hasattr(data, "tell") and not inspect.iscoroutinefunction(data.tell):
+        try:
+            position = data.tell()
+        except (OSError, ValueError):
+            return None
+        return lambda: data.seek(position)
+
+    return None
+
+
+def body_rewinder_async(data: Any) -> Callable[[], Any] | None:
+    """异步版本的 :func:`body_rewinder` ，返回的函数需要await。"""
+    if data is None or isinstance(data, (bytes, bytearray, memoryview, str)):
+        return _noop_async
+
+    if hasattr(data, "rewindable"):
+        if not data.rewindable():
+            return None
+
+        async def rewind_adapter():
+            result = data.rewind()
+            if inspect.isawaitable(result):
+                await result
+
+        return rewind_adapter
+
+    if hasattr(data, "seek") and hasattr(data, "tell") and not inspect.iscoroutinefunction(data.tell):
+        try:
+            position = data.tell()
+        except (OSError, ValueError):
+            return None
+
+        async def rewind():
+            result = data.seek(position)
+            if inspect.isawaitable(result):
+                await result
+
+        return rewind
+
+    return None
+
+
+async def _noop_async():
+    pass
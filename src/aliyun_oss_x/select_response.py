@@ -1,4 +1,5 @@
 import struct
+import collections
 from typing import Callable
 
 import logging
@@ -62,7 +63,7 @@ class SelectResponseAdapter:
         self.callback = progress_callback
         self.frames_since_last_progress_report = 0
         self.content_length = content_length
-        self.resp_content_iter = response.__iter__()
+        self.resp_content_iter = self._content_iter(response)
         self.enable_crc = enable_crc
         self.payload = b""
         self.output_raw_data = response.headers.get("x-oss-select-output-raw", "") == "true"
@@ -81,6 +82,9 @@ class SelectResponseAdapter:
 
         return content
 
+    def _content_iter(self, response):
+        return response.__iter__()
+
     def __iter__(self):
         return self
 
@@ -97,21 +101,27 @@ class SelectResponseAdapter:
 
         while self.finished == 0:
             if self.frame_off_set < self.frame_length:
-                data = self.frame_data[self.frame_off_set : self.frame_length]
-                self.frame_length = self.frame_off_set = 0
-                return data
+                return self._take_frame_data()
             else:
                 self.read_next_frame()
-                self.frames_since_last_progress_report += 1
-                if (
-                    self.frames_since_last_progress_report >= SelectResponseAdapter._FRAMES_FOR_PROGRESS_UPDATE
-                    and self.callback is not None
-                ):
-                    self.callback(self.file_offset, self.content_length)
-                    self.frames_since_last_progress_report = 0
+                self._report_progress()
 
         raise StopIteration
 
+    def _take_frame_data(self):
+        data = self.frame_data[self.frame_off_set : self.frame_length]
+        self.frame_length = self.frame_off_set = 0
+        return data
+
+    def _report_progress(self):
+        self.frames_since_last_progress_report += 1
+        if (
+            self.frames_since_last_progress_report >= SelectResponseAdapter._FRAMES_FOR_PROGRESS_UPDATE
+            and self.callback is not None
+        ):
+            self.callback(self.file_offset, self.content_length)
+            self.frames_since_last_progress_report = 0
+
     def read_raw(self, amt):
         ret = b""
         read_count = 0
@@ -257,3 +267,84 @@ class SelectResponseAdapter:
             self.finished = 1
             if status / 100 != 2:
                 raise SelectOperationFailed(status, error_code, error_msg)
+
+
+class AsyncSelectResponseAdapter(SelectResponseAdapter):
+    """异步版本的 :class:`SelectResponseAdapter` ，用 `async for` 迭代。
+
+    先从响应中异步读取一个完整的帧，再交给 :meth:`read_next_frame <SelectResponseAdapter.read_next_frame>` 解析，
+    解析时不会在连接上阻塞。
+    """
+
+    def __init__(
+        self,
+        response,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+        content_length=None,
+        enable_crc=False,
+    ):
+        self.__frames = collections.deque()
+        self.__raw_iter = response.__aiter__()
+        self.__raw_buffer = b""
+        super(AsyncSelectResponseAdapter, self).__init__(response, progress_callback, content_length, enable_crc)
+
+    def _content_iter(self, response):
+        # read_raw从这里取得已经读好的帧，没有时返回空bytes
+        while True:
+            yield self.__frames.popleft() if self.__frames else b""
+
+    async def read(self):
+        if self.finished:
+            return b""
+
+        return b"".join([data async for data in self])
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.output_raw_data:
+            data = await self.__raw_iter.__anext__()
+            if len(data) != 0:
+                return data
+            else:
+                raise StopAsyncIteration
+
+        while self.finished == 0:
+            if self.frame_off_set < self.frame_length:
+                return self._take_frame_data()
+            else:
+                if not await self.__read_frame():
+                    break
+                self.read_next_frame()
+                self._report_progress()
+
+        raise StopAsyncIteration
+
+    async def __read_frame(self) -> bool:
+        # 和read_next_frame读取的长度一致：类型、负载长度各4字节，负载，4字节的校验值
+        header = await self.__read_raw_async(8)
+        if len(header) < 8:
+            return False
+        payload_length = struct.unpack(">I", header[4:8])[0]
+        rest = await self.__read_raw_async(payload_length + 4)
+        if len(rest) < payload_length + 4:
+            return False
+
+        self.__frames.append(header + rest)
+        return True
+
+    async def __read_raw_async(self, amt):
+        chunks = [self.__raw_buffer]
+        size = len(self.__raw_buffer)
+        while size < amt:
+            try:
+                chunk = await self.__raw_iter.__anext__()
+            except StopAsyncIteration:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+
+        data = b"".join(chunks)
+        self.__raw_buffer = data[amt:]
+        return data[:amt]
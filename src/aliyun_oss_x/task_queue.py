@@ -4,15 +4,24 @@ import logging
 import threading
 import traceback
 
+from .executor import get_default_executor
+
 logger = logging.getLogger(__name__)
 
 
 class TaskQueue:
-    def __init__(self, producer, consumers):
+    """生产者、消费者模型的任务队列，生产者和消费者作为同一个传输的任务在 :class:`TransferExecutor
+    <aliyun_oss_x.TransferExecutor>` 中执行。
+
+    :param producer: 生产者，参数为队列
+    :param consumers: 消费者列表，参数为队列
+    :param executor: 执行任务的线程池，缺省为进程内共用的线程池
+    """
+
+    def __init__(self, producer, consumers, executor=None):
         self.__producer = producer
         self.__consumers = consumers
-
-        self.__threads = []
+        self.__executor = executor or get_default_executor()
 
         # must be an infinite queue, otherwise producer may be blocked after all consumers being dead.
         self.__queue = queue.Queue()
@@ -22,15 +31,12 @@ class TaskQueue:
         self.__exc_stack = ""
 
     def run(self):
-        self.__add_and_run(threading.Thread(target=self.__producer_func))
-
+        # 生产者先于消费者开始执行，消费者不会一直等待一个没有机会执行的生产者
+        transfer = self.__executor.transfer(len(self.__consumers) + 1)
+        transfer.submit(self.__producer_func)
         for c in self.__consumers:
-            self.__add_and_run(threading.Thread(target=self.__consumer_func, args=(c,)))
-
-        # give KeyboardInterrupt chances to happen by joining with timeouts.
-        while self.__any_active():
-            for t in self.__threads:
-                t.join(1)
+            transfer.submit(self.__consumer_func, c)
+        transfer.wait()
 
         if self.__exc_info:
             logger.error("An exception was thrown by producer or consumer, backtrace: {0}".format(self.__exc_stack))
@@ -47,14 +53,6 @@ class TaskQueue:
         with self.__lock:
             return self.__exc_info is None
 
-    def __add_and_run(self, thread):
-        thread.daemon = True
-        thread.start()
-        self.__threads.append(thread)
-
-    def __any_active(self):
-        return any(t.is_alive() for t in self.__threads)
-
     def __producer_func(self):
         try:
             self.__producer(self)
@@ -104,7 +102,7 @@ class AsyncTaskQueue:
 
         if self.__exc_info:
             logger.error(f"异步任务中发生异常，回溯信息: {self.__exc_stack}")
-            raise self.__exc_info
+            raise self.__exc_info[1]
 
     async def put(self, data):
         assert data is not None
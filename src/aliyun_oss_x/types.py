@@ -1,88 +1,282 @@
 import logging
-from typing import Iterable, Protocol, Any, TypeGuard, TYPE_CHECKING
+import collections
+from typing import Iterable, Protocol, Any, Awaitable, Callable, TypeGuard, TYPE_CHECKING
 
+import httpx
 
 if TYPE_CHECKING:
     from httpx import Response
 
-_CHUNK_SIZE = 8 * 1024
-
 logger = logging.getLogger(__name__)
 
 
+def _request_error(e: httpx.RequestError):
+    """读取流式响应体时的网络错误，和发送请求时一样转换为 :class:`RequestError <aliyun_oss_x.exceptions.RequestError>` 。"""
+    # exceptions模块依赖本模块，在这里延迟导入
+    from .exceptions import RequestError
+
+    return RequestError(e)
+
+
+class _ChunkBuffer:
+    """保存已经从连接上读取、但还没有被调用方取走的数据块。
+
+    数据块以memoryview的形式保存在队列里，取数据时只对跨越数据块边界的部分做一次拷贝，
+    整块取走时直接返回原始的bytes对象，不做拷贝。
+    """
+
+    def __init__(self):
+        self.__chunks: collections.deque[memoryview] = collections.deque()
+        self.size = 0
+
+    def append(self, chunk: bytes):
+        if chunk:
+            self.__chunks.append(memoryview(chunk))
+            self.size += len(chunk)
+
+    def take(self, amt: int) -> bytes:
+        """取走最多 `amt` 字节。"""
+        if not self.__chunks:
+            return b""
+
+        first = self.__chunks[0]
+        if len(first) >= amt:
+            return self.__take_from_first(amt)
+
+        views = []
+        remain = amt
+        while remain > 0 and self.__chunks:
+            view = self.__chunks[0]
+            if len(view) <= remain:
+                views.append(self.__chunks.popleft())
+                remain -= len(view)
+            else:
+                views.append(view[:remain])
+                self.__chunks[0] = view[remain:]
+                remain = 0
+
+        result = b"".join(views)
+        self.size -= len(result)
+        return result
+
+    def take1(self, amt: int) -> bytes:
+        """只从第一个数据块中取走最多 `amt` 字节。"""
+        if not self.__chunks:
+            return b""
+        return self.__take_from_first(min(amt, len(self.__chunks[0])))
+
+    def take_into(self, view: memoryview) -> int:
+        """把数据直接拷贝到 `view` 中，返回拷贝的字节数。"""
+        n = 0
+        while n < len(view) and self.__chunks:
+            chunk = self.__chunks[0]
+            count = min(len(chunk), len(view) - n)
+            view[n : n + count] = chunk[:count]
+            if count == len(chunk):
+                self.__chunks.popleft()
+            else:
+                self.__chunks[0] = chunk[count:]
+            n += count
+
+        self.size -= n
+        return n
+
+    def take_all(self) -> list[memoryview]:
+        chunks = list(self.__chunks)
+        self.__chunks.clear()
+        self.size = 0
+        return chunks
+
+    def __take_from_first(self, amt: int) -> bytes:
+        view = self.__chunks[0]
+        if len(view) == amt:
+            self.__chunks.popleft()
+            result = view.obj if isinstance(view.obj, bytes) and len(view.obj) == amt else bytes(view)
+        else:
+            result = bytes(view[:amt])
+            self.__chunks[0] = view[amt:]
+
+        self.size -= amt
+        return result
+
+
 class OSSResponse:
-    def __init__(self, response: "Response"):
+    def __init__(self, response: "Response", on_close: Callable[[], None] | None = None):
         self.response = response
         self.status = response.status_code
         self.headers = response.headers
         self.request_id = response.headers.get("x-oss-request-id", "")
         self._content_iter = response.iter_bytes()
-        self._buffer = b""
+        self._buffer = _ChunkBuffer()
         self.__all_read = False
+        # 响应体读完或者响应被关闭时调用，用于释放连接相关的资源
+        self.__on_close = on_close
 
         logger.debug(f"Get response headers, req-id:{self.request_id}, status: {self.status}, headers: {self.headers}")
 
     def read(self, amt: int | None = None):
+        if amt is None or amt < 0:
+            return b"".join(self._buffer.take_all() + list(self.__remaining()))
+
+        while self._buffer.size < amt and self.__fill():
+            pass
+
+        return self._buffer.take(amt)
+
+    def read1(self, amt: int = -1):
+        """最多从连接上读取一次，返回不超过 `amt` 字节的数据。"""
+        if not self._buffer.size:
+            self.__fill()
+
+        if amt is None or amt < 0:
+            amt = self._buffer.size
+        return self._buffer.take1(amt)
+
+    def readinto(self, b) -> int:
+        """把数据直接读入可写的缓冲区 `b` ，直到填满或者读完，返回读取的字节数。"""
+        view = memoryview(b).cast("B")
+        n = 0
+        while n < len(view):
+            if not self._buffer.size and not self.__fill():
+                break
+            n += self._buffer.take_into(view[n:])
+        return n
+
+    def __fill(self) -> bool:
         if self.__all_read:
-            return b""
+            return False
 
-        if amt is None:
-            content = b"".join([self._buffer] + list(self._content_iter))
-            self._buffer = b""
+        try:
+            self._buffer.append(next(self._content_iter))
+        except StopIteration:
             self.__all_read = True
-            return content
-        else:
-            while len(self._buffer) < amt:
-                try:
-                    chunk = next(self._content_iter)
-                    self._buffer += chunk
-                except StopIteration:
-                    self.__all_read = True
-                    break
-
-            result, self._buffer = self._buffer[:amt], self._buffer[amt:]
-            return result
+            self.__release()
+            return False
+        except httpx.RequestError as e:
+            self.__release()
+            raise _request_error(e) from e
+        return True
+
+    def __remaining(self):
+        if self.__all_read:
+            return
+        try:
+            yield from self._content_iter
+        except httpx.RequestError as e:
+            self.__release()
+            raise _request_error(e) from e
+        self.__all_read = True
+        self.__release()
+
+    def __release(self):
+        on_close, self.__on_close = self.__on_close, None
+        if on_close:
+            on_close()
 
     def __iter__(self):
-        return self.response.iter_bytes(_CHUNK_SIZE)
+        for view in self._buffer.take_all():
+            yield bytes(view)
+        yield from self.__remaining()
+
+    def close(self):
+        """关闭响应。对于流式响应，未读完的响应体会被丢弃，连接随之释放。"""
+        try:
+            self.response.close()
+        finally:
+            self.__release()
 
 
 class AsyncOSSResponse:
-    def __init__(self, response: "Response"):
+    def __init__(self, response: "Response", on_close: Callable[[], Awaitable[None]] | None = None):
         self.response = response
         self.status = response.status_code
         self.headers = response.headers
         self.request_id = response.headers.get("x-oss-request-id", "")
         self._content_iter = response.aiter_bytes()
-        self._buffer = b""
+        self._buffer = _ChunkBuffer()
         self.__all_read = False
+        # 响应体读完或者响应被关闭时调用，用于释放连接相关的资源
+        self.__on_close = on_close
 
         logger.debug(f"Get response headers, req-id:{self.request_id}, status: {self.status}, headers: {self.headers}")
 
     async def read(self, amt: int | None = None):
+        if amt is None or amt < 0:
+            chunks = self._buffer.take_all()
+            if not self.__all_read:
+                try:
+                    chunks.extend([chunk async for chunk in self._content_iter])
+                except httpx.RequestError as e:
+                    await self.__release()
+                    raise _request_error(e) from e
+                self.__all_read = True
+                await self.__release()
+            return b"".join(chunks)
+
+        while self._buffer.size < amt and await self.__fill():
+            pass
+
+        return self._buffer.take(amt)
+
+    async def read1(self, amt: int = -1):
+        """最多从连接上读取一次，返回不超过 `amt` 字节的数据。"""
+        if not self._buffer.size:
+            await self.__fill()
+
+        if amt is None or amt < 0:
+            amt = self._buffer.size
+        return self._buffer.take1(amt)
+
+    async def readinto(self, b) -> int:
+        """把数据直接读入可写的缓冲区 `b` ，直到填满或者读完，返回读取的字节数。"""
+        view = memoryview(b).cast("B")
+        n = 0
+        while n < len(view):
+            if not self._buffer.size and not await self.__fill():
+                break
+            n += self._buffer.take_into(view[n:])
+        return n
+
+    async def __fill(self) -> bool:
         if self.__all_read:
-            return b""
+            return False
 
-        if amt is None:
-            content = b"".join([self._buffer] + [chunk async for chunk in self._content_iter])
-            self._buffer = b""
+        try:
+            self._buffer.append(await anext(self._content_iter))
+        except StopAsyncIteration:
             self.__all_read = True
-            return content
-        else:
-            while len(self._buffer) < amt:
-                try:
-                    chunk = await anext(self._content_iter)
-                    self._buffer += chunk
-                except StopAsyncIteration:
-                    self.__all_read = True
-                    break
-
-            result, self._buffer = self._buffer[:amt], self._buffer[amt:]
-            return result
+            await self.__release()
+            return False
+        except httpx.RequestError as e:
+            await self.__release()
+            raise _request_error(e) from e
+        return True
+
+    async def __release(self):
+        on_close, self.__on_close = self.__on_close, None
+        if on_close:
+            await on_close()
 
     async def __aiter__(self):
-        async for chunk in self.response.aiter_bytes(_CHUNK_SIZE):
-            yield chunk
+        for view in self._buffer.take_all():
+            yield bytes(view)
+
+        if not self.__all_read:
+            try:
+                async for chunk in self._content_iter:
+                    yield chunk
+            except httpx.RequestError as e:
+                await self.__release()
+                raise _request_error(e) from e
+            self.__all_read = True
+            await self.__release()
+
+    async def aclose(self):
+        """关闭响应。对于流式响应，未读完的响应体会被丢弃，连接随之释放。"""
+        try:
+            await self.response.aclose()
+        finally:
+            await self.__release()
 
 
 ResponseType = OSSResponse | AsyncOSSResponse
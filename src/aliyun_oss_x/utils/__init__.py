@@ -11,12 +11,14 @@ import hashlib
 import calendar
 import datetime
 import binascii
+import inspect
 import threading
 import mimetypes
 from pathlib import Path
 from email.utils import formatdate
 
-from .crc import Crc64
+from .crc import Crc64, crc64_backend
+from .checksum import RangeChecksum, calc_range_checksums, calc_file_crc64
 from .. import defaults
 from ..compat import to_bytes
 from ..exceptions import ClientError, InconsistentError, OpenApiFormatError
@@ -24,12 +26,14 @@ from .adapter.sync_adapter import (
     SizedFileAdapter,
     make_crc_adapter,
     make_cipher_adapter,
+    make_stream_adapter,
     make_progress_adapter,
 )
 from .adapter.async_adapter import (
     AsyncSizedFileAdapter,
     make_crc_adapter_async,
     make_cipher_adapter_async,
+    make_stream_adapter_async,
     make_progress_adapter_async,
 )
 
@@ -178,14 +182,12 @@ _CHUNK_SIZE = 8 * 1024
 
 
 def calc_obj_crc_from_parts(parts, init_crc=0):
-    object_crc = 0
-    crc_obj = Crc64(init_crc)
+    crcs = []
     for part in parts:
         if not part.part_crc or not part.size:
             return None
-        else:
-            object_crc = crc_obj.combine(object_crc, part.part_crc, part.size)
-    return object_crc
+        crcs.append((part.part_crc, part.size))
+    return Crc64(init_crc).combine_many(crcs)
 
 
 def check_crc(operation, client_crc, oss_crc, request_id):
@@ -488,10 +490,11 @@ def force_rename(src, dst):
 
 
 def copyfileobj_and_verify(
-    file_source, file_target, expected_len: int, chunk_size: int = 16 * 1024, request_id: str = ""
+    file_source, file_target, expected_len: int, chunk_size: int | None = None, request_id: str = ""
 ):
     """copy data from file-like object file_source to file-like object file_target, and verify length"""
 
+    chunk_size = defaults.get(chunk_size, defaults.stream_chunk_size)
     num_read = 0
 
     while True:
@@ -507,10 +510,11 @@ def copyfileobj_and_verify(
 
 
 async def copyfileobj_and_verify_async(
-    file_source, file_target, expected_len: int, chunk_size: int = 16 * 1024, request_id: str = ""
+    file_source, file_target, expected_len: int, chunk_size: int | None = None, request_id: str = ""
 ):
     """copy data from file-like object file_source to file-like object file_target, and verify length"""
 
+    chunk_size = defaults.get(chunk_size, defaults.stream_chunk_size)
     num_read = 0
 
     while True:
@@ -519,7 +523,9 @@ async def copyfileobj_and_verify_async(
             break
 
         num_read += len(buf)
-        file_target.write(buf)
+        written = file_target.write(buf)
+        if inspect.isawaitable(written):
+            await written
 
     if num_read != expected_len:
         raise InconsistentError("IncompleteRead from source", request_id)
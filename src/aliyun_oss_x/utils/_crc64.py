@@ -0,0 +1,182 @@
+"""CRC-64/ECMA-182（即 `x-oss-hash-crc64ecma` ）的计算后端。
+
+导入时检测crcmod的C扩展：
+
+    * `"crcmod-c"` ：crcmod的C扩展可用时使用它，每秒数百MB；
+    * `"python"` ：否则使用纯Python实现，比crcmod的纯Python版本（逐字节查表）快数倍：
+        #. 短数据用slicing-by-8，8张表，每次处理8个字节；
+        #. 长数据整块转为大整数，利用CRC在GF(2)上的线性把它对折取模，移位和异或都是对整块数据进行的C循环，
+           每次处理 `_BULK_BLOCK_SIZE` 字节。
+
+后端的接口都是 `update(crc, data) -> crc` ，`crc` 是对外的CRC值（和 :attr:`Crc64.crc <aliyun_oss_x.utils.Crc64.crc>`
+相同），可以在之前的结果上继续计算。 `data` 可以是bytes、bytearray或者memoryview。
+"""
+
+import sys
+import struct
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+_POLY = 0x142F0E1EBA9EA3693
+_POLY_REFLECTED = 0xC96C5795D7870F42
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+# 短于该长度的数据用slicing-by-8计算，对折的固定开销在更短的数据上不划算
+_SLICING_MAX_SIZE = 512
+
+# 对折时每块数据的长度，限制临时大整数占用的内存
+_BULK_BLOCK_SIZE = 1024 * 1024
+
+# 每个字节的比特位逆序
+_REVERSE_BITS = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def _make_slicing_tables():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ _POLY_REFLECTED if crc & 1 else crc >> 1
+        table.append(crc)
+
+    tables = [table]
+    for _ in range(7):
+        tables.append([(crc >> 8) ^ table[crc & 0xFF] for crc in tables[-1]])
+    return tables
+
+
+_T0, _T1, _T2, _T3, _T4, _T5, _T6, _T7 = _make_slicing_tables()
+
+
+def _words(mv):
+    """把长度为8的整数倍的memoryview按小端解析为64位整数。"""
+    if sys.byteorder == "little":
+        return mv.cast("Q")
+    return (word for (word,) in struct.iter_unpack("<Q", mv))
+
+
+def _update_slicing(crc, mv, T0=_T0, T1=_T1, T2=_T2, T3=_T3, T4=_T4, T5=_T5, T6=_T6, T7=_T7):
+    """slicing-by-8，处理的是反射形式的寄存器。"""
+    crc ^= _MASK
+    aligned = len(mv) & ~7
+    for word in _words(mv[:aligned]):
+        crc ^= word
+        crc = (
+            T7[crc & 0xFF]
+            ^ T6[crc >> 8 & 0xFF]
+            ^ T5[crc >> 16 & 0xFF]
+            ^ T4[crc >> 24 & 0xFF]
+            ^ T3[crc >> 32 & 0xFF]
+            ^ T2[crc >> 40 & 0xFF]
+            ^ T1[crc >> 48 & 0xFF]
+            ^ T0[crc >> 56]
+        )
+    for byte in mv[aligned:]:
+        crc = T0[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ _MASK
+
+
+def _reverse64(value):
+    return int.from_bytes(value.to_bytes(8, "little").translate(_REVERSE_BITS), "big")
+
+
+def _mulmod(a, b):
+    """GF(2)上的 `a * b mod P` ，a、b都小于2^64。"""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        b >>= 1
+        a <<= 1
+        if a >> 64:
+            a ^= _POLY
+    return result
+
+
+def _make_fold_bits():
+    """第k项是 `x^(2^k) mod P` 中为1的比特位。"""
+    powers = [2]
+    while len(powers) < 40:
+        powers.append(_mulmod(powers[-1], powers[-1]))
+    return [[j for j in range(64) if power >> j & 1] for power in powers]
+
+
+_FOLD_BITS = _make_fold_bits()
+
+
+def _mod(value):
+    """`value mod P` 。
+
+    把 `value` 拆成 `high * x^m + low` （m为2的幂），因为 `x^m mod P` 只有64位， `high * (x^m mod P) + low`
+    和 `value` 同余而长度减半，只需要约32次整块的移位和异或。剩下不超过128位时逐位约简。
+    """
+    length = value.bit_length()
+    while length > 128:
+        k = (length - 1).bit_length() - 1
+        m = 1 << k
+        high = value >> m
+        value &= (1 << m) - 1
+        for j in _FOLD_BITS[k]:
+            value ^= high << j
+        length = value.bit_length()
+
+    while length > 64:
+        value ^= _POLY << (length - 65)
+        length = value.bit_length()
+    return value
+
+
+def _update_bulk(crc, mv):
+    """按多项式计算：新的寄存器 = `寄存器 * x^n + 数据 * x^64 mod P` ，n为数据的比特数。
+
+    反射形式的CRC等价于把每个字节的比特逆序之后按普通形式计算，再把结果逆序。
+    """
+    register = _reverse64(crc ^ _MASK)
+    for start in range(0, len(mv), _BULK_BLOCK_SIZE):
+        block = mv[start : start + _BULK_BLOCK_SIZE]
+        data = int.from_bytes(block.tobytes().translate(_REVERSE_BITS), "big")
+        register = _mod((register << (len(block) * 8)) ^ (data << 64))
+    return _reverse64(register) ^ _MASK
+
+
+def _update_python(crc, data):
+    mv = memoryview(data)
+    if mv.format != "B" or mv.ndim != 1:
+        mv = mv.cast("B")
+    if len(mv) < _SLICING_MAX_SIZE:
+        return _update_slicing(crc, mv)
+    return _update_bulk(crc, mv)
+
+
+def _load_crcmod_extension():
+    try:
+        import crcmod
+        import crcmod.crcmod
+    except ImportError:
+        return None
+
+    if not getattr(sys.modules["crcmod.crcmod"], "_usingExtension", False):
+        return None
+    crc_func = crcmod.mkCrcFun(_POLY, initCrc=0, rev=True, xorOut=_MASK)
+
+    def update(crc, data):
+        return crc_func(data, crc)
+
+    return update
+
+
+#: 可用的后端，名字 -> `update(crc, data)`
+BACKENDS = {"python": _update_python}
+
+_crcmod_update = _load_crcmod_extension()
+if _crcmod_update is not None:
+    BACKENDS["crcmod-c"] = _crcmod_update
+
+#: 当前使用的后端
+BACKEND = "crcmod-c" if _crcmod_update is not None else "python"
+
+update = BACKENDS[BACKEND]
+
+logger.debug(f"CRC64 backend: {BACKEND}")
@@ -2,6 +2,7 @@ import logging
 from typing import Callable, Union, AsyncIterable, Iterable, AsyncIterator, Awaitable
 
 from ..crc import Crc64
+from ... import defaults
 from ...compat import to_bytes
 from ...exceptions import ClientError
 from ...types import (
@@ -11,6 +12,14 @@ from ...types import (
     is_readable_buffer_async,
     is_readable_buffer_sync,
     has_crc_attr,
+    _ChunkBuffer,
+)
+from .sync_adapter import (
+    _make_progress_reporter,
+    _invoke_crc_callback,
+    _invoke_progress_callback,
+    _invoke_cipher_callback,
+    _to_chunk,
 )
 
 
@@ -24,11 +33,14 @@ class AsyncSizedFileAdapter:
         self.file_object = file_object
         self.size = size
         self.offset = 0
+        self.__source = _AsyncRewindableSource(file_object)
 
     async def read(self, amt=None):
         if self.offset >= self.size:
             return b""
 
+        await self.__source.mark()
+
         if (amt is None or amt < 0) or (amt + self.offset >= self.size):
             _data = self.file_object.read(self.size - self.offset)
             if isinstance(_data, Awaitable):
@@ -45,6 +57,23 @@ class AsyncSizedFileAdapter:
         else:
             return _data
 
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        content = await self.read(defaults.stream_chunk_size)
+        if content:
+            return content
+        raise StopAsyncIteration
+
+    def rewindable(self):
+        return self.__source.rewindable()
+
+    async def rewind(self):
+        """回到第一次读取之前的位置，以便重新发送请求体。"""
+        await self.__source.rewind()
+        self.offset = 0
+
     @property
     def len(self):
         return self.size
@@ -77,7 +106,40 @@ def _get_data_size(data):
     return None
 
 
-_CHUNK_SIZE = 8 * 1024
+async def _maybe_await(value):
+    if isinstance(value, Awaitable):
+        return await value
+    return value
+
+
+class _AsyncRewindableSource:
+    """异步版本的 `_RewindableSource` ，数据源的 `seek` 和 `tell` 可以是同步或者异步的。"""
+
+    def __init__(self, data):
+        self.data = data
+        self.__start = None
+
+    async def mark(self):
+        if self.__start is None and _has_seek(self.data):
+            self.__start = await _maybe_await(self.data.tell())
+
+    def rewindable(self):
+        if isinstance(self.data, bytes):
+            return True
+        if hasattr(self.data, "rewindable"):
+            return self.data.rewindable()
+        return _has_seek(self.data)
+
+    async def rewind(self):
+        if hasattr(self.data, "rewindable"):
+            await _maybe_await(self.data.rewind())
+        elif self.__start is not None:
+            await _maybe_await(self.data.seek(self.__start))
+
+
+def _has_seek(data):
+    return hasattr(data, "seek") and hasattr(data, "tell")
+
 
 AsyncAdapterType = Union["_AsyncBytesAndFileAdapter", "_AsyncIterableAdapter", "_AsyncFileLikeAdapter"]
 IterableType = Union[AsyncIterable, Iterable]
@@ -123,6 +185,35 @@ def make_crc_adapter_async(data: AsyncAdapterType | ObjectDataType, init_crc=0,
         raise ClientError(f"{data.__class__.__name__} is not a file object, nor an iterator")
 
 
+def make_stream_adapter_async(
+    data: AsyncAdapterType | ObjectDataType,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    size: int | None = None,
+    enable_crc: bool = False,
+    init_crc: int = 0,
+    cipher_callback: Callable[[bytes], bytes] | None = None,
+    discard: int = 0,
+):
+    """异步版本的 make_stream_adapter，在同一次读取中完成进度回调、CRC计算、加解密和丢弃开头的字节。"""
+
+    data = to_bytes(data)
+    crc_callback = Crc64(init_crc) if enable_crc else None
+
+    # bytes or file object
+    if _has_data_size_attr(data) and not discard:
+        size = _get_data_size(data) if size is None else size
+        return _AsyncBytesAndFileAdapter(data, progress_callback, size, crc_callback, cipher_callback)
+    # file-like object，读到结束为止， `size` 只用于进度回调
+    if is_readable_buffer(data):
+        return _AsyncFileLikeAdapter(data, progress_callback, crc_callback, cipher_callback, discard, size)
+    if discard:
+        raise ClientError(f"{data.__class__.__name__} adapter does not support discard bytes")
+    # iterator
+    if isinstance(data, IterableType):
+        return _AsyncIterableAdapter(data, progress_callback, crc_callback, cipher_callback)
+    raise ClientError(f"{data.__class__.__name__} is not a file object, nor an iterator")
+
+
 def make_cipher_adapter_async(data: ObjectDataType, cipher_callback: Callable[[bytes], bytes], discard: int = 0):
     """异步版本的 make_cipher_adapter，用于 AsyncClient 的 data 参数。"""
 
@@ -142,25 +233,6 @@ def make_cipher_adapter_async(data: ObjectDataType, cipher_callback: Callable[[b
         raise ClientError(f"{data.__class__.__name__} is not a file object")
 
 
-def _invoke_crc_callback(crc_callback, content, discard=0):
-    if crc_callback:
-        crc_callback(content[discard:])
-
-
-def _invoke_progress_callback(
-    progress_callback: Callable[[int, int | None], None] | None, consumed_bytes: int, total_bytes: int | None
-):
-    if progress_callback:
-        progress_callback(consumed_bytes, total_bytes)
-
-
-def _invoke_cipher_callback(cipher_callback, content, discard=0):
-    if cipher_callback:
-        content = cipher_callback(content)
-        return content[discard:]
-    return content
-
-
 class _AsyncIterableAdapter:
     def __init__(
         self,
@@ -174,19 +246,26 @@ class _AsyncIterableAdapter:
         self.offset = 0
         self.crc_callback = crc_callback
         self.cipher_callback = cipher_callback
-        self.buffer = b""
+        self.buffer = _ChunkBuffer()
+        self.__progress = _make_progress_reporter(progress_callback)
 
     def __aiter__(self):
         return self
 
+    def rewindable(self):
+        return False
+
+    async def rewind(self):
+        raise ClientError("Iterator adapter can not be rewound")
+
     async def __anext__(self):
-        await self._report_progress()
         try:
             if isinstance(self.iter, AsyncIterator):
                 content = await self.iter.__anext__()
             else:
                 content = next(self.iter)
-        except StopIteration:
+        except (StopIteration, StopAsyncIteration):
+            _invoke_progress_callback(self.__progress, self.offset, None, True)
             raise StopAsyncIteration
 
         if isinstance(content, bytes):
@@ -194,6 +273,7 @@ class _AsyncIterableAdapter:
         else:
             length = len(to_bytes(content))
         self.offset += length
+        _invoke_progress_callback(self.__progress, self.offset, None)
 
         _invoke_crc_callback(self.crc_callback, content)
 
@@ -201,9 +281,6 @@ class _AsyncIterableAdapter:
 
         return content
 
-    async def _report_progress(self):
-        _invoke_progress_callback(self.progress_callback, self.offset, None)
-
     @property
     def crc(self):
         if self.crc_callback:
@@ -214,24 +291,17 @@ class _AsyncIterableAdapter:
             return None
 
     async def read(self, amt: int | None = None):
-        if amt is None:
+        if amt is None or amt < 0:
             # 如果没有指定读取长度,读取所有剩余数据
-            result = self.buffer
-            self.buffer = b""
-            async for chunk in self:
-                result += chunk
-            return result
+            return b"".join(self.buffer.take_all() + [chunk async for chunk in self])
 
-        while len(self.buffer) < amt:
+        while self.buffer.size < amt:
             try:
-                chunk = await self.__anext__()
-                self.buffer += chunk
+                self.buffer.append(await self.__anext__())
             except StopAsyncIteration:
                 break
 
-        result = self.buffer[:amt]
-        self.buffer = self.buffer[amt:]
-        return result
+        return self.buffer.take(amt)
 
 
 class _AsyncFileLikeAdapter:
@@ -244,24 +314,42 @@ class _AsyncFileLikeAdapter:
         crc_callback=None,
         cipher_callback=None,
         discard=0,
+        total_bytes: int | None = None,
     ):
         self.fileobj = fileobj
         self.progress_callback = progress_callback
+        self.total_bytes = total_bytes
         self.offset = 0
+        self.__progress = _make_progress_reporter(progress_callback)
 
         self.crc_callback = crc_callback
         self.cipher_callback = cipher_callback
         self.discard = discard
         self.read_all = False
+        self.__source = _AsyncRewindableSource(fileobj)
 
     def __aiter__(self):
         return self
 
+    def rewindable(self):
+        # 加密是有状态的，无法从头重新计算
+        return self.cipher_callback is None and self.__source.rewindable()
+
+    async def rewind(self):
+        """回到第一次读取之前的位置，重新计算CRC，以便重新发送请求体。"""
+        if self.cipher_callback is not None:
+            raise ClientError("Cipher adapter can not be rewound")
+        await self.__source.rewind()
+        self.offset = 0
+        self.read_all = False
+        if self.crc_callback:
+            self.crc_callback.reset()
+
     async def __anext__(self):
         if self.read_all:
             raise StopAsyncIteration
 
-        content = await self.read(_CHUNK_SIZE)
+        content = await self.read(defaults.stream_chunk_size)
 
         if content:
             return content
@@ -273,6 +361,7 @@ class _AsyncFileLikeAdapter:
         if offset_start < self.discard and amt and self.cipher_callback:
             amt += self.discard
 
+        await self.__source.mark()
         _content = self.fileobj.read(amt)
         if isinstance(_content, Awaitable):
             content = await _content
@@ -281,11 +370,15 @@ class _AsyncFileLikeAdapter:
 
         if not content:
             self.read_all = True
-            _invoke_progress_callback(self.progress_callback, self.offset, None)
+            _invoke_progress_callback(self.__progress, self.offset, self.total_bytes, True)
         else:
-            _invoke_progress_callback(self.progress_callback, self.offset, None)
-
             self.offset += len(content)
+            _invoke_progress_callback(
+                self.__progress,
+                self.offset,
+                self.total_bytes,
+                self.total_bytes is not None and self.offset >= self.total_bytes,
+            )
 
             real_discard = 0
             if offset_start < self.discard:
@@ -325,19 +418,36 @@ class _AsyncBytesAndFileAdapter:
         self.progress_callback = progress_callback
         self.size = size
         self.offset = 0
+        self.__progress = _make_progress_reporter(progress_callback)
 
         self.crc_callback = crc_callback
         self.cipher_callback = cipher_callback
+        self.__source = _AsyncRewindableSource(self.data)
+        # 参见 :class:`_BytesAndFileAdapter`
+        self.__view = memoryview(self.data) if isinstance(self.data, bytes) else None
 
     @property
     def len(self):
         return self.size
 
+    def rewindable(self):
+        # 加密是有状态的，无法从头重新计算
+        return self.cipher_callback is None and self.__source.rewindable()
+
+    async def rewind(self):
+        """回到第一次读取之前的位置，重新计算CRC，以便重新发送请求体。"""
+        if self.cipher_callback is not None:
+            raise ClientError("Cipher adapter can not be rewound")
+        await self.__source.rewind()
+        self.offset = 0
+        if self.crc_callback:
+            self.crc_callback.reset()
+
     def __aiter__(self):
         return self
 
     async def __anext__(self):
-        content = await self.read(_CHUNK_SIZE)
+        content = await self.read(defaults.stream_chunk_size)
 
         if content:
             return content
@@ -356,24 +466,26 @@ class _AsyncBytesAndFileAdapter:
         else:
             bytes_to_read = min(amt, self.size - self.offset)
 
-        if isinstance(self.data, bytes):
-            content = self.data[self.offset : self.offset + bytes_to_read]
+        if self.__view is not None:
+            content = self.__view[self.offset : self.offset + bytes_to_read]
         elif is_readable_buffer_async(self.data):
+            await self.__source.mark()
             content = await self.data.read(bytes_to_read)
         elif is_readable_buffer_sync(self.data):
+            await self.__source.mark()
             content = self.data.read(bytes_to_read)
         else:
             raise ClientError(f"{self.data.__class__.__name__} is not a file object")
 
         self.offset += bytes_to_read
 
-        _invoke_progress_callback(self.progress_callback, min(self.offset, self.size), self.size)
+        _invoke_progress_callback(self.__progress, min(self.offset, self.size), self.size, self.offset >= self.size)
 
         _invoke_crc_callback(self.crc_callback, content)
 
         content = _invoke_cipher_callback(self.cipher_callback, content)
 
-        return content
+        return _to_chunk(content)
 
     @property
     def crc(self):
@@ -1,10 +1,12 @@
+import time
 import logging
 from typing import Callable, Iterable
 
 from ..crc import Crc64
+from ... import defaults
 from ...compat import to_bytes
 from ...exceptions import ClientError
-from ...types import SyncReadableBuffer, ObjectDataType, is_readable_buffer_sync, has_crc_attr
+from ...types import SyncReadableBuffer, ObjectDataType, is_readable_buffer_sync, has_crc_attr, _ChunkBuffer
 
 
 logger = logging.getLogger(__name__)
@@ -17,11 +19,14 @@ class SizedFileAdapter:
         self.file_object = file_object
         self.size = size
         self.offset = 0
+        self.__source = _RewindableSource(file_object)
 
     def read(self, amt=None):
         if self.offset >= self.size:
             return b""
 
+        self.__source.mark()
+
         if (amt is None or amt < 0) or (amt + self.offset >= self.size):
             data = self.file_object.read(self.size - self.offset)
             self.offset = self.size
@@ -30,6 +35,23 @@ class SizedFileAdapter:
         self.offset += amt
         return self.file_object.read(amt)
 
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        content = self.read(defaults.stream_chunk_size)
+        if content:
+            return content
+        raise StopIteration
+
+    def rewindable(self):
+        return self.__source.rewindable()
+
+    def rewind(self):
+        """回到第一次读取之前的位置，以便重新发送请求体。"""
+        self.__source.rewind()
+        self.offset = 0
+
     @property
     def len(self):
         return self.size
@@ -62,12 +84,41 @@ def _get_data_size(data):
     return None
 
 
-_CHUNK_SIZE = 8 * 1024
+class _RewindableSource:
+    """记录数据源第一次被读取前的位置，从而可以回绕数据源。
 
+    数据源是bytes时总是可以回绕；是适配器时委托给适配器的 `rewind()` ；是文件对象时要求支持 `seek` 和 `tell` 。
+    """
 
-def make_progress_adapter(
-    data: ObjectDataType, progress_callback: Callable[[int, int | None], None] | None, size=None
-):
+    def __init__(self, data):
+        self.data = data
+        self.__start = None
+
+    def mark(self):
+        if self.__start is None and _is_seekable(self.data):
+            self.__start = self.data.tell()
+
+    def rewindable(self):
+        if isinstance(self.data, bytes):
+            return True
+        if hasattr(self.data, "rewindable"):
+            return self.data.rewindable()
+        return _is_seekable(self.data)
+
+    def rewind(self):
+        if hasattr(self.data, "rewindable"):
+            self.data.rewind()
+        elif self.__start is not None:
+            self.data.seek(self.__start)
+
+
+def _is_seekable(data):
+    if hasattr(data, "seekable"):
+        return data.seekable()
+    return hasattr(data, "seek") and hasattr(data, "tell")
+
+
+def make_progress_adapter(data: ObjectDataType, progress_callback: Callable[[int, int | None], None] | None, size=None):
     """返回一个适配器，从而在读取 `data` ，即调用read或者对其进行迭代的时候，能够
      调用进度回调函数。当 `size` 没有指定，且无法确定时，上传回调函数返回的总字节数为None。
 
@@ -122,6 +173,48 @@ def make_crc_adapter(data: ObjectDataType, init_crc=0, discard=0):
         raise ClientError(f"{data.__class__.__name__} is not a file object, nor an iterator")
 
 
+def make_stream_adapter(
+    data: ObjectDataType,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+    size: int | None = None,
+    enable_crc: bool = False,
+    init_crc: int = 0,
+    cipher_callback=None,
+    discard: int = 0,
+):
+    """返回一个适配器，每次读取 `data` 时在同一次调用中完成进度回调、CRC计算、加解密和丢弃开头的字节，
+    代替逐层嵌套的 :func:`make_progress_adapter` 、 :func:`make_crc_adapter` 和 :func:`make_cipher_adapter` 。
+
+    CRC按读到的原始数据（不包括丢弃的字节）计算，之后再加解密，和下载时的顺序相同。
+
+    :param data: 可以是bytes、file object或iterable
+    :param progress_callback: 进度回调函数，参见 :ref:`progress_callback`
+    :param size: 指定 `data` 的大小，可选。 `data` 是无法确定长度的file-like object时只用于进度回调
+    :param enable_crc: 是否计算CRC
+    :param init_crc: 初始CRC值，可选
+    :param cipher_callback: 加解密函数，可选
+    :param discard: 读取时需要丢弃的开头的字节数，只支持file-like object
+
+    :return: 适配器
+    """
+    data = to_bytes(data)
+    crc_callback = Crc64(init_crc) if enable_crc else None
+
+    # bytes or file object
+    if _has_data_size_attr(data) and not discard:
+        size = _get_data_size(data) if size is None else size
+        return _BytesAndFileAdapter(data, progress_callback, size, crc_callback, cipher_callback)
+    # file-like object，读到结束为止， `size` 只用于进度回调
+    if is_readable_buffer_sync(data):
+        return _FileLikeAdapter(data, progress_callback, crc_callback, cipher_callback, discard, size)
+    if discard:
+        raise ClientError(f"{data.__class__.__name__} adapter does not support discard bytes")
+    # iterator
+    if isinstance(data, Iterable):
+        return _IterableAdapter(data, progress_callback, crc_callback, cipher_callback)
+    raise ClientError(f"{data.__class__.__name__} is not a file object, nor an iterator")
+
+
 def make_cipher_adapter(data: ObjectDataType, cipher_callback, discard: int = 0):
     """返回一个适配器，从而在读取 `data` ，即调用read或者对其进行迭代的时候，能够进行加解密操作。
 
@@ -150,22 +243,62 @@ def make_cipher_adapter(data: ObjectDataType, cipher_callback, discard: int = 0)
         raise ClientError(f"{data.__class__.__name__} is not a file object")
 
 
+class _ProgressReporter:
+    """限制进度回调函数的调用频率。
+
+    距离上次调用不足 `defaults.progress_interval` 秒，或者已读取的字节数没有变化时不调用；
+    读取结束（ `final` 为True）时总会调用。
+
+    :param progress_callback: 进度回调函数，参见 :ref:`progress_callback`
+    """
+
+    def __init__(self, progress_callback: Callable[[int, int | None], None]):
+        self.progress_callback = progress_callback
+        self.__last_time = None
+        self.__last_bytes = None
+
+    def __call__(self, consumed_bytes: int, total_bytes: int | None, final: bool = False):
+        if consumed_bytes == self.__last_bytes:
+            return
+
+        now = time.monotonic()
+        if not final and self.__last_time is not None and now - self.__last_time < defaults.progress_interval:
+            return
+
+        self.__last_time = now
+        self.__last_bytes = consumed_bytes
+        self.progress_callback(consumed_bytes, total_bytes)
+
+
+def _make_progress_reporter(progress_callback):
+    return _ProgressReporter(progress_callback) if progress_callback else None
+
+
 def _invoke_crc_callback(crc_callback, content, discard=0):
     if crc_callback:
-        crc_callback(content[discard:])
+        crc_callback(memoryview(content)[discard:] if discard else content)
 
 
 def _invoke_progress_callback(
-    progress_callback: Callable[[int, int | None], None] | None, consumed_bytes: int, total_bytes: int | None
+    progress_reporter: _ProgressReporter | None, consumed_bytes: int, total_bytes: int | None, final: bool = False
 ):
-    if progress_callback:
-        progress_callback(consumed_bytes, total_bytes)
+    if progress_reporter:
+        progress_reporter(consumed_bytes, total_bytes, final)
 
 
 def _invoke_cipher_callback(cipher_callback, content, discard=0):
     if cipher_callback:
         content = cipher_callback(content)
-        return content[discard:]
+        return content[discard:] if discard else content
+    return content
+
+
+def _to_chunk(content) -> bytes:
+    """httpx只接受bytes类型的数据块，memoryview在这里才复制。覆盖整个bytes对象时直接返回原对象。"""
+    if isinstance(content, memoryview):
+        if isinstance(content.obj, bytes) and content.nbytes == len(content.obj):
+            return content.obj
+        return bytes(content)
     return content
 
 
@@ -182,19 +315,30 @@ class _IterableAdapter:
         self.offset = 0
         self.crc_callback = crc_callback
         self.cipher_callback = cipher_callback
-        self.buffer = b""
+        self.buffer = _ChunkBuffer()
+        self.__progress = _make_progress_reporter(progress_callback)
 
     def __iter__(self):
         return self
 
+    def rewindable(self):
+        return False
+
+    def rewind(self):
+        raise ClientError("Iterator adapter can not be rewound")
+
     def __next__(self):
         return self.next()
 
     def next(self):
-        _invoke_progress_callback(self.progress_callback, self.offset, None)
+        try:
+            content = next(self.iter)
+        except StopIteration:
+            _invoke_progress_callback(self.__progress, self.offset, None, True)
+            raise
 
-        content = next(self.iter)
         self.offset += len(content)
+        _invoke_progress_callback(self.__progress, self.offset, None)
 
         _invoke_crc_callback(self.crc_callback, content)
 
@@ -212,24 +356,17 @@ class _IterableAdapter:
             return None
 
     def read(self, amt: int | None = None):
-        if amt is None:
+        if amt is None or amt < 0:
             # 如果没有指定读取长度，读取所有剩余数据
-            result = self.buffer
-            self.buffer = b""
-            for chunk in self:
-                result += chunk
-            return result
+            return b"".join(self.buffer.take_all() + list(self))
 
-        while len(self.buffer) < amt:
+        while self.buffer.size < amt:
             try:
-                chunk = next(self)
-                self.buffer += chunk
+                self.buffer.append(next(self))
             except StopIteration:
                 break
 
-        result = self.buffer[:amt]
-        self.buffer = self.buffer[amt:]
-        return result
+        return self.buffer.take(amt)
 
 
 class _FileLikeAdapter:
@@ -237,6 +374,7 @@ class _FileLikeAdapter:
 
     :param fileobj: file-like object，只要支持read即可
     :param progress_callback: 进度回调函数
+    :param total_bytes: 进度回调函数中的总字节数，可选
     """
 
     def __init__(
@@ -246,19 +384,37 @@ class _FileLikeAdapter:
         crc_callback=None,
         cipher_callback=None,
         discard=0,
+        total_bytes: int | None = None,
     ):
         self.fileobj = fileobj
         self.progress_callback = progress_callback
+        self.total_bytes = total_bytes
         self.offset = 0
+        self.__progress = _make_progress_reporter(progress_callback)
 
         self.crc_callback = crc_callback
         self.cipher_callback = cipher_callback
         self.discard = discard
         self.read_all = False
+        self.__source = _RewindableSource(fileobj)
 
     def __iter__(self):
         return self
 
+    def rewindable(self):
+        # 加密是有状态的，无法从头重新计算
+        return self.cipher_callback is None and self.__source.rewindable()
+
+    def rewind(self):
+        """回到第一次读取之前的位置，重新计算CRC，以便重新发送请求体。"""
+        if self.cipher_callback is not None:
+            raise ClientError("Cipher adapter can not be rewound")
+        self.__source.rewind()
+        self.offset = 0
+        self.read_all = False
+        if self.crc_callback:
+            self.crc_callback.reset()
+
     def __next__(self):
         return self.next()
 
@@ -266,7 +422,7 @@ class _FileLikeAdapter:
         if self.read_all:
             raise StopIteration
 
-        content = self.read(_CHUNK_SIZE)
+        content = self.read(defaults.stream_chunk_size)
 
         if content:
             return content
@@ -278,14 +434,19 @@ class _FileLikeAdapter:
         if offset_start < self.discard and amt and self.cipher_callback:
             amt += self.discard
 
+        self.__source.mark()
         content = self.fileobj.read(amt)
         if not content:
             self.read_all = True
-            _invoke_progress_callback(self.progress_callback, self.offset, None)
+            _invoke_progress_callback(self.__progress, self.offset, self.total_bytes, True)
         else:
-            _invoke_progress_callback(self.progress_callback, self.offset, None)
-
             self.offset += len(content)
+            _invoke_progress_callback(
+                self.__progress,
+                self.offset,
+                self.total_bytes,
+                self.total_bytes is not None and self.offset >= self.total_bytes,
+            )
 
             real_discard = 0
             if offset_start < self.discard:
@@ -331,14 +492,31 @@ class _BytesAndFileAdapter:
         self.progress_callback = progress_callback
         self.size = size
         self.offset = 0
+        self.__progress = _make_progress_reporter(progress_callback)
 
         self.crc_callback = crc_callback
         self.cipher_callback = cipher_callback
+        self.__source = _RewindableSource(self.data)
+        # 切片memoryview不复制数据，CRC和加密直接使用切片
+        self.__view = memoryview(self.data) if isinstance(self.data, bytes) else None
 
     @property
     def len(self):
         return self.size
 
+    def rewindable(self):
+        # 加密是有状态的，无法从头重新计算
+        return self.cipher_callback is None and self.__source.rewindable()
+
+    def rewind(self):
+        """回到第一次读取之前的位置，重新计算CRC，以便重新发送请求体。"""
+        if self.cipher_callback is not None:
+            raise ClientError("Cipher adapter can not be rewound")
+        self.__source.rewind()
+        self.offset = 0
+        if self.crc_callback:
+            self.crc_callback.reset()
+
     def __iter__(self):
         return self
 
@@ -346,7 +524,7 @@ class _BytesAndFileAdapter:
         return self.next()
 
     def next(self):
-        content = self.read(_CHUNK_SIZE)
+        content = self.read(defaults.stream_chunk_size)
 
         if content:
             return content
@@ -365,22 +543,23 @@ class _BytesAndFileAdapter:
         else:
             bytes_to_read = min(amt, self.size - self.offset)
 
-        if isinstance(self.data, bytes):
-            content = self.data[self.offset : self.offset + bytes_to_read]
+        if self.__view is not None:
+            content = self.__view[self.offset : self.offset + bytes_to_read]
         elif is_readable_buffer_sync(self.data):
+            self.__source.mark()
             content = self.data.read(bytes_to_read)
         else:
             raise ClientError(f"{self.data.__class__.__name__} is not a file object")
 
         self.offset += bytes_to_read
 
-        _invoke_progress_callback(self.progress_callback, min(self.offset, self.size), self.size)
+        _invoke_progress_callback(self.__progress, min(self.offset, self.size), self.size, self.offset >= self.size)
 
         _invoke_crc_callback(self.crc_callback, content)
 
         content = _invoke_cipher_callback(self.cipher_callback, content)
 
-        return content
+        return _to_chunk(content)
 
     @property
     def crc(self):
@@ -0,0 +1,151 @@
+"""并行计算本地文件的CRC64和MD5。
+
+文件被分成若干段，每段独立计算CRC64（可选MD5），再用 :meth:`Crc64.combine_many <aliyun_oss_x.utils.Crc64.combine_many>`
+合并为整个文件的CRC64。每段用 `os.pread` 按 `_READ_SIZE` 读取，不共享文件位置，可以并发执行。
+
+MD5由hashlib计算，计算时释放GIL，多线程可以利用多个CPU；crcmod的C扩展计算CRC64时不释放GIL，多线程只能让读盘和计算
+重叠。需要多核并行计算CRC64时，可以传入 `concurrent.futures.ProcessPoolExecutor` 作为 `executor` 。
+"""
+
+import os
+import base64
+import hashlib
+import concurrent.futures
+from pathlib import Path
+from typing import Iterable
+
+from .. import defaults
+from . import _crc64
+from .crc import Crc64
+
+
+# 每次读取的长度，和纯Python后端整块计算的长度相同
+_READ_SIZE = 1024 * 1024
+
+
+class RangeChecksum:
+    """文件中一段数据的校验值。
+
+    :param start: 起始位置
+    :param size: 长度
+    :param crc64: CRC64
+    :param md5: MD5摘要（16字节），没有计算MD5时为None
+    """
+
+    def __init__(self, start: int, size: int, crc64: int, md5: bytes | None = None):
+        #: 起始位置
+        self.start = start
+
+        #: 长度
+        self.size = size
+
+        #: CRC64
+        self.crc64 = crc64
+
+        #: MD5摘要（16字节），没有计算MD5时为None
+        self.md5 = md5
+
+    @property
+    def content_md5(self) -> str | None:
+        """Base64编码的MD5，可以作为 `Content-MD5` 头部。"""
+        return None if self.md5 is None else base64.b64encode(self.md5).decode()
+
+    @property
+    def etag(self) -> str | None:
+        """大写十六进制的MD5，和未加密的 `put_object` 、 `upload_part` 返回的ETag相同。"""
+        return None if self.md5 is None else self.md5.hex().upper()
+
+    def __repr__(self):
+        return f"<RangeChecksum start: {self.start}, size: {self.size}, crc64: {self.crc64}, etag: {self.etag}>"
+
+
+def _checksum_range(filename: str, start: int, size: int, md5: bool) -> tuple[int, bytes | None]:
+    """计算一段数据的CRC64和MD5。在进程池中执行时需要可以被pickle，所以是模块级的函数。"""
+    crc = 0
+    digest = hashlib.md5() if md5 else None
+    with open(filename, "rb") as f:
+        fd = f.fileno()
+        offset = start
+        end = start + size
+        while offset < end:
+            length = min(_READ_SIZE, end - offset)
+            if hasattr(os, "pread"):
+                data = os.pread(fd, length, offset)
+            else:
+                f.seek(offset)
+                data = f.read(length)
+            if not data:
+                raise EOFError(f"{filename} is shorter than expected: {offset} < {end}")
+
+            crc = _crc64.update(crc, data)
+            if digest is not None:
+                digest.update(data)
+            offset += len(data)
+
+    return crc, None if digest is None else digest.digest()
+
+
+def calc_range_checksums(
+    filename: str | Path,
+    ranges: Iterable[tuple[int, int]],
+    md5: bool = False,
+    num_threads: int | None = None,
+    executor: concurrent.futures.Executor | None = None,
+) -> list[RangeChecksum]:
+    """并发计算文件中每段数据的CRC64，以及可选的MD5。
+
+    用法 ::
+
+        >>> checksums = calc_range_checksums('big.bin', [(0, 1024), (1024, 1024)], md5=True)
+        >>> headers = {'Content-MD5': checksums[0].content_md5}
+
+    :param filename: 本地文件名
+    :param ranges: `(起始位置, 长度)` 的序列
+    :param md5: 是否同时计算MD5
+    :param num_threads: 不指定 `executor` 时使用的线程数，如不指定则使用 `aliyun_oss_x.defaults.checksum_num_threads`
+    :param executor: 执行计算的 `concurrent.futures.Executor` ，可以是进程池。如不指定则临时创建一个线程池。
+
+    :return: :class:`RangeChecksum` 的列表，和 `ranges` 的顺序相同
+    """
+    filename = os.fspath(filename)
+    ranges = list(ranges)
+    if not ranges:
+        return []
+
+    own_executor = executor is None
+    if own_executor:
+        num_threads = min(defaults.get(num_threads, defaults.checksum_num_threads), len(ranges))
+        executor = concurrent.futures.ThreadPoolExecutor(num_threads, thread_name_prefix="oss-checksum")
+
+    try:
+        futures = [executor.submit(_checksum_range, filename, start, size, md5) for start, size in ranges]
+        results = [future.result() for future in futures]
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+    return [RangeChecksum(start, size, crc, digest) for (start, size), (crc, digest) in zip(ranges, results)]
+
+
+def calc_file_crc64(
+    filename: str | Path,
+    part_size: int | None = None,
+    num_threads: int | None = None,
+    executor: concurrent.futures.Executor | None = None,
+) -> int:
+    """把文件分成长度为 `part_size` 的若干段并发计算CRC64，合并为整个文件的CRC64，和OSS返回的
+    `x-oss-hash-crc64ecma` 相同。
+
+    :param filename: 本地文件名
+    :param part_size: 每段的长度，如不指定则使用 `aliyun_oss_x.defaults.checksum_part_size`
+    :param num_threads: 不指定 `executor` 时使用的线程数，如不指定则使用 `aliyun_oss_x.defaults.checksum_num_threads`
+    :param executor: 执行计算的 `concurrent.futures.Executor` ，可以是进程池。如不指定则临时创建一个线程池。
+    """
+    part_size = defaults.get(part_size, defaults.checksum_part_size)
+    if part_size <= 0:
+        raise ValueError(f"part_size must be positive: {part_size}")
+
+    size = Path(filename).stat().st_size
+    ranges = [(start, min(part_size, size - start)) for start in range(0, size, part_size)]
+    checksums = calc_range_checksums(filename, ranges, num_threads=num_threads, executor=executor)
+    return Crc64().combine_many((c.crc64, c.size) for c in checksums)
@@ -1,14 +1,27 @@
+from . import _crc64
 from ..crc64_combine import make_combine_function
 
 
+def crc64_backend() -> str:
+    """返回当前计算CRC64的后端： `"crcmod-c"` （crcmod的C扩展）或者 `"python"` （纯Python实现）。
+
+    没有安装crcmod的C扩展时，开启CRC校验（ `enable_crc=True` ）的上传、下载可能受限于CRC的计算速度。
+    """
+    return _crc64.BACKEND
+
+
 class Crc64:
+    """CRC-64/ECMA-182，和OSS返回的 `x-oss-hash-crc64ecma` 一致。计算后端参见 :func:`crc64_backend` 。
+
+    :param init_crc: 初始值，即之前数据的CRC，在其基础上继续计算
+    """
+
     _POLY = 0x142F0E1EBA9EA3693
     _XOROUT = 0xFFFFFFFFFFFFFFFF
 
     def __init__(self, init_crc=0):
-        from crcmod import Crc
-
-        self.crc64 = Crc(self._POLY, initCrc=init_crc, rev=True, xorOut=self._XOROUT)
+        self.__init_crc = init_crc
+        self.__crc = init_crc
 
         self.crc64_combineFun = make_combine_function(self._POLY, initCrc=init_crc, rev=True, xorOut=self._XOROUT)
 
@@ -16,14 +29,32 @@ class Crc64:
         self.update(data)
 
     def update(self, data):
-        self.crc64.update(data)
+        self.__crc = _crc64.update(self.__crc, data)
+
+    def reset(self):
+        """恢复到初始状态，用于重新计算同一段数据的CRC。"""
+        self.__crc = self.__init_crc
 
     def combine(self, crc1, crc2, len2):
         return self.crc64_combineFun(crc1, crc2, len2)
 
+    def combine_many(self, parts):
+        """按顺序合并多段数据的CRC，得到整个数据的CRC。
+
+        长度相同的段共用一个缓存的算子，合并上万个分片也只需要几十毫秒。
+
+        :param parts: `(crc, 长度)` 的序列
+        :return: 合并后的CRC
+        """
+        combine = self.crc64_combineFun
+        crc = 0
+        for part_crc, size in parts:
+            crc = combine(crc, part_crc, size)
+        return crc
+
     @property
     def crc(self):
-        return self.crc64.crcValue
+        return self.__crc
 
 
 class Crc32:
@@ -41,6 +72,10 @@ class Crc32:
     def update(self, data):
         self.crc32.update(data)
 
+    def reset(self):
+        """恢复到初始状态，用于重新计算同一段数据的CRC。"""
+        self.crc32 = self.crc32.new()
+
     @property
     def crc(self):
         return self.crc32.crcValue
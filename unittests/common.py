@@ -8,13 +8,20 @@ import os
 import io
 import functools
 import re
+import time
+import asyncio
+import hashlib
+import threading
 
 import xml
 from xml.dom import minidom
 
 import shutil
 
+import httpx
+
 import aliyun_oss_x
+from aliyun_oss_x import http
 
 DT_NONE = 0
 DT_BYTES = 1
@@ -24,6 +31,8 @@ CHUNK_SIZE = 8192
 
 BUCKET_NAME = "ming-oss-share"
 
+ENDPOINT = "http://oss-cn-hangzhou.aliyuncs.com"
+
 
 def random_string(n):
     return "".join(random.choice(string.ascii_lowercase) for i in range(n))
@@ -294,6 +303,183 @@ def calc_crc(data):
     return crc.crc
 
 
+def mock_bucket(handler, bucket_class=aliyun_oss_x.Bucket, **kwargs):
+    """创建请求由 `handler` 处理的Bucket，用于不经过网络的测试。其余参数传给 `bucket_class` 。"""
+    session = http.Session(http2=False)
+    session.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return bucket_class(aliyun_oss_x.AnonymousAuth(), ENDPOINT, BUCKET_NAME, session=session, **kwargs)
+
+
+def mock_async_bucket(handler, bucket_class=aliyun_oss_x.AsyncBucket, **kwargs):
+    """:func:`mock_bucket` 的异步版本，需要在事件循环中调用。"""
+    session = http.AsyncSession(http2=False)
+    session.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return bucket_class(aliyun_oss_x.AnonymousAuth(), ENDPOINT, BUCKET_NAME, session=session, **kwargs)
+
+
+class RangeServer:
+    """支持HEAD和Range GET的对象服务，用作 `httpx.MockTransport` 的处理函数，记录每个Range GET的范围。
+
+    `etag` 改变后带旧ETag的请求返回412； `crc` 不为None时HEAD返回这个CRC64而不是文件真实的CRC64。
+
+    :param throttle: 前几个Range GET返回503
+    :param free: 不为None时，只有前 `free` 个Range GET立即返回，之后的请求等待 `gate`
+    :param slow_start: 从这个位置开始的第一个Range GET每16KB等待 `delay` 秒
+    """
+
+    def __init__(self, content, throttle=0, free=None, slow_start=None, delay=0):
+        self.content = content
+        self.etag = "etag"
+        self.crc = None
+        self.throttle = throttle
+        self.free = free
+        self.gate = threading.Event()
+        self.slow_start = slow_start
+        self.delay = delay
+        self.ranges = []
+        self.if_match = set()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def count(self):
+        with self.lock:
+            return self.requests
+
+    def __call__(self, request):
+        request.read()
+        if self._gated(request):
+            self.gate.wait(5)
+        return self._respond(request)
+
+    async def handle_async(self, request):
+        await request.aread()
+        if self._gated(request):
+            while not self.gate.is_set():
+                await asyncio.sleep(0.01)
+        return self._respond(request)
+
+    def _is_data(self, request):
+        return "Range" in request.headers
+
+    def _gated(self, request):
+        if not self._is_data(request):
+            return False
+        with self.lock:
+            self.requests += 1
+            return self.free is not None and self.requests > self.free
+
+    def _respond(self, request):
+        headers = {"x-oss-request-id": REQUEST_ID, "Last-Modified": MTIME_STRING, "ETag": f'"{self.etag}"'}
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(self.content))
+            headers["x-oss-hash-crc64ecma"] = str(self.crc if self.crc is not None else calc_crc(self.content))
+            return httpx.Response(200, headers=headers)
+
+        if request.headers.get("If-Match", self.etag) != self.etag:
+            xml = "<Error><Code>PreconditionFailed</Code><Message>etag mismatch</Message></Error>"
+            return httpx.Response(412, headers=headers, content=xml.encode())
+
+        with self.lock:
+            throttled = self.throttle > 0
+            self.throttle -= 1
+        if throttled:
+            return httpx.Response(503, headers=headers)
+
+        start, end = (int(x) for x in request.headers["Range"][len("bytes=") :].split("-"))
+        with self.lock:
+            slow = start == self.slow_start and all(r[0] != start for r in self.ranges)
+            self.ranges.append((start, end))
+            if "If-Match" in request.headers:
+                self.if_match.add(request.headers["If-Match"])
+
+        body = self.content[start : end + 1]
+        if not slow:
+            return httpx.Response(206, headers=headers, content=body)
+
+        def stream():
+            for i in range(0, len(body), 16 * 1024):
+                time.sleep(self.delay)
+                yield body[i : i + 16 * 1024]
+
+        return httpx.Response(206, headers=headers, content=stream())
+
+
+class MultipartServer:
+    """保存分片内容的对象服务，用作 `httpx.MockTransport` 的处理函数，返回数据的CRC64，分片的ETag为分片的MD5。
+
+    :param fail_part: 上传这个编号的分片时返回500
+    :param fail_complete: 前几次CompleteMultipartUpload返回403，模拟上传中断
+    :param delay: 每个分片上传请求的耗时（秒）
+    """
+
+    def __init__(self, fail_part=None, fail_complete=0, delay=0):
+        self.parts = {}
+        self.uploaded = []
+        self.put_body = None
+        self.aborted = False
+        self.complete_calls = 0
+        self.fail_part = fail_part
+        self.fail_complete = fail_complete
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def content(self):
+        return b"".join(self.parts[i] for i in sorted(self.parts))
+
+    def __call__(self, request):
+        headers = {"x-oss-request-id": REQUEST_ID, "ETag": '"etag"'}
+        params = request.url.params
+        body = request.read()
+        if "uploads" in params:
+            xml = "<InitiateMultipartUploadResult><UploadId>upload-id</UploadId></InitiateMultipartUploadResult>"
+            return httpx.Response(200, headers=headers, content=xml.encode())
+        if "partNumber" in params:
+            part_number = int(params["partNumber"])
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(self.delay)
+            with self.lock:
+                self.running -= 1
+            if part_number == self.fail_part:
+                return httpx.Response(500, headers=headers)
+            with self.lock:
+                self.parts[part_number] = body
+                self.uploaded.append(part_number)
+            headers["ETag"] = '"' + hashlib.md5(body).hexdigest().upper() + '"'
+            headers["x-oss-hash-crc64ecma"] = str(calc_crc(body))
+            return httpx.Response(200, headers=headers)
+        if request.method == "DELETE":
+            self.aborted = True
+            return httpx.Response(204, headers=headers)
+        if request.method == "GET":
+            xml = "<ListPartsResult><IsTruncated>false</IsTruncated><NextPartNumberMarker>0</NextPartNumberMarker>"
+            for number, data in sorted(self.parts.items()):
+                xml += (
+                    f"<Part><PartNumber>{number}</PartNumber><LastModified>2015-12-12T00:36:29.000Z</LastModified>"
+                    f'<ETag>"{hashlib.md5(data).hexdigest().upper()}"</ETag><Size>{len(data)}</Size></Part>'
+                )
+            xml += "</ListPartsResult>"
+            return httpx.Response(200, headers=headers, content=xml.encode())
+        if "uploadId" not in params:
+            self.put_body = body
+            headers["x-oss-hash-crc64ecma"] = str(calc_crc(body))
+            return httpx.Response(200, headers=headers)
+
+        self.complete_calls += 1
+        if self.complete_calls <= self.fail_complete:
+            return httpx.Response(403, headers=headers)
+        headers["x-oss-hash-crc64ecma"] = str(calc_crc(self.content()))
+        xml = "<CompleteMultipartUploadResult><ETag>etag</ETag></CompleteMultipartUploadResult>"
+        return httpx.Response(200, headers=headers, content=xml.encode())
+
+    async def handle_async(self, request):
+        await request.aread()
+        return await asyncio.to_thread(self, request)
+
+
 class MockSocket:
     def __init__(self, payload):
         self._file = io.BytesIO(payload)
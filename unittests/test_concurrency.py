@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import aliyun_oss_x
+
+from unittests.common import random_bytes, mock_bucket, RangeServer
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def test_increase_while_throughput_improves(self):
+        changes = []
+        controller = aliyun_oss_x.AdaptiveConcurrency(max_limit=3, initial_limit=1, on_change=changes.append)
+
+        # 每一轮吞吐量都在提升，直到达到上限
+        for _ in range(10):
+            controller.record_success(1024, 0)
+        self.assertEqual(controller.limit, 3)
+        self.assertEqual(changes, [2, 3])
+
+    def test_decrease_on_throttle(self):
+        controller = aliyun_oss_x.AdaptiveConcurrency(max_limit=16, initial_limit=10, decrease_factor=0.5)
+        controller.record_throttled()
+        self.assertEqual(controller.limit, 5)
+
+        # 同一轮内只减一次
+        controller.record_throttled()
+        self.assertEqual(controller.limit, 5)
+
+        controller = aliyun_oss_x.AdaptiveConcurrency(min_limit=2, initial_limit=2)
+        controller.record_throttled()
+        self.assertEqual(controller.limit, 2)
+
+    def test_decrease_on_rising_latency(self):
+        controller = aliyun_oss_x.AdaptiveConcurrency(max_limit=16, initial_limit=4, decrease_factor=0.5)
+        for _ in range(4):
+            controller.record_success(1000, 1)
+        self.assertEqual(controller.limit, 5)
+
+        for _ in range(5):
+            controller.record_success(1000, 10)
+        self.assertEqual(controller.limit, 2)
+
+    def test_acquire_blocks_at_limit(self):
+        controller = aliyun_oss_x.AdaptiveConcurrency(max_limit=4, initial_limit=1)
+        controller.acquire()
+
+        acquired = threading.Event()
+
+        def worker():
+            controller.acquire()
+            acquired.set()
+            controller.release()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        self.assertFalse(acquired.wait(0.1))
+
+        controller.release()
+        self.assertTrue(acquired.wait(1))
+        t.join()
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_acquire_async(self):
+        controller = aliyun_oss_x.AdaptiveConcurrency(max_limit=2, min_limit=2)
+        peak = [0]
+
+        async def part():
+            peak[0] = max(peak[0], controller.in_flight)
+            await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(*[controller.run_async(part, 1) for _ in range(8)])
+
+        asyncio.run(run())
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_retries_counted_per_call(self):
+        server = RangeServer(random_bytes(100), throttle=1)
+        bucket = mock_bucket(server, enable_crc=False, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+        controller = aliyun_oss_x.AdaptiveConcurrency(max_limit=8, initial_limit=4, decrease_factor=0.5)
+
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def part():
+            started.set()
+            proceed.wait(5)
+
+        # 其他线程中的重试不计入正在传输的分片
+        t = threading.Thread(target=controller.run, args=(part, 100))
+        t.start()
+        started.wait(5)
+        bucket.get_object("key", byte_range=(0, 9)).read()
+        proceed.set()
+        t.join()
+        self.assertEqual(controller.limit, 4)
+
+        # 分片自己的请求发生重试时减小并发
+        server.throttle = 1
+        controller.run(lambda: bucket.get_object("key", byte_range=(0, 9)).read(), 10)
+        self.assertEqual(controller.limit, 2)
+
+    def test_resumable_download(self):
+        content = random_bytes(1024 * 1024)
+        server = RangeServer(content, throttle=1)
+
+        bucket = mock_bucket(server, enable_crc=False, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+
+        changes = []
+        controller = aliyun_oss_x.AdaptiveConcurrency(max_limit=8, initial_limit=4, on_change=changes.append)
+        with mock.patch("aliyun_oss_x.resumable.sync_resumable.ResumableDownloadStore") as store:
+            store.return_value.get.return_value = None
+            filename = self.id() + ".txt"
+            self.addCleanup(aliyun_oss_x.utils.silently_remove, filename)
+            aliyun_oss_x.resumable_download(
+                bucket, "key", filename, multiget_threshold=1, part_size=64 * 1024, concurrency=controller
+            )
+
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), content)
+        self.assertEqual(changes[0], 2)
+        self.assertEqual(controller.in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
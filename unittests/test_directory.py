@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+
+import os
+import asyncio
+import hashlib
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from pathlib import Path
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+from urllib.parse import unquote
+
+import httpx
+
+import aliyun_oss_x
+from aliyun_oss_x.executor import TransferExecutor
+
+from unittests.common import MTIME_STRING, REQUEST_ID, mock_bucket, mock_async_bucket, calc_crc
+
+
+_LIST_PAGE = 3
+
+
+def _etag(content):
+    return hashlib.md5(content).hexdigest().upper()
+
+
+class _BucketServer:
+    """内存中的Bucket，支持put_object、分片上传、HEAD、GET（包括Range）、ListObjectsV2和批量删除。
+    `fail_keys` 中的文件上传或者下载时返回403。
+    """
+
+    def __init__(self, objects=None, fail_keys=()):
+        self.objects = dict(objects or {})
+        self.fail_keys = set(fail_keys)
+        self.uploads = {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        headers = {"x-oss-request-id": REQUEST_ID, "ETag": '"etag"', "Last-Modified": MTIME_STRING}
+        params = request.url.params
+        key = unquote(request.url.path.lstrip("/"))
+        body = request.read()
+        with self.lock:
+            self.requests.append((request.method, key))
+
+        if key in self.fail_keys:
+            xml = "<Error><Code>AccessDenied</Code><Message>denied</Message></Error>"
+            return httpx.Response(403, headers=headers, content=xml.encode())
+
+        if request.method == "GET" and not key:
+            return self.__list(params, headers)
+        if "delete" in params:
+            return self.__delete(body, headers)
+        if "uploads" in params:
+            with self.lock:
+                self.uploads[key] = {}
+            xml = f"<InitiateMultipartUploadResult><UploadId>{key}</UploadId></InitiateMultipartUploadResult>"
+            return httpx.Response(200, headers=headers, content=xml.encode())
+        if "partNumber" in params:
+            with self.lock:
+                self.uploads[key][int(params["partNumber"])] = body
+            return httpx.Response(200, headers=headers)
+        if "uploadId" in params and request.method == "GET":
+            xml = "<ListPartsResult><IsTruncated>false</IsTruncated><NextPartNumberMarker>0</NextPartNumberMarker></ListPartsResult>"
+            return httpx.Response(200, headers=headers, content=xml.encode())
+        if "uploadId" in params and request.method == "POST":
+            with self.lock:
+                parts = self.uploads.pop(key)
+                content = self.objects[key] = b"".join(parts[i] for i in sorted(parts))
+            xml = "<CompleteMultipartUploadResult><ETag>etag</ETag></CompleteMultipartUploadResult>"
+            return httpx.Response(200, headers=self.__object_headers(headers, content), content=xml.encode())
+        if request.method == "PUT":
+            with self.lock:
+                self.objects[key] = body
+            return httpx.Response(200, headers=self.__object_headers(headers, body))
+
+        content = self.objects[key]
+        headers = self.__object_headers(headers, content)
+        if request.method == "HEAD":
+            return httpx.Response(200, headers=dict(headers, **{"Content-Length": str(len(content))}))
+        if "Range" in request.headers:
+            start, end = (int(x) for x in request.headers["Range"][len("bytes=") :].split("-"))
+            return httpx.Response(206, headers=headers, content=content[start : end + 1])
+        return httpx.Response(200, headers=headers, content=content)
+
+    def __list(self, params, headers):
+        prefix = params.get("prefix", "")
+        # 和OSS一样从上一页的最后一个文件名之后继续列举，列举过程中删除文件不影响后面的页
+        token = params.get("continuation-token", "")
+        with self.lock:
+            objects = sorted((k, v) for k, v in self.objects.items() if k.startswith(prefix) and k > token)
+        page = objects[:_LIST_PAGE]
+        truncated = len(objects) > _LIST_PAGE
+
+        xml = "<ListBucketResult>"
+        xml += f"<IsTruncated>{'true' if truncated else 'false'}</IsTruncated>"
+        if truncated:
+            xml += f"<NextContinuationToken>{escape(page[-1][0])}</NextContinuationToken>"
+        for k, content in page:
+            xml += (
+                f"<Contents><Key>{escape(k)}</Key><LastModified>2015-12-17T06:36:41.000Z</LastModified>"
+                f'<ETag>"{_etag(content)}"</ETag><Type>Normal</Type><Size>{len(content)}</Size>'
+                f"<StorageClass>Standard</StorageClass></Contents>"
+            )
+        xml += "</ListBucketResult>"
+        return httpx.Response(200, headers=headers, content=xml.encode())
+
+    def __delete(self, body, headers):
+        keys = [node.text for node in ElementTree.fromstring(body).iter("Key")]
+        with self.lock:
+            for k in keys:
+                self.objects.pop(k, None)
+        xml = "<DeleteResult>" + "".join(f"<Deleted><Key>{escape(k)}</Key></Deleted>" for k in keys) + "</DeleteResult>"
+        return httpx.Response(200, headers=headers, content=xml.encode())
+
+    @staticmethod
+    def __object_headers(headers, content):
+        return dict(headers, **{"ETag": f'"{_etag(content)}"', "x-oss-hash-crc64ecma": str(calc_crc(content))})
+
+    async def handle_async(self, request):
+        await request.aread()
+        return await asyncio.to_thread(self, request)
+
+
+def _make_tree(root, files):
+    for relative, content in files.items():
+        path = Path(root) / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+class TestDirectory(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.directory = self.tmp / "data"
+        self.upload_store = aliyun_oss_x.ResumableStore(root=self.tmp / "store")
+        self.download_store = aliyun_oss_x.ResumableDownloadStore(root=self.tmp / "store")
+
+    def test_upload_directory(self):
+        files = {f"dir{i % 3}/file{i}.txt": os.urandom(100 + i) for i in range(20)}
+        files["big.bin"] = os.urandom(300 * 1024)
+        files["skip.tmp"] = b"tmp"
+        _make_tree(self.directory, files)
+        server = _BucketServer()
+        consumed = []
+
+        result = aliyun_oss_x.upload_directory(
+            mock_bucket(server, enable_crc=False),
+            self.directory,
+            prefix="backup/",
+            exclude=["*.tmp"],
+            store=self.upload_store,
+            multipart_threshold=200 * 1024,
+            part_size=100 * 1024,
+            num_threads=4,
+            part_num_threads=2,
+            executor=TransferExecutor(2),
+            progress_callback=lambda consumed_bytes, total_bytes: consumed.append((consumed_bytes, total_bytes)),
+        )
+
+        del files["skip.tmp"]
+        self.assertTrue(result.ok)
+        self.assertEqual(sorted(result.succeeded), sorted(files))
+        self.assertEqual(result.transferred_bytes, sum(len(c) for c in files.values()))
+        self.assertEqual(server.objects, {"backup/" + k: v for k, v in files.items()})
+        self.assertEqual(consumed[-1], (result.transferred_bytes, result.transferred_bytes))
+
+    def test_download_directory(self):
+        objects = {f"backup/a/{i}.csv": os.urandom(50 + i) for i in range(8)}
+        objects["backup/b/big.bin"] = os.urandom(300 * 1024)
+        objects["backup/b/"] = b""
+        objects["other/x.csv"] = b"x"
+        server = _BucketServer(objects)
+
+        result = aliyun_oss_x.download_directory(
+            mock_bucket(server, enable_crc=False),
+            "backup/",
+            self.directory,
+            include=["a/*", "*.bin"],
+            store=self.download_store,
+            multiget_threshold=200 * 1024,
+            part_size=100 * 1024,
+            num_threads=3,
+            part_num_threads=2,
+            executor=TransferExecutor(2),
+        )
+
+        self.assertTrue(result.ok)
+        self.assertEqual(len(result.succeeded), 9)
+        for key, content in objects.items():
+            if key.startswith("backup/") and not key.endswith("/"):
+                self.assertEqual((self.directory / key[len("backup/") :]).read_bytes(), content)
+        self.assertFalse((self.directory / "other").exists())
+
+    def test_errors(self):
+        objects = {"p/ok.txt": b"ok", "p/denied.txt": b"no", "p/../escape.txt": b"bad"}
+        server = _BucketServer(objects, fail_keys=["p/denied.txt"])
+
+        result = aliyun_oss_x.download_directory(
+            mock_bucket(server, enable_crc=False), "p/", self.directory, store=self.download_store
+        )
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.succeeded, ["ok.txt"])
+        self.assertIsInstance(result.failed["denied.txt"], aliyun_oss_x.exceptions.AccessDenied)
+        self.assertIsInstance(result.failed["../escape.txt"], aliyun_oss_x.exceptions.ClientError)
+        self.assertFalse((self.tmp / "escape.txt").exists())
+
+    def test_async(self):
+        files = {f"d{i % 2}/f{i}": os.urandom(10 + i) for i in range(10)}
+        _make_tree(self.directory, files)
+        server = _BucketServer()
+        target = self.tmp / "copy"
+
+        async def run():
+            bucket = mock_async_bucket(server.handle_async, enable_crc=False)
+            uploaded = await aliyun_oss_x.upload_directory_async(
+                bucket,
+                self.directory,
+                prefix="x/",
+                include=["d0/*"],
+                store=aliyun_oss_x.AsyncResumableStore(root=self.tmp / "store"),
+                num_threads=3,
+            )
+            downloaded = await aliyun_oss_x.download_directory_async(
+                bucket,
+                "x/",
+                target,
+                store=aliyun_oss_x.AsyncResumableDownloadStore(root=self.tmp / "store"),
+                num_threads=3,
+            )
+            return uploaded, downloaded
+
+        uploaded, downloaded = asyncio.run(run())
+        expected = sorted(k for k in files if k.startswith("d0/"))
+        self.assertEqual(sorted(uploaded.succeeded), expected)
+        self.assertEqual(sorted(downloaded.succeeded), expected)
+        for relative in expected:
+            self.assertEqual((target / relative).read_bytes(), files[relative])
+
+    def test_sync_directory(self):
+        files = {
+            "a.txt": b"local a",
+            "b.txt": b"b",
+            "b-x.txt": b"bx",
+            "b/c.txt": b"same content",
+            "b/d.txt": b"new",
+            "big.bin": os.urandom(300 * 1024),
+            "skip.tmp": b"tmp",
+        }
+        _make_tree(self.directory, files)
+        objects = {
+            "s/a.txt": b"other a",
+            "s/b/c.txt": b"same content",
+            "s/old1.txt": b"old",
+            "s/old2.txt": b"old",
+            "s/z/old3.txt": b"old",
+            "s/keep.tmp": b"keep",
+            "other/x.txt": b"x",
+        }
+        server = _BucketServer(objects)
+        manifest = self.tmp / "manifest.db"
+
+        def sync():
+            server.requests = []
+            return aliyun_oss_x.sync_directory(
+                mock_bucket(server, enable_crc=False),
+                self.directory,
+                prefix="s/",
+                exclude=["*.tmp"],
+                delete=True,
+                manifest=manifest,
+                store=self.upload_store,
+                multipart_threshold=200 * 1024,
+                part_size=100 * 1024,
+                num_threads=3,
+                executor=TransferExecutor(2),
+            )
+
+        with mock.patch("aliyun_oss_x.resumable.sync_directory._DELETE_BATCH_SIZE", 2):
+            result = sync()
+
+        self.assertTrue(result.ok)
+        self.assertEqual(sorted(result.succeeded), ["a.txt", "b-x.txt", "b.txt", "b/d.txt", "big.bin"])
+        self.assertEqual(result.skipped, ["b/c.txt"])
+        self.assertEqual(sorted(result.deleted), ["old1.txt", "old2.txt", "z/old3.txt"])
+        self.assertEqual(server.requests.count(("POST", "")), 2)
+        del files["skip.tmp"]
+        expected = {"s/" + k: v for k, v in files.items()}
+        expected.update({"s/keep.tmp": b"keep", "other/x.txt": b"x"})
+        self.assertEqual(server.objects, expected)
+
+        # 没有变化时只需要列举
+        result = sync()
+        self.assertEqual(sorted(result.skipped), sorted(files))
+        self.assertEqual({method for method, _ in server.requests}, {"GET"})
+
+        # 长度变化的文件上传；只有修改时间变化的文件和清单中的CRC64比较，不需要HEAD
+        (self.directory / "a.txt").write_bytes(b"changed a")
+        os.utime(self.directory / "b/c.txt", ns=(0, 10**9))
+        result = sync()
+        self.assertEqual(result.succeeded, ["a.txt"])
+        self.assertEqual(server.objects["s/a.txt"], b"changed a")
+        self.assertNotIn("HEAD", {method for method, _ in server.requests})
+
+        # OSS文件被其他程序修改后重新上传
+        server.objects["s/b/c.txt"] = b"modified by others"
+        result = sync()
+        self.assertEqual(result.succeeded, ["b/c.txt"])
+        self.assertEqual(server.objects["s/b/c.txt"], b"same content")
+
+    def test_sync_directory_async(self):
+        files = {f"d{i % 2}/f{i}": os.urandom(10 + i) for i in range(6)}
+        _make_tree(self.directory, files)
+        server = _BucketServer({"p/d0/f0": files["d0/f0"], "p/gone": b"gone"})
+
+        async def run():
+            bucket = mock_async_bucket(server.handle_async, enable_crc=False)
+            results = []
+            for _ in range(2):
+                results.append(
+                    await aliyun_oss_x.sync_directory_async(
+                        bucket,
+                        self.directory,
+                        prefix="p/",
+                        delete=True,
+                        manifest=self.tmp / "manifest.db",
+                        store=aliyun_oss_x.AsyncResumableStore(root=self.tmp / "store"),
+                        num_threads=3,
+                    )
+                )
+            return results
+
+        first, second = asyncio.run(run())
+        self.assertEqual(sorted(first.succeeded), sorted(set(files) - {"d0/f0"}))
+        self.assertEqual(first.skipped, ["d0/f0"])
+        self.assertEqual(first.deleted, ["gone"])
+        self.assertEqual(sorted(second.skipped), sorted(files))
+        self.assertEqual(server.objects, {"p/" + k: v for k, v in files.items()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import unittest
+
+import aliyun_oss_x
+from aliyun_oss_x.executor import TransferExecutor
+
+
+class _Gate:
+    """占住线程池的唯一线程，直到 `open` 被调用，以便按确定的顺序提交任务。"""
+
+    def __init__(self, executor):
+        self.started = threading.Event()
+        self.event = threading.Event()
+        self.transfer = executor.transfer(1)
+        self.transfer.submit(self.__block)
+        self.started.wait(5)
+
+    def __block(self):
+        self.started.set()
+        self.event.wait(5)
+
+    def open(self):
+        self.event.set()
+        self.transfer.wait()
+
+
+class TestTransferExecutor(unittest.TestCase):
+    def test_global_limit(self):
+        executor = TransferExecutor(max_workers=3)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def task():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+
+        transfers = [executor.transfer(4) for i in range(4)]
+        for transfer in transfers:
+            for i in range(8):
+                transfer.submit(task)
+        for transfer in transfers:
+            self.assertTrue(transfer.wait())
+
+        self.assertEqual(state["peak"], 3)
+        self.assertLessEqual(executor.workers, 3)
+
+    def test_max_parallel(self):
+        executor = TransferExecutor(max_workers=8)
+        transfer = executor.transfer(2)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def task():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+
+        for i in range(10):
+            transfer.submit(task)
+        transfer.wait()
+        self.assertEqual(state["peak"], 2)
+
+    def test_fairness_and_priority(self):
+        executor = TransferExecutor(max_workers=1)
+        order = []
+
+        gate = _Gate(executor)
+        a = executor.transfer(4)
+        b = executor.transfer(4)
+        urgent = executor.transfer(4, priority=1)
+        for i in range(3):
+            a.submit(order.append, f"a{i}")
+            b.submit(order.append, f"b{i}")
+        urgent.submit(order.append, "urgent")
+        gate.open()
+
+        for transfer in (a, b, urgent):
+            transfer.wait()
+        self.assertEqual(order, ["urgent", "a0", "b0", "a1", "b1", "a2", "b2"])
+
+    def test_exception(self):
+        executor = TransferExecutor(max_workers=1)
+        done = []
+
+        def fail():
+            raise RuntimeError("some error")
+
+        gate = _Gate(executor)
+        transfer = executor.transfer(1)
+        transfer.submit(fail)
+        transfer.submit(done.append, 1)
+        gate.open()
+
+        self.assertRaises(RuntimeError, transfer.wait)
+        self.assertFalse(transfer.ok())
+        self.assertEqual(done, [])
+
+        # 出错之后提交的任务被忽略
+        transfer.submit(done.append, 2)
+        self.assertRaises(RuntimeError, transfer.wait)
+        self.assertEqual(done, [])
+
+    def test_wait_timeout(self):
+        executor = TransferExecutor(max_workers=1)
+        event = threading.Event()
+        transfer = executor.transfer(1)
+        transfer.submit(event.wait, 5)
+
+        self.assertFalse(transfer.wait(0.05))
+        event.set()
+        self.assertTrue(transfer.wait(5))
+
+    def test_nested_wait(self):
+        executor = TransferExecutor(max_workers=1)
+        result = []
+
+        def outer():
+            inner = executor.transfer(2)
+            for i in range(3):
+                inner.submit(result.append, i)
+            inner.wait()
+
+        transfer = executor.transfer(1)
+        transfer.submit(outer)
+        self.assertTrue(transfer.wait(5))
+        self.assertEqual(sorted(result), [0, 1, 2])
+
+    def test_exported(self):
+        self.assertIs(aliyun_oss_x.TransferExecutor, TransferExecutor)
+
+
+if __name__ == "__main__":
+    unittest.main()
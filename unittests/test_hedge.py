@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+import time
+import asyncio
+import threading
+import unittest
+
+import httpx
+
+import aliyun_oss_x
+
+from unittests.common import MTIME_STRING, REQUEST_ID, mock_bucket, mock_async_bucket
+
+
+def _response(body):
+    headers = {"x-oss-request-id": REQUEST_ID, "Last-Modified": MTIME_STRING, "ETag": '"etag"'}
+    return httpx.Response(200, headers=headers, content=body)
+
+
+class _SlowFirstServer:
+    """第一个请求延迟 `delay` 秒返回，之后的请求立即返回，响应体为请求序号。"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __next(self):
+        with self.lock:
+            self.count += 1
+            return self.count
+
+    def __call__(self, request):
+        n = self.__next()
+        if n == 1:
+            time.sleep(self.delay)
+        return _response(str(n).encode())
+
+
+class _ErrorBody(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """记录是否被关闭的错误响应体。"""
+
+    def __init__(self):
+        self.closed = False
+
+    def __iter__(self):
+        yield b"<Error><Code>InternalError</Code></Error>"
+
+    async def __aiter__(self):
+        yield b"<Error><Code>InternalError</Code></Error>"
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestHedge(unittest.TestCase):
+    def test_hedge_slow_request(self):
+        server = _SlowFirstServer(delay=1)
+        policy = aliyun_oss_x.HedgePolicy(initial_delay=0.05)
+        bucket = mock_bucket(server, enable_crc=False, hedge_policy=policy)
+
+        start = time.monotonic()
+        result = bucket.get_object("key")
+        self.assertLess(time.monotonic() - start, 0.8)
+        self.assertEqual(result.read(), b"2")
+
+        self.assertEqual(policy.stats.requests, 1)
+        self.assertEqual(policy.stats.hedges, 1)
+        self.assertEqual(policy.stats.hedge_wins, 1)
+
+    def test_server_error_not_winner(self):
+        body = _ErrorBody()
+
+        def handler(request):
+            if handler.count == 0:
+                handler.count += 1
+                time.sleep(0.3)
+                return _response(b"1")
+            return httpx.Response(503, headers={"x-oss-request-id": REQUEST_ID}, stream=body)
+
+        handler.count = 0
+        policy = aliyun_oss_x.HedgePolicy(initial_delay=0.05)
+        bucket = mock_bucket(handler, enable_crc=False, hedge_policy=policy)
+
+        # 对冲请求先返回了503，继续等待原请求
+        self.assertEqual(bucket.get_object("key").read(), b"1")
+        self.assertTrue(body.closed)
+        self.assertEqual(policy.stats.hedges, 1)
+        self.assertEqual(policy.stats.hedge_wins, 0)
+        policy.close()
+
+    def test_fast_request_not_hedged(self):
+        server = _SlowFirstServer(delay=0)
+        policy = aliyun_oss_x.HedgePolicy(initial_delay=0.5)
+        bucket = mock_bucket(server, enable_crc=False, hedge_policy=policy)
+
+        bucket.head_object("key")
+        self.assertEqual(server.count, 1)
+        self.assertEqual(policy.stats.hedges, 0)
+
+    def test_write_not_hedged(self):
+        server = _SlowFirstServer(delay=0.2)
+        policy = aliyun_oss_x.HedgePolicy(initial_delay=0.01)
+        bucket = mock_bucket(server, enable_crc=False, hedge_policy=policy)
+
+        bucket.put_object("key", b"data")
+        self.assertEqual(server.count, 1)
+        self.assertEqual(policy.stats.requests, 0)
+
+    def test_hedge_budget(self):
+        server = _SlowFirstServer(delay=0.2)
+        policy = aliyun_oss_x.HedgePolicy(initial_delay=0.01, max_hedge_ratio=0, burst=0)
+        bucket = mock_bucket(server, enable_crc=False, hedge_policy=policy)
+
+        self.assertEqual(bucket.get_object("key").read(), b"1")
+        self.assertEqual(server.count, 1)
+        self.assertEqual(policy.stats.budget_exhausted, 1)
+
+    def test_no_free_worker(self):
+        server = _SlowFirstServer(delay=0.2)
+        policy = aliyun_oss_x.HedgePolicy(initial_delay=0.01, max_workers=1)
+        bucket = mock_bucket(server, enable_crc=False, hedge_policy=policy)
+
+        # 唯一的线程被原请求占用，不再对冲
+        self.assertEqual(bucket.get_object("key").read(), b"1")
+        self.assertEqual(server.count, 1)
+        self.assertEqual(policy.stats.hedges, 0)
+        policy.close()
+
+    def test_busy_pool_runs_inline(self):
+        release = threading.Event()
+        threads = []
+
+        def handler(request):
+            threads.append(threading.current_thread())
+            if len(threads) == 1:
+                release.wait(5)
+            return _response(b"data")
+
+        policy = aliyun_oss_x.HedgePolicy(initial_delay=5, max_workers=1)
+        bucket = mock_bucket(handler, enable_crc=False, hedge_policy=policy)
+
+        first = threading.Thread(target=bucket.head_object, args=("key",))
+        first.start()
+        while not threads:
+            time.sleep(0.01)
+
+        # 线程池已满时在调用者的线程中发送，不排队
+        bucket.head_object("key")
+        self.assertIs(threads[1], threading.current_thread())
+
+        release.set()
+        first.join()
+        self.assertEqual(policy.stats.hedges, 0)
+        policy.close()
+
+    def test_budget_is_atomic(self):
+        policy = aliyun_oss_x.HedgePolicy(max_hedge_ratio=0, burst=5)
+        barrier = threading.Barrier(20)
+        acquired = []
+
+        def acquire():
+            barrier.wait()
+            acquired.append(policy._acquire())
+
+        threads = [threading.Thread(target=acquire) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(acquired.count(True), 5)
+        self.assertEqual(policy.stats.hedges, 5)
+        self.assertEqual(policy.stats.budget_exhausted, 15)
+
+    def test_close(self):
+        server = _SlowFirstServer(delay=0)
+        policy = aliyun_oss_x.HedgePolicy()
+        bucket = mock_bucket(server, enable_crc=False, hedge_policy=policy)
+
+        bucket.head_object("key")
+        policy.close()
+        policy.close()
+
+        # 关闭之后再使用时重新创建线程池
+        bucket.head_object("key")
+        self.assertEqual(server.count, 2)
+        policy.close()
+
+    def test_delay_percentile(self):
+        policy = aliyun_oss_x.HedgePolicy(percentile=90, min_samples=10, min_delay=0, max_delay=50)
+        self.assertEqual(policy.delay(), policy.initial_delay)
+
+        for i in range(1, 101):
+            policy.record_latency(i / 10)
+        self.assertAlmostEqual(policy.delay(), 9.1)
+
+        policy.max_delay = 2
+        self.assertEqual(policy.delay(), 2)
+
+
+class TestAsyncHedge(unittest.TestCase):
+    def test_hedge_cancels_loser(self):
+        cancelled = []
+
+        async def handler(request):
+            n = handler.count
+            handler.count += 1
+            if n == 0:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+            return _response(str(n + 1).encode())
+
+        handler.count = 0
+
+        async def run():
+            policy = aliyun_oss_x.HedgePolicy(initial_delay=0.05)
+            bucket = mock_async_bucket(handler, hedge_policy=policy)
+
+            result = await bucket.get_object("key")
+            body = await result.read()
+            await asyncio.sleep(0)
+            return body, policy.stats
+
+        body, stats = asyncio.run(run())
+        self.assertEqual(body, b"2")
+        self.assertEqual(stats.hedge_wins, 1)
+        self.assertEqual(cancelled, [True])
+
+    def test_server_error_not_winner(self):
+        body = _ErrorBody()
+
+        async def handler(request):
+            if handler.count == 0:
+                handler.count += 1
+                await asyncio.sleep(0.3)
+                return _response(b"1")
+            return httpx.Response(503, headers={"x-oss-request-id": REQUEST_ID}, stream=body)
+
+        handler.count = 0
+
+        async def run():
+            policy = aliyun_oss_x.HedgePolicy(initial_delay=0.05)
+            bucket = mock_async_bucket(handler, hedge_policy=policy)
+
+            result = await bucket.get_object("key")
+            return await result.read(), policy.stats
+
+        data, stats = asyncio.run(run())
+        self.assertEqual(data, b"1")
+        self.assertTrue(body.closed)
+        self.assertEqual(stats.hedges, 1)
+        self.assertEqual(stats.hedge_wins, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
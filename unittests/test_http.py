@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+
+import os
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import httpx
+
+import aliyun_oss_x
+from aliyun_oss_x import http, xml_utils
+from aliyun_oss_x.types import OSSResponse, AsyncOSSResponse
+
+from unittests.common import (
+    BUCKET_NAME,
+    ENDPOINT,
+    ETAG,
+    MTIME_STRING,
+    REQUEST_ID,
+    random_bytes,
+    mock_bucket,
+    mock_async_bucket,
+)
+
+
+def _object_handler(content, requests=None):
+    def handler(request):
+        if requests is not None:
+            requests.append(request)
+
+        headers = {
+            "x-oss-request-id": REQUEST_ID,
+            "ETag": '"' + ETAG + '"',
+            "Last-Modified": MTIME_STRING,
+            "Content-Length": str(len(content)),
+        }
+
+        def body():
+            for i in range(0, len(content), 1024):
+                yield content[i : i + 1024]
+
+        return httpx.Response(200, headers=headers, content=body())
+
+    return handler
+
+
+def _broken_handler(content):
+    """响应体读出 ``content`` 之后连接中断。"""
+
+    def handler(request):
+        def body():
+            yield content
+            raise httpx.ReadError("connection reset", request=request)
+
+        return httpx.Response(
+            200, headers={"x-oss-request-id": REQUEST_ID, "Last-Modified": MTIME_STRING}, content=body()
+        )
+
+    return handler
+
+
+class _BrokenAsyncBody(httpx.AsyncByteStream):
+    def __init__(self, content):
+        self.content = content
+
+    async def __aiter__(self):
+        yield self.content
+        raise httpx.ReadError("connection reset")
+
+
+class _AsyncBody(httpx.AsyncByteStream):
+    def __init__(self, content):
+        self.content = content
+
+    async def __aiter__(self):
+        for i in range(0, len(self.content), 1024):
+            yield self.content[i : i + 1024]
+
+
+class TestSession(unittest.TestCase):
+    def test_get_object_is_streamed(self):
+        content = random_bytes(100 * 1024)
+        bucket = mock_bucket(_object_handler(content))
+
+        result = bucket.get_object("stream-key")
+        self.assertFalse(result.resp.response.is_stream_consumed)
+
+        self.assertEqual(result.read(10), content[:10])
+        self.assertEqual(result.read(), content[10:])
+        self.assertTrue(result.resp.response.is_closed)
+
+    def test_close_streamed_response(self):
+        content = random_bytes(100 * 1024)
+        bucket = mock_bucket(_object_handler(content))
+
+        with bucket.get_object("stream-key") as result:
+            self.assertEqual(result.read(1024), content[:1024])
+
+        self.assertTrue(result.resp.response.is_closed)
+
+    def test_non_streamed_request(self):
+        content = b"hello"
+        bucket = mock_bucket(_object_handler(content))
+
+        result = bucket.head_object("stream-key")
+        self.assertTrue(result.resp.response.is_closed)
+
+    def test_read_error_in_body(self):
+        session = http.Session(http2=False, pool_config=http.PoolConfig(max_connections_per_host=1))
+        session.client = httpx.Client(transport=httpx.MockTransport(_broken_handler(b"abc")))
+        bucket = aliyun_oss_x.Bucket(aliyun_oss_x.AnonymousAuth(), ENDPOINT, BUCKET_NAME, session=session)
+
+        result = bucket.get_object("broken-key")
+        self.assertRaises(aliyun_oss_x.exceptions.RequestError, result.read)
+
+        # 出错时连接已经释放，同一主机上的下一个请求不会被阻塞
+        result = bucket.get_object("broken-key")
+        self.assertEqual(result.read(3), b"abc")
+        self.assertRaises(aliyun_oss_x.exceptions.RequestError, lambda: b"".join(result))
+
+    def test_async_read_error_in_body(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={"x-oss-request-id": REQUEST_ID, "Last-Modified": MTIME_STRING},
+                stream=_BrokenAsyncBody(b"abc"),
+            )
+
+        async def run():
+            bucket = mock_async_bucket(handler)
+
+            result = await bucket.get_object("broken-key")
+            with self.assertRaises(aliyun_oss_x.exceptions.RequestError):
+                await result.read()
+
+            result = await bucket.get_object("broken-key")
+            self.assertEqual(await result.read(3), b"abc")
+            with self.assertRaises(aliyun_oss_x.exceptions.RequestError):
+                await result.read(10)
+
+            result = await bucket.get_object("broken-key")
+            with self.assertRaises(aliyun_oss_x.exceptions.RequestError):
+                async for _ in result:
+                    pass
+
+        asyncio.run(run())
+
+    def test_async_get_object_is_streamed(self):
+        content = random_bytes(100 * 1024)
+
+        def handler(request):
+            headers = {
+                "x-oss-request-id": REQUEST_ID,
+                "Last-Modified": MTIME_STRING,
+                "Content-Length": str(len(content)),
+            }
+            return httpx.Response(200, headers=headers, stream=_AsyncBody(content))
+
+        async def run():
+            bucket = mock_async_bucket(handler)
+
+            async with await bucket.get_object("stream-key") as result:
+                self.assertFalse(result.resp.response.is_stream_consumed)
+                self.assertEqual(await result.read(10), content[:10])
+            self.assertTrue(result.resp.response.is_closed)
+
+        asyncio.run(run())
+
+    def test_async_close_get_object(self):
+        content = random_bytes(100 * 1024)
+
+        def handler(request):
+            headers = {"x-oss-request-id": REQUEST_ID, "Last-Modified": MTIME_STRING}
+            return httpx.Response(200, headers=headers, stream=_AsyncBody(content))
+
+        async def run():
+            bucket = mock_async_bucket(handler)
+
+            result = await bucket.get_object("stream-key")
+            await result.aclose()
+            self.assertTrue(result.resp.response.is_closed)
+
+            # 同步的close只是安排关闭，让出一次事件循环之后完成
+            result = await bucket.get_object("stream-key")
+            result.close()
+            await asyncio.sleep(0)
+            self.assertTrue(result.resp.response.is_closed)
+
+        asyncio.run(run())
+
+    def test_async_select_object_is_streamed(self):
+        content = random_bytes(100 * 1024)
+
+        def handler(request):
+            headers = {
+                "x-oss-request-id": REQUEST_ID,
+                "Last-Modified": MTIME_STRING,
+                "x-oss-select-output-raw": "true",
+            }
+            return httpx.Response(206, headers=headers, stream=_AsyncBody(content))
+
+        async def run():
+            bucket = mock_async_bucket(handler)
+
+            async with await bucket.select_object("select-key", "select * from ossobject") as result:
+                self.assertFalse(result.resp.response.is_stream_consumed)
+                self.assertEqual(await result.read(), content)
+            self.assertTrue(result.resp.response.is_closed)
+
+            with tempfile.TemporaryDirectory() as tmp:
+                filename = os.path.join(tmp, "select.txt")
+                result = await bucket.select_object_to_file("select-key", filename, "select * from ossobject")
+                self.assertTrue(result.resp.response.is_closed)
+                with open(filename, "rb") as f:
+                    self.assertEqual(f.read(), content)
+
+        # 只关心响应体的读取方式，请求体用固定的内容
+        with mock.patch.object(xml_utils, "to_select_object", return_value=b"<SelectRequest/>"):
+            asyncio.run(run())
+
+
+class TestProxyClientCache(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.content = random_bytes(10 * 1024)
+        handler = _object_handler(self.content)
+        real_client = httpx.Client
+
+        def make_client(http2=False, proxies=None, limits=None):
+            client = real_client(transport=httpx.MockTransport(handler))
+            self.created.append((proxies, client))
+            return client
+
+        patcher = mock.patch.object(http.httpx, "Client", side_effect=make_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def __request(self, proxies, stream=False):
+        return http.Request("GET", ENDPOINT + "/key", proxies=proxies, stream=stream)
+
+    def test_reuse_client_for_same_proxies(self):
+        session = http.Session(http2=False)
+        session.do_request(self.__request("http://proxy-a:8080"), timeout=10)
+        session.do_request(self.__request("http://proxy-a:8080"), timeout=10)
+        session.do_request(self.__request({"all://": "http://proxy-b:8080"}), timeout=10)
+        session.do_request(self.__request({"all://": "http://proxy-b:8080"}), timeout=10)
+
+        # 默认客户端 + 两个代理客户端
+        self.assertEqual(len(self.created), 3)
+        self.assertEqual(len(session.proxy_clients), 2)
+        self.assertFalse(session.client.is_closed)
+
+    def test_evict_least_recently_used(self):
+        session = http.Session(http2=False)
+        session.proxy_clients.max_size = 2
+
+        for proxy in ["http://proxy-a", "http://proxy-b", "http://proxy-a", "http://proxy-c"]:
+            session.do_request(self.__request(proxy), timeout=10)
+
+        clients = {proxies: client for proxies, client in self.created[1:]}
+        self.assertEqual(len(session.proxy_clients), 2)
+        self.assertTrue(clients["http://proxy-b"].is_closed)
+        self.assertFalse(clients["http://proxy-a"].is_closed)
+        self.assertFalse(clients["http://proxy-c"].is_closed)
+
+        session.close()
+        self.assertTrue(all(client.is_closed for _, client in self.created))
+
+    def test_evicted_client_closed_after_stream(self):
+        session = http.Session(http2=False)
+        session.proxy_clients.max_size = 1
+
+        resp = session.do_request(self.__request("http://proxy-a", stream=True), timeout=10)
+        session.do_request(self.__request("http://proxy-b"), timeout=10)
+
+        client_a = self.created[1][1]
+        self.assertFalse(client_a.is_closed)
+        self.assertEqual(resp.read(), self.content)
+        self.assertTrue(client_a.is_closed)
+
+    def test_async_reuse_client(self):
+        created = []
+        real_client = httpx.AsyncClient
+
+        def make_client(http2=False, proxies=None, limits=None):
+            client = real_client(
+                transport=httpx.MockTransport(lambda request: httpx.Response(200, content=self.content))
+            )
+            created.append(client)
+            return client
+
+        async def run():
+            with mock.patch.object(http.httpx, "AsyncClient", side_effect=make_client):
+                session = http.AsyncSession(http2=False)
+                for proxy in ["http://proxy-a", "http://proxy-a", "http://proxy-b"]:
+                    req = http.AsyncRequest("GET", ENDPOINT + "/key", proxies=proxy)
+                    resp = await session.do_request(req, timeout=10)
+                    self.assertEqual(await resp.read(), self.content)
+
+                self.assertEqual(len(created), 3)
+                await session.aclose()
+                self.assertTrue(all(client.is_closed for client in created))
+
+        asyncio.run(run())
+
+
+class TestPoolConfig(unittest.TestCase):
+    def test_defaults_follow_thread_counts(self):
+        with mock.patch.multiple(
+            aliyun_oss_x.defaults, connection_pool_size=10, multipart_num_threads=64, multiget_num_threads=4
+        ):
+            config = http.PoolConfig()
+
+        self.assertEqual(config.max_keepalive_connections, 64)
+        self.assertEqual(config.max_connections, 100)
+        self.assertIsNone(config.max_connections_per_host)
+        self.assertEqual(config.max_concurrency, 100)
+
+    def test_session_limits(self):
+        config = http.PoolConfig(max_connections=8, max_keepalive_connections=4, keepalive_expiry=30, http2=False)
+        with mock.patch.object(http.httpx, "Client") as client_class:
+            session = http.Session(http2=True, pool_config=config)
+
+        self.assertFalse(session.http2)
+        kwargs = client_class.call_args.kwargs
+        self.assertFalse(kwargs["http2"])
+        self.assertEqual(
+            kwargs["limits"], httpx.Limits(max_connections=8, max_keepalive_connections=4, keepalive_expiry=30)
+        )
+
+    def test_bucket_pool_config(self):
+        config = http.PoolConfig(max_connections=16)
+        bucket = aliyun_oss_x.Bucket(aliyun_oss_x.AnonymousAuth(), ENDPOINT, BUCKET_NAME, pool_config=config)
+        self.assertIs(bucket.session.pool_config, config)
+
+        self.assertRaises(
+            aliyun_oss_x.exceptions.ClientError,
+            aliyun_oss_x.Bucket,
+            aliyun_oss_x.AnonymousAuth(),
+            ENDPOINT,
+            BUCKET_NAME,
+            session=http.Session(),
+            pool_config=config,
+        )
+
+    def test_max_connections_per_host(self):
+        content = random_bytes(1024)
+        session = http.Session(http2=False, pool_config=http.PoolConfig(max_connections_per_host=1))
+        session.client = httpx.Client(transport=httpx.MockTransport(_object_handler(content)))
+
+        resp = session.do_request(http.Request("GET", ENDPOINT + "/key", stream=True), timeout=10)
+
+        acquired = threading.Event()
+
+        def second_request():
+            session.do_request(http.Request("GET", ENDPOINT + "/key"), timeout=10)
+            acquired.set()
+
+        t = threading.Thread(target=second_request)
+        t.start()
+        self.assertFalse(acquired.wait(0.2))
+
+        resp.close()
+        self.assertTrue(acquired.wait(5))
+        t.join()
+
+        # 其他主机不受影响
+        session.do_request(http.Request("GET", "http://other-host/key", stream=True), timeout=10)
+
+
+def _chunked_response(content, chunk_size):
+    def body():
+        for i in range(0, len(content), chunk_size):
+            yield content[i : i + chunk_size]
+
+    return OSSResponse(httpx.Response(200, content=body()))
+
+
+class TestOSSResponse(unittest.TestCase):
+    def test_read_across_chunks(self):
+        content = random_bytes(10000)
+        resp = _chunked_response(content, 777)
+
+        result = b""
+        while True:
+            data = resp.read(1000)
+            if not data:
+                break
+            self.assertTrue(len(data) == 1000 or len(result) + len(data) == len(content))
+            result += data
+
+        self.assertEqual(result, content)
+        self.assertEqual(resp.read(), b"")
+
+    def test_read_rest(self):
+        content = random_bytes(5000)
+        resp = _chunked_response(content, 1024)
+
+        self.assertEqual(resp.read(100), content[:100])
+        self.assertEqual(resp.read(), content[100:])
+        self.assertEqual(resp.read(10), b"")
+
+    def test_read1(self):
+        content = random_bytes(5000)
+        resp = _chunked_response(content, 1024)
+
+        self.assertEqual(resp.read(100), content[:100])
+        self.assertEqual(resp.read1(4096), content[100:1024])
+        self.assertEqual(resp.read1(10), content[1024:1034])
+        self.assertEqual(resp.read1(), content[1034:2048])
+
+    def test_readinto(self):
+        content = random_bytes(5000)
+        resp = _chunked_response(content, 1024)
+
+        buf = bytearray(3000)
+        self.assertEqual(resp.readinto(buf), 3000)
+        self.assertEqual(bytes(buf), content[:3000])
+
+        buf = bytearray(3000)
+        self.assertEqual(resp.readinto(memoryview(buf)[1000:]), 2000)
+        self.assertEqual(bytes(buf[1000:]), content[3000:])
+        self.assertEqual(resp.readinto(buf), 0)
+
+    def test_iter_after_read(self):
+        content = random_bytes(5000)
+        resp = _chunked_response(content, 1024)
+
+        self.assertEqual(resp.read(10), content[:10])
+        self.assertEqual(b"".join(resp), content[10:])
+
+    def test_async_read(self):
+        content = random_bytes(5000)
+
+        async def run():
+            resp = AsyncOSSResponse(httpx.Response(200, stream=_AsyncBody(content)))
+            self.assertEqual(await resp.read(1500), content[:1500])
+
+            buf = bytearray(1000)
+            self.assertEqual(await resp.readinto(buf), 1000)
+            self.assertEqual(bytes(buf), content[1500:2500])
+
+            self.assertEqual(await resp.read1(4096), content[2500:3072])
+            self.assertEqual(await resp.read(), content[3072:])
+            self.assertEqual(await resp.read(10), b"")
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
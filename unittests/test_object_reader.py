@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import zipfile
+import unittest
+
+import aliyun_oss_x
+from aliyun_oss_x.executor import TransferExecutor
+
+from unittests.common import mock_bucket, RangeServer
+
+
+_BLOCK_SIZE = 1024
+
+
+class TestObjectReader(unittest.TestCase):
+    def __open(self, server, **kwargs):
+        bucket = mock_bucket(server, enable_crc=False)
+        kwargs.setdefault("block_size", _BLOCK_SIZE)
+        return bucket.open_read("key", **kwargs)
+
+    def test_random_access(self):
+        content = os.urandom(_BLOCK_SIZE * 10 + 100)
+        server = RangeServer(content)
+
+        with self.__open(server, readahead_blocks=0) as f:
+            self.assertEqual(f.size, len(content))
+            self.assertEqual(f.seek(-8, io.SEEK_END), len(content) - 8)
+            self.assertEqual(f.read(), content[-8:])
+            self.assertEqual(f.read(), b"")
+
+            f.seek(_BLOCK_SIZE * 3 + 10)
+            self.assertEqual(f.read(100), content[_BLOCK_SIZE * 3 + 10 : _BLOCK_SIZE * 3 + 110])
+
+            # 同一个块再读一次不发请求
+            f.seek(_BLOCK_SIZE * 3)
+            self.assertEqual(f.read(10), content[_BLOCK_SIZE * 3 : _BLOCK_SIZE * 3 + 10])
+
+            # 跨越多个块的读取
+            f.seek(_BLOCK_SIZE // 2)
+            self.assertEqual(f.read(_BLOCK_SIZE * 3), content[_BLOCK_SIZE // 2 : _BLOCK_SIZE * 7 // 2])
+            self.assertEqual(f.tell(), _BLOCK_SIZE * 7 // 2)
+
+        self.assertEqual(
+            sorted(server.ranges),
+            [(i * _BLOCK_SIZE, (i + 1) * _BLOCK_SIZE - 1) for i in range(4)] + [(_BLOCK_SIZE * 10, len(content) - 1)],
+        )
+        self.assertEqual(server.if_match, {"etag"})
+        self.assertEqual(f.cache_misses, 5)
+        self.assertEqual(f.cache_hits, 2)
+        self.assertEqual(f.bytes_fetched, _BLOCK_SIZE * 4 + 100)
+        self.assertEqual(f.bytes_read, 8 + 100 + 10 + _BLOCK_SIZE * 3)
+        self.assertRaises(ValueError, f.read)
+
+    def test_sequential_readahead(self):
+        content = os.urandom(_BLOCK_SIZE * 16)
+        server = RangeServer(content)
+        f = self.__open(server, readahead_blocks=4, executor=TransferExecutor(4))
+
+        chunks = []
+        while True:
+            chunk = f.read(_BLOCK_SIZE // 2)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        self.assertEqual(b"".join(chunks), content)
+        self.assertEqual(len(server.ranges), 16)
+        self.assertEqual(f.cache_misses, 1)
+        self.assertEqual(f.hit_ratio, (32 - 1) / 32)
+        self.assertEqual(f.bytes_fetched, len(content))
+        self.assertEqual(f.bytes_read, len(content))
+
+    def test_cache_eviction(self):
+        content = os.urandom(_BLOCK_SIZE * 4)
+        server = RangeServer(content)
+        f = self.__open(server, cache_blocks=2, readahead_blocks=0)
+
+        for index in (0, 1, 2, 0):
+            f.seek(index * _BLOCK_SIZE)
+            self.assertEqual(f.read(1), content[index * _BLOCK_SIZE : index * _BLOCK_SIZE + 1])
+
+        self.assertEqual(len(server.ranges), 4)
+        self.assertEqual(f.cache_hits, 0)
+
+    def test_zipfile(self):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            zf.writestr("a.txt", b"hello" * 1000)
+            zf.writestr("b.bin", os.urandom(5000))
+        server = RangeServer(buf.getvalue())
+
+        with self.__open(server) as f:
+            with zipfile.ZipFile(f) as zf:
+                self.assertEqual(zf.namelist(), ["a.txt", "b.bin"])
+                self.assertEqual(zf.read("a.txt"), b"hello" * 1000)
+
+    def test_object_changed(self):
+        server = RangeServer(os.urandom(_BLOCK_SIZE * 2))
+        f = self.__open(server)
+        server.etag = "new-etag"
+
+        self.assertRaises(aliyun_oss_x.exceptions.PreconditionFailed, f.read, 10)
+        self.assertEqual(f.tell(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import asyncio
+import unittest
+
+import aliyun_oss_x
+
+from unittests.common import MultipartServer, mock_bucket, mock_async_bucket, calc_crc
+from unittests.test_upload_stream import _PART_SIZE, _chunks
+
+
+class TestObjectWriter(unittest.TestCase):
+    def test_write(self):
+        content = os.urandom(_PART_SIZE * 5 + 321)
+        server = MultipartServer(delay=0.01)
+
+        with mock_bucket(server).open_write("key", part_size=_PART_SIZE, num_threads=3) as f:
+            for chunk in _chunks(content, 3000):
+                self.assertEqual(f.write(chunk), len(chunk))
+            f.flush()
+            self.assertEqual(f.tell(), len(content))
+
+        self.assertTrue(f.closed)
+        self.assertEqual(server.content(), content)
+        self.assertEqual(len(server.parts), 6)
+        self.assertEqual(f.crc, calc_crc(content))
+        self.assertEqual(f.result.etag, "etag")
+
+    def test_gzip(self):
+        content = os.urandom(_PART_SIZE * 3)
+        server = MultipartServer()
+
+        with mock_bucket(server).open_write("key.gz", part_size=_PART_SIZE, num_threads=2) as f:
+            with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+                gz.write(content)
+
+        self.assertEqual(gzip.decompress(server.content()), content)
+        self.assertGreater(len(server.parts), 1)
+
+    def test_small_object(self):
+        server = MultipartServer()
+        with mock_bucket(server).open_write("key", part_size=_PART_SIZE) as f:
+            f.write("hello ")
+            f.write(memoryview(b"world"))
+
+        self.assertEqual(server.put_body, b"hello world")
+        self.assertEqual(server.parts, {})
+        self.assertEqual(f.crc, calc_crc(b"hello world"))
+
+    def test_abort_on_exception(self):
+        server = MultipartServer()
+        try:
+            with mock_bucket(server).open_write("key", part_size=_PART_SIZE) as f:
+                f.write(os.urandom(_PART_SIZE * 2))
+                raise RuntimeError("producer failed")
+        except RuntimeError:
+            pass
+
+        self.assertTrue(server.aborted)
+        self.assertTrue(f.closed)
+        self.assertRaises(ValueError, f.write, b"more")
+
+    def test_background_failure(self):
+        server = MultipartServer(fail_part=1)
+        f = mock_bucket(server, enable_crc=False).open_write("key", part_size=_PART_SIZE)
+
+        def write_all():
+            for chunk in _chunks(os.urandom(_PART_SIZE * 4), 8192):
+                f.write(chunk)
+            f.close()
+
+        self.assertRaises(aliyun_oss_x.exceptions.ServerError, write_all)
+        self.assertTrue(server.aborted)
+        self.assertTrue(f.closed)
+
+    def test_async_write(self):
+        content = os.urandom(_PART_SIZE * 3 + 7)
+        server = MultipartServer(delay=0.01)
+
+        async def run():
+            bucket = mock_async_bucket(server.handle_async, enable_crc=True)
+            async with bucket.open_write("key", part_size=_PART_SIZE, num_threads=2) as f:
+                for chunk in _chunks(content, 10000):
+                    await f.write(chunk)
+            return f
+
+        f = asyncio.run(run())
+        self.assertEqual(server.content(), content)
+        self.assertEqual(len(server.parts), 4)
+        self.assertEqual(server.peak, 2)
+        self.assertEqual(f.crc, calc_crc(content))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import mmap
+import asyncio
+import unittest
+import threading
+
+import aliyun_oss_x
+from aliyun_oss_x.executor import TransferExecutor
+
+from unittests.common import mock_bucket, mock_async_bucket, RangeServer
+
+
+_PART_SIZE = 1000
+
+
+class TestGetObjectInto(unittest.TestCase):
+    def test_bytearray(self):
+        content = os.urandom(_PART_SIZE * 7 + 33)
+        server = RangeServer(content)
+        buf = bytearray(len(content))
+        consumed = []
+
+        size = mock_bucket(server, enable_crc=True).get_object_into(
+            "key",
+            buf,
+            part_size=_PART_SIZE,
+            num_threads=3,
+            executor=TransferExecutor(3),
+            progress_callback=lambda consumed_bytes, total_bytes: consumed.append((consumed_bytes, total_bytes)),
+        )
+
+        self.assertEqual(size, len(content))
+        self.assertEqual(bytes(buf), content)
+        self.assertEqual(len(server.ranges), 8)
+        self.assertEqual(server.if_match, {"etag"})
+        self.assertEqual(consumed[-1], (len(content), len(content)))
+
+    def test_larger_buffer(self):
+        content = os.urandom(_PART_SIZE * 2)
+        server = RangeServer(content)
+        with mmap.mmap(-1, len(content) + 100) as m:
+            mock_bucket(server, enable_crc=True).get_object_into("key", m, part_size=_PART_SIZE)
+            self.assertEqual(m[: len(content)], content)
+            self.assertEqual(m[len(content) :], b"\0" * 100)
+
+    def test_invalid_buffer(self):
+        server = RangeServer(os.urandom(100))
+        bucket = mock_bucket(server, enable_crc=True)
+
+        self.assertRaises(aliyun_oss_x.exceptions.ClientError, bucket.get_object_into, "key", bytearray(99))
+        self.assertRaises(aliyun_oss_x.exceptions.ClientError, bucket.get_object_into, "key", bytes(100))
+        self.assertEqual(server.ranges, [])
+
+    def test_crc_mismatch(self):
+        server = RangeServer(os.urandom(_PART_SIZE * 3))
+        server.crc = 12345
+
+        self.assertRaises(
+            aliyun_oss_x.exceptions.InconsistentError,
+            mock_bucket(server, enable_crc=True).get_object_into,
+            "key",
+            bytearray(_PART_SIZE * 3),
+            part_size=_PART_SIZE,
+        )
+
+    def test_crypto_bucket(self):
+        server = RangeServer(os.urandom(100))
+        bucket = mock_bucket(
+            server, bucket_class=aliyun_oss_x.CryptoBucket, crypto_provider=aliyun_oss_x.RsaProvider({})
+        )
+
+        self.assertRaises(aliyun_oss_x.exceptions.ClientError, bucket.get_object_into, "key", bytearray(100))
+        self.assertEqual(server.ranges, [])
+
+    def test_async_crypto_bucket(self):
+        server = RangeServer(os.urandom(100))
+
+        async def run():
+            bucket = mock_async_bucket(
+                server.handle_async,
+                bucket_class=aliyun_oss_x.AsyncCryptoBucket,
+                crypto_provider=aliyun_oss_x.RsaProvider({}),
+            )
+            await bucket.get_object_into("key", bytearray(100))
+
+        self.assertRaises(aliyun_oss_x.exceptions.ClientError, asyncio.run, run())
+        self.assertEqual(server.ranges, [])
+
+    def test_async(self):
+        content = os.urandom(_PART_SIZE * 5 + 1)
+        server = RangeServer(content)
+        buf = bytearray(len(content))
+
+        async def run():
+            bucket = mock_async_bucket(server.handle_async, enable_crc=True)
+            return await bucket.get_object_into("key", memoryview(buf), part_size=_PART_SIZE, num_threads=2)
+
+        self.assertEqual(asyncio.run(run()), len(content))
+        self.assertEqual(bytes(buf), content)
+        self.assertEqual(len(server.ranges), 6)
+
+
+class TestObjectStream(unittest.TestCase):
+    def test_read_in_order(self):
+        content = os.urandom(_PART_SIZE * 9 + 7)
+        server = RangeServer(content)
+
+        with mock_bucket(server, enable_crc=True).get_object_stream(
+            "key", part_size=_PART_SIZE, num_threads=3, executor=TransferExecutor(3)
+        ) as stream:
+            self.assertEqual(stream.size, len(content))
+            chunks = []
+            while chunk := stream.read(333):
+                chunks.append(chunk)
+            self.assertEqual(stream.tell(), len(content))
+
+        self.assertEqual(b"".join(chunks), content)
+        self.assertEqual(len(server.ranges), 10)
+        self.assertEqual(server.if_match, {"etag"})
+
+    def test_iterate_and_readinto(self):
+        content = os.urandom(_PART_SIZE * 4)
+        server = RangeServer(content)
+        bucket = mock_bucket(server, enable_crc=True)
+
+        self.assertEqual(
+            list(bucket.get_object_stream("key", part_size=_PART_SIZE)),
+            [content[i : i + _PART_SIZE] for i in range(0, len(content), _PART_SIZE)],
+        )
+
+        stream = bucket.get_object_stream("key", part_size=_PART_SIZE)
+        buf = bytearray(len(content) + 10)
+        n = 0
+        while count := stream.readinto(memoryview(buf)[n:]):
+            n += count
+        self.assertEqual(bytes(buf[:n]), content)
+
+    def test_window(self):
+        content = os.urandom(_PART_SIZE * 10)
+        server = RangeServer(content)
+        stream = mock_bucket(server, enable_crc=True).get_object_stream(
+            "key", part_size=_PART_SIZE, num_threads=2, executor=TransferExecutor(4)
+        )
+
+        # 读取者不读时只下载窗口内的分片
+        time.sleep(0.2)
+        self.assertEqual(sorted(server.ranges), [(0, _PART_SIZE - 1), (_PART_SIZE, _PART_SIZE * 2 - 1)])
+
+        self.assertEqual(stream.read(1), content[:1])
+        time.sleep(0.2)
+        self.assertEqual(len(server.ranges), 3)
+
+        self.assertEqual(stream.read(), content[1:])
+        stream.close()
+        self.assertRaises(ValueError, stream.read)
+
+    def test_close_stops_prefetch(self):
+        server = RangeServer(os.urandom(_PART_SIZE * 10), free=0)
+        stream = mock_bucket(server, enable_crc=True).get_object_stream(
+            "key", part_size=_PART_SIZE, num_threads=3, executor=TransferExecutor(1)
+        )
+
+        # 第一个分片正在下载时关闭，close等它结束之后返回，排队的分片不再下载
+        closer = threading.Thread(target=stream.close)
+        closer.start()
+        time.sleep(0.2)
+        self.assertTrue(closer.is_alive())
+
+        server.gate.set()
+        closer.join()
+        self.assertEqual(server.ranges, [(0, _PART_SIZE - 1)])
+        self.assertRaises(ValueError, stream.read)
+
+    def test_crypto_bucket(self):
+        server = RangeServer(os.urandom(100))
+        bucket = mock_bucket(
+            server, bucket_class=aliyun_oss_x.CryptoBucket, crypto_provider=aliyun_oss_x.RsaProvider({})
+        )
+
+        self.assertRaises(aliyun_oss_x.exceptions.ClientError, bucket.get_object_stream, "key")
+        self.assertEqual(server.ranges, [])
+
+    def test_crc_mismatch(self):
+        server = RangeServer(os.urandom(_PART_SIZE * 3))
+        server.crc = 12345
+        stream = mock_bucket(server, enable_crc=True).get_object_stream("key", part_size=_PART_SIZE)
+
+        self.assertEqual(len(stream.read(_PART_SIZE)), _PART_SIZE)
+        self.assertEqual(len(stream.read(_PART_SIZE)), _PART_SIZE)
+        self.assertRaises(aliyun_oss_x.exceptions.InconsistentError, stream.read)
+
+    def test_object_changed(self):
+        server = RangeServer(os.urandom(_PART_SIZE * 3))
+        stream = mock_bucket(server, enable_crc=True).get_object_stream("key", part_size=_PART_SIZE, num_threads=1)
+        self.assertEqual(len(stream.read(_PART_SIZE)), _PART_SIZE)
+        server.etag = "new-etag"
+
+        self.assertRaises(aliyun_oss_x.exceptions.PreconditionFailed, stream.read)
+
+    def test_async(self):
+        content = os.urandom(_PART_SIZE * 6 + 1)
+        server = RangeServer(content)
+
+        async def run():
+            bucket = mock_async_bucket(server.handle_async, enable_crc=True)
+            async with await bucket.get_object_stream("key", part_size=_PART_SIZE, num_threads=2) as stream:
+                head = await stream.read(10)
+                chunks = [chunk async for chunk in stream]
+            return head + b"".join(chunks)
+
+        self.assertEqual(asyncio.run(run()), content)
+        self.assertEqual(len(server.ranges), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,28 @@
 import unittest
 import aliyun_oss_x
 import os
+import time
+import hashlib
+import asyncio
+import tempfile
+import threading
+from unittest import mock
+
+import httpx
+
+from aliyun_oss_x.models import PartInfo
+from aliyun_oss_x.resumable._base import _PartToProcess, _StragglerSplitter, _parts_to_download, _verify_uploaded_parts
+from aliyun_oss_x.resumable._writer import _FileWriter
+
+from unittests.common import (
+    MTIME_STRING,
+    REQUEST_ID,
+    MultipartServer,
+    mock_bucket,
+    mock_async_bucket,
+    RangeServer,
+    calc_crc,
+)
 
 
 class TestResumable(unittest.TestCase):
@@ -38,5 +60,490 @@ class TestResumable(unittest.TestCase):
         os.rmdir(path)
 
 
+class TestJournalStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+
+    def __store(self, **kwargs):
+        return aliyun_oss_x.ResumableDownloadStore(root=self.root.name, dir="store", **kwargs)
+
+    def __journal(self, key):
+        return os.path.join(self.root.name, "store", key + ".journal")
+
+    def test_append_parts(self):
+        store = self.__store()
+        record = {"size": 100, "parts": []}
+        store.put("key", record)
+
+        for i in range(10):
+            record["parts"].append({"part_number": i + 1})
+            store.put("key", record)
+
+        self.assertTrue(os.path.exists(self.__journal("key")))
+        with open(os.path.join(self.root.name, "store", "key")) as f:
+            self.assertEqual(f.read(), '{"size": 100, "parts": []}')
+
+        self.assertEqual(self.__store().get("key"), record)
+
+    def test_torn_journal(self):
+        store = self.__store()
+        record = {"size": 100, "parts": [{"part_number": 1}]}
+        store.put("key", record)
+        record["parts"].append({"part_number": 2})
+        store.put("key", record)
+
+        with open(self.__journal("key"), "ab") as f:
+            f.write(b'[2, {"part_nu')
+
+        store = self.__store()
+        record = store.get("key")
+        self.assertEqual(record["parts"], [{"part_number": 1}, {"part_number": 2}])
+
+        record["parts"].append({"part_number": 3})
+        store.put("key", record)
+        self.assertEqual(self.__store().get("key")["parts"], [{"part_number": i} for i in range(1, 4)])
+
+    def test_compact(self):
+        store = self.__store(compact_threshold=3)
+        record = {"size": 100, "parts": []}
+        store.put("key", record)
+
+        for i in range(4):
+            record["parts"].append({"part_number": i + 1})
+            store.put("key", record)
+
+        self.assertFalse(os.path.exists(self.__journal("key")))
+        self.assertEqual(self.__store().get("key"), record)
+
+        # 快照已经替换、日志还没有删除时崩溃，日志中的part不会重复
+        with open(self.__journal("key"), "w") as f:
+            f.write('[3, {"part_number": 4}]\n[4, {"part_number": 5}]\n')
+        self.assertEqual(self.__store().get("key")["parts"], [{"part_number": i} for i in range(1, 6)])
+
+    def test_rewrite_on_change(self):
+        store = self.__store(fsync_every=1)
+        record = {"size": 100, "parts": [{"part_number": 1}]}
+        store.put("key", record)
+        record["parts"].append({"part_number": 2})
+        store.put("key", record)
+
+        record = {"size": 200, "parts": []}
+        store.put("key", record)
+        self.assertFalse(os.path.exists(self.__journal("key")))
+        self.assertEqual(self.__store().get("key"), record)
+
+        store.delete("key")
+        self.assertIsNone(store.get("key"))
+
+
+class TestStragglerSplit(unittest.TestCase):
+    def test_parts_to_download(self):
+        # 第1片完成；第2片被拆成[100, 150)和[150, 200)，只完成了后一半；第3片未开始
+        finished = [_PartToProcess(1, 0, 100), _PartToProcess(4, 150, 200)]
+        parts = _parts_to_download(250, 100, finished)
+
+        self.assertEqual([(p.part_number, p.start, p.end) for p in parts], [(5, 100, 150), (3, 200, 250)])
+        self.assertEqual(
+            _parts_to_download(250, 100, []),
+            [_PartToProcess(1, 0, 100), _PartToProcess(2, 100, 200), _PartToProcess(3, 200, 250)],
+        )
+
+    def test_split_straggler(self):
+        splitter = _StragglerSplitter(10, min_split_size=10, factor=2)
+        fast = splitter.start(_PartToProcess(1, 0, 100))
+        splitter.advance(fast, 100)
+        splitter.finish(fast)
+
+        slow = _PartToProcess(2, 100, 200)
+        running = splitter.start(slow)
+        self.assertEqual(splitter.advance(running, 20), (20, False))
+
+        with mock.patch("time.monotonic", return_value=running.started + 1000):
+            tail = splitter.split()
+        self.assertEqual((tail.part_number, tail.start, tail.end), (10, 160, 200))
+        self.assertEqual(slow.end, 160)
+
+        # 超出新范围的数据被丢弃
+        self.assertEqual(splitter.advance(running, 50), (40, True))
+
+        # 剩余部分太小，不再拆分
+        with mock.patch("time.monotonic", return_value=running.started + 1000):
+            self.assertIsNone(splitter.split())
+
+    def test_resumable_download_split(self):
+        content = os.urandom(4 * 1024 * 1024)
+        part_size = 1024 * 1024
+        server = RangeServer(content, slow_start=0, delay=0.01)
+
+        bucket = mock_bucket(server)
+
+        with tempfile.TemporaryDirectory() as root:
+            filename = os.path.join(root, "object")
+            store = aliyun_oss_x.ResumableDownloadStore(root=root)
+            with mock.patch.object(aliyun_oss_x.defaults, "multiget_min_split_size", 16 * 1024):
+                start = time.monotonic()
+                aliyun_oss_x.resumable_download(
+                    bucket, "key", filename, multiget_threshold=1, part_size=part_size, num_threads=4, store=store
+                )
+                elapsed = time.monotonic() - start
+
+            with open(filename, "rb") as f:
+                self.assertEqual(f.read(), content)
+
+        # 慢分片需要64 * 0.01秒，拆分之后其他线程下载了它尚未下载的部分
+        self.assertGreater(len(server.ranges), 4)
+        self.assertLess(elapsed, 0.5)
+
+
+class TestFileWriter(unittest.TestCase):
+    def __write_parallel(self, use_mmap):
+        content = os.urandom(1024 * 1024)
+        part_size = 64 * 1024
+
+        with tempfile.TemporaryDirectory() as root:
+            filename = os.path.join(root, "tmp")
+            with _FileWriter(filename, len(content), use_mmap=use_mmap) as writer:
+                self.assertEqual(os.path.getsize(filename), len(content))
+
+                def write(start):
+                    sink = writer.sink(start)
+                    for offset in range(start, start + part_size, 4096):
+                        sink.write(content[offset : offset + 4096])
+
+                threads = [threading.Thread(target=write, args=(start,)) for start in range(0, len(content), part_size)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+            with open(filename, "rb") as f:
+                self.assertEqual(f.read(), content)
+
+            self.assertRaises(ValueError, writer.write, 0, b"a")
+
+    def test_pwrite(self):
+        self.__write_parallel(False)
+
+    def test_mmap(self):
+        self.__write_parallel(True)
+
+    def test_keep_existing_content(self):
+        with tempfile.TemporaryDirectory() as root:
+            filename = os.path.join(root, "tmp")
+            with open(filename, "wb") as f:
+                f.write(b"123")
+
+            with _FileWriter(filename, 6) as writer:
+                writer.write(3, b"456")
+
+            with open(filename, "rb") as f:
+                self.assertEqual(f.read(), b"123456")
+
+    def test_no_pwrite(self):
+        with tempfile.TemporaryDirectory() as root:
+            filename = os.path.join(root, "tmp")
+            # 模拟没有os.pwrite的平台
+            with mock.patch.dict(os.__dict__):
+                del os.pwrite
+                with _FileWriter(filename, 6) as writer:
+                    writer.sink(3).write(b"def")
+                    writer.sink(0).write(b"abc")
+
+            with open(filename, "rb") as f:
+                self.assertEqual(f.read(), b"abcdef")
+
+
+class TestAsyncResumableIO(unittest.TestCase):
+    """异步断点续传的文件读写和断点信息保存不在事件循环线程中执行。"""
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.io_threads = set()
+
+    def __record_thread(self, func):
+        def wrapper(*args, **kwargs):
+            self.io_threads.add(threading.current_thread())
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def test_download(self):
+        content = os.urandom(1024 * 1024)
+        headers = {"x-oss-request-id": REQUEST_ID, "Last-Modified": MTIME_STRING, "ETag": '"etag"'}
+
+        async def handler(request):
+            if request.method == "HEAD":
+                return httpx.Response(200, headers=dict(headers, **{"Content-Length": str(len(content))}))
+            start, end = (int(x) for x in request.headers["Range"][len("bytes=") :].split("-"))
+            return httpx.Response(206, headers=headers, content=content[start : end + 1])
+
+        filename = os.path.join(self.root.name, "object")
+        store = aliyun_oss_x.AsyncResumableDownloadStore(root=self.root.name)
+
+        with mock.patch.object(_FileWriter, "write", self.__record_thread(_FileWriter.write)):
+            with mock.patch.object(store, "put", self.__record_thread(store.put)):
+                asyncio.run(
+                    aliyun_oss_x.resumable_download_async(
+                        mock_async_bucket(handler, enable_crc=False),
+                        "key",
+                        filename,
+                        multiget_threshold=1,
+                        part_size=128 * 1024,
+                        store=store,
+                    )
+                )
+
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), content)
+        self.assertTrue(self.io_threads)
+        self.assertNotIn(threading.current_thread(), self.io_threads)
+
+    def test_upload(self):
+        content = os.urandom(300 * 1024)
+        received = {}
+        headers = {"x-oss-request-id": REQUEST_ID, "ETag": '"etag"'}
+
+        async def handler(request):
+            body = await request.aread()
+            params = request.url.params
+            if "uploads" in params:
+                xml = "<InitiateMultipartUploadResult><UploadId>upload-id</UploadId></InitiateMultipartUploadResult>"
+                return httpx.Response(200, headers=headers, content=xml.encode())
+            if "partNumber" in params:
+                received[int(params["partNumber"])] = body
+                return httpx.Response(200, headers=headers)
+            if request.method == "GET":
+                xml = "<ListPartsResult><IsTruncated>false</IsTruncated><NextPartNumberMarker>0</NextPartNumberMarker></ListPartsResult>"
+                return httpx.Response(200, headers=headers, content=xml.encode())
+            xml = "<CompleteMultipartUploadResult><ETag>etag</ETag></CompleteMultipartUploadResult>"
+            return httpx.Response(200, headers=headers, content=xml.encode())
+
+        filename = os.path.join(self.root.name, "upload")
+        with open(filename, "wb") as f:
+            f.write(content)
+
+        store = aliyun_oss_x.AsyncResumableStore(root=self.root.name)
+        with mock.patch("aliyun_oss_x.resumable._aio.open", self.__record_thread(open), create=True):
+            asyncio.run(
+                aliyun_oss_x.resumable_upload_async(
+                    mock_async_bucket(handler, enable_crc=False),
+                    "key",
+                    filename,
+                    store=store,
+                    multipart_threshold=1,
+                    part_size=100 * 1024,
+                )
+            )
+
+        self.assertEqual(b"".join(received[i] for i in sorted(received)), content)
+        self.assertTrue(self.io_threads)
+        self.assertNotIn(threading.current_thread(), self.io_threads)
+
+
+class _GatedServer(RangeServer):
+    """在 :class:`RangeServer` 的基础上支持分片上传，UploadPart请求和Range GET一样计数并等待 `gate` 。"""
+
+    def __init__(self, content, free):
+        super().__init__(content, free=free)
+        self.upload = MultipartServer()
+
+    @property
+    def aborted(self):
+        return self.upload.aborted
+
+    def _is_data(self, request):
+        return "partNumber" in request.url.params or super()._is_data(request)
+
+    def _respond(self, request):
+        if request.method == "HEAD" or "Range" in request.headers:
+            return super()._respond(request)
+        return self.upload(request)
+
+
+def _wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+class TestTransferHandle(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.content = os.urandom(16 * 128 * 1024)
+        self.filename = os.path.join(self.root.name, "object")
+        self.store_dir = os.path.join(self.root.name, "store")
+
+    def __start_download(self, server):
+        return aliyun_oss_x.start_resumable_download(
+            mock_bucket(server, enable_crc=False),
+            "key",
+            self.filename,
+            multiget_threshold=1,
+            part_size=128 * 1024,
+            num_threads=2,
+            store=aliyun_oss_x.ResumableDownloadStore(root=self.root.name, dir="store"),
+        )
+
+    def __pause(self, handle, server):
+        # 3个分片下载完成，2个分片正在下载
+        _wait_until(lambda: server.count() == 5)
+        handle.pause()
+        server.gate.set()
+        _wait_until(lambda: handle.state == "paused")
+
+    def test_pause_resume_download(self):
+        server = _GatedServer(self.content, free=3)
+        handle = self.__start_download(server)
+        self.__pause(handle, server)
+
+        time.sleep(0.1)
+        self.assertEqual(server.count(), 5)
+        self.assertTrue(os.listdir(self.store_dir))
+
+        handle.resume()
+        self.assertTrue(handle.wait(5))
+        self.assertEqual(handle.state, "completed")
+        with open(self.filename, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+        # 恢复后只下载断点信息中没有的13个分片
+        self.assertEqual(server.count(), 18)
+
+        stats = handle.stats
+        self.assertEqual(stats.consumed_bytes, len(self.content))
+        self.assertEqual(stats.total_bytes, len(self.content))
+        self.assertEqual(stats.eta, 0)
+
+    def test_cancel_paused_download(self):
+        server = _GatedServer(self.content, free=3)
+        handle = self.__start_download(server)
+        self.__pause(handle, server)
+
+        handle.cancel()
+        self.assertTrue(handle.wait(5))
+        self.assertEqual(handle.state, "cancelled")
+        self.assertEqual(os.listdir(self.store_dir), [])
+        self.assertEqual(sorted(os.listdir(self.root.name)), ["store"])
+
+    def test_cancel_upload(self):
+        server = _GatedServer(self.content, free=1)
+        with open(self.filename, "wb") as f:
+            f.write(self.content)
+
+        handle = aliyun_oss_x.start_resumable_upload(
+            mock_bucket(server, enable_crc=False),
+            "key",
+            self.filename,
+            store=aliyun_oss_x.ResumableStore(root=self.root.name, dir="store"),
+            multipart_threshold=1,
+            part_size=128 * 1024,
+        )
+        _wait_until(lambda: server.count() == 2)
+        handle.cancel()
+        server.gate.set()
+
+        self.assertTrue(handle.wait(5))
+        self.assertEqual(handle.state, "cancelled")
+        self.assertEqual(server.count(), 2)
+        self.assertTrue(server.aborted)
+        self.assertEqual(os.listdir(self.store_dir), [])
+
+    def test_failure(self):
+        def handler(request):
+            return httpx.Response(404, headers={"x-oss-request-id": REQUEST_ID})
+
+        handle = aliyun_oss_x.start_resumable_download(mock_bucket(handler, enable_crc=False), "key", self.filename)
+        self.assertRaises(aliyun_oss_x.exceptions.NotFound, handle.wait, 5)
+        self.assertEqual(handle.state, "failed")
+
+    def test_async_pause_resume_download(self):
+        server = _GatedServer(self.content, free=3)
+
+        async def run():
+            bucket = mock_async_bucket(server.handle_async, enable_crc=False)
+            handle = await aliyun_oss_x.start_resumable_download_async(
+                bucket,
+                "key",
+                self.filename,
+                multiget_threshold=1,
+                part_size=128 * 1024,
+                num_threads=2,
+                store=aliyun_oss_x.AsyncResumableDownloadStore(root=self.root.name, dir="store"),
+            )
+
+            while server.count() < 5:
+                await asyncio.sleep(0.01)
+            handle.pause()
+            server.gate.set()
+            self.assertFalse(await handle.wait(0.2))
+            self.assertEqual(handle.state, "paused")
+            self.assertEqual(server.count(), 5)
+
+            handle.resume()
+            self.assertTrue(await handle.wait(5))
+            return handle
+
+        handle = asyncio.run(run())
+        self.assertEqual(handle.state, "completed")
+        self.assertEqual(server.count(), 18)
+        with open(self.filename, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+
+class TestVerifyParts(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.content = os.urandom(4 * 100 * 1024 + 10)
+        self.filename = os.path.join(self.root.name, "upload")
+        with open(self.filename, "wb") as f:
+            f.write(self.content)
+
+    def __upload(self, server, **kwargs):
+        aliyun_oss_x.resumable_upload(
+            mock_bucket(server),
+            "key",
+            self.filename,
+            store=aliyun_oss_x.ResumableStore(root=self.root.name),
+            multipart_threshold=1,
+            part_size=100 * 1024,
+            num_threads=2,
+            **kwargs,
+        )
+
+    def test_verify_parts(self):
+        server = MultipartServer(fail_complete=1)
+        self.assertRaises(aliyun_oss_x.exceptions.ServerError, self.__upload, server)
+        self.assertEqual(sorted(server.uploaded), [1, 2, 3, 4, 5])
+
+        # 服务端的第2个分片损坏，第4个分片丢失
+        server.parts[2] = os.urandom(100 * 1024)
+        del server.parts[4]
+        server.uploaded = []
+
+        self.__upload(server, verify_parts=True)
+        self.assertEqual(sorted(server.uploaded), [2, 4])
+        self.assertEqual(server.content(), self.content)
+
+    def test_verified_parts_have_crc(self):
+        part_size = 100 * 1024
+        first = self.content[:part_size]
+        parts = [
+            PartInfo(1, hashlib.md5(first).hexdigest(), size=part_size),
+            PartInfo(2, "etag", size=part_size),
+            PartInfo(5, hashlib.md5(self.content[4 * part_size :]).hexdigest().upper(), size=part_size),
+            PartInfo(9, "etag", size=part_size),
+        ]
+
+        verified = _verify_uploaded_parts(self.filename, len(self.content), part_size, parts)
+        self.assertEqual([p.part_number for p in verified], [1])
+        self.assertEqual(verified[0].part_crc, calc_crc(first))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+import os
+import asyncio
+import tempfile
+import threading
+import unittest
+
+import httpx
+
+import aliyun_oss_x
+
+from unittests.common import MTIME_STRING, REQUEST_ID, mock_bucket, mock_async_bucket, calc_crc
+
+
+_PART_SIZE = 100 * 1024
+_SOURCE_BUCKET = "source-bucket"
+
+
+def _error(status, code):
+    xml = f"<Error><Code>{code}</Code><Message>{code}</Message></Error>"
+    return httpx.Response(status, headers={"x-oss-request-id": REQUEST_ID}, content=xml.encode())
+
+
+class _CopyServer:
+    """模拟源文件和目标Bucket，记录分片拷贝的请求。 `fail_part` 指定的分片返回403，
+    `etag` 改变后带旧ETag的分片拷贝返回412。
+    """
+
+    def __init__(self, content, fail_part=None):
+        self.content = content
+        self.etag = "etag"
+        self.fail_part = fail_part
+        self.parts = {}
+        self.copied = []
+        self.uploads = 0
+        self.init_headers = None
+        self.copy_object = None
+        self.completed = False
+        self.aborted = False
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        headers = {"x-oss-request-id": REQUEST_ID, "ETag": f'"{self.etag}"'}
+        params = request.url.params
+        request.read()
+
+        if request.method == "HEAD":
+            self.head_host = request.url.host
+            headers.update(
+                {
+                    "Content-Length": str(len(self.content)),
+                    "Last-Modified": MTIME_STRING,
+                    "Content-Type": "text/csv",
+                    "Cache-Control": "no-cache",
+                    "x-oss-meta-owner": "alice",
+                    "x-oss-hash-crc64ecma": str(calc_crc(self.content)),
+                }
+            )
+            return httpx.Response(200, headers=headers)
+        if "uploads" in params:
+            self.uploads += 1
+            self.init_headers = request.headers
+            xml = f"<InitiateMultipartUploadResult><UploadId>upload-{self.uploads}</UploadId></InitiateMultipartUploadResult>"
+            return httpx.Response(200, headers=headers, content=xml.encode())
+        if "partNumber" in params:
+            part_number = int(params["partNumber"])
+            if part_number == self.fail_part:
+                return _error(403, "AccessDenied")
+            if request.headers["x-oss-copy-source-if-match"] != self.etag:
+                return _error(412, "PreconditionFailed")
+            assert request.headers["x-oss-copy-source"] == f"/{_SOURCE_BUCKET}/src"
+            start, end = (int(x) for x in request.headers["x-oss-copy-source-range"][len("bytes=") :].split("-"))
+            data = self.content[start : end + 1]
+            with self.lock:
+                self.parts[part_number] = data
+                self.copied.append(part_number)
+            xml = "<CopyPartResult><ETag>part-etag</ETag></CopyPartResult>"
+            return httpx.Response(
+                200, headers=dict(headers, **{"x-oss-hash-crc64ecma": str(calc_crc(data))}), content=xml.encode()
+            )
+        if "uploadId" in params and request.method == "GET":
+            xml = "<ListPartsResult><IsTruncated>false</IsTruncated><NextPartNumberMarker>0</NextPartNumberMarker></ListPartsResult>"
+            return httpx.Response(200, headers=headers, content=xml.encode())
+        if request.method == "DELETE":
+            self.aborted = True
+            return httpx.Response(204, headers=headers)
+        if request.method == "PUT":
+            self.copy_object = request.headers["x-oss-copy-source"]
+            xml = "<CopyObjectResult><ETag>etag</ETag></CopyObjectResult>"
+            return httpx.Response(200, headers=headers, content=xml.encode())
+
+        self.completed = True
+        headers["x-oss-hash-crc64ecma"] = str(calc_crc(self.copied_content()))
+        xml = "<CompleteMultipartUploadResult><ETag>etag</ETag></CompleteMultipartUploadResult>"
+        return httpx.Response(200, headers=headers, content=xml.encode())
+
+    async def handle_async(self, request):
+        await request.aread()
+        return self(request)
+
+    def copied_content(self):
+        return b"".join(self.parts[i] for i in sorted(self.parts))
+
+
+class TestResumableCopy(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = aliyun_oss_x.ResumableStore(root=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def __copy(self, server, **kwargs):
+        kwargs.setdefault("multipart_threshold", _PART_SIZE)
+        kwargs.setdefault("part_size", _PART_SIZE)
+        return aliyun_oss_x.resumable_copy(
+            mock_bucket(server, enable_crc=True), _SOURCE_BUCKET, "src", "dst", store=self.store, **kwargs
+        )
+
+    def test_small_object(self):
+        server = _CopyServer(os.urandom(100))
+        self.__copy(server)
+
+        self.assertEqual(server.copy_object, f"/{_SOURCE_BUCKET}/src")
+        self.assertEqual(server.head_host, f"{_SOURCE_BUCKET}.oss-cn-hangzhou.aliyuncs.com")
+        self.assertEqual(server.uploads, 0)
+
+    def test_multipart_copy(self):
+        content = os.urandom(_PART_SIZE * 5 + 10)
+        server = _CopyServer(content)
+        consumed = []
+
+        self.__copy(
+            server,
+            headers={"Content-Type": "application/json"},
+            num_threads=3,
+            progress_callback=lambda consumed_bytes, total_bytes: consumed.append(consumed_bytes),
+        )
+
+        self.assertEqual(server.copied_content(), content)
+        self.assertEqual(sorted(server.copied), list(range(1, 7)))
+        self.assertTrue(server.completed)
+        self.assertEqual(server.init_headers["Content-Type"], "application/json")
+        self.assertEqual(server.init_headers["Cache-Control"], "no-cache")
+        self.assertEqual(server.init_headers["x-oss-meta-owner"], "alice")
+        self.assertEqual(consumed[-1], len(content))
+        self.assertEqual(os.listdir(self.store.dir), [])
+
+    def test_resume(self):
+        content = os.urandom(_PART_SIZE * 4)
+        server = _CopyServer(content, fail_part=3)
+        self.assertRaises(aliyun_oss_x.exceptions.AccessDenied, self.__copy, server, num_threads=1)
+        self.assertEqual(sorted(server.copied), [1, 2])
+
+        server.fail_part = None
+        server.copied = []
+        self.__copy(server, num_threads=1)
+
+        self.assertEqual(server.copied, [3, 4])
+        self.assertEqual(server.uploads, 1)
+        self.assertEqual(server.copied_content(), content)
+
+    def test_source_changed(self):
+        server = _CopyServer(os.urandom(_PART_SIZE * 3), fail_part=2)
+        self.assertRaises(aliyun_oss_x.exceptions.AccessDenied, self.__copy, server, num_threads=1)
+
+        server.fail_part = None
+        server.etag = "new-etag"
+        server.copied = []
+        self.__copy(server, num_threads=1)
+
+        self.assertTrue(server.aborted)
+        self.assertEqual(server.uploads, 2)
+        self.assertEqual(server.copied, [1, 2, 3])
+
+    def test_async(self):
+        content = os.urandom(_PART_SIZE * 3 + 1)
+        server = _CopyServer(content)
+
+        async def run():
+            bucket = mock_async_bucket(server.handle_async, enable_crc=True)
+            await aliyun_oss_x.resumable_copy_async(
+                bucket,
+                _SOURCE_BUCKET,
+                "src",
+                "dst",
+                store=aliyun_oss_x.AsyncResumableStore(root=self.tmp.name),
+                multipart_threshold=_PART_SIZE,
+                part_size=_PART_SIZE,
+                num_threads=2,
+            )
+
+        asyncio.run(run())
+        self.assertEqual(server.copied_content(), content)
+        self.assertTrue(server.completed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import io
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+
+import aliyun_oss_x
+from aliyun_oss_x.exceptions import ServerError, RequestError
+
+from unittests.common import MTIME_STRING, REQUEST_ID, random_bytes, mock_bucket, mock_async_bucket, calc_crc
+
+
+def _response(status, headers=None, content=b""):
+    base = {"x-oss-request-id": REQUEST_ID, "Last-Modified": MTIME_STRING, "ETag": '"etag"'}
+    base.update(headers or {})
+    return httpx.Response(status, headers=base, content=content)
+
+
+class _Server:
+    """按顺序返回预先设定的响应或抛出异常，并记录收到的请求体。"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.bodies = []
+
+    def __call__(self, request):
+        body = request.read()
+        self.bodies.append(body)
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        if outcome != 200:
+            return _response(outcome, {"Retry-After": "0"} if outcome == 429 else None)
+
+        return _response(200, {"x-oss-hash-crc64ecma": str(calc_crc(body))}, b"ok")
+
+
+class TestRetry(unittest.TestCase):
+    def test_retry_server_error(self):
+        server = _Server(503, 500, 200)
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+
+        bucket.get_object("key").read()
+
+        self.assertEqual(len(server.bodies), 3)
+        self.assertEqual(bucket.retry_policy.stats.attempts, 3)
+        self.assertEqual(bucket.retry_policy.stats.retries, 2)
+
+    def test_max_retries(self):
+        server = _Server(503, 503, 503)
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(max_retries=2, base_delay=0))
+
+        self.assertRaises(ServerError, bucket.get_object, "key")
+        self.assertEqual(len(server.bodies), 3)
+        self.assertEqual(bucket.retry_policy.stats.give_ups, 1)
+
+    def test_not_retry_client_error(self):
+        server = _Server(403)
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+
+        self.assertRaises(ServerError, bucket.get_object, "key")
+        self.assertEqual(len(server.bodies), 1)
+
+    def test_post_only_retry_connect_error(self):
+        server = _Server(500)
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+        self.assertRaises(ServerError, bucket.append_object, "key", 0, b"data")
+        self.assertEqual(len(server.bodies), 1)
+
+        server = _Server(httpx.ConnectError("refused"), 200)
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+        bucket.append_object("key", 0, b"data")
+        self.assertEqual(len(server.bodies), 2)
+
+        server = _Server(httpx.ReadError("reset"))
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+        self.assertRaises(RequestError, bucket.append_object, "key", 0, b"data")
+        self.assertEqual(len(server.bodies), 1)
+
+    def test_resend_seekable_body(self):
+        content = random_bytes(100 * 1024)
+        server = _Server(httpx.ReadError("reset"), 503, 200)
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+
+        f = io.BytesIO(b"header" + content)
+        f.seek(6)
+        bucket.put_object("key", f)
+
+        self.assertEqual(server.bodies, [content] * 3)
+
+    def test_not_resend_iterator_body(self):
+        server = _Server(503, 200)
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+
+        def body():
+            yield b"a" * 1024
+
+        self.assertRaises(ServerError, bucket.put_object, "key", body())
+        self.assertEqual(len(server.bodies), 1)
+
+    def test_retry_after(self):
+        server = _Server(503, 200)
+        bucket = mock_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+        events = []
+        bucket.retry_policy.on_retry = events.append
+
+        with mock.patch("aliyun_oss_x.retry._retry_after", return_value=1.5), mock.patch("time.sleep") as sleep:
+            bucket.get_object("key")
+
+        sleep.assert_called_once_with(1.5)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].delay, 1.5)
+        self.assertEqual(events[0].attempt, 1)
+        self.assertAlmostEqual(bucket.retry_policy.stats.retry_time, 1.5)
+
+    def test_retry_after_header(self):
+        error = ServerError(503, httpx.Headers({"Retry-After": "3"}), b"", {})
+        policy = aliyun_oss_x.RetryPolicy(max_delay=10)
+        self.assertEqual(policy.next_delay("GET", "url", error, 1, True), 3)
+
+        policy = aliyun_oss_x.RetryPolicy(max_delay=2)
+        self.assertIsNone(policy.next_delay("GET", "url", error, 1, True))
+
+    def test_backoff_is_capped(self):
+        policy = aliyun_oss_x.RetryPolicy(base_delay=1, max_delay=4)
+        for attempt in range(1, 10):
+            delay = policy.backoff(attempt)
+            self.assertTrue(0 <= delay <= min(4, 2 ** (attempt - 1)))
+
+    def test_budget(self):
+        budget = aliyun_oss_x.RetryBudget(capacity=10, retry_cost=5, success_refill=5)
+        policy = aliyun_oss_x.RetryPolicy(max_retries=10, base_delay=0, budget=budget)
+
+        server = _Server(503, 503, 503)
+        bucket = mock_bucket(server, retry_policy=policy)
+        self.assertRaises(ServerError, bucket.get_object, "key")
+
+        # 两次重试之后预算耗尽
+        self.assertEqual(len(server.bodies), 3)
+        self.assertEqual(policy.stats.budget_exhausted, 1)
+
+        bucket.get_object("key")
+        self.assertEqual(budget.tokens, 5)
+
+
+class TestAsyncRetry(unittest.TestCase):
+    def test_retry(self):
+        content = random_bytes(10 * 1024)
+        server = _Server(429, httpx.ConnectError("refused"), 200)
+
+        async def run():
+            bucket = mock_async_bucket(server, retry_policy=aliyun_oss_x.RetryPolicy(base_delay=0))
+            await bucket.put_object("key", content)
+            return bucket.retry_policy.stats
+
+        stats = asyncio.run(run())
+        self.assertEqual(server.bodies, [content] * 3)
+        self.assertEqual(stats.retries, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import asyncio
+import unittest
+from unittest import mock
+
+import aliyun_oss_x
+from aliyun_oss_x.resumable._stream import _BufferPool, _stream_part_size
+
+from unittests.common import MultipartServer, mock_bucket, mock_async_bucket
+
+
+_PART_SIZE = 100 * 1024
+
+
+def _chunks(content, size):
+    for i in range(0, len(content), size):
+        yield content[i : i + size]
+
+
+class TestUploadStream(unittest.TestCase):
+    def test_generator(self):
+        content = os.urandom(_PART_SIZE * 7 + 123)
+        server = MultipartServer(delay=0.02)
+        buffers = set()
+        take = _BufferPool.take
+
+        def record_take(pool, size):
+            buf = take(pool, size)
+            buffers.add(id(buf))
+            return buf
+
+        with mock.patch.object(_BufferPool, "take", record_take):
+            aliyun_oss_x.upload_stream(
+                mock_bucket(server, enable_crc=False),
+                "key",
+                _chunks(content, 7777),
+                part_size=_PART_SIZE,
+                num_threads=3,
+            )
+
+        self.assertEqual(server.content(), content)
+        self.assertEqual(len(server.parts), 8)
+        self.assertTrue(all(len(server.parts[i]) == _PART_SIZE for i in range(1, 8)))
+        self.assertGreater(server.peak, 1)
+        self.assertLessEqual(len(buffers), 3)
+
+    def test_file_object(self):
+        content = os.urandom(_PART_SIZE * 3)
+        server = MultipartServer()
+        consumed = []
+
+        aliyun_oss_x.upload_stream(
+            mock_bucket(server, enable_crc=False),
+            "key",
+            io.BytesIO(content),
+            size=len(content),
+            part_size=_PART_SIZE,
+            num_threads=2,
+            progress_callback=lambda consumed_bytes, total_bytes: consumed.append((consumed_bytes, total_bytes)),
+        )
+
+        self.assertEqual(server.content(), content)
+        self.assertEqual(len(server.parts), 3)
+        self.assertEqual(consumed[-1], (len(content), len(content)))
+
+    def test_small_stream(self):
+        server = MultipartServer()
+        aliyun_oss_x.upload_stream(
+            mock_bucket(server, enable_crc=False), "key", iter([b"hello ", "world"]), part_size=_PART_SIZE
+        )
+
+        self.assertEqual(server.put_body, b"hello world")
+        self.assertEqual(server.parts, {})
+
+    def test_adaptive_part_size(self):
+        self.assertEqual(_stream_part_size(1, 1), aliyun_oss_x.defaults.min_part_size)
+        self.assertEqual(_stream_part_size(1000, _PART_SIZE), _PART_SIZE)
+        self.assertEqual(_stream_part_size(1001, _PART_SIZE), _PART_SIZE * 2)
+
+        content = os.urandom(_PART_SIZE * 7)
+        server = MultipartServer()
+        with mock.patch.object(aliyun_oss_x.defaults, "max_part_count", 20):
+            aliyun_oss_x.upload_stream(
+                mock_bucket(server, enable_crc=False), "key", _chunks(content, 4096), part_size=_PART_SIZE
+            )
+
+        self.assertEqual(server.content(), content)
+        self.assertEqual(
+            [len(server.parts[i]) for i in sorted(server.parts)], [_PART_SIZE] * 2 + [_PART_SIZE * 2] * 2 + [_PART_SIZE]
+        )
+
+    def test_failure(self):
+        content = os.urandom(_PART_SIZE * 5)
+        server = MultipartServer(fail_part=2)
+
+        self.assertRaises(
+            aliyun_oss_x.exceptions.ServerError,
+            aliyun_oss_x.upload_stream,
+            mock_bucket(server, enable_crc=False),
+            "key",
+            _chunks(content, 8192),
+            part_size=_PART_SIZE,
+            num_threads=2,
+        )
+        self.assertTrue(server.aborted)
+
+    def test_async_generator(self):
+        content = os.urandom(_PART_SIZE * 4 + 1)
+        server = MultipartServer(delay=0.02)
+
+        async def produce():
+            for chunk in _chunks(content, 5000):
+                yield chunk
+
+        async def run():
+            bucket = mock_async_bucket(server.handle_async, enable_crc=False)
+            await aliyun_oss_x.upload_stream_async(bucket, "key", produce(), part_size=_PART_SIZE, num_threads=2)
+
+        asyncio.run(run())
+        self.assertEqual(server.content(), content)
+        self.assertEqual(len(server.parts), 5)
+        self.assertEqual(server.peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import io
+import os
+import time
+import base64
+import hashlib
+import random
+import tempfile
+import asyncio
 import unittest
+import concurrent.futures
+from unittest import mock
 import aliyun_oss_x
 from aliyun_oss_x.utils import *
+from aliyun_oss_x.utils import _crc64
 
 
 class TestUtils(unittest.TestCase):
@@ -45,6 +56,175 @@ class TestUtils(unittest.TestCase):
         aliyun_oss_x.defaults.part_size = 1024 * 1024 - 1
         self.assertEqual(cipher.determine_part_size(1024 * 1024 * 1000), 1024 * 1024)
 
+    def test_crc64_backends(self):
+        self.assertIn(crc64_backend(), _crc64.BACKENDS)
+        rand = random.Random(0)
+        for name, update in _crc64.BACKENDS.items():
+            # CRC-64/XZ的标准校验值
+            self.assertEqual(update(0, b"123456789"), 0x995DC9BBDF1939FA, name)
+            for size in [0, 1, 7, 8, 9, 511, 512, 513, 4096 + 3, _crc64._BULK_BLOCK_SIZE * 2 + 5]:
+                data = os.urandom(size)
+                split = rand.randint(0, size)
+                expected = _crc64.BACKENDS["python"](0, data)
+                self.assertEqual(update(update(0, data[:split]), memoryview(data)[split:]), expected, (name, size))
+
+    def test_crc64(self):
+        data = os.urandom(10000)
+        crc = Crc64()
+        crc.update(data[:3000])
+        crc(bytearray(data[3000:]))
+        self.assertEqual(crc.crc, _crc64.update(0, data))
+
+        crc.reset()
+        crc.update(data[:10])
+        self.assertEqual(crc.crc, _crc64.update(0, data[:10]))
+
+        resumed = Crc64(_crc64.update(0, data[:10]))
+        resumed.update(data[10:])
+        self.assertEqual(resumed.crc, _crc64.update(0, data))
+
+    def test_crc64_combine_many(self):
+        data = os.urandom(1000)
+        sizes = [100, 100, 1, 299, 100, 400]
+        parts = []
+        offset = 0
+        for size in sizes:
+            parts.append((_crc64.update(0, data[offset : offset + size]), size))
+            offset += size
+
+        self.assertEqual(Crc64().combine_many(parts), _crc64.update(0, data))
+        self.assertEqual(Crc64().combine_many([]), 0)
+
+    def test_crc64_combine_many_benchmark(self):
+        # 10000个分片的CRC合并，之前每次合并都要重新平方矩阵，需要两分钟以上
+        rand = random.Random(0)
+        parts = [(rand.getrandbits(64), 10 * 1024 * 1024) for _ in range(9999)]
+        parts.append((rand.getrandbits(64), 12345))
+
+        start = time.perf_counter()
+        crc = Crc64().combine_many(parts)
+        elapsed = time.perf_counter() - start
+
+        expected = 0
+        crc_obj = Crc64()
+        for part_crc, size in parts[:100]:
+            expected = crc_obj.combine(expected, part_crc, size)
+        self.assertEqual(Crc64().combine_many(parts[:100]), expected)
+        self.assertLess(elapsed, 2, f"combine_many of {len(parts)} parts took {elapsed:.3f}s, crc: {crc}")
+
+    def test_calc_range_checksums(self):
+        data = os.urandom(3 * 1024 * 1024 + 7)
+        with tempfile.TemporaryDirectory() as root:
+            filename = os.path.join(root, "file")
+            with open(filename, "wb") as f:
+                f.write(data)
+
+            ranges = [(0, 100), (100, 2 * 1024 * 1024), (5, 0), (len(data) - 7, 7)]
+            checksums = calc_range_checksums(filename, ranges, md5=True, num_threads=2)
+            self.assertEqual([(c.start, c.size) for c in checksums], ranges)
+            for (start, size), c in zip(ranges, checksums):
+                chunk = data[start : start + size]
+                self.assertEqual(c.crc64, _crc64.update(0, chunk))
+                self.assertEqual(c.etag, hashlib.md5(chunk).hexdigest().upper())
+                self.assertEqual(c.content_md5, base64.b64encode(hashlib.md5(chunk).digest()).decode())
+
+            self.assertIsNone(calc_range_checksums(filename, [(0, 10)])[0].md5)
+            self.assertRaises(EOFError, calc_range_checksums, filename, [(len(data) - 1, 2)])
+
+            expected = _crc64.update(0, data)
+            self.assertEqual(calc_file_crc64(filename, part_size=1000 * 1000), expected)
+            self.assertEqual(calc_file_crc64(filename), expected)
+            with concurrent.futures.ThreadPoolExecutor(3) as executor:
+                self.assertEqual(calc_file_crc64(filename, part_size=123457, executor=executor), expected)
+
+            empty = os.path.join(root, "empty")
+            open(empty, "wb").close()
+            self.assertEqual(calc_file_crc64(empty), 0)
+
+    def test_stream_adapter(self):
+        data = os.urandom(3 * 1024 * 1024 + 5)
+        calls = []
+
+        def progress(consumed_bytes, total_bytes):
+            calls.append((consumed_bytes, total_bytes))
+
+        # 各种数据源读完后的CRC都相同，进度回调的最后一次是读取结束时
+        sources = [
+            (data, len(data)),
+            (io.BytesIO(data), len(data)),
+            (_Unsized(data), None),
+            ((data[i : i + 100000] for i in range(0, len(data), 100000)), None),
+        ]
+        for source, total in sources:
+            calls.clear()
+            adapter = make_stream_adapter(source, progress, enable_crc=True)
+            self.assertEqual(b"".join(adapter), data)
+            self.assertEqual(adapter.crc, _crc64.update(0, data))
+            self.assertEqual(calls[-1], (len(data), total))
+            self.assertEqual(len(calls), len(set(calls)))
+
+        # 调用间隔很长时，只在第一次和结束时调用
+        calls.clear()
+        with mock.patch.object(aliyun_oss_x.defaults, "progress_interval", 3600):
+            adapter = make_stream_adapter(data, progress)
+            while adapter.read(1000):
+                pass
+        self.assertEqual(calls, [(1000, len(data)), (len(data), len(data))])
+
+    def test_stream_adapter_bytes_chunks(self):
+        data = os.urandom(5000)
+
+        # bytes数据源按memoryview切片，交给httpx的数据块仍然是bytes，一次读完时不复制
+        adapter = make_stream_adapter(data, enable_crc=True)
+        self.assertIs(type(adapter.read(1000)), bytes)
+        self.assertEqual(adapter.read(), data[1000:])
+        self.assertEqual(adapter.crc, _crc64.update(0, data))
+        self.assertIs(make_stream_adapter(data).read(), data)
+
+    def test_stream_adapter_cipher_discard(self):
+        data = os.urandom(100000)
+
+        def cipher(content):
+            return bytes(content).translate(bytes(reversed(range(256))))
+
+        adapter = make_stream_adapter(_Unsized(data), enable_crc=True, init_crc=0, cipher_callback=cipher, discard=10)
+        result = adapter.read(5) + adapter.read()
+        self.assertEqual(result, cipher(data)[10:])
+        self.assertEqual(adapter.crc, _crc64.update(0, data[10:]))
+
+        self.assertRaises(ClientError, make_stream_adapter, data, discard=10)
+
+    def test_stream_adapter_async(self):
+        data = os.urandom(1024 * 1024 + 5)
+        calls = []
+
+        async def chunks():
+            for i in range(0, len(data), 100000):
+                yield data[i : i + 100000]
+
+        async def read_all(adapter):
+            result = []
+            while chunk := await adapter.read(300000):
+                result.append(chunk)
+            return b"".join(result)
+
+        for source, total in [(data, len(data)), (chunks(), None)]:
+            calls.clear()
+            adapter = make_stream_adapter_async(source, lambda *args: calls.append(args), enable_crc=True)
+            self.assertEqual(asyncio.run(read_all(adapter)), data)
+            self.assertEqual(adapter.crc, _crc64.update(0, data))
+            self.assertEqual(calls[-1], (len(data), total))
+
+
+class _Unsized:
+    """只支持read、无法确定长度的数据源。"""
+
+    def __init__(self, data):
+        self.__file = io.BytesIO(data)
+
+    def read(self, amt=None):
+        return self.__file.read(amt)
+
 
 if __name__ == "__main__":
     unittest.main()